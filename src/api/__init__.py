@@ -0,0 +1,10 @@
+"""
+API 层：常驻服务模式（FastAPI）
+
+依赖 fastapi / uvicorn（可选依赖），仅在服务模式下导入。
+"""
+from .server import serve
+
+__all__ = [
+    "serve",
+]
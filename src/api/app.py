@@ -0,0 +1,224 @@
+"""
+本地 HTTP API
+
+为前端提供采集、上架、任务队列和知识库接口，以及 EventBus 事件流（SSE）。
+浏览器、存储和知识库在进程内常驻，请求之间复用。
+"""
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from src.infra.logger import logger, trace, get_run_id
+from src.models import JobKind, JobStatus, ProductStatus, ProblemStatus, TrustLevel, Result
+from .state import ServiceState
+
+log = logger.get("api")
+
+# 错误码 -> HTTP 状态码（未列出的按是否可恢复返回 503 / 500）
+_STATUS_CODES = {
+    "S_NOT_FOUND": 404,
+    "K_SOLUTION_NOT_FOUND": 404,
+    "C_INVALID_URL": 400,
+    "B_NOT_STARTED": 503,
+    "B_LAUNCH_FAILED": 503,
+    "B_LOGIN_EXPIRED": 401,
+}
+
+
+class CollectRequest(BaseModel):
+    url: str
+
+
+class CollectBatchRequest(BaseModel):
+    urls: list[str]
+    priority: int = 0
+
+
+class UploadRequest(BaseModel):
+    product_id: str
+    binding_id: str | None = None
+    priority: int = 10      # 交互提交的上架任务优先于批量任务
+
+
+def unwrap(result: Result):
+    """成功时返回数据，失败时转换为 HTTP 错误"""
+    if result.success:
+        return result.data
+    error = result.error
+    status = _STATUS_CODES.get(error.code, 503 if error.recoverable else 500)
+    raise HTTPException(status_code=status, detail={
+        "code": error.code,
+        "message": error.message,
+        "recoverable": error.recoverable,
+        "context": error.context
+    })
+
+
+def create_app(state: ServiceState = None, warm_browser: bool = True) -> FastAPI:
+    """创建应用（state 为空时按 data/config.json 创建）"""
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        app.state.service = state or ServiceState()
+        await app.state.service.start(warm_browser=warm_browser)
+        log.info("服务已启动", run_id=get_run_id())
+        try:
+            yield
+        finally:
+            await app.state.service.stop()
+            log.info("服务已停止")
+
+    app = FastAPI(title="Product Uploader", version="0.1.0", lifespan=lifespan)
+    # 前端开发服务器（next dev）运行在其他端口
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["http://localhost:3000", "http://127.0.0.1:3000"],
+        allow_methods=["*"],
+        allow_headers=["*"]
+    )
+
+    @app.middleware("http")
+    async def trace_requests(request: Request, call_next):
+        if request.url.path == "/api/events":
+            return await call_next(request)
+        with trace(f"{request.method} {request.url.path}", layer="api"):
+            return await call_next(request)
+
+    def service(request: Request) -> ServiceState:
+        return request.app.state.service
+
+    # ==================== 状态 ====================
+
+    @app.get("/api/health")
+    async def health(request: Request):
+        svc = service(request)
+        return {
+            "status": "ok",
+            "run_id": get_run_id(),
+            "browser_ready": svc.browser_ready,
+            "pool": svc.browser.pool_stats().to_dict(),
+            "breakers": svc.browser.breakers.stats(),
+            "rate_limits": svc.browser.rate_limiter.stats(),
+            "event_subscribers": svc.events.subscriber_count,
+            "event_bus": svc.event_bus.stats(),
+            "images": svc.images.cache.stats()
+        }
+
+    @app.get("/api/events")
+    async def events(request: Request, types: str = None):
+        """事件流（text/event-stream），types 为逗号分隔的事件类型"""
+        wanted = {t.strip() for t in types.split(",") if t.strip()} if types else None
+        return StreamingResponse(
+            service(request).events.stream(wanted),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+
+    # ==================== 商品 ====================
+
+    @app.get("/api/products")
+    async def list_products(request: Request, status: ProductStatus = None, limit: int = None):
+        entries = unwrap(service(request).storage.list(status))
+        return entries[:limit] if limit else entries
+
+    @app.get("/api/products/{product_id}")
+    async def get_product(request: Request, product_id: str):
+        return unwrap(service(request).storage.get(product_id)).to_dict()
+
+    @app.delete("/api/products/{product_id}")
+    async def delete_product(request: Request, product_id: str):
+        return {"deleted": unwrap(service(request).storage.delete(product_id))}
+
+    # ==================== 采集 ====================
+
+    @app.post("/api/collect")
+    async def collect(request: Request, body: CollectRequest):
+        """立即采集单个链接并保存（使用常驻浏览器的标签页池）"""
+        svc = service(request)
+        unwrap(await svc.ensure_browser())
+        product = unwrap(await svc.collector.collect_pooled(body.url))
+        unwrap(svc.storage.save(product))
+        return product.to_dict()
+
+    @app.post("/api/collect/batch")
+    async def collect_batch(request: Request, body: CollectBatchRequest):
+        """链接加入采集队列（同一链接只入队一次）"""
+        svc = service(request)
+        urls = list(dict.fromkeys(u.strip() for u in body.urls if u and u.strip()))
+        added = unwrap(svc.jobs.enqueue_many(
+            JobKind.COLLECT,
+            [{"url": url} for url in urls],
+            priority=body.priority,
+            dedupe_keys=[f"collect:{url}" for url in urls]
+        ))
+        svc.runner.notify()
+        return {"added": added, "duplicates": len(urls) - added}
+
+    # ==================== 上架 ====================
+
+    @app.post("/api/upload")
+    async def upload(request: Request, body: UploadRequest):
+        """商品加入上架队列（表单填写后在浏览器中提交，跳转到发布成功页后才标记为已上架）"""
+        svc = service(request)
+        unwrap(svc.storage.get(body.product_id))
+        payload = {"product_id": body.product_id}
+        if body.binding_id:
+            payload["binding_id"] = body.binding_id
+        added = unwrap(svc.jobs.enqueue(
+            JobKind.UPLOAD, payload,
+            priority=body.priority,
+            dedupe_key=f"upload:{body.product_id}"
+        ))
+        svc.runner.notify()
+        return {"added": added}
+
+    # ==================== 任务队列 ====================
+
+    @app.get("/api/jobs")
+    async def list_jobs(request: Request, status: JobStatus = None, kind: JobKind = None, limit: int = 100):
+        jobs = unwrap(service(request).jobs.list(status, kind, limit))
+        return [job.to_dict() for job in jobs]
+
+    @app.get("/api/jobs/counts")
+    async def job_counts(request: Request):
+        return unwrap(service(request).jobs.counts())
+
+    @app.get("/api/jobs/{job_id}")
+    async def get_job(request: Request, job_id: int):
+        return unwrap(service(request).jobs.get(job_id)).to_dict()
+
+    @app.post("/api/jobs/retry")
+    async def retry_jobs(request: Request):
+        svc = service(request)
+        count = unwrap(svc.jobs.retry_failed())
+        svc.runner.notify()
+        return {"requeued": count}
+
+    @app.post("/api/jobs/resume")
+    async def resume_jobs(request: Request):
+        """重新登录后恢复被暂停的上架任务"""
+        service(request).runner.resume(JobKind.UPLOAD)
+        return {"resumed": True}
+
+    # ==================== 知识库 / 绑定配置 ====================
+
+    @app.get("/api/knowledge/stats")
+    async def knowledge_stats(request: Request):
+        return service(request).knowledge_base.get_stats()
+
+    @app.get("/api/knowledge/problems")
+    async def list_problems(request: Request, status: ProblemStatus = None):
+        return unwrap(service(request).knowledge_base.problems.list(status=status))
+
+    @app.get("/api/knowledge/solutions")
+    async def list_solutions(request: Request, trust_level: TrustLevel = None):
+        return unwrap(service(request).knowledge_base.solutions.list(trust_level=trust_level))
+
+    @app.get("/api/bindings")
+    async def list_bindings(request: Request):
+        return unwrap(service(request).bindings.list())
+
+    return app
@@ -0,0 +1,62 @@
+"""
+事件推送
+
+把 EventBus 上的事件转发给所有 SSE 订阅者。每个订阅者一个有界队列，
+客户端消费过慢时丢弃最旧的事件，不会阻塞业务代码。
+"""
+import asyncio
+import json
+from typing import AsyncIterator
+
+from src.core import Event, EventBus
+
+
+def serialize_event(event: Event) -> str:
+    """事件序列化为 SSE 消息"""
+    data = json.dumps(
+        {"type": event.type, "timestamp": event.timestamp.isoformat(), "payload": event.payload},
+        ensure_ascii=False,
+        default=str
+    )
+    return f"event: {event.type}\ndata: {data}\n\n"
+
+
+class EventStream:
+    """EventBus 监听器：向订阅者广播事件"""
+
+    QUEUE_SIZE = 256
+    KEEPALIVE = 15.0    # 空闲时发送注释行的间隔（秒），防止代理断开连接
+
+    def __init__(self, event_bus: EventBus):
+        self._subscribers: set[asyncio.Queue[Event]] = set()
+        self.dropped = 0
+        event_bus.subscribe(self)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def on_event(self, event: Event) -> None:
+        for queue in self._subscribers:
+            if queue.full():
+                queue.get_nowait()
+                self.dropped += 1
+            queue.put_nowait(event)
+
+    async def stream(self, types: set[str] | None = None) -> AsyncIterator[str]:
+        """订阅事件流（types 为空时接收全部类型）"""
+        queue: asyncio.Queue[Event] = asyncio.Queue(self.QUEUE_SIZE)
+        self._subscribers.add(queue)
+        try:
+            yield ": connected\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), self.KEEPALIVE)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if types and event.type not in types:
+                    continue
+                yield serialize_event(event)
+        finally:
+            self._subscribers.discard(queue)
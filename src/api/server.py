@@ -0,0 +1,32 @@
+"""
+服务模式入口
+
+    python -m src.main serve [--host 127.0.0.1] [--port 8765] [--workers 3] [--no-warm]
+"""
+import argparse
+
+from src.infra.logger import logger
+
+log = logger.get("service")
+
+
+def serve(argv: list[str] = None):
+    """启动常驻服务（需要安装 fastapi 和 uvicorn）"""
+    parser = argparse.ArgumentParser(prog="uploader serve", description="本地 HTTP API 服务")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=None, help="任务队列 worker 数量（默认取批量采集并发数）")
+    parser.add_argument("--no-warm", action="store_true", help="不在启动时预热浏览器")
+    args = parser.parse_args(argv)
+
+    try:
+        import uvicorn
+        from .app import create_app
+        from .state import ServiceState
+    except ImportError as e:
+        print(f"服务模式需要安装 fastapi 和 uvicorn: pip install 'product-uploader[api]' ({e})")
+        raise SystemExit(1)
+
+    app = create_app(ServiceState(workers=args.workers), warm_browser=not args.no_warm)
+    log.info("启动服务", host=args.host, port=args.port)
+    uvicorn.run(app, host=args.host, port=args.port, log_config=None)
@@ -0,0 +1,128 @@
+"""
+服务运行时状态
+
+常驻进程内共享的组件：配置、存储（含内存索引缓存）、知识库、任务队列、
+预热的浏览器和后台任务执行器。所有请求复用同一组实例。
+"""
+import asyncio
+from pathlib import Path
+
+from src.core import Collector, HttpCollector, EventBus, Filler, ImagePipeline, JobRunner
+from src.infra import (
+    BrowserManager, BrowserConfig, HttpConfig, BindingStorage, JobQueue, ImageCache, KnowledgeBase,
+    Config, ConfigManager, create_product_storage
+)
+from src.infra.logger import logger
+from src.models import Result
+from .events import EventStream
+
+log = logger.get("service")
+
+
+class ServiceState:
+    """服务组件容器"""
+
+    def __init__(self, config: Config = None, workers: int = None):
+        self.config = config or ConfigManager().load()
+        data_dir = Path(self.config.data_dir)
+
+        # SSE 推送等订阅者在后台处理，不阻塞采集/填写
+        self.event_bus = EventBus(mode="async")
+        self.events = EventStream(self.event_bus)
+        self.storage = create_product_storage(
+            data_dir / "products", self.config.storage_backend, self.config.storage_fsync
+        )
+        self.knowledge_base = KnowledgeBase(data_dir)
+        self.bindings = BindingStorage(data_dir / "bindings")
+        self.jobs = JobQueue(data_dir)
+        self.images = ImagePipeline(ImageCache(data_dir), rate_limits=self.config.rate_limits)
+        self.workers = workers or self.config.collect_concurrency
+
+        self.browser = BrowserManager(BrowserConfig(
+            headless=self.config.browser_headless,
+            slow_mo=self.config.browser_slow_mo,
+            timeout=self.config.browser_timeout,
+            user_data_dir=self.config.user_data_dir,
+            mode=self.config.browser_mode,
+            debug_port=self.config.browser_debug_port,
+            cdp_endpoint=self.config.browser_cdp_endpoint,
+            nav_strategies=self.config.browser_nav_strategies,
+            max_retry=self.config.max_retry,
+            retry_delay=self.config.retry_delay,
+            rate_limits=self.config.rate_limits
+        ))
+        self.browser_ready = False
+        self._browser_lock = asyncio.Lock()
+
+        if self.config.collect_backend == "http":
+            self.collector = HttpCollector(
+                self.browser, self.event_bus,
+                http_config=HttpConfig(max_connections=max(self.config.http_concurrency, 1)),
+                block_profile=self.config.collect_block_profile
+            )
+        else:
+            self.collector = Collector(
+                self.browser, self.event_bus, block_profile=self.config.collect_block_profile
+            )
+        self.filler = Filler(self.browser, self.knowledge_base, self.event_bus, images=self.images)
+        self.runner = JobRunner(
+            self.jobs, self.storage, self.event_bus,
+            collector=self.collector,
+            filler=self.filler,
+            bindings=self.bindings,
+            images=self.images
+        )
+        self._stop = asyncio.Event()
+        self._runner_task: asyncio.Task | None = None
+
+    async def ensure_browser(self) -> Result[bool]:
+        """启动浏览器（只启动一次，之后所有请求复用）"""
+        async with self._browser_lock:
+            if self.browser_ready:
+                return Result.ok(True)
+            result = await self.browser.start()
+            if not result.success:
+                log.error("浏览器启动失败", error=result.error.message)
+                return result
+            self.browser_ready = True
+            log.info("浏览器已启动")
+            return Result.ok(True)
+
+    async def start(self, warm_browser: bool = True):
+        """启动后台任务执行器（和浏览器）"""
+        if warm_browser:
+            result = await self.ensure_browser()
+            if result.success:
+                await self.browser.warm_pool(self.workers)
+        self._stop.clear()
+        self._runner_task = asyncio.ensure_future(self._run_jobs())
+
+    async def _run_jobs(self):
+        """常驻运行任务队列，执行需要浏览器时先确保浏览器已启动"""
+        result = await self.ensure_browser()
+        if not result.success:
+            return
+        run_result = await self.runner.run(concurrency=self.workers, until_empty=False, stop=self._stop)
+        if not run_result.success:
+            log.error("任务执行器退出", error=run_result.error.message)
+
+    async def stop(self):
+        """停止执行器并释放资源"""
+        self._stop.set()
+        if self._runner_task:
+            try:
+                await asyncio.wait_for(self._runner_task, timeout=30)
+            except asyncio.TimeoutError:
+                self._runner_task.cancel()
+            self._runner_task = None
+        if self.browser_ready:
+            try:
+                await self.browser.stop()
+            except Exception as e:
+                log.warning("关闭浏览器时出错", error=str(e))
+            self.browser_ready = False
+        await self.event_bus.close()
+        self.filler.selectors.flush()
+        await self.images.close()
+        self.storage.close()
+        self.jobs.close()
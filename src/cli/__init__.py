@@ -5,7 +5,7 @@ from .ui import UI
 from .shell import InteractiveShell, main
 from .flows import (
     BaseFlow, FlowResult, FlowStatus,
-    CollectFlow, UploadFlow, LearnFlow, KnowledgeFlow
+    CollectFlow, CollectBatchFlow, UploadFlow, LearnFlow, KnowledgeFlow
 )
 
 __all__ = [
@@ -16,6 +16,7 @@ __all__ = [
     "FlowResult",
     "FlowStatus",
     "CollectFlow",
+    "CollectBatchFlow",
     "UploadFlow",
     "LearnFlow",
     "KnowledgeFlow",
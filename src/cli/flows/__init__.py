@@ -2,17 +2,22 @@
 交互流程模块
 """
 from .base import BaseFlow, FlowResult, FlowStatus
-from .collect import CollectFlow
+from .collect import CollectFlow, CollectBatchFlow
 from .upload import UploadFlow
 from .learn import LearnFlow
 from .knowledge import KnowledgeFlow
+from .jobs import JobFlow
+from .pipeline import PipelineFlow
 
 __all__ = [
     "BaseFlow",
     "FlowResult",
     "FlowStatus",
     "CollectFlow",
+    "CollectBatchFlow",
     "UploadFlow",
     "LearnFlow",
     "KnowledgeFlow",
+    "JobFlow",
+    "PipelineFlow",
 ]
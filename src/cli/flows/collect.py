@@ -1,12 +1,30 @@
 """
 采集流程
 """
+from pathlib import Path
+
 from src.cli.ui import UI
-from src.core import Collector, EventBus, EventTypes
-from src.infra import BrowserManager, ProductStorage
+from src.core import Collector, HttpCollector, BatchItem, EventBus, EventTypes
+from src.infra import BrowserManager, ProductStorage, HttpConfig
 from .base import BaseFlow, FlowResult
 
 
+def parse_url_source(source: str) -> list[str]:
+    """解析链接来源：文件路径（每行一个链接，# 开头为注释）或空白分隔的链接"""
+    path = Path(source)
+    if path.is_file():
+        lines = path.read_text(encoding="utf-8").splitlines()
+    else:
+        lines = source.split()
+
+    urls = []
+    for line in lines:
+        line = line.strip()
+        if line and not line.startswith("#"):
+            urls.append(line)
+    return urls
+
+
 class CollectFlow(BaseFlow):
     """商品采集流程"""
 
@@ -56,6 +74,8 @@ class CollectFlow(BaseFlow):
         self.ui.print(f"  标题: {product.title}")
         self.ui.print(f"  价格: ¥{product.price:.2f}")
         self.ui.print(f"  图片: {len(product.images)} 张")
+        if product.skus:
+            self.ui.print(f"  SKU: {len(product.skus)} 个")
         self.ui.print()
 
         # 确认保存
@@ -81,3 +101,123 @@ class CollectFlow(BaseFlow):
             payload.get("total", 1),
             payload.get("message", "")
         )
+
+
+class CollectBatchFlow(BaseFlow):
+    """批量采集流程（collect-batch）"""
+
+    def __init__(
+        self,
+        ui: UI,
+        browser: BrowserManager,
+        storage: ProductStorage,
+        event_bus: EventBus = None,
+        concurrency: int = 3,
+        block_profile: str = "collect-lean",
+        backend: str = "browser"
+    ):
+        super().__init__(ui)
+        self.browser = browser
+        self.storage = storage
+        self.event_bus = event_bus or EventBus()
+        self.concurrency = concurrency
+        self.backend = backend
+        if backend == "http":
+            # HTTP 后端：直接请求 HTML，需要 JS 的页面回退到浏览器
+            self.collector = HttpCollector(
+                browser, self.event_bus,
+                http_config=HttpConfig(max_connections=max(concurrency, 1)),
+                block_profile=block_profile
+            )
+        else:
+            self.collector = Collector(browser, self.event_bus, block_profile=block_profile)
+        self._saved: list[str] = []
+
+        # 批量模式只显示汇总进度
+        self.event_bus.on(EventTypes.PROGRESS, self._on_progress)
+
+    async def run(self) -> FlowResult:
+        """执行批量采集流程"""
+        self.ui.print_header("批量采集")
+        self.ui.print()
+        self.ui.print_info("可输入链接文件路径（每行一个链接，# 开头为注释），或用空格分隔的多个链接")
+        self.ui.print()
+
+        source = self.input("链接文件或链接列表")
+        if not source:
+            return FlowResult.cancelled("未输入商品链接")
+
+        urls = parse_url_source(source)
+        if not urls:
+            self.ui.print_warning("没有找到有效链接")
+            return FlowResult.cancelled("无有效链接")
+
+        label = "并发请求数" if self.backend == "http" else "并发标签页数量"
+        value = self.input(label, str(self.concurrency))
+        try:
+            concurrency = max(1, int(value))
+        except ValueError:
+            concurrency = self.concurrency
+
+        # 浏览器模式受标签页池容量限制，HTTP 模式受连接池上限限制
+        max_workers = self.collector.max_workers()
+        if concurrency > max_workers:
+            self.ui.print_warning(f"并发数超过上限 {max_workers}，已调整为 {max_workers}")
+            concurrency = max_workers
+
+        self.ui.print()
+        self.ui.print_info(f"共 {len(urls)} 个链接，并发 {concurrency}，采集成功的商品将自动保存")
+        self.ui.print()
+
+        if self.backend == "http" and self.browser:
+            # HTTP 请求复用浏览器的登录态
+            await self.browser.save_cookies(self.collector.http.config.cookie_file)
+
+        # 批次内的保存合并写索引（每 BATCH_FLUSH_EVERY 个写一次，中断时已写入的不会丢失）
+        with self.storage.batch():
+            result = await self.collector.collect_batch(
+                urls, concurrency=concurrency, on_item=self._on_item
+            )
+        if not result.success:
+            self.ui.print_error(result.error.message)
+            return FlowResult.failed(result.error.message)
+
+        items = result.data
+        failed = [item for item in items if not item.result.success]
+
+        self.ui.print()
+        self.ui.print_success(f"批量采集完成: 成功 {len(self._saved)} / 共 {len(items)}")
+        if self.backend == "http" and self.collector.fallbacks:
+            self.ui.print_info(f"{self.collector.fallbacks} 个链接需要 JS，已回退到浏览器采集")
+        blocked = self.browser.block_stats.blocked_requests if self.browser else 0
+        if blocked:
+            self.ui.print_info(f"已拦截 {blocked} 个无关资源请求")
+        if failed:
+            self.ui.print()
+            self.ui.print_warning(f"失败 {len(failed)} 个:")
+            rows = [[item.url[:60], item.result.error.code] for item in failed[:20]]
+            self.ui.table(["链接", "错误码"], rows)
+            if len(failed) > 20:
+                self.ui.print_info(f"共 {len(failed)} 条失败，仅显示前 20 条")
+
+        return FlowResult.success(
+            "批量采集完成",
+            {"product_ids": list(self._saved), "failed": [item.url for item in failed]}
+        )
+
+    def _on_item(self, item: BatchItem):
+        """单个链接完成：保存成功采集的商品"""
+        if not item.result.success:
+            return
+        save_result = self.storage.save(item.result.data)
+        if save_result.success:
+            self._saved.append(item.result.data.id)
+
+    def _on_progress(self, event):
+        """处理进度事件"""
+        payload = event.payload
+        self.ui.progress(
+            payload.get("step", 0),
+            payload.get("total", 1),
+            payload.get("message", "")
+        )
@@ -0,0 +1,210 @@
+"""
+任务队列流程
+"""
+import asyncio
+
+from src.cli.ui import UI
+from src.core import Collector, HttpCollector, Filler, ImagePipeline, JobRunner, EventBus, EventTypes
+from src.infra import BrowserManager, ProductStorage, KnowledgeBase, BindingStorage, JobQueue, HttpConfig
+from src.models import JobKind, JobStatus, Product, ProductStatus
+from .base import BaseFlow, FlowResult
+from .collect import parse_url_source
+
+
+class JobFlow(BaseFlow):
+    """任务队列管理流程：添加采集/上架任务、运行队列（中断后可继续）"""
+
+    def __init__(
+        self,
+        ui: UI,
+        browser: BrowserManager,
+        storage: ProductStorage,
+        queue: JobQueue,
+        knowledge_base: KnowledgeBase,
+        event_bus: EventBus = None,
+        bindings: BindingStorage = None,
+        concurrency: int = 3,
+        block_profile: str = "collect-lean",
+        backend: str = "browser",
+        images: ImagePipeline = None
+    ):
+        super().__init__(ui)
+        self.browser = browser
+        self.storage = storage
+        self.queue = queue
+        self.event_bus = event_bus or EventBus()
+        self.concurrency = concurrency
+
+        if backend == "http":
+            collector = HttpCollector(
+                browser, self.event_bus,
+                http_config=HttpConfig(max_connections=max(concurrency, 1)),
+                block_profile=block_profile
+            )
+        else:
+            collector = Collector(browser, self.event_bus, block_profile=block_profile)
+        self.runner = JobRunner(
+            queue, storage, self.event_bus,
+            collector=collector,
+            filler=Filler(browser, knowledge_base, self.event_bus, images=images),
+            bindings=bindings,
+            images=images,
+            review=self._review
+        )
+        # 多个上架 worker 同时填写完成时，逐个确认
+        self._review_lock = asyncio.Lock()
+
+        self.event_bus.on(EventTypes.BATCH_ITEM, self._on_item)
+
+    async def run(self) -> FlowResult:
+        """执行任务队列流程"""
+        self.ui.print_header("任务队列")
+        self.ui.print()
+        self._print_counts()
+
+        options = [
+            "添加采集任务（链接文件/链接列表）",
+            "将全部待上架商品加入队列",
+            "运行队列",
+            "重试失败的任务",
+            "清理已完成的任务",
+            "返回"
+        ]
+        idx = self.select(options)
+
+        if idx == 0:
+            return self._add_collect_jobs()
+        elif idx == 1:
+            return self._add_upload_jobs()
+        elif idx == 2:
+            return await self._run_queue()
+        elif idx == 3:
+            return self._retry_failed()
+        elif idx == 4:
+            return self._purge_done()
+        else:
+            return FlowResult.cancelled("用户返回")
+
+    def _print_counts(self):
+        """显示各类任务的状态统计"""
+        rows = []
+        for kind, label in ((JobKind.COLLECT, "采集"), (JobKind.UPLOAD, "上架")):
+            result = self.queue.counts(kind)
+            if not result.success:
+                continue
+            counts = result.data
+            rows.append([label] + [str(counts[s.value]) for s in JobStatus])
+        if rows:
+            self.ui.table(["类型", "等待", "运行中", "完成", "失败"], rows)
+            self.ui.print()
+
+    def _add_collect_jobs(self) -> FlowResult:
+        """添加采集任务（同一链接只入队一次）"""
+        self.ui.print_info("可输入链接文件路径（每行一个链接，# 开头为注释），或用空格分隔的多个链接")
+        source = self.input("链接文件或链接列表")
+        if not source:
+            return FlowResult.cancelled("未输入商品链接")
+
+        urls = list(dict.fromkeys(parse_url_source(source)))
+        if not urls:
+            self.ui.print_warning("没有找到有效链接")
+            return FlowResult.cancelled("无有效链接")
+
+        result = self.queue.enqueue_many(
+            JobKind.COLLECT,
+            [{"url": url} for url in urls],
+            dedupe_keys=[f"collect:{url}" for url in urls]
+        )
+        if not result.success:
+            self.ui.print_error(result.error.message)
+            return FlowResult.failed(result.error.message)
+
+        self.ui.print_success(f"已加入 {result.data} 个采集任务（{len(urls) - result.data} 个已在队列中）")
+        return FlowResult.success("已添加采集任务", {"added": result.data})
+
+    def _add_upload_jobs(self) -> FlowResult:
+        """把所有待上架商品加入上架队列（同一商品只入队一次）"""
+        list_result = self.storage.list(ProductStatus.DRAFT)
+        if not list_result.success:
+            self.ui.print_error(list_result.error.message)
+            return FlowResult.failed(list_result.error.message)
+
+        ids = [p["id"] for p in list_result.data]
+        if not ids:
+            self.ui.print_warning("没有待上架的商品")
+            return FlowResult.cancelled("无待上架商品")
+
+        result = self.queue.enqueue_many(
+            JobKind.UPLOAD,
+            [{"product_id": product_id} for product_id in ids],
+            dedupe_keys=[f"upload:{product_id}" for product_id in ids]
+        )
+        if not result.success:
+            self.ui.print_error(result.error.message)
+            return FlowResult.failed(result.error.message)
+
+        self.ui.print_success(f"已加入 {result.data} 个上架任务（{len(ids) - result.data} 个已在队列中）")
+        return FlowResult.success("已添加上架任务", {"added": result.data})
+
+    async def _run_queue(self) -> FlowResult:
+        """运行队列直到没有可执行的任务"""
+        value = self.input("并发 worker 数量", str(self.concurrency))
+        try:
+            concurrency = max(1, int(value))
+        except ValueError:
+            concurrency = self.concurrency
+
+        self.ui.print()
+        self.ui.print_info("开始运行队列，中断后再次运行会从未完成的任务继续")
+        self.ui.print()
+
+        # 不使用 storage.batch()：每个任务完成前商品必须已写入索引，崩溃后才能正确继续
+        result = await self.runner.run(concurrency=concurrency)
+        if not result.success:
+            self.ui.print_error(result.error.message)
+            return FlowResult.failed(result.error.message)
+
+        stats = result.data
+        self.ui.print()
+        self.ui.print_success(f"队列运行结束: 完成 {stats.done}，失败 {stats.failed}，待重试 {stats.retried}")
+        if stats.recovered:
+            self.ui.print_info(f"已恢复上次中断的 {stats.recovered} 个任务")
+        if stats.released:
+            self.ui.print_warning("登录已过期，上架任务已暂停，请在浏览器中登录后重新运行队列")
+        return FlowResult.success("队列运行结束", stats.to_dict())
+
+    async def _review(self, product: Product) -> bool:
+        """等待用户在浏览器中提交表单（在线程中读取输入，其他 worker 继续运行）"""
+        async with self._review_lock:
+            self.ui.print()
+            self.ui.print_success(f"「{product.title[:30]}」表单已填写，请在浏览器中检查并提交")
+            answer = await asyncio.to_thread(input, "  提交后按回车继续（输入 s 跳过）: ")
+            return answer.strip().lower() != "s"
+
+    def _retry_failed(self) -> FlowResult:
+        """失败任务重新排队"""
+        result = self.queue.retry_failed()
+        if not result.success:
+            self.ui.print_error(result.error.message)
+            return FlowResult.failed(result.error.message)
+        self.ui.print_success(f"已重新排队 {result.data} 个任务")
+        return FlowResult.success()
+
+    def _purge_done(self) -> FlowResult:
+        """删除已完成任务"""
+        result = self.queue.purge(JobStatus.DONE)
+        if not result.success:
+            self.ui.print_error(result.error.message)
+            return FlowResult.failed(result.error.message)
+        self.ui.print_success(f"已清理 {result.data} 个已完成任务")
+        return FlowResult.success()
+
+    def _on_item(self, event):
+        """单个任务结束"""
+        payload = event.payload
+        if "job_id" not in payload:
+            return
+        if payload.get("success"):
+            self.ui.print_success(f"任务 {payload['job_id']} ({payload['kind']}) 完成")
+        else:
+            self.ui.print_warning(f"任务 {payload['job_id']} ({payload['kind']}) 失败: {payload.get('error')}")
@@ -4,9 +4,11 @@
 import asyncio
 from datetime import datetime
 
+from playwright.async_api import Page
+
 from src.cli.ui import UI
 from src.core import EventBus
-from src.infra import BrowserManager, KnowledgeBase
+from src.infra import BrowserManager, KnowledgeBase, BindingStorage
 from src.models import FieldType, FieldBinding, BindingConfig, Result
 from src.infra.logger import logger, trace
 from .base import BaseFlow, FlowResult
@@ -35,11 +37,16 @@ class LearnFlow(BaseFlow):
         self,
         ui: UI,
         knowledge_base: KnowledgeBase,
-        event_bus: EventBus = None
+        event_bus: EventBus = None,
+        bindings: BindingStorage = None,
+        browser: BrowserManager = None
     ):
         super().__init__(ui)
         self.knowledge_base = knowledge_base
         self.event_bus = event_bus or EventBus()
+        self.bindings = bindings or BindingStorage()
+        # 传入共享浏览器时直接复用，流程结束不关闭
+        self.shared_browser = browser
         self.browser: BrowserManager | None = None
         self.config: BindingConfig | None = None
 
@@ -82,14 +89,17 @@ class LearnFlow(BaseFlow):
             name=config_name
         )
 
-        # 启动浏览器
-        self.ui.print()
-        self.ui.print_info("正在启动浏览器...")
-        self.browser = BrowserManager()
-        result = await self.browser.start()
-        if not result.success:
-            self.ui.print_error(f"启动浏览器失败: {result.error.message}")
-            return FlowResult.failed(result.error.message)
+        # 启动浏览器（有共享浏览器时直接复用）
+        if self.shared_browser:
+            self.browser = self.shared_browser
+        else:
+            self.ui.print()
+            self.ui.print_info("正在启动浏览器...")
+            self.browser = BrowserManager()
+            result = await self.browser.start()
+            if not result.success:
+                self.ui.print_error(f"启动浏览器失败: {result.error.message}")
+                return FlowResult.failed(result.error.message)
 
         try:
             # 阶段1: 登录千牛
@@ -120,12 +130,15 @@ class LearnFlow(BaseFlow):
             await self._cleanup_browser()
 
     async def _cleanup_browser(self):
-        """安全清理浏览器"""
+        """安全清理浏览器（共享浏览器只关闭元素捕获）"""
         if self.browser:
             try:
                 await self.browser.disable_element_capture()
             except Exception:
                 pass
+            if self.browser is self.shared_browser:
+                self.browser = None
+                return
             try:
                 await self.browser.stop()
             except Exception:
@@ -157,7 +170,7 @@ class LearnFlow(BaseFlow):
         # 导航到千牛后台
         self.ui.print()
         self.ui.print_info("正在打开千牛后台...")
-        result = await self.browser.goto(QIANNIU_LOGIN_URL)
+        result = await self.browser.goto(QIANNIU_LOGIN_URL, strategy="seller-home")
         if not result.success:
             return result
 
@@ -167,9 +180,8 @@ class LearnFlow(BaseFlow):
             load_result = await self.browser.load_cookies("cookies.json")
             if load_result.success:
                 self.ui.print_success("Cookies 加载成功")
-                # 刷新页面使 cookies 生效
-                await self.browser.page.reload()
-                await asyncio.sleep(2)  # 等待页面加载
+                # 刷新页面使 cookies 生效，等待登录状态确定
+                await self.browser.reload(strategy="seller-home")
                 self.ui.print()
                 self.ui.print_info("如果没有自动登录，请选择手动登录")
                 self.ui.input("按回车继续")
@@ -199,8 +211,7 @@ class LearnFlow(BaseFlow):
                 load_result = await self.browser.load_cookies("cookies.json")
                 if load_result.success:
                     self.ui.print_success("Cookies 加载成功")
-                    await self.browser.page.reload()
-                    await asyncio.sleep(2)
+                    await self.browser.reload(strategy="seller-home")
                 else:
                     self.ui.print_warning("Cookies 加载失败，请手动登录")
                     self.ui.input("登录完成后按回车继续")
@@ -272,8 +283,6 @@ class LearnFlow(BaseFlow):
 
             if bind_idx == 0:  # Ctrl+点击捕获
                 self.ui.print()
-                # 每次捕获前重新注入脚本（页面导航后脚本会失效）
-                await self.browser.enable_element_capture()
                 self.ui.print_info("请在页面上 Ctrl+点击 要绑定的元素...")
                 self.ui.print_info("（按住 Ctrl 移动鼠标可看到高亮效果）")
 
@@ -350,27 +359,28 @@ class LearnFlow(BaseFlow):
             self.ui.print_warning("跳过淘宝元素绑定")
             return Result.ok(True)
 
-        # 打开新标签页
+        # 从标签页池租用独立页面，不影响千牛主页面
         self.ui.print_info("正在打开淘宝页面...")
-        new_page_result = await self.browser.new_page()
-        if not new_page_result.success:
-            self.ui.print_error("打开新标签页失败")
-            return Result.ok(True)  # 不阻断流程
-
-        new_page = new_page_result.data
         try:
-            await new_page.goto(taobao_url, wait_until="domcontentloaded")
+            async with self.browser.lease_page() as source_page:
+                result = await self.browser.goto(taobao_url, page=source_page, strategy="item")
+                if not result.success:
+                    self.ui.print_error(f"打开淘宝页面失败: {result.error.message}")
+                    return Result.ok(True)  # 不阻断流程
+
+                await source_page.bring_to_front()
+                await self._bind_source_fields(source_page, taobao_url)
+                await self.browser.disable_element_capture(source_page)
         except Exception as e:
-            self.ui.print_error(f"打开淘宝页面失败: {e}")
-            return Result.ok(True)
+            self.ui.print_error(f"淘宝元素绑定失败: {e}")
+            return Result.ok(True)  # 不阻断流程
 
-        # 切换到新页面进行元素捕获
-        # 保存原页面引用
-        original_page = self.browser._page
-        self.browser._page = new_page
+        return Result.ok(True)
 
-        # 重新启用元素捕获
-        await self.browser.enable_element_capture()
+    async def _bind_source_fields(self, page: Page, taobao_url: str):
+        """在淘宝页面上逐个绑定字段"""
+        # 在淘宝页面启用元素捕获
+        await self.browser.enable_element_capture(page)
 
         self.config.source_url_pattern = taobao_url
 
@@ -399,10 +409,8 @@ class LearnFlow(BaseFlow):
             xpath = None
 
             if bind_idx == 0:  # Ctrl+点击
-                # 重新注入脚本
-                await self.browser.enable_element_capture()
                 self.ui.print_info("请在页面上 Ctrl+点击 对应元素...")
-                result = await self._wait_for_capture_or_timeout(timeout=60)
+                result = await self._wait_for_capture_or_timeout(timeout=60, page=page)
 
                 if result is None:
                     self.ui.print_warning(f"  超时跳过: {binding.name}")
@@ -426,11 +434,6 @@ class LearnFlow(BaseFlow):
 
             self.ui.print()
 
-        # 恢复原页面
-        self.browser._page = original_page
-
-        return Result.ok(True)
-
     async def _phase_save(self) -> FlowResult:
         """阶段4: 保存配置"""
         self.ui.print()
@@ -501,42 +504,20 @@ class LearnFlow(BaseFlow):
             )
 
     def _save_config(self) -> Result[bool]:
-        """保存配置到文件"""
-        import json
-        from pathlib import Path
-
-        try:
-            # 创建目录
-            config_dir = Path("data/bindings")
-            config_dir.mkdir(parents=True, exist_ok=True)
-
-            # 保存文件
-            config_file = config_dir / f"{self.config.id}.json"
-            with open(config_file, "w", encoding="utf-8") as f:
-                json.dump(self.config.to_dict(), f, ensure_ascii=False, indent=2)
+        """保存配置"""
+        result = self.bindings.save(self.config)
+        if not result.success:
+            log.error("保存配置失败", error=result.error.message)
+            return result
 
-            log.info("配置已保存", config_id=self.config.id, path=str(config_file))
-            return Result.ok(True)
-        except Exception as e:
-            log.error("保存配置失败", error=str(e))
-            return Result.fail_with(
-                code="S_WRITE_FAILED",
-                message=f"保存失败: {e}",
-                recoverable=False
-            )
+        log.info("配置已保存", config_id=self.config.id)
+        return Result.ok(True)
 
     async def _view_configs(self) -> FlowResult:
         """查看已有配置"""
-        import json
-        from pathlib import Path
-
-        config_dir = Path("data/bindings")
-        if not config_dir.exists():
-            self.ui.print_warning("暂无配置")
-            return FlowResult.cancelled("无配置")
-
-        config_files = list(config_dir.glob("*.json"))
-        if not config_files:
+        list_result = self.bindings.list()
+        configs = list_result.data if list_result.success else []
+        if not configs:
             self.ui.print_warning("暂无配置")
             return FlowResult.cancelled("无配置")
 
@@ -544,34 +525,18 @@ class LearnFlow(BaseFlow):
         self.ui.print("已有配置:")
         self.ui.print()
 
-        for cf in config_files:
-            try:
-                with open(cf, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    config = BindingConfig.from_dict(data)
-                    self.ui.print(
-                        f"  - {config.name} ({len(config.fields)} 个字段) "
-                        f"[{config.created_at.strftime('%Y-%m-%d')}]"
-                    )
-            except Exception:
-                continue
+        for config in configs:
+            created = config["created_at"][:10]
+            self.ui.print(f"  - {config['name']} ({config['field_count']} 个字段) [{created}]")
 
         self.ui.print()
         return FlowResult.success("查看完成")
 
-    async def _wait_for_capture_or_timeout(self, timeout: int = 60) -> dict | None:
-        """等待元素捕获或超时"""
-        start_time = asyncio.get_event_loop().time()
-
-        while True:
-            # 检查是否有捕获的元素
-            result = await self.browser.get_captured_element()
-            if result.success and result.data:
-                return result.data
-
-            # 检查超时
-            elapsed = asyncio.get_event_loop().time() - start_time
-            if elapsed >= timeout:
-                return None
-
-            await asyncio.sleep(0.2)
+    async def _wait_for_capture_or_timeout(
+        self,
+        timeout: int = 60,
+        page: Page | None = None
+    ) -> dict | None:
+        """等待元素捕获或超时（页面点击后立即推送，无需轮询）"""
+        result = await self.browser.wait_for_element_capture(timeout * 1000, page)
+        return result.data if result.success else None
@@ -0,0 +1,97 @@
+"""
+采集并上架流程（流水线）
+"""
+import asyncio
+
+from src.cli.ui import UI
+from src.core import Collector, CollectUploadPipeline, EventBus, EventTypes, Filler, ImagePipeline
+from src.infra import BrowserManager, ProductStorage, KnowledgeBase, BindingStorage
+from src.models import Product
+from .base import BaseFlow, FlowResult
+from .collect import parse_url_source
+from .upload import select_binding
+
+
+class PipelineFlow(BaseFlow):
+    """采集并上架：确认当前商品的表单时，下一个商品已在另一个标签页采集"""
+
+    def __init__(
+        self,
+        ui: UI,
+        browser: BrowserManager,
+        storage: ProductStorage,
+        knowledge_base: KnowledgeBase,
+        event_bus: EventBus = None,
+        bindings: BindingStorage = None,
+        images: ImagePipeline = None,
+        block_profile: str = "collect-lean"
+    ):
+        super().__init__(ui)
+        self.bindings = bindings or BindingStorage()
+        self.event_bus = event_bus or EventBus()
+        self.pipeline = CollectUploadPipeline(
+            browser, storage,
+            collector=Collector(browser, self.event_bus, block_profile=block_profile),
+            filler=Filler(browser, knowledge_base, self.event_bus, images=images),
+            event_bus=self.event_bus,
+            images=images
+        )
+
+        self.event_bus.on(EventTypes.LOGIN_EXPIRED, self._on_login_expired)
+
+    async def run(self) -> FlowResult:
+        """执行采集并上架流程"""
+        self.ui.print_header("采集并上架")
+        self.ui.print()
+        self.ui.print_info("可输入链接文件路径（每行一个链接，# 开头为注释），或用空格分隔的多个链接")
+        self.ui.print()
+
+        source = self.input("链接文件或链接列表")
+        if not source:
+            return FlowResult.cancelled("未输入商品链接")
+
+        urls = parse_url_source(source)
+        if not urls:
+            self.ui.print_warning("没有找到有效链接")
+            return FlowResult.cancelled("无有效链接")
+
+        binding = select_binding(self, self.bindings)
+
+        self.ui.print()
+        self.ui.print_info(f"共 {len(urls)} 个链接，每个商品填写完成后请在浏览器中检查并提交")
+        self.ui.print()
+
+        result = await self.pipeline.run(urls, binding=binding, review=self._review)
+        if not result.success:
+            self.ui.print_error(result.error.message)
+            return FlowResult.failed(result.error.message)
+
+        stats = result.data
+        self.ui.print()
+        self.ui.print_success(
+            f"完成: 采集 {stats.collected}/{stats.total}，上架 {stats.uploaded}，"
+            f"用时 {stats.elapsed:.0f} 秒（重叠执行节省 {stats.overlap:.0f} 秒）"
+        )
+        if stats.deferred:
+            self.ui.print_info(f"{stats.deferred} 个商品已保存为待上架，可稍后在「上架商品」中继续")
+
+        failed = [i for i in stats.items if i.collect_error or i.upload_error]
+        if failed:
+            self.ui.print()
+            self.ui.print_warning(f"失败 {len(failed)} 个:")
+            rows = [[i.url[:60], i.collect_error or i.upload_error] for i in failed[:20]]
+            self.ui.table(["链接", "错误"], rows)
+
+        return FlowResult.success("采集并上架完成", stats.to_dict())
+
+    async def _review(self, product: Product) -> bool:
+        """等待用户提交表单（在线程中读取输入，采集阶段继续运行）"""
+        self.ui.print()
+        self.ui.print_success(f"「{product.title[:30]}」表单已填写，请在浏览器中检查并提交")
+        answer = await asyncio.to_thread(input, "  提交后按回车继续（输入 s 跳过）: ")
+        return answer.strip().lower() != "s"
+
+    def _on_login_expired(self, event):
+        """处理登录过期事件"""
+        self.ui.print()
+        self.ui.print_warning("登录已过期，剩余商品只采集不填写，登录后可在「上架商品」中继续")
@@ -1,13 +1,37 @@
 """
 上架流程
 """
+import asyncio
+
 from src.cli.ui import UI
-from src.core import Filler, EventBus, EventTypes
-from src.infra import BrowserManager, ProductStorage, KnowledgeBase
-from src.models import ProductStatus
+from src.core import Filler, EventBus, EventTypes, ImagePipeline, ShopOrchestrator, ShopProfile
+from src.infra import BrowserManager, ProductStorage, KnowledgeBase, BindingStorage
+from src.models import BindingConfig, Product, ProductStatus
 from .base import BaseFlow, FlowResult
 
 
+def select_binding(flow: BaseFlow, bindings: BindingStorage) -> BindingConfig | None:
+    """选择字段绑定配置（无配置时使用内置规则）"""
+    list_result = bindings.list()
+    configs = list_result.data if list_result.success else []
+    if not configs:
+        return None
+
+    options = ["内置规则（标题/价格/描述）"]
+    options.extend(f"{c['name']} ({c['field_count']} 个字段)" for c in configs)
+
+    flow.ui.print()
+    idx = flow.select(options, "选择字段绑定配置")
+    if idx == 0 or idx > len(configs):
+        return None
+
+    get_result = bindings.get(configs[idx - 1]["id"])
+    if not get_result.success:
+        flow.ui.print_warning(f"读取配置失败，使用内置规则: {get_result.error.message}")
+        return None
+    return get_result.data
+
+
 class UploadFlow(BaseFlow):
     """商品上架流程"""
 
@@ -17,14 +41,23 @@ class UploadFlow(BaseFlow):
         browser: BrowserManager,
         storage: ProductStorage,
         knowledge_base: KnowledgeBase,
-        event_bus: EventBus = None
+        event_bus: EventBus = None,
+        bindings: BindingStorage = None,
+        shops: list[ShopProfile] = None,
+        max_shops: int = 10,
+        images: ImagePipeline = None
     ):
         super().__init__(ui)
         self.browser = browser
         self.storage = storage
         self.knowledge_base = knowledge_base
         self.event_bus = event_bus or EventBus()
-        self.filler = Filler(browser, knowledge_base, self.event_bus)
+        self.bindings = bindings or BindingStorage()
+        self.images = images
+        self.filler = Filler(browser, knowledge_base, self.event_bus, images=images)
+        self.shops = [s for s in (shops or []) if s.enabled]
+        self.max_shops = max_shops
+        self._review_lock = asyncio.Lock()
 
         # 监听事件
         self.event_bus.on(EventTypes.PROGRESS, self._on_progress)
@@ -74,19 +107,26 @@ class UploadFlow(BaseFlow):
         if not self.confirm("确认上架该商品？"):
             return FlowResult.cancelled("用户取消")
 
+        binding = self._select_binding()
+
+        if self.shops:
+            options = ["当前浏览器", f"全部店铺（{len(self.shops)} 个）"]
+            if self.select(options, "发布到") == 1:
+                return await self._publish_to_shops(product, binding)
+
         self.ui.print()
         self.ui.print_info("正在填写上架表单...")
         self.ui.print()
 
         # 执行填充
-        result = await self.filler.fill(product)
+        result = await self._fill(product, binding)
 
         if not result.success:
             if result.error.code == "B_LOGIN_EXPIRED":
                 self.ui.print_warning("请在浏览器中登录后，按回车继续...")
                 input()
                 # 重试
-                result = await self.filler.fill(product)
+                result = await self._fill(product, binding)
 
         if result.success:
             self.ui.print()
@@ -105,6 +145,88 @@ class UploadFlow(BaseFlow):
             self.ui.print_error(result.error.message)
             return FlowResult.failed(result.error.message)
 
+    def _select_binding(self) -> BindingConfig | None:
+        """选择字段绑定配置（无配置时使用内置规则）"""
+        return select_binding(self, self.bindings)
+
+    async def _fill(self, product, binding: BindingConfig | None):
+        """按绑定配置或内置规则填写"""
+        if binding is None:
+            return await self.filler.fill(product)
+
+        result = await self.filler.fill_with_binding(product, binding)
+        if result.success and result.data.skipped:
+            self.ui.print_info(f"商品中没有对应值，已跳过: {', '.join(result.data.skipped)}")
+        return result
+
+    async def _publish_to_shops(self, product, binding: BindingConfig | None) -> FlowResult:
+        """并行发布到所有已配置店铺（每个店铺独立的浏览器上下文）"""
+        orchestrator = ShopOrchestrator(
+            self.knowledge_base, self.event_bus,
+            browser_config=self.browser.config,
+            bindings=self.bindings,
+            selector_cache=self.filler.selectors,
+            max_shops=self.max_shops,
+            images=self.images,
+            review=self._review_shop
+        )
+
+        self.ui.print()
+        self.ui.print_info(f"正在启动 {len(self.shops)} 个店铺的浏览器...")
+        try:
+            start_result = await orchestrator.start(self.shops)
+            if not start_result.success:
+                self.ui.print_error(start_result.error.message)
+                return FlowResult.failed(start_result.error.message)
+
+            result = await orchestrator.publish([product], binding=binding)
+            items = result.data if result.success else []
+
+            # 未登录的店铺：用户在对应窗口登录后重试一次
+            expired = [i.shop for i in items if not i.result.success and i.result.error.code == "B_LOGIN_EXPIRED"]
+            if expired:
+                self.ui.print()
+                self.ui.print_warning(f"以下店铺未登录: {', '.join(expired)}")
+                self.ui.print_warning("请在对应的浏览器窗口中登录后，按回车继续...")
+                input()
+                for shop in expired:
+                    orchestrator.reset_login(shop)
+                retry = await orchestrator.publish([product], shops=expired, binding=binding)
+                if retry.success:
+                    retried = {i.shop: i for i in retry.data}
+                    items = [retried.get(i.shop, i) for i in items]
+
+            self.ui.print()
+            for item in items:
+                if item.result.success:
+                    self.ui.print_success(f"{item.shop}: 已提交")
+                else:
+                    self.ui.print_error(f"{item.shop}: {item.result.error.message}")
+
+            succeeded = [i.shop for i in items if i.result.success]
+        finally:
+            await orchestrator.stop()
+
+        if not succeeded:
+            return FlowResult.failed("所有店铺上架失败")
+
+        product.status = ProductStatus.UPLOADED
+        from datetime import datetime
+        product.uploaded_at = datetime.now()
+        self.storage.save(product)
+        return FlowResult.success(
+            f"{len(succeeded)}/{len(items)} 个店铺上架成功",
+            {"product_id": product.id, "shops": succeeded}
+        )
+
+    async def _review_shop(self, shop: str, product: Product) -> bool:
+        """等待用户在店铺浏览器中提交表单（各店铺依次确认，其他店铺继续填写）"""
+        async with self._review_lock:
+            self.ui.print()
+            self.ui.print_success(f"{shop}: 「{product.title[:30]}」表单已填写，请在该店铺浏览器中检查并提交")
+            answer = await asyncio.to_thread(input, "  提交后按回车继续（输入 s 跳过）: ")
+            return answer.strip().lower() != "s"
+
     def _on_progress(self, event):
         """处理进度事件"""
         payload = event.payload
@@ -5,9 +5,9 @@ import asyncio
 from pathlib import Path
 
 from src.cli.ui import UI
-from src.cli.flows import CollectFlow, UploadFlow, LearnFlow, KnowledgeFlow
-from src.core import EventBus
-from src.infra import BrowserManager, BrowserConfig, ProductStorage, KnowledgeBase, ConfigManager
+from src.cli.flows import CollectFlow, CollectBatchFlow, UploadFlow, LearnFlow, KnowledgeFlow, JobFlow, PipelineFlow
+from src.core import EventBus, ImagePipeline, ShopProfile
+from src.infra import BrowserManager, BrowserConfig, create_product_storage, BindingStorage, JobQueue, ImageCache, KnowledgeBase, ConfigManager
 from src.infra import logger, trace, get_run_id
 
 log = logger.get("shell")
@@ -25,9 +25,14 @@ class InteractiveShell:
 
         # 初始化组件
         data_dir = Path(self.config.data_dir)
-        self.storage = ProductStorage(data_dir / "products")
+        self.storage = create_product_storage(
+            data_dir / "products", self.config.storage_backend, self.config.storage_fsync
+        )
         self.knowledge_base = KnowledgeBase(data_dir)
-        self.event_bus = EventBus()
+        self.bindings = BindingStorage(data_dir / "bindings")
+        self.jobs = JobQueue(data_dir)
+        self.images = ImagePipeline(ImageCache(data_dir), rate_limits=self.config.rate_limits)
+        self.event_bus = EventBus(mode=self.config.event_dispatch)
 
         # 浏览器管理器（延迟初始化）
         self.browser: BrowserManager | None = None
@@ -42,9 +47,12 @@ class InteractiveShell:
 
                 if choice == 0:  # 学习模式
                     with trace("学习模式"):
-                        # codegen 会自己打开浏览器，不需要预先启动
+                        # 与其他流程共用同一个浏览器，避免重复冷启动
+                        await self._ensure_browser()
                         flow = LearnFlow(
-                            self.ui, self.knowledge_base, self.event_bus
+                            self.ui, self.knowledge_base, self.event_bus,
+                            bindings=self.bindings,
+                            browser=self.browser
                         )
                         await flow.run()
 
@@ -56,27 +64,75 @@ class InteractiveShell:
                         )
                         await flow.run()
 
-                elif choice == 2:  # 上架商品
+                elif choice == 2:  # 批量采集
+                    with trace("批量采集"):
+                        await self._ensure_browser()
+                        http_backend = self.config.collect_backend == "http"
+                        flow = CollectBatchFlow(
+                            self.ui, self.browser, self.storage, self.event_bus,
+                            concurrency=(
+                                self.config.http_concurrency if http_backend
+                                else self.config.collect_concurrency
+                            ),
+                            block_profile=self.config.collect_block_profile,
+                            backend=self.config.collect_backend
+                        )
+                        await flow.run()
+
+                elif choice == 3:  # 上架商品
                     with trace("上架商品"):
                         await self._ensure_browser()
                         flow = UploadFlow(
                             self.ui, self.browser, self.storage,
-                            self.knowledge_base, self.event_bus
+                            self.knowledge_base, self.event_bus,
+                            bindings=self.bindings,
+                            shops=[ShopProfile.from_dict(s) for s in self.config.shops],
+                            max_shops=self.config.shop_max_contexts,
+                            images=self.images
                         )
                         await flow.run()
 
-                elif choice == 3:  # 知识库
+                elif choice == 4:  # 采集并上架
+                    with trace("采集并上架"):
+                        await self._ensure_browser()
+                        flow = PipelineFlow(
+                            self.ui, self.browser, self.storage,
+                            self.knowledge_base, self.event_bus,
+                            bindings=self.bindings,
+                            images=self.images,
+                            block_profile=self.config.collect_block_profile
+                        )
+                        await flow.run()
+
+                elif choice == 5:  # 任务队列
+                    with trace("任务队列"):
+                        await self._ensure_browser()
+                        flow = JobFlow(
+                            self.ui, self.browser, self.storage, self.jobs,
+                            self.knowledge_base, self.event_bus,
+                            bindings=self.bindings,
+                            concurrency=self.config.collect_concurrency,
+                            block_profile=self.config.collect_block_profile,
+                            backend=self.config.collect_backend,
+                            images=self.images
+                        )
+                        await flow.run()
+
+                elif choice == 6:  # 知识库
                     with trace("知识库管理"):
                         flow = KnowledgeFlow(self.ui, self.knowledge_base)
                         await flow.run()
 
-                elif choice == 4:  # 设置
+                elif choice == 7:  # 设置
                     self._show_settings()
 
-                elif choice == 5:  # 退出
+                elif choice == 8:  # 退出
                     log.info("用户退出")
                     break
 
+                # async 分发时等待剩余事件输出完，再回到主菜单
+                await self.event_bus.drain(timeout=5)
+
             except KeyboardInterrupt:
                 self.ui.print()
                 self.ui.print_info("收到退出信号...")
@@ -126,7 +182,10 @@ class InteractiveShell:
         options = [
             "学习模式 - 录制操作方案（首次使用请先选这个）",
             "采集商品 - 从淘宝复制商品信息",
+            "批量采集 - 从链接列表/文件并发采集",
             "上架商品 - 将商品发布到店铺",
+            "采集并上架 - 边采集边填写发布表单",
+            "任务队列 - 批量采集/上架，中断后可继续",
             "知识库   - 管理已录制的方案",
             "设置",
             "退出"
@@ -134,7 +193,14 @@ class InteractiveShell:
         return self.ui.select(options, "请选择操作")
 
     async def _ensure_browser(self):
-        """确保浏览器已启动"""
+        """确保浏览器已启动（已启动但被关闭或断开时自动重连）"""
+        if self.browser is not None and not self.browser.connected:
+            result = await self.browser.ensure_connected()
+            if not result.success:
+                self.ui.print_error(result.error.message)
+                log.error("浏览器重连失败", error=result.error.message)
+            return
+
         if self.browser is None:
             self.ui.print_info("正在启动浏览器...")
             log.info("启动浏览器")
@@ -143,7 +209,14 @@ class InteractiveShell:
                 headless=self.config.browser_headless,
                 slow_mo=self.config.browser_slow_mo,
                 timeout=self.config.browser_timeout,
-                user_data_dir=self.config.user_data_dir
+                user_data_dir=self.config.user_data_dir,
+                mode=self.config.browser_mode,
+                debug_port=self.config.browser_debug_port,
+                cdp_endpoint=self.config.browser_cdp_endpoint,
+                nav_strategies=self.config.browser_nav_strategies,
+                max_retry=self.config.max_retry,
+                retry_delay=self.config.retry_delay,
+                rate_limits=self.config.rate_limits
             )
             self.browser = BrowserManager(browser_config)
 
@@ -198,11 +271,16 @@ class InteractiveShell:
     async def _cleanup(self):
         """清理资源"""
         if self.browser:
+            # server 模式下只断开连接，常驻浏览器留给下次启动使用
             self.ui.print_info("正在关闭浏览器...")
             try:
                 await self.browser.stop()
             except Exception as e:
                 log.warning("关闭浏览器时出错", error=str(e))
+        await self.event_bus.close()
+        await self.images.close()
+        self.storage.close()
+        self.jobs.close()
 
 
 class _OutputFilter:
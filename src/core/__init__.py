@@ -1,22 +1,79 @@
 """
 Core 业务逻辑层
+
+依赖浏览器（playwright）或 HTTP 客户端（httpx）的模块首次访问时才导入，
+事件总线、提取器、学习引擎等纯逻辑模块不需要安装这些依赖。
 """
-from .events import Event, EventBus, EventListener, EventTypes
-from .collector import Collector
-from .filler import Filler
+import importlib
+
+from .events import DispatchPolicy, Event, EventBus, EventListener, EventTypes
+from .extractor import ExtractionPlan, ExtractionResult, FieldRule
 from .learning_engine import LearningEngine, RecordingSession
 
 __all__ = [
     # events
+    "DispatchPolicy",
     "Event",
     "EventBus",
     "EventListener",
     "EventTypes",
+    # extractor
+    "ExtractionPlan",
+    "ExtractionResult",
+    "FieldRule",
     # collector
     "Collector",
+    "BatchItem",
+    "HttpCollector",
+    # executor
+    "SolutionExecutor",
+    "ExecutionReport",
     # filler
     "Filler",
+    "FillReport",
+    # image_pipeline
+    "ImagePipeline",
+    # job_runner
+    "JobRunner",
+    "RunStats",
+    # pipeline
+    "CollectUploadPipeline",
+    "PipelineItem",
+    "PipelineStats",
+    # orchestrator
+    "ShopOrchestrator",
+    "ShopProfile",
+    "ShopUploadResult",
     # learning_engine
     "LearningEngine",
     "RecordingSession",
 ]
+
+# 按需导入的导出名 -> 子模块
+_LAZY_EXPORTS = {
+    "Collector": "collector",
+    "BatchItem": "collector",
+    "HttpCollector": "http_collector",
+    "SolutionExecutor": "executor",
+    "ExecutionReport": "executor",
+    "Filler": "filler",
+    "FillReport": "filler",
+    "ImagePipeline": "image_pipeline",
+    "JobRunner": "job_runner",
+    "RunStats": "job_runner",
+    "CollectUploadPipeline": "pipeline",
+    "PipelineItem": "pipeline",
+    "PipelineStats": "pipeline",
+    "ShopOrchestrator": "orchestrator",
+    "ShopProfile": "orchestrator",
+    "ShopUploadResult": "orchestrator",
+}
+
+
+def __getattr__(name: str):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
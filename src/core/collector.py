@@ -1,27 +1,295 @@
 """
 商品采集器
 """
+import asyncio
 import re
 import uuid
+from dataclasses import dataclass
 from datetime import datetime
+from typing import Callable
 
-from src.models import Product, SKU, Result
+from playwright.async_api import Page
+
+from src.models import Product, Result
 from src.infra.browser import BrowserManager
 from src.infra.logger import logger
+from src.infra.resilience import AdaptiveLimiter, RetryPolicy, with_retry
 from .events import EventBus, EventTypes
+from .extractor import ExtractionPlan, ExtractionResult, FieldRule
+from .item_model import (
+    ITEM_API_PATTERNS, DESC_API_PATTERNS, INLINE_MARKERS, ItemModel,
+    parse_json_text, parse_item_model, parse_desc_images, extract_inline_json,
+    normalize_image_url
+)
 
 log = logger.get("collector")
 
 
+class _ResponseCapture:
+    """监听商品详情/描述接口响应，解析其中的商品模型"""
+
+    def __init__(self, page: Page | None):
+        self._page = page
+        self._tasks: list[asyncio.Task] = []
+        self._model_ready = asyncio.Event()
+        self.model: ItemModel | None = None
+        self.detail_images: list[str] = []
+
+    def __enter__(self) -> '_ResponseCapture':
+        if self._page:
+            self._page.on("response", self._on_response)
+        return self
+
+    def __exit__(self, *exc):
+        if self._page:
+            self._page.remove_listener("response", self._on_response)
+        for task in self._tasks:
+            if not task.done():
+                task.cancel()
+
+    def _on_response(self, response):
+        url = response.url
+        if any(p.search(url) for p in ITEM_API_PATTERNS):
+            kind = "item"
+        elif any(p.search(url) for p in DESC_API_PATTERNS):
+            kind = "desc"
+        else:
+            return
+        self._tasks.append(asyncio.ensure_future(self._read(response, kind)))
+
+    async def _read(self, response, kind: str):
+        try:
+            obj = parse_json_text(await response.text())
+        except Exception as e:
+            log.debug("读取接口响应失败", url=response.url, error=str(e))
+            return
+        if obj is None:
+            return
+
+        if kind == "item":
+            model = parse_item_model(obj)
+            if model and model.title:
+                self.model = model
+                self._model_ready.set()
+        else:
+            self.detail_images = parse_desc_images(obj) or self.detail_images
+
+    async def wait_for_model(self, timeout: float) -> ItemModel | None:
+        """等待详情接口返回商品模型"""
+        if self.model is None:
+            try:
+                await asyncio.wait_for(self._model_ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return self.model
+
+    async def settle(self, timeout: float = 0.5):
+        """等待已到达的响应解析完成"""
+        pending = [t for t in self._tasks if not t.done()]
+        if pending:
+            await asyncio.wait(pending, timeout=timeout)
+
+
+@dataclass
+class BatchItem:
+    """批量采集中单个链接的结果"""
+    url: str
+    result: Result[Product]
+
+
 class Collector:
     """商品采集器：从淘宝页面提取商品信息"""
 
-    def __init__(self, browser: BrowserManager, event_bus: EventBus = None):
+    # 字段候选选择器（按优先级排列），合并为一次页面往返执行
+    ITEM_PLAN = ExtractionPlan([
+        FieldRule("title", [
+            "h1.tb-main-title",
+            ".tb-detail-hd h1",
+            "div[data-spm='1000983'] h1",
+            ".ItemHeader--mainTitle--3CIjqW5",
+        ], first_only=True),
+        FieldRule("price", [
+            ".tb-rmb-num",
+            ".tm-price",
+            ".tm-promo-price .tm-price",
+            ".Price--priceText--2nLbVda",
+        ]),
+        FieldRule("images", [
+            "#J_UlThumb img",
+            ".tb-thumb img",
+            ".PicGallery--thumbnails--2XJVxAf img",
+        ], attribute="src", multiple=True),
+        FieldRule("inline_model", [
+            "script:not([src])",
+        ], multiple=True, contains=INLINE_MARKERS),
+    ])
+
+    # 页面内没有内联商品数据时，等待详情接口响应的最长时间（秒）
+    ITEM_API_WAIT = 3.0
+
+    def __init__(
+        self,
+        browser: BrowserManager,
+        event_bus: EventBus = None,
+        block_profile: str = "collect-lean"
+    ):
         self.browser = browser
         self.event_bus = event_bus or EventBus()
+        self.block_profile = block_profile  # 批量采集使用的资源拦截配置
+        self.retry_policy = browser.retry_policy if browser else RetryPolicy()
+        # 采集会话的 AIMD 并发控制（站点限流时自动降低并发，恢复后逐步增加）；
+        # collect_batch 使用各自的局部实例，与会话互不影响
+        self._session_limiter: AdaptiveLimiter | None = None
 
-    async def collect(self, url: str) -> Result[Product]:
+    async def collect(self, url: str, page: Page | None = None) -> Result[Product]:
         """采集商品信息"""
+        return await self._collect(url, page, verbose=True)
+
+    async def collect_batch(
+        self,
+        urls: list[str],
+        concurrency: int = 3,
+        on_item: Callable[[BatchItem], None] = None
+    ) -> Result[list[BatchItem]]:
+        """批量采集：固定数量的 worker 并发处理链接队列
+
+        每个链接从标签页池租用页面，用完归还复用，内存占用与池容量成正比，
+        与链接数量无关。返回结果与输入链接顺序一致（重复链接只采集一次）。
+        超时/网络错误带抖动重试，并按 AIMD 在 1 到 worker 数之间调整同时采集的链接数。
+        """
+        urls = list(dict.fromkeys(u.strip() for u in urls if u and u.strip()))
+        if not urls:
+            return Result.ok([])
+
+        if concurrency > self.max_workers():
+            log.warning("并发数超过上限，已调整", requested=concurrency, workers=self.max_workers())
+        worker_count = max(1, min(concurrency, len(urls), self.max_workers()))
+        queue: asyncio.Queue[tuple[int, str]] = asyncio.Queue()
+        for idx, url in enumerate(urls):
+            queue.put_nowait((idx, url))
+
+        items: list[BatchItem | None] = [None] * len(urls)
+        done = 0
+
+        prepare_result = await self._prepare_batch(worker_count)
+        if not prepare_result.success:
+            return prepare_result
+        limiter = AdaptiveLimiter(worker_count)
+
+        log.info("开始批量采集", total=len(urls), workers=worker_count)
+        self._emit_event(EventTypes.BATCH_START, total=len(urls), workers=worker_count)
+
+        async def worker():
+            nonlocal done
+            while True:
+                try:
+                    idx, url = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+
+                try:
+                    result = await self._collect_adaptive(url, limiter)
+                except Exception as e:
+                    log.error("采集异常", url=url, error=str(e))
+                    result = Result.fail_with(
+                        code="C_COLLECT_FAILED",
+                        message=f"采集异常: {e}",
+                        recoverable=True,
+                        context={"url": url}
+                    )
+
+                item = BatchItem(url=url, result=result)
+                items[idx] = item
+                done += 1
+
+                if on_item:
+                    on_item(item)
+                self._emit_event(
+                    EventTypes.BATCH_ITEM,
+                    url=url,
+                    success=result.success,
+                    product_id=result.data.id if result.success else None,
+                    error=result.error.message if result.error else None
+                )
+                self._emit_progress(done, len(urls), f"已采集 {done}/{len(urls)}")
+
+        await asyncio.gather(*(worker() for _ in range(worker_count)))
+
+        succeeded = sum(1 for item in items if item.result.success)
+        log.info(
+            "批量采集完成",
+            total=len(urls),
+            succeeded=succeeded,
+            concurrency=limiter.to_dict(),
+            **self._batch_stats()
+        )
+        self._emit_event(
+            EventTypes.BATCH_DONE,
+            total=len(urls),
+            succeeded=succeeded,
+            failed=len(urls) - succeeded
+        )
+        return Result.ok(items)
+
+    async def open_session(self, workers: int) -> Result[int]:
+        """开始长时间运行的采集会话（任务队列使用），之后可并发调用 collect_pooled()"""
+        result = await self._prepare_batch(workers)
+        if result.success:
+            self._session_limiter = AdaptiveLimiter(max(1, workers))
+        return result
+
+    async def collect_pooled(self, url: str) -> Result[Product]:
+        """按批量模式采集单个链接（租用池中页面，不发送单品进度事件）"""
+        return await self._collect_adaptive(url, self._session_limiter)
+
+    async def close_session(self):
+        """结束采集会话"""
+        if self._session_limiter:
+            log.info("采集会话结束", concurrency=self._session_limiter.to_dict())
+        self._session_limiter = None
+
+    def max_workers(self) -> int:
+        """并发 worker 上限（浏览器模式受标签页池容量限制）"""
+        return self.browser.config.pool_size
+
+    async def _prepare_batch(self, worker_count: int) -> Result[int]:
+        """批量采集前的准备：预热标签页池"""
+        return await self.browser.warm_pool(worker_count)
+
+    async def _collect_adaptive(self, url: str, limiter: AdaptiveLimiter | None) -> Result[Product]:
+        """在 AIMD 并发上限内采集，超时/网络错误按重试策略退避重试（每次尝试都计入并发调整）"""
+
+        async def attempt() -> Result[Product]:
+            result = await self._collect_item(url)
+            if limiter:
+                limiter.record(result)
+            return result
+
+        if limiter is None:
+            return await with_retry(attempt, policy=self.retry_policy)
+        async with limiter:
+            return await with_retry(attempt, policy=self.retry_policy)
+
+    async def _collect_item(self, url: str) -> Result[Product]:
+        """批量采集单个链接：租用池中页面并应用资源拦截"""
+        async with self.browser.lease_page() as page:
+            if self.block_profile:
+                await self.browser.apply_block_profile(self.block_profile, page)
+            return await self._collect(url, page, verbose=False)
+
+    def _batch_stats(self) -> dict:
+        """批量采集完成时记录的统计信息"""
+        return {
+            "pool": self.browser.pool_stats().to_dict(),
+            "blocked": self.browser.block_stats.to_dict(),
+            "breakers": self.browser.breakers.stats(),
+            "rate_limits": self.browser.rate_limiter.stats()
+        }
+
+    async def _collect(self, url: str, page: Page | None, verbose: bool) -> Result[Product]:
+        """采集单个商品（verbose=False 时不发送单品进度事件）"""
+        progress = self._emit_progress if verbose else (lambda *args: None)
+
         # 验证 URL
         if not self._is_valid_url(url):
             return Result.fail_with(
@@ -31,58 +299,83 @@ class Collector:
             )
 
         # 发送进度事件
-        self._emit_progress(1, 5, "正在打开商品页面...")
-
-        # 导航到页面
-        result = await self.browser.goto(url)
-        if not result.success:
-            return result
-
-        self._emit_progress(2, 5, "正在解析商品标题...")
-
-        # 提取商品信息
-        product_id = f"prod_{uuid.uuid4().hex[:8]}"
-        product_data = {
-            "id": product_id,
-            "source_url": url,
-            "title": "",
-            "price": 0.0,
-            "images": [],
-            "skus": []
-        }
-
-        # 提取标题
-        title_result = await self._extract_title()
-        if title_result.success:
-            product_data["title"] = title_result.data
-
-        self._emit_progress(3, 5, "正在解析价格...")
+        progress(1, 3, "正在打开商品页面...")
+
+        # 导航前开始监听接口响应
+        page = page or self.browser.page
+        with _ResponseCapture(page) as capture:
+            result = await self.browser.goto(url, page=page, strategy="item")
+            if not result.success:
+                return result
+
+            page = result.data
+            progress(2, 3, "正在解析商品信息...")
+
+            # 一次往返提取全部 DOM 字段和内联数据
+            extract_result = await self.ITEM_PLAN.run(page)
+            if not extract_result.success:
+                return extract_result
+            extracted = extract_result.data
+
+            # 优先使用结构化数据：接口响应 > 内联 JSON > 等待接口
+            # （DOM 已补全标题、价格和主图时不再等待接口）
+            model = capture.model or self._parse_inline_model(extracted)
+            if not self._has_core_fields(extracted, model):
+                model = await capture.wait_for_model(self.ITEM_API_WAIT) or model
+            await capture.settle()
+            detail_images = capture.detail_images
+
+        product = self._build_product(url, extracted, model, detail_images)
+        progress(3, 3, "采集完成")
 
-        # 提取价格
-        price_result = await self._extract_price()
-        if price_result.success:
-            product_data["price"] = price_result.data
-
-        self._emit_progress(4, 5, "正在解析图片...")
-
-        # 提取图片
-        images_result = await self._extract_images()
-        if images_result.success:
-            product_data["images"] = images_result.data
-
-        self._emit_progress(5, 5, "采集完成")
+        return Result.ok(product)
 
-        # 创建商品对象
-        product = Product(
-            id=product_data["id"],
-            source_url=product_data["source_url"],
-            title=product_data["title"],
-            price=product_data["price"],
-            images=product_data["images"],
+    def _build_product(
+        self,
+        url: str,
+        extracted: ExtractionResult,
+        model: ItemModel | None,
+        detail_images: list[str]
+    ) -> Product:
+        """合并结构化数据与 DOM 字段（结构化数据缺失的字段回退到 DOM）"""
+        model = model or ItemModel()
+
+        title = model.title or self._parse_title(extracted)
+        price = model.price if model.price is not None else self._parse_price(extracted)
+        images = model.images or self._parse_images(extracted)
+
+        return Product(
+            id=f"prod_{uuid.uuid4().hex[:8]}",
+            source_url=url,
+            title=title or "",
+            price=price if price is not None else 0.0,
+            original_price=model.original_price,
+            category=model.category,
+            skus=model.skus,
+            images=images,
+            detail_images=model.detail_images or detail_images,
+            extra=model.extra,
             collected_at=datetime.now()
         )
 
-        return Result.ok(product)
+    def _has_core_fields(self, extracted: ExtractionResult, model: ItemModel | None) -> bool:
+        """结构化数据与 DOM 字段合并后是否已包含标题、价格和主图"""
+        if model is not None and model.is_complete:
+            return True
+        model = model or ItemModel()
+        has_title = bool(model.title or extracted.candidates("title"))
+        has_price = model.price is not None or self._parse_price(extracted) is not None
+        return has_title and has_price and bool(model.images or self._parse_images(extracted))
+
+    def _parse_inline_model(self, extracted: ExtractionResult) -> ItemModel | None:
+        """解析内联脚本中的商品模型"""
+        for _, scripts in extracted.candidates("inline_model"):
+            for script in scripts:
+                for obj in extract_inline_json(script):
+                    model = parse_item_model(obj)
+                    if model and model.title:
+                        return model
+        return None
 
     def _is_valid_url(self, url: str) -> bool:
         """验证是否为淘宝商品链接"""
@@ -93,100 +386,43 @@ class Collector:
         ]
         return any(re.match(p, url) for p in patterns)
 
-    async def _extract_title(self) -> Result[str]:
-        """提取商品标题"""
-        # 尝试多个可能的选择器
-        selectors = [
-            "h1.tb-main-title",
-            ".tb-detail-hd h1",
-            "div[data-spm='1000983'] h1",
-            ".ItemHeader--mainTitle--3CIjqW5",
-        ]
-
-        for selector in selectors:
-            result = await self.browser.get_content(selector)
-            if result.success and result.data:
-                return Result.ok(result.data.strip())
-
-        # 使用页面标题作为备选
-        if self.browser.page:
-            title = await self.browser.page.title()
-            # 移除后缀
-            title = re.sub(r"-.*$", "", title).strip()
-            if title:
-                return Result.ok(title)
-
-        return Result.fail_with(
-            code="C_PARSE_FAILED",
-            message="无法提取商品标题",
-            recoverable=True
-        )
-
-    async def _extract_price(self) -> Result[float]:
-        """提取商品价格"""
-        selectors = [
-            ".tb-rmb-num",
-            ".tm-price",
-            ".tm-promo-price .tm-price",
-            ".Price--priceText--2nLbVda",
-        ]
-
-        for selector in selectors:
-            result = await self.browser.get_content(selector)
-            if result.success and result.data:
-                # 提取数字
-                match = re.search(r"[\d.]+", result.data)
-                if match:
-                    try:
-                        return Result.ok(float(match.group()))
-                    except ValueError:
-                        continue
-
-        return Result.fail_with(
-            code="C_PARSE_FAILED",
-            message="无法提取商品价格",
-            recoverable=True
-        )
-
-    async def _extract_images(self) -> Result[list[str]]:
-        """提取商品图片"""
-        images = []
-
-        if not self.browser.page:
-            return Result.ok(images)
-
-        # 尝试获取主图列表
-        selectors = [
-            "#J_UlThumb img",
-            ".tb-thumb img",
-            ".PicGallery--thumbnails--2XJVxAf img",
-        ]
-
-        for selector in selectors:
-            try:
-                elements = await self.browser.page.query_selector_all(selector)
-                for el in elements:
-                    src = await el.get_attribute("src")
-                    if src:
-                        # 转换为大图
-                        src = self._to_large_image(src)
-                        if src not in images:
-                            images.append(src)
-                if images:
-                    break
-            except Exception:
-                continue
-
-        return Result.ok(images)
+    def _parse_title(self, extracted: ExtractionResult) -> str | None:
+        """解析商品标题（选择器均未命中时使用页面标题）"""
+        for _, text in extracted.candidates("title"):
+            return text.strip()
+
+        # 使用页面标题作为备选，移除后缀
+        title = re.sub(r"-.*$", "", extracted.document_title).strip()
+        return title or None
+
+    def _parse_price(self, extracted: ExtractionResult) -> float | None:
+        """解析商品价格"""
+        for _, text in extracted.candidates("price"):
+            # 提取数字
+            match = re.search(r"[\d.]+", text)
+            if match:
+                try:
+                    return float(match.group())
+                except ValueError:
+                    continue
+        return None
+
+    def _parse_images(self, extracted: ExtractionResult) -> list[str]:
+        """解析商品主图（第一个有结果的选择器）"""
+        for _, sources in extracted.candidates("images"):
+            images = []
+            for src in sources:
+                # 转换为大图
+                src = self._to_large_image(src)
+                if src not in images:
+                    images.append(src)
+            if images:
+                return images
+        return []
 
     def _to_large_image(self, url: str) -> str:
         """转换为大图 URL"""
-        # 移除尺寸后缀
-        url = re.sub(r"_\d+x\d+\.[a-z]+$", "", url)
-        # 确保使用 https
-        if url.startswith("//"):
-            url = "https:" + url
-        return url
+        return normalize_image_url(url)
 
     def _emit_progress(self, step: int, total: int, message: str):
         """发送进度事件"""
@@ -197,3 +433,8 @@ class Collector:
                 total=total,
                 message=message
             )
+
+    def _emit_event(self, event_type: str, **payload):
+        """发送事件"""
+        if self.event_bus:
+            self.event_bus.emit(event_type, **payload)
@@ -1,10 +1,23 @@
 """
 事件机制
+
+EventBus 支持两种分发方式：
+- sync: publish 时依次调用所有订阅者（默认，与调用方顺序一致）
+- async: publish 只把事件放入总线入口队列（O(1)，与订阅者数量无关），
+  由后台任务分发到每个订阅者自己的有界队列，订阅者在各自的任务中处理。
+  处理器慢或出错不会拖住采集/填写流程。
 """
+import asyncio
+import inspect
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Protocol, Callable
 
+from src.infra.logger import logger
+
+log = logger.get("events")
+
 
 @dataclass
 class Event:
@@ -19,38 +32,346 @@ class EventListener(Protocol):
     def on_event(self, event: Event) -> None: ...
 
 
+class DispatchPolicy:
+    """订阅者队列满时的处理策略（仅 async 模式）"""
+    DROP_OLDEST = "drop_oldest"    # 丢弃最旧的事件（默认，适合界面刷新）
+    DROP_NEWEST = "drop_newest"    # 丢弃新到的事件
+    BLOCK = "block"                # 不丢事件：暂停分发直到队列有空位，事件积压在总线入口
+
+
+class _Subscription:
+    """单个订阅者：有界队列 + 处理任务"""
+
+    def __init__(
+        self,
+        callback: Callable[[Event], object],
+        types: set[str] | None,
+        policy: str,
+        maxsize: int,
+        coalesce: frozenset[str]
+    ):
+        self.callback = callback
+        self.types = types
+        self.policy = policy
+        self.maxsize = max(1, maxsize)
+        self.coalesce = coalesce
+        # 队列元素为 Event；可合并的事件只放类型名，内容取 latest 中的最新一条
+        self.queue: deque[Event | str] = deque()
+        self.latest: dict[str, Event] = {}
+        self.ready: asyncio.Event | None = None
+        self.space: asyncio.Event | None = None
+        self.task: asyncio.Task | None = None
+        self.busy = False
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    @property
+    def name(self) -> str:
+        callback = self.callback
+        owner = getattr(callback, "__self__", None)
+        if owner is not None:
+            return f"{type(owner).__name__}.{callback.__name__}"
+        return getattr(callback, "__qualname__", repr(callback))
+
+    @property
+    def idle(self) -> bool:
+        return not self.queue and not self.busy
+
+    def offer(self, event: Event) -> bool:
+        """放入队列；BLOCK 策略下队列已满时返回 False"""
+        if event.type in self.coalesce and event.type in self.latest:
+            # 同类事件还没处理：只保留最新一条
+            self.latest[event.type] = event
+            self.coalesced += 1
+            return True
+
+        if len(self.queue) >= self.maxsize:
+            if self.policy == DispatchPolicy.BLOCK:
+                self.space.clear()
+                return False
+            self.dropped += 1
+            if self.policy == DispatchPolicy.DROP_NEWEST:
+                return True
+            oldest = self.queue.popleft()
+            if isinstance(oldest, str):
+                self.latest.pop(oldest, None)
+
+        if event.type in self.coalesce:
+            self.latest[event.type] = event
+            self.queue.append(event.type)
+        else:
+            self.queue.append(event)
+        self.ready.set()
+        return True
+
+    def take(self) -> Event:
+        """取出队首事件"""
+        item = self.queue.popleft()
+        self.space.set()
+        if isinstance(item, str):
+            return self.latest.pop(item)
+        return item
+
+    def stats(self) -> dict:
+        return {
+            "handler": self.name,
+            "types": sorted(self.types) if self.types else None,
+            "policy": self.policy,
+            "pending": len(self.queue),
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "errors": self.errors
+        }
+
+
 class EventBus:
     """事件总线"""
 
-    def __init__(self):
-        self._listeners: list[EventListener] = []
-        self._handlers: dict[str, list[Callable[[Event], None]]] = {}
+    MODES = ("sync", "async")
+    QUEUE_SIZE = 256        # 每个订阅者的队列长度
+    INBOX_SIZE = 10000      # 总线入口队列长度，超过时丢弃最旧的事件
 
-    def subscribe(self, listener: EventListener) -> None:
-        """订阅所有事件"""
-        self._listeners.append(listener)
+    def __init__(self, mode: str = "sync", queue_size: int = None):
+        if mode not in self.MODES:
+            raise ValueError(f"未知的事件分发方式: {mode}")
+        self.mode = mode
+        self.queue_size = queue_size or self.QUEUE_SIZE
+        self._listeners: list[_Subscription] = []
+        self._handlers: dict[str, list[_Subscription]] = {}
+        self._inbox: deque[Event] = deque(maxlen=self.INBOX_SIZE)
+        self._inbox_dropped = 0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._dispatcher: asyncio.Task | None = None
+        self._pending_calls: set[asyncio.Future] = set()
 
-    def on(self, event_type: str, handler: Callable[[Event], None]) -> None:
-        """订阅特定类型事件"""
+    def subscribe(
+        self,
+        listener: EventListener,
+        policy: str = DispatchPolicy.DROP_OLDEST,
+        maxsize: int = None,
+        coalesce: set[str] = None
+    ) -> None:
+        """订阅所有事件
+
+        Args:
+            policy: 队列满时的处理策略（async 模式）
+            maxsize: 队列长度（async 模式）
+            coalesce: 未处理时只保留最新一条的事件类型，默认为 PROGRESS
+        """
+        self._listeners.append(self._subscription(listener.on_event, None, policy, maxsize, coalesce))
+
+    def on(
+        self,
+        event_type: str,
+        handler: Callable[[Event], None],
+        policy: str = DispatchPolicy.DROP_OLDEST,
+        maxsize: int = None,
+        coalesce: set[str] = None
+    ) -> None:
+        """订阅特定类型事件
+
+        handler 可以是 async 函数，但需要在事件循环中发布事件：
+        不在事件循环中发布时异步处理器不会执行（记为处理器错误）。
+        """
         if event_type not in self._handlers:
             self._handlers[event_type] = []
-        self._handlers[event_type].append(handler)
+        self._handlers[event_type].append(
+            self._subscription(handler, {event_type}, policy, maxsize, coalesce)
+        )
+
+    def unsubscribe(self, listener: EventListener) -> None:
+        """取消订阅所有事件"""
+        self._listeners = self._remove(self._listeners, listener.on_event)
+
+    def off(self, event_type: str, handler: Callable[[Event], None]) -> None:
+        """取消订阅特定类型事件"""
+        if event_type in self._handlers:
+            self._handlers[event_type] = self._remove(self._handlers[event_type], handler)
 
     def publish(self, event: Event) -> None:
         """发布事件"""
-        # 通知全局监听器
-        for listener in self._listeners:
-            listener.on_event(event)
-
-        # 通知特定类型处理器
-        if event.type in self._handlers:
-            for handler in self._handlers[event.type]:
-                handler(event)
+        if self.mode == "async":
+            loop = self._running_loop()
+            if loop is not None:
+                self._enqueue(event, loop)
+                return
+        # sync 模式，或不在事件循环中（无法启动分发任务）
+        for subscription in self._targets(event):
+            self._call(subscription, event)
 
     def emit(self, event_type: str, **payload) -> None:
         """便捷方法：发送事件"""
         self.publish(Event(type=event_type, payload=payload))
 
+    async def drain(self, timeout: float = None) -> bool:
+        """等待已发布的事件全部处理完（async 模式），超时返回 False"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout if timeout is not None else None
+        while not self._idle():
+            if deadline is not None and loop.time() >= deadline:
+                return False
+            await asyncio.sleep(0.01)
+        return True
+
+    async def close(self, timeout: float = 5.0):
+        """处理完剩余事件后停止分发任务"""
+        if self._loop is None:
+            return
+        if not await self.drain(timeout):
+            log.warning("关闭事件总线时仍有未处理的事件", pending=self._pending_count())
+        tasks = [s.task for s in self._subscriptions() if s.task] + list(self._pending_calls)
+        if self._dispatcher:
+            tasks.append(self._dispatcher)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._reset()
+
+    def stats(self) -> dict:
+        """分发统计：入口积压、丢弃数量和每个订阅者的处理情况"""
+        return {
+            "mode": self.mode,
+            "pending": len(self._inbox),
+            "dropped": self._inbox_dropped,
+            "subscribers": [s.stats() for s in self._subscriptions()]
+        }
+
+    # ==================== 内部方法 ====================
+
+    def _subscription(self, callback, types, policy, maxsize, coalesce) -> _Subscription:
+        if coalesce is None:
+            coalesce = {EventTypes.PROGRESS}
+        return _Subscription(callback, types, policy, maxsize or self.queue_size, frozenset(coalesce))
+
+    def _remove(self, subscriptions: list[_Subscription], callback) -> list[_Subscription]:
+        kept = []
+        for subscription in subscriptions:
+            if subscription.callback == callback:
+                if subscription.task:
+                    subscription.task.cancel()
+            else:
+                kept.append(subscription)
+        return kept
+
+    def _subscriptions(self) -> list[_Subscription]:
+        subscriptions = list(self._listeners)
+        for handlers in self._handlers.values():
+            subscriptions.extend(handlers)
+        return subscriptions
+
+    def _targets(self, event: Event) -> list[_Subscription]:
+        return self._listeners + self._handlers.get(event.type, [])
+
+    def _running_loop(self) -> asyncio.AbstractEventLoop | None:
+        try:
+            return asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+
+    def _enqueue(self, event: Event, loop: asyncio.AbstractEventLoop):
+        """事件放入入口队列并唤醒分发任务"""
+        if loop is not self._loop:
+            # 首次使用，或原事件循环已结束（如多次 asyncio.run）
+            self._reset()
+            self._loop = loop
+            self._wakeup = asyncio.Event()
+        if len(self._inbox) == self._inbox.maxlen:
+            self._inbox_dropped += 1
+        self._inbox.append(event)
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = loop.create_task(self._dispatch_loop())
+        self._wakeup.set()
+
+    def _reset(self):
+        self._loop = None
+        self._wakeup = None
+        self._dispatcher = None
+        self._pending_calls.clear()
+        for subscription in self._subscriptions():
+            subscription.task = None
+            subscription.ready = None
+            subscription.space = None
+            subscription.busy = False
+
+    async def _dispatch_loop(self):
+        """把入口队列中的事件分发到订阅者队列"""
+        while True:
+            if not self._inbox:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            event = self._inbox.popleft()
+            for subscription in self._targets(event):
+                self._ensure_worker(subscription)
+                while not subscription.offer(event):
+                    await subscription.space.wait()
+
+    def _ensure_worker(self, subscription: _Subscription):
+        if subscription.task is None or subscription.task.done():
+            subscription.ready = asyncio.Event()
+            subscription.space = asyncio.Event()
+            subscription.task = self._loop.create_task(self._worker(subscription))
+
+    async def _worker(self, subscription: _Subscription):
+        """按顺序处理单个订阅者的事件"""
+        while True:
+            if not subscription.queue:
+                subscription.ready.clear()
+                await subscription.ready.wait()
+                continue
+            event = subscription.take()
+            subscription.busy = True
+            try:
+                result = subscription.callback(event)
+                if inspect.isawaitable(result):
+                    await result
+                subscription.delivered += 1
+            except Exception as e:
+                self._handler_failed(subscription, event, e)
+            finally:
+                subscription.busy = False
+
+    def _call(self, subscription: _Subscription, event: Event):
+        """同步调用处理器（单个处理器出错不影响其他处理器和发布方）"""
+        try:
+            result = subscription.callback(event)
+            if inspect.isawaitable(result):
+                if self._running_loop() is None:
+                    # 没有事件循环可以调度：关闭协程，避免 "never awaited" 警告
+                    if inspect.iscoroutine(result):
+                        result.close()
+                    raise RuntimeError("不在事件循环中，异步处理器未执行")
+                future = asyncio.ensure_future(result)
+                self._pending_calls.add(future)
+                future.add_done_callback(self._pending_calls.discard)
+            subscription.delivered += 1
+        except Exception as e:
+            self._handler_failed(subscription, event, e)
+
+    def _handler_failed(self, subscription: _Subscription, event: Event, error: Exception):
+        subscription.errors += 1
+        # 持续出错的处理器只记录第 1 次和之后每 100 次
+        if subscription.errors == 1 or subscription.errors % 100 == 0:
+            log.warning(
+                "事件处理器出错",
+                handler=subscription.name,
+                event=event.type,
+                errors=subscription.errors,
+                error=str(error)
+            )
+
+    def _idle(self) -> bool:
+        if self._inbox or self._pending_calls:
+            return False
+        return all(s.idle for s in self._subscriptions())
+
+    def _pending_count(self) -> int:
+        return len(self._inbox) + sum(len(s.queue) for s in self._subscriptions())
+
 
 # 预定义事件类型
 class EventTypes:
@@ -62,3 +383,6 @@ class EventTypes:
     STATUS_CHANGE = "status_change"    # 状态变化
     RECORDING_START = "recording_start"  # 开始录制
     RECORDING_STOP = "recording_stop"    # 停止录制
+    BATCH_START = "batch_start"        # 批量任务开始
+    BATCH_ITEM = "batch_item"          # 批量任务单项完成
+    BATCH_DONE = "batch_done"          # 批量任务结束
@@ -0,0 +1,244 @@
+"""
+方案执行器
+
+回放知识库中录制的方案步骤（点击、填写、选择等），并把执行结果写回方案统计。
+连续的填写步骤合并为一次页面脚本执行；脚本无法处理的步骤逐个回退到 Playwright 操作。
+"""
+import asyncio
+import re
+from dataclasses import dataclass, field
+
+from playwright.async_api import Page
+
+from src.models import Solution, Step, StepAction, Result
+from src.infra.browser import BrowserManager
+from src.infra.knowledge import KnowledgeBase
+from src.infra.logger import logger
+from .events import EventBus, EventTypes
+
+log = logger.get("executor")
+
+# 步骤值中的变量占位符，如 ${value}
+_VARIABLE_RE = re.compile(r"\$\{(\w+)\}")
+
+# Playwright 专有的选择器语法，无法用 document.querySelector 执行
+_ENGINE_SELECTOR_RE = re.compile(r"^(text|xpath|css|role|id|data-testid)=|>>|:has-text\(|:text\(|:nth-match\(|^//")
+
+# 批量填写：按原生 setter 写入并触发 input/change，返回每个步骤是否成功
+_BATCH_FILL_JS = """
+(items) => items.map(([selector, value]) => {
+    let el;
+    try {
+        el = document.querySelector(selector);
+    } catch (e) {
+        return false;
+    }
+    if (!el || el.disabled || el.readOnly) return false;
+    // 不可见元素交给 Playwright 处理（会等待元素可操作）
+    if (!el.getClientRects().length) return false;
+
+    if (el.isContentEditable) {
+        el.focus();
+        el.textContent = value;
+    } else if (el instanceof HTMLInputElement || el instanceof HTMLTextAreaElement) {
+        const proto = el instanceof HTMLInputElement
+            ? HTMLInputElement.prototype : HTMLTextAreaElement.prototype;
+        const setter = Object.getOwnPropertyDescriptor(proto, 'value').set;
+        el.focus();
+        setter.call(el, value);
+    } else {
+        return false;
+    }
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+    el.dispatchEvent(new Event('change', {bubbles: true}));
+    return true;
+})
+"""
+
+
+@dataclass
+class ExecutionReport:
+    """方案执行结果"""
+    solution_id: str
+    success: bool
+    executed: int = 0                                   # 实际执行的步骤数
+    skipped: list[int] = field(default_factory=list)    # 失败但可选的步骤序号
+    failed_step: int | None = None                      # 导致失败的步骤序号
+    error: str | None = None
+    batched_fills: int = 0                              # 通过批量脚本完成的填写数
+
+    def to_dict(self) -> dict:
+        return {
+            "solution_id": self.solution_id,
+            "success": self.success,
+            "executed": self.executed,
+            "skipped": self.skipped,
+            "failed_step": self.failed_step,
+            "error": self.error,
+            "batched_fills": self.batched_fills
+        }
+
+
+class SolutionExecutor:
+    """方案执行器：回放 Solution.steps"""
+
+    def __init__(
+        self,
+        browser: BrowserManager,
+        knowledge_base: KnowledgeBase,
+        event_bus: EventBus = None
+    ):
+        self.browser = browser
+        self.knowledge_base = knowledge_base
+        self.event_bus = event_bus or EventBus()
+
+    async def execute(
+        self,
+        solution: Solution,
+        page: Page | None = None,
+        variables: dict = None,
+        record: bool = True
+    ) -> Result[ExecutionReport]:
+        """执行方案
+
+        Args:
+            solution: 要执行的方案
+            page: 目标页面（为空时使用主标签页）
+            variables: 替换步骤值中 ${name} 占位符的变量
+            record: 是否把执行结果写回方案统计
+        """
+        page = page or self.browser.page
+        if not page:
+            return Result.fail_with(
+                code="B_NOT_STARTED",
+                message="浏览器未启动",
+                recoverable=False
+            )
+
+        report = ExecutionReport(solution_id=solution.id, success=True)
+        steps = [self._resolve(step, variables or {}) for step in solution.steps]
+
+        idx = 0
+        while idx < len(steps):
+            # 连续的可批量填写步骤合并执行
+            end = idx
+            while end < len(steps) and self._is_batchable(steps[end]):
+                end += 1
+            if end - idx >= 2:
+                ok = await self._run_fill_batch(page, steps, idx, end, report)
+                if not ok:
+                    break
+                idx = end
+                continue
+
+            ok = await self._run_single(page, steps[idx], idx, report)
+            if not ok:
+                break
+            idx += 1
+
+        log.info("方案执行完成", **report.to_dict())
+
+        if record:
+            record_result = self.knowledge_base.solutions.record_execution(solution.id, report.success)
+            if not record_result.success:
+                log.warning("记录方案执行结果失败", solution_id=solution.id, error=record_result.error.message)
+
+        self._emit_event(
+            EventTypes.SOLUTION,
+            solution_id=solution.id,
+            success=report.success,
+            failed_step=report.failed_step,
+            error=report.error
+        )
+        return Result.ok(report)
+
+    def _resolve(self, step: Step, variables: dict) -> Step:
+        """替换步骤值中的变量"""
+        if not step.value or "${" not in step.value:
+            return step
+        value = _VARIABLE_RE.sub(lambda m: str(variables.get(m.group(1), m.group(0))), step.value)
+        return Step(
+            action=step.action,
+            selector=step.selector,
+            value=value,
+            timeout=step.timeout,
+            optional=step.optional
+        )
+
+    def _is_batchable(self, step: Step) -> bool:
+        """填写步骤且选择器是标准 CSS 时可以合并"""
+        return (
+            step.action == StepAction.FILL
+            and step.value is not None
+            and bool(step.selector)
+            and not _ENGINE_SELECTOR_RE.search(step.selector)
+        )
+
+    async def _run_fill_batch(
+        self,
+        page: Page,
+        steps: list[Step],
+        start: int,
+        end: int,
+        report: ExecutionReport
+    ) -> bool:
+        """一次脚本执行多个填写步骤，未完成的步骤逐个重试（会等待元素出现）"""
+        batch = steps[start:end]
+        try:
+            filled = await page.evaluate(_BATCH_FILL_JS, [[s.selector, s.value] for s in batch])
+        except Exception as e:
+            log.debug("批量填写失败，逐个执行", error=str(e))
+            filled = [False] * len(batch)
+
+        for offset, (step, ok) in enumerate(zip(batch, filled)):
+            if ok:
+                report.executed += 1
+                report.batched_fills += 1
+                continue
+            if not await self._run_single(page, step, start + offset, report):
+                return False
+        return True
+
+    async def _run_single(self, page: Page, step: Step, index: int, report: ExecutionReport) -> bool:
+        """执行单个步骤，返回是否继续"""
+        try:
+            await self._perform(page, step)
+            report.executed += 1
+            return True
+        except Exception as e:
+            if step.optional:
+                report.skipped.append(index)
+                log.debug("可选步骤失败，跳过", index=index, selector=step.selector, error=str(e))
+                return True
+            report.success = False
+            report.failed_step = index
+            report.error = f"{step.action.value} {step.selector}: {e}"
+            return False
+
+    async def _perform(self, page: Page, step: Step):
+        """执行 Playwright 操作"""
+        timeout = step.timeout
+        action = step.action
+
+        if action == StepAction.CLICK:
+            await page.click(step.selector, timeout=timeout)
+        elif action == StepAction.FILL:
+            await page.fill(step.selector, step.value or "", timeout=timeout)
+        elif action == StepAction.SELECT:
+            await page.select_option(step.selector, step.value, timeout=timeout)
+        elif action == StepAction.HOVER:
+            await page.hover(step.selector, timeout=timeout)
+        elif action == StepAction.PRESS:
+            await page.press(step.selector, step.value or "Enter", timeout=timeout)
+        elif action == StepAction.SCROLL:
+            await page.locator(step.selector).scroll_into_view_if_needed(timeout=timeout)
+        elif action == StepAction.WAIT:
+            if step.selector:
+                await page.wait_for_selector(step.selector, timeout=timeout)
+            else:
+                await asyncio.sleep(timeout / 1000)
+
+    def _emit_event(self, event_type: str, **payload):
+        """发送事件"""
+        if self.event_bus:
+            self.event_bus.emit(event_type, **payload)
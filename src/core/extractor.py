@@ -0,0 +1,433 @@
+"""
+页面字段提取引擎
+
+把所有字段的候选选择器列表合并成一次 page.evaluate 调用，
+在页面内按顺序尝试每个选择器，一次往返返回全部字段的候选值。
+同一套规则也可以直接作用于 HTML 文本（HTTP 采集模式，无需浏览器）。
+"""
+import re
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from typing import TYPE_CHECKING
+
+from src.models import Result
+from src.infra.logger import logger
+
+log = logger.get("extractor")
+
+if TYPE_CHECKING:
+    # 仅用于类型标注：run_html 不需要安装 playwright
+    from playwright.async_api import Page
+
+
+# 注入脚本：参数为规则列表，返回 {字段名: [[选择器, 值], ...]} 和 document.title
+# 选择器支持 CSS 和 "xpath=" 前缀；值为空（或不含 contains 标记）的选择器不返回，候选顺序与规则一致
+_EXTRACT_JS = """
+(rules) => {
+    const query = (selector, multiple) => {
+        try {
+            if (selector.startsWith('xpath=')) {
+                const snapshot = document.evaluate(
+                    selector.slice(6), document, null,
+                    XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null
+                );
+                const nodes = [];
+                for (let i = 0; i < snapshot.snapshotLength; i++) {
+                    nodes.push(snapshot.snapshotItem(i));
+                    if (!multiple) break;
+                }
+                return nodes;
+            }
+            if (multiple) return Array.from(document.querySelectorAll(selector));
+            const el = document.querySelector(selector);
+            return el ? [el] : [];
+        } catch (e) {
+            return [];
+        }
+    };
+    const read = (el, attribute) => {
+        if (attribute) return el.getAttribute ? el.getAttribute(attribute) : null;
+        return el.textContent;
+    };
+
+    const fields = {};
+    for (const rule of rules) {
+        const candidates = [];
+        for (const selector of rule.selectors) {
+            const values = query(selector, rule.multiple)
+                .map(el => read(el, rule.attribute))
+                .filter(v => v !== null && v !== undefined && String(v).trim() !== '')
+                .filter(v => !rule.contains.length || rule.contains.some(m => String(v).includes(m)));
+            if (!values.length) continue;
+            candidates.push([selector, rule.multiple ? values : values[0]]);
+            if (rule.first_only) break;
+        }
+        fields[rule.name] = candidates;
+    }
+    return {fields, title: document.title};
+}
+"""
+
+
+@dataclass
+class FieldRule:
+    """字段提取规则：按顺序尝试的候选选择器"""
+    name: str
+    selectors: list[str]
+    attribute: str | None = None    # None 表示取文本内容
+    multiple: bool = False          # 是否取全部匹配元素
+    first_only: bool = False        # 只返回第一个有值的候选（无需 Python 侧再校验时使用）
+    contains: tuple[str, ...] = ()  # 值需包含任一标记（用于筛选内联脚本等大文本）
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "selectors": list(self.selectors),
+            "attribute": self.attribute,
+            "multiple": self.multiple,
+            "first_only": self.first_only,
+            "contains": list(self.contains)
+        }
+
+
+@dataclass
+class ExtractionResult:
+    """提取结果：每个字段的候选值（按规则中的选择器顺序）"""
+    fields: dict[str, list[tuple[str, str | list[str]]]] = field(default_factory=dict)
+    document_title: str = ""
+
+    def candidates(self, name: str) -> list[tuple[str, str | list[str]]]:
+        """字段的全部候选 (选择器, 值)"""
+        return self.fields.get(name, [])
+
+    def first(self, name: str) -> str | list[str] | None:
+        """字段的第一个候选值"""
+        candidates = self.candidates(name)
+        return candidates[0][1] if candidates else None
+
+
+# ==================== HTML 文档（CSS 选择器子集） ====================
+
+_VOID_TAGS = frozenset({
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr",
+})
+
+# 开始标签会隐式关闭的同级元素（<li> 遇到下一个 <li> 时闭合）
+_IMPLIED_END = {
+    "li": ("li",),
+    "p": ("p",),
+    "option": ("option",),
+    "tr": ("tr", "td", "th"),
+    "td": ("td", "th"),
+    "th": ("td", "th"),
+    "dt": ("dt", "dd"),
+    "dd": ("dt", "dd"),
+}
+
+# 复合选择器中的简单选择器：标签 / #id / .class / [属性] / :not(...)
+_SIMPLE_RE = re.compile(
+    r"""(?P<tag>\*|[a-zA-Z][\w-]*)"""
+    r"""|\#(?P<id>[\w-]+)"""
+    r"""|\.(?P<cls>[\w-]+)"""
+    r"""|\[\s*(?P<attr>[\w:-]+)\s*(?:(?P<op>[~^$*]?=)\s*(?:"(?P<dq>[^"]*)"|'(?P<sq>[^']*)'|(?P<bare>[^\]\s]+))\s*)?\]"""
+    r"""|:not\((?P<neg>[^()]*)\)"""
+)
+
+
+def _tokenize(selector: str) -> list[list[str]] | None:
+    """按顶层逗号拆分选择器列表，每组再拆为复合选择器和 ">"
+
+    引号、[...] 和 (...) 内的逗号、空格和 ">" 不作分隔；引号或括号未闭合时返回 None。
+    """
+    groups: list[list[str]] = []
+    tokens: list[str] = []
+    current: list[str] = []
+    quote = None
+    depth = 0
+
+    def flush():
+        if current:
+            tokens.append("".join(current))
+            current.clear()
+
+    for ch in selector:
+        if quote:
+            current.append(ch)
+            if ch == quote:
+                quote = None
+        elif ch in "\"'":
+            quote = ch
+            current.append(ch)
+        elif ch in "[(":
+            depth += 1
+            current.append(ch)
+        elif ch in "])":
+            depth -= 1
+            if depth < 0:
+                return None
+            current.append(ch)
+        elif depth:
+            current.append(ch)
+        elif ch.isspace():
+            flush()
+        elif ch == ">":
+            flush()
+            tokens.append(">")
+        elif ch == ",":
+            flush()
+            groups.append(tokens)
+            tokens = []
+        else:
+            current.append(ch)
+
+    if quote or depth:
+        return None
+    flush()
+    groups.append(tokens)
+    return groups
+
+
+class _Node:
+    """HTML 元素节点"""
+    __slots__ = ("tag", "attrs", "children", "parent")
+
+    def __init__(self, tag: str, attrs: dict, parent: '_Node | None'):
+        self.tag = tag
+        self.attrs = attrs
+        self.children: list['_Node | str'] = []
+        self.parent = parent
+
+    def text(self) -> str:
+        """等价于 textContent"""
+        parts = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, str):
+                parts.append(node)
+            else:
+                stack.extend(reversed(node.children))
+        return "".join(parts)
+
+
+class _TreeBuilder(HTMLParser):
+    """把 HTML 解析为简单节点树（容忍未闭合标签）"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = _Node("#document", {}, None)
+        self.nodes: list[_Node] = []
+        self._stack = [self.root]
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _IMPLIED_END and self._stack[-1].tag in _IMPLIED_END[tag]:
+            self._stack.pop()
+        node = _Node(tag, {k: (v if v is not None else "") for k, v in attrs}, self._stack[-1])
+        self._stack[-1].children.append(node)
+        self.nodes.append(node)
+        if tag not in _VOID_TAGS:
+            self._stack.append(node)
+
+    def handle_startendtag(self, tag, attrs):
+        node = _Node(tag, {k: (v if v is not None else "") for k, v in attrs}, self._stack[-1])
+        self._stack[-1].children.append(node)
+        self.nodes.append(node)
+
+    def handle_endtag(self, tag):
+        for i in range(len(self._stack) - 1, 0, -1):
+            if self._stack[i].tag == tag:
+                del self._stack[i:]
+                return
+
+    def handle_data(self, data):
+        self._stack[-1].children.append(data)
+
+
+class HtmlDocument:
+    """HTML 文档：支持常用 CSS 选择器子集
+
+    支持标签、#id、.class、[attr]、[attr=v]（含 ~= ^= $= *=）、:not(...)，
+    以及后代（空格）和子元素（>）组合符、逗号分隔的选择器列表。
+    属性值可以加引号，引号内的空格、逗号和 ">" 按原样匹配。
+    """
+
+    def __init__(self, html: str):
+        builder = _TreeBuilder()
+        builder.feed(html)
+        builder.close()
+        self._nodes = builder.nodes
+        self._cache: dict[str, list] = {}
+
+    @property
+    def title(self) -> str:
+        nodes = self.select("title")
+        return nodes[0].text().strip() if nodes else ""
+
+    def select(self, selector: str) -> list[_Node]:
+        """按文档顺序返回全部匹配元素（不支持的选择器返回空列表）"""
+        if selector not in self._cache:
+            self._cache[selector] = self._compile(selector)
+        compiled = self._cache[selector]
+        if compiled is None:
+            return []
+        return [node for node in self._nodes if any(self._match(node, parts) for parts in compiled)]
+
+    def _compile(self, selector: str) -> list | None:
+        """解析选择器为 [[复合选择器, 组合符, 复合选择器, ...], ...]"""
+        if selector.startswith("xpath="):
+            return None
+        groups = _tokenize(selector)
+        if groups is None:
+            return None
+        compiled = []
+        for tokens in groups:
+            parts = []
+            for token in tokens:
+                if token == ">":
+                    parts.append(">")
+                    continue
+                if parts and parts[-1] != ">":
+                    parts.append(" ")
+                compound = self._compile_compound(token)
+                if compound is None:
+                    return None
+                parts.append(compound)
+            if not parts or parts[-1] in (">", " "):
+                return None
+            compiled.append(parts)
+        return compiled
+
+    def _compile_compound(self, text: str) -> list | None:
+        """解析复合选择器为简单选择器列表"""
+        conditions = []
+        pos = 0
+        while pos < len(text):
+            match = _SIMPLE_RE.match(text, pos)
+            if not match:
+                return None
+            if match.group("neg") is not None:
+                negated = self._compile_compound(match.group("neg").strip())
+                if negated is None:
+                    return None
+                conditions.append(("not", negated))
+            elif match.group("tag"):
+                conditions.append(("tag", match.group("tag").lower()))
+            elif match.group("id"):
+                conditions.append(("id", match.group("id")))
+            elif match.group("cls"):
+                conditions.append(("cls", match.group("cls")))
+            else:
+                value = next(
+                    (v for v in (match.group("dq"), match.group("sq"), match.group("bare")) if v is not None),
+                    None
+                )
+                conditions.append(("attr", (match.group("attr").lower(), match.group("op"), value)))
+            pos = match.end()
+        return conditions
+
+    def _match_compound(self, node: _Node, conditions: list) -> bool:
+        for kind, arg in conditions:
+            if kind == "tag":
+                if arg != "*" and node.tag != arg:
+                    return False
+            elif kind == "id":
+                if node.attrs.get("id") != arg:
+                    return False
+            elif kind == "cls":
+                if arg not in node.attrs.get("class", "").split():
+                    return False
+            elif kind == "not":
+                if self._match_compound(node, arg):
+                    return False
+            else:
+                name, op, value = arg
+                actual = node.attrs.get(name)
+                if actual is None:
+                    return False
+                if op == "=" and actual != value:
+                    return False
+                if op == "~=" and value not in actual.split():
+                    return False
+                if op == "^=" and not actual.startswith(value):
+                    return False
+                if op == "$=" and not actual.endswith(value):
+                    return False
+                if op == "*=" and value not in actual:
+                    return False
+        return True
+
+    def _match(self, node: _Node, parts: list, index: int = None) -> bool:
+        """从右向左匹配复杂选择器"""
+        if index is None:
+            index = len(parts) - 1
+        if not self._match_compound(node, parts[index]):
+            return False
+        if index == 0:
+            return True
+
+        combinator = parts[index - 1]
+        parent = node.parent
+        if combinator == ">":
+            return parent is not None and parent.tag != "#document" and self._match(parent, parts, index - 2)
+        while parent is not None and parent.tag != "#document":
+            if self._match(parent, parts, index - 2):
+                return True
+            parent = parent.parent
+        return False
+
+
+class ExtractionPlan:
+    """提取计划：一组字段规则，单次往返执行"""
+
+    def __init__(self, rules: list[FieldRule]):
+        self.rules = rules
+        self._arg = [rule.to_dict() for rule in rules]
+
+    async def run(self, page: "Page") -> Result[ExtractionResult]:
+        """在页面中执行提取"""
+        try:
+            raw = await page.evaluate(_EXTRACT_JS, self._arg)
+        except Exception as e:
+            log.warning("页面字段提取失败", error=str(e))
+            return Result.fail_with(
+                code="C_PARSE_FAILED",
+                message=f"页面字段提取失败: {e}",
+                recoverable=True
+            )
+
+        fields = {
+            name: [(selector, value) for selector, value in candidates]
+            for name, candidates in (raw.get("fields") or {}).items()
+        }
+        return Result.ok(ExtractionResult(
+            fields=fields,
+            document_title=raw.get("title") or ""
+        ))
+
+    def run_html(self, html: str) -> ExtractionResult:
+        """对 HTML 文本执行同一套规则（语义与页面内脚本一致）"""
+        document = HtmlDocument(html)
+        fields = {}
+        for rule in self.rules:
+            candidates = []
+            for selector in rule.selectors:
+                nodes = document.select(selector)
+                if not rule.multiple:
+                    nodes = nodes[:1]
+                values = [
+                    node.attrs.get(rule.attribute) if rule.attribute else node.text()
+                    for node in nodes
+                ]
+                values = [
+                    v for v in values
+                    if v is not None and v.strip()
+                    and (not rule.contains or any(m in v for m in rule.contains))
+                ]
+                if not values:
+                    continue
+                candidates.append((selector, values if rule.multiple else values[0]))
+                if rule.first_only:
+                    break
+            fields[rule.name] = candidates
+        return ExtractionResult(fields=fields, document_title=document.title)
@@ -1,17 +1,143 @@
 """
 表单填充器
 """
+import re
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 
-from src.models import Product, Problem, ProblemContext, ProblemType, ProblemStatus, Result
+from playwright.async_api import Page
+
+from src.models import (
+    Product, Problem, ProblemContext, ProblemType, ProblemStatus, TrustLevel, Result,
+    BindingConfig, FieldBinding, FieldType, ImageAsset
+)
 from src.infra.browser import BrowserManager
 from src.infra.knowledge import KnowledgeBase
+from src.infra.selector_cache import SelectorCache
 from src.infra.logger import logger
 from .events import EventBus, EventTypes
+from .executor import SolutionExecutor
+from .image_pipeline import ImagePipeline
 
 log = logger.get("filler")
 
+# 绑定字段名 -> 商品属性（字段名由用户在学习模式中填写）
+FIELD_ALIASES = {
+    "title": ("title", "标题", "商品标题", "宝贝标题"),
+    "price": ("price", "价格", "售价", "一口价", "销售价"),
+    "original_price": ("original_price", "原价", "划线价"),
+    "description": ("description", "描述", "商品描述", "宝贝描述"),
+    "images": ("images", "主图", "图片", "商品图片", "宝贝图片"),
+    "detail_images": ("detail_images", "详情", "详情图", "商品详情", "宝贝详情"),
+    "category": ("category", "类目"),
+}
+
+# 批量填写：一次 evaluate 写入全部文本类字段
+# 参数为 [[选择器, 类型, 值], ...]，选择器支持 CSS 和 "xpath=" 前缀；返回每个字段是否成功
+_BINDING_FILL_JS = """
+(items) => {
+    const find = (selector) => {
+        try {
+            if (selector.startsWith('xpath=')) {
+                return document.evaluate(
+                    selector.slice(6), document, null,
+                    XPathResult.FIRST_ORDERED_NODE_TYPE, null
+                ).singleNodeValue;
+            }
+            return document.querySelector(selector);
+        } catch (e) {
+            return null;
+        }
+    };
+    const editable = (el) => {
+        if (el instanceof HTMLInputElement || el instanceof HTMLTextAreaElement
+                || el instanceof HTMLSelectElement || el.isContentEditable) {
+            return el;
+        }
+        // 绑定的可能是外层容器，取其中第一个可编辑元素
+        return el.querySelector('input:not([type=hidden]), textarea, select, [contenteditable=true]');
+    };
+    const fire = (el) => {
+        el.dispatchEvent(new Event('input', {bubbles: true}));
+        el.dispatchEvent(new Event('change', {bubbles: true}));
+    };
+
+    return items.map(([selector, type, value]) => {
+        const found = find(selector);
+        const el = found && editable(found);
+        if (!el || el.disabled || el.readOnly || !el.getClientRects().length) return false;
+
+        if (el instanceof HTMLSelectElement) {
+            const option = Array.from(el.options).find(
+                o => o.value === value || o.textContent.trim() === value
+            );
+            if (!option) return false;
+            el.value = option.value;
+            fire(el);
+            return true;
+        }
+        if (el.isContentEditable) {
+            el.focus();
+            if (type === 'richtext') el.innerHTML = value; else el.textContent = value;
+            fire(el);
+            return true;
+        }
+        const proto = el instanceof HTMLInputElement
+            ? HTMLInputElement.prototype : HTMLTextAreaElement.prototype;
+        Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, value);
+        fire(el);
+        return true;
+    });
+}
+"""
+
+# 上传接口响应中可能存放图片地址的字段
+_IMAGE_URL_KEYS = ("url", "fullUrl", "picUrl", "imageUrl", "imgUrl", "src")
+
+
+def _find_image_url(data) -> str | None:
+    """在素材库上传接口的响应中查找图片地址（优先常见字段名，再递归查找）"""
+    if isinstance(data, dict):
+        for key in _IMAGE_URL_KEYS:
+            value = data.get(key)
+            if isinstance(value, str) and value.startswith(("http", "//")):
+                return value
+        data = list(data.values())
+    if isinstance(data, list):
+        for item in data:
+            if isinstance(item, (dict, list)):
+                found = _find_image_url(item)
+                if found:
+                    return found
+    return None
+
+
+def _is_upload_response(response) -> bool:
+    """图片上传请求的响应"""
+    return response.request.method == "POST" and "upload" in response.url.lower()
+
+
+# 可通过批量脚本填写的字段类型（图片需要上传，单独处理）
+_SCRIPT_TYPES = (FieldType.TEXT, FieldType.NUMBER, FieldType.TEXTAREA, FieldType.SELECT, FieldType.RICHTEXT)
+
+
+@dataclass
+class FillReport:
+    """按绑定配置填写的结果"""
+    filled: list[str] = field(default_factory=list)     # 已填写的字段名
+    failed: list[str] = field(default_factory=list)     # 填写失败的字段名
+    skipped: list[str] = field(default_factory=list)    # 商品无对应值的字段名
+    batched: int = 0                                     # 通过批量脚本完成的字段数
+
+    def to_dict(self) -> dict:
+        return {
+            "filled": self.filled,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "batched": self.batched
+        }
+
 
 class Filler:
     """表单填充器：自动填写上架表单"""
@@ -19,27 +145,62 @@ class Filler:
     # 天猫发布商品页面
     PUBLISH_URL = "https://upload.taobao.com/auction/container/publish.htm"
 
+    # 探测到元素后执行填写的超时（ms）：元素已存在，不需要等待默认的 30 秒
+    ACTION_TIMEOUT = 2000
+
+    # 图片上传的文件选择框（通常是隐藏的）
+    IMAGE_INPUT_SELECTORS = [
+        "input[type='file'][accept*='image']",
+        ".image-upload input[type='file']",
+        ".upload-pic input[type='file']",
+        "input[type='file']",
+    ]
+    # 单张图片等待上传接口响应的超时（ms）
+    UPLOAD_TIMEOUT = 30000
+    # 表单提交成功后跳转的页面，及等待用户提交的最长时间（ms）
+    SUBMIT_SUCCESS_PATTERN = re.compile(r"success", re.I)
+    SUBMIT_TIMEOUT = 30 * 60 * 1000
+
     def __init__(
         self,
         browser: BrowserManager,
         knowledge_base: KnowledgeBase,
-        event_bus: EventBus = None
+        event_bus: EventBus = None,
+        auto_recover: bool = True,
+        selector_cache: SelectorCache = None,
+        images: ImagePipeline = None
     ):
         self.browser = browser
         self.knowledge_base = knowledge_base
         self.event_bus = event_bus or EventBus()
-
-    async def fill(self, product: Product) -> Result[bool]:
-        """填写商品上架表单"""
+        # 填写失败时自动执行知识库中已验证的方案
+        self.executor = SolutionExecutor(browser, knowledge_base, self.event_bus) if auto_recover else None
+        # 按历史命中率排列候选选择器
+        self.selectors = selector_cache or SelectorCache()
+        # 图片管道（为空时跳过图片上传）
+        self.images = images
+
+    async def fill(self, product: Product, page: Page | None = None) -> Result[bool]:
+        """填写商品上架表单（page 为空时使用主标签页）"""
+        try:
+            return await self._fill_form(product, page)
+        finally:
+            self.selectors.flush()
+            log.debug("选择器缓存统计", **self.selectors.stats.to_dict())
+
+    async def _fill_form(self, product: Product, page: Page | None = None) -> Result[bool]:
+        """内置规则填写标题、价格、图片和描述"""
         self._emit_progress(1, 6, "正在打开发布页面...")
 
         # 导航到发布页面
-        result = await self.browser.goto(self.PUBLISH_URL)
+        result = await self.browser.with_retry(
+            self.browser.goto, self.PUBLISH_URL, page=page, strategy="publish-form"
+        )
         if not result.success:
             return result
 
         # 检查登录状态
-        logged_in = await self._check_login()
+        logged_in = await self._check_login(page)
         if not logged_in:
             self._emit_event(EventTypes.LOGIN_EXPIRED, session_id="main")
             return Result.fail_with(
@@ -51,32 +212,36 @@ class Filler:
         self._emit_progress(2, 6, "正在填写商品标题...")
 
         # 填写标题
-        title_result = await self._fill_title(product.title)
+        title_result = await self._fill_title(product.title, page)
         if not title_result.success:
-            await self._report_problem(
+            problem = await self._report_problem(
                 ProblemType.FIELD_MISMATCH,
                 "无法填写商品标题",
-                {"field": "title", "value": product.title}
+                {"element_selector": title_result.error.context["selector"], "expected_value": product.title},
+                page=page
             )
-            return title_result
+            if not await self._try_recover(problem, {"value": product.title}, page):
+                return title_result
 
         self._emit_progress(3, 6, "正在填写商品价格...")
 
         # 填写价格
-        price_result = await self._fill_price(product.price)
+        price_result = await self._fill_price(product.price, page)
         if not price_result.success:
-            await self._report_problem(
+            problem = await self._report_problem(
                 ProblemType.FIELD_MISMATCH,
                 "无法填写商品价格",
-                {"field": "price", "value": str(product.price)}
+                {"element_selector": price_result.error.context["selector"], "expected_value": str(product.price)},
+                page=page
             )
-            return price_result
+            if not await self._try_recover(problem, {"value": str(product.price)}, page):
+                return price_result
 
         self._emit_progress(4, 6, "正在上传商品图片...")
 
         # 上传图片
         if product.images:
-            images_result = await self._upload_images(product.images)
+            images_result = await self._upload_images(product.images, page)
             if not images_result.success:
                 # 图片上传失败不阻断流程
                 self._emit_progress(4, 6, "图片上传失败，请手动上传")
@@ -85,19 +250,181 @@ class Filler:
 
         # 填写描述
         if product.description:
-            await self._fill_description(product.description)
+            await self._fill_description(product.description, page)
 
         self._emit_progress(6, 6, "表单填写完成，请检查并提交")
 
         return Result.ok(True)
 
-    async def _check_login(self) -> bool:
+    async def fill_with_binding(
+        self,
+        product: Product,
+        binding: BindingConfig,
+        page: Page | None = None
+    ) -> Result[FillReport]:
+        """按绑定配置填写全部字段
+
+        文本、数字、下拉和富文本字段合并为一次页面脚本写入；
+        脚本无法完成的字段逐个回退到 Playwright 操作，图片字段单独上传。
+        """
+        total = 4
+        self._emit_progress(1, total, "正在打开发布页面...")
+
+        url = binding.target_url_pattern if binding.target_url_pattern.startswith("http") else self.PUBLISH_URL
+        result = await self.browser.with_retry(self.browser.goto, url, page=page, strategy="publish-form")
+        if not result.success:
+            return result
+        page = result.data
+
+        if not await self._check_login(page):
+            self._emit_event(EventTypes.LOGIN_EXPIRED, session_id="main")
+            return Result.fail_with(
+                code="B_LOGIN_EXPIRED",
+                message="请先登录淘宝账号",
+                recoverable=True
+            )
+
+        report = FillReport()
+        scripted: list[tuple[FieldBinding, str]] = []
+        uploads: list[tuple[FieldBinding, list[str]]] = []
+        for field_binding in binding.fields:
+            value = self._binding_value(product, field_binding)
+            if value is None:
+                report.skipped.append(field_binding.name)
+            elif field_binding.field_type in _SCRIPT_TYPES:
+                scripted.append((field_binding, value))
+            else:
+                uploads.append((field_binding, value))
+
+        self._emit_progress(2, total, f"正在填写 {len(scripted)} 个字段...")
+
+        # 一次往返写入全部文本类字段
+        filled = [False] * len(scripted)
+        if scripted:
+            try:
+                filled = await page.evaluate(_BINDING_FILL_JS, [
+                    [fb.target_selector, fb.field_type.value, value] for fb, value in scripted
+                ])
+            except Exception as e:
+                log.debug("批量填写失败，逐个填写", error=str(e))
+
+        retry = []
+        for (fb, value), ok in zip(scripted, filled):
+            if ok:
+                report.filled.append(fb.name)
+                report.batched += 1
+            else:
+                retry.append((fb, value))
+
+        # 脚本未完成的字段（元素未渲染、需要真实输入事件等）逐个回退：
+        # 同一页面上的 focus/输入/下拉框不能交错执行，否则输入会落到别的字段
+        for fb, value in retry:
+            ok = await self._fill_binding_field(fb, value, page)
+            (report.filled if ok else report.failed).append(fb.name)
+
+        self._emit_progress(3, total, "正在上传图片...")
+        for fb, images in uploads:
+            upload_result = await self._upload_images(images, page, fb.target_selector)
+            (report.filled if upload_result.success else report.failed).append(fb.name)
+
+        # 必填字段失败时上报问题并尝试方案恢复
+        bindings = {fb.name: fb for fb in binding.fields}
+        for name in list(report.failed):
+            fb = bindings[name]
+            if not fb.required:
+                continue
+            value = self._binding_value(product, fb)
+            problem = await self._report_problem(
+                ProblemType.FIELD_MISMATCH,
+                f"无法填写字段: {name}",
+                {"element_selector": fb.target_selector, "expected_value": str(value)},
+                page=page
+            )
+            if await self._try_recover(problem, {"value": value if isinstance(value, str) else ""}, page):
+                report.failed.remove(name)
+                report.filled.append(name)
+
+        log.info("按绑定配置填写完成", binding_id=binding.id, **report.to_dict())
+        self._emit_progress(total, total, "表单填写完成，请检查并提交")
+
+        missing = [name for name in report.failed if bindings[name].required]
+        if missing:
+            return Result.fail_with(
+                code="F_FIELD_MISMATCH",
+                message=f"必填字段填写失败: {', '.join(missing)}",
+                recoverable=True,
+                context=report.to_dict()
+            )
+        return Result.ok(report)
+
+    def _binding_value(self, product: Product, binding: FieldBinding) -> str | list[str] | None:
+        """取绑定字段对应的商品值（extra 中的同名字段优先）"""
+        raw = product.extra.get(binding.name)
+        if raw is None:
+            for attr, aliases in FIELD_ALIASES.items():
+                if binding.name.strip().lower() in aliases:
+                    raw = getattr(product, attr)
+                    break
+        if raw is None or raw == "" or raw == []:
+            return None
+
+        field_type = binding.field_type
+        if field_type in (FieldType.IMAGE, FieldType.IMAGES):
+            images = raw if isinstance(raw, list) else [str(raw)]
+            return images[:1] if field_type == FieldType.IMAGE else images
+        if field_type == FieldType.NUMBER and isinstance(raw, (int, float)):
+            return f"{raw:.2f}".rstrip("0").rstrip(".")
+        if field_type == FieldType.RICHTEXT and isinstance(raw, list):
+            return "".join(f'<p><img src="{src}"/></p>' for src in raw)
+        if isinstance(raw, list):
+            return "\n".join(str(v) for v in raw)
+        return str(raw)
+
+    async def _fill_binding_field(self, binding: FieldBinding, value: str, page: Page) -> bool:
+        """用 Playwright 操作填写单个字段（元素在探测预算内未出现时直接失败）"""
+        probe_result = await self.browser.probe([binding.target_selector], page=page)
+        if probe_result.success and probe_result.data is None:
+            return False
+
+        try:
+            if binding.field_type == FieldType.SELECT:
+                try:
+                    await page.select_option(binding.target_selector, value, timeout=self.ACTION_TIMEOUT)
+                except Exception:
+                    await page.select_option(binding.target_selector, label=value, timeout=self.ACTION_TIMEOUT)
+            else:
+                result = await self.browser.fill(
+                    binding.target_selector, value, page=page, timeout=self.ACTION_TIMEOUT
+                )
+                return result.success
+            return True
+        except Exception as e:
+            log.debug("字段填写失败", field=binding.name, error=str(e))
+            return False
+
+    async def wait_for_submit(self, page: Page | None = None, timeout: int = None) -> Result[bool]:
+        """等待用户在浏览器中检查并提交表单（页面跳转到发布成功页）
+
+        超时、标签页被关闭或跳转到其他页面时返回 False，商品应保持待上架。
+        """
+        page = page or self.browser.page
+        try:
+            await page.wait_for_url(
+                lambda url: bool(self.SUBMIT_SUCCESS_PATTERN.search(url)),
+                timeout=self.SUBMIT_TIMEOUT if timeout is None else timeout
+            )
+            return Result.ok(True)
+        except Exception as e:
+            log.info("表单未提交", url=page.url if not page.is_closed() else None, error=str(e))
+            return Result.ok(False)
+
+    async def _check_login(self, page: Page | None = None) -> bool:
         """检查登录状态"""
         # 检查是否有登录相关元素
-        result = await self.browser.is_logged_in(".user-nick")
+        result = await self.browser.is_logged_in(".user-nick", page=page)
         return result.success and result.data
 
-    async def _fill_title(self, title: str) -> Result[bool]:
+    async def _fill_title(self, title: str, page: Page | None = None) -> Result[bool]:
         """填写标题"""
         selectors = [
             "input[name='title']",
@@ -105,18 +432,18 @@ class Filler:
             ".title-input input",
         ]
 
-        for selector in selectors:
-            result = await self.browser.fill(selector, title)
-            if result.success:
-                return result
+        result = await self._fill_first("title", selectors, title, page)
+        if result.success:
+            return result
 
         return Result.fail_with(
             code="F_FIELD_MISMATCH",
             message="找不到标题输入框",
-            recoverable=True
+            recoverable=True,
+            context={"selector": result.error.context.get("selector") or selectors[0]}
         )
 
-    async def _fill_price(self, price: float) -> Result[bool]:
+    async def _fill_price(self, price: float, page: Page | None = None) -> Result[bool]:
         """填写价格"""
         selectors = [
             "input[name='price']",
@@ -124,24 +451,94 @@ class Filler:
             ".price-input input",
         ]
 
-        for selector in selectors:
-            result = await self.browser.fill(selector, str(price))
-            if result.success:
-                return result
+        result = await self._fill_first("price", selectors, str(price), page)
+        if result.success:
+            return result
 
         return Result.fail_with(
             code="F_FIELD_MISMATCH",
             message="找不到价格输入框",
-            recoverable=True
+            recoverable=True,
+            context={"selector": result.error.context.get("selector") or selectors[0]}
         )
 
-    async def _upload_images(self, images: list[str]) -> Result[bool]:
-        """上传图片（占位实现）"""
-        # TODO: 实现图片上传逻辑
-        # 这需要处理文件上传或 URL 导入
-        return Result.ok(True)
+    async def _upload_images(
+        self,
+        images: list[str],
+        page: Page | None = None,
+        selector: str = None
+    ) -> Result[list[str]]:
+        """上传图片，返回上传后的地址（与 images 顺序一致，上传失败的不在其中）
+
+        未配置图片管道时跳过（需手动上传）。图片先下载到本地缓存，
+        再通过文件选择框添加到表单（同一商品中内容相同的图片只上传一次）。
+        """
+        if not self.images:
+            log.debug("未配置图片管道，跳过图片上传", count=len(images))
+            return Result.ok([])
+
+        result = await self.images.publish(
+            images, lambda assets: self._upload_files(assets, page, selector)
+        )
+        if not result.success:
+            return result
+        attached = [asset.remote_url for asset in result.data if asset.remote_url]
+        if len(attached) < len(result.data):
+            log.warning("部分图片未添加到表单", attached=len(attached), total=len(result.data))
+        return Result.ok(attached)
 
-    async def _fill_description(self, description: str) -> Result[bool]:
+    async def _upload_files(
+        self,
+        assets: list[ImageAsset],
+        page: Page | None = None,
+        selector: str = None
+    ) -> Result[dict[str, str]]:
+        """通过页面的文件选择框逐张上传，从上传接口的响应中取素材库地址"""
+        current = page or self.browser.page
+        candidates = list(self.IMAGE_INPUT_SELECTORS)
+        if selector:
+            # 绑定的可能是图片区域的容器，也可能就是文件选择框
+            if selector.startswith("xpath="):
+                nested = f"{selector}//input[@type='file']"
+            else:
+                nested = f"{selector} input[type='file']"
+            candidates = [nested, selector] + candidates
+
+        probe_result = await self.browser.probe(candidates, visible=False, page=page)
+        target = probe_result.data if probe_result.success else None
+        if not target:
+            return Result.fail_with(
+                code="F_UPLOAD_FAILED",
+                message="找不到图片上传控件",
+                recoverable=True,
+                context={"selectors": candidates}
+            )
+
+        uploaded = {}
+        for asset in assets:
+            try:
+                async with current.expect_response(_is_upload_response, timeout=self.UPLOAD_TIMEOUT) as info:
+                    await current.set_input_files(target, asset.path, timeout=self.ACTION_TIMEOUT)
+                response = await info.value
+                remote_url = _find_image_url(await response.json())
+            except Exception as e:
+                log.warning("图片上传失败", file=asset.path, error=str(e))
+                continue
+            if remote_url:
+                uploaded[asset.sha256] = remote_url
+            else:
+                log.warning("上传响应中没有图片地址", file=asset.path, url=response.url)
+
+        if not uploaded:
+            return Result.fail_with(
+                code="F_UPLOAD_FAILED",
+                message="图片上传失败",
+                recoverable=True,
+                context={"count": len(assets)}
+            )
+        return Result.ok(uploaded)
+
+    async def _fill_description(self, description: str, page: Page | None = None) -> Result[bool]:
         """填写描述"""
         selectors = [
             "textarea[name='description']",
@@ -149,35 +546,103 @@ class Filler:
             ".desc-editor textarea",
         ]
 
-        for selector in selectors:
-            result = await self.browser.fill(selector, description)
+        await self._fill_first("description", selectors, description, page)
+        return Result.ok(True)  # 描述可选
+
+    async def _fill_first(
+        self,
+        field_name: str,
+        selectors: list[str],
+        value: str,
+        page: Page | None = None
+    ) -> Result[bool]:
+        """探测候选选择器并填写第一个存在的元素
+
+        候选按历史命中率排序后一次性探测，排在命中项之前的候选记为未命中。
+        探测本身失败时（如页面正在跳转）退回逐个尝试，每次使用短超时。
+        """
+        current = page or self.browser.page
+        url = current.url if current else ""
+        ordered = self.selectors.order(url, field_name, selectors)
+
+        probe_result = await self.browser.probe(ordered, page=page)
+        if probe_result.success:
+            winner = probe_result.data
+            for selector in ordered:
+                if selector == winner:
+                    break
+                self.selectors.record(url, field_name, selector, False)
+            if winner is None:
+                return Result.fail_with(
+                    code="C_ELEMENT_NOT_FOUND",
+                    message=f"候选元素均不存在: {field_name}",
+                    recoverable=True,
+                    context={"selectors": ordered, "selector": ordered[0] if ordered else None}
+                )
+            result = await self.browser.fill(winner, value, page=page, timeout=self.ACTION_TIMEOUT)
+            self.selectors.record(url, field_name, winner, result.success)
+            if not result.success:
+                result.error.context.setdefault("selector", winner)
+            return result
+
+        result = Result.fail_with(code="F_FIELD_MISMATCH", message="没有候选选择器", recoverable=True)
+        for selector in ordered:
+            result = await self.browser.fill(selector, value, page=page, timeout=self.ACTION_TIMEOUT)
+            self.selectors.record(url, field_name, selector, result.success)
             if result.success:
                 return result
+        # 逐个尝试均失败时，以排序最靠前的候选作为失败的选择器
+        result.error.context.setdefault("selector", ordered[0] if ordered else None)
+        return result
 
-        return Result.ok(True)  # 描述可选
+    async def _try_recover(self, problem: Problem, variables: dict, page: Page | None = None) -> bool:
+        """查找并执行匹配的方案，成功时关联到问题"""
+        if not self.executor:
+            return False
+
+        result = self.knowledge_base.find_solution(problem)
+        if not result.success or result.data is None:
+            return False
+
+        solution = result.data
+        if solution.trust_level == TrustLevel.NEW:
+            # 新录制的方案需要人工确认后才能自动执行
+            log.info("找到待确认的方案，跳过自动执行", solution_id=solution.id, problem_id=problem.id)
+            return False
+
+        exec_result = await self.executor.execute(solution, page=page, variables=variables)
+        if not exec_result.success or not exec_result.data.success:
+            return False
+
+        self.knowledge_base.link_solution(problem.id, solution.id)
+        log.info("已通过方案自动恢复", solution_id=solution.id, problem_id=problem.id)
+        return True
 
     async def _report_problem(
         self,
         problem_type: ProblemType,
         message: str,
-        extra_context: dict = None
+        extra_context: dict = None,
+        page: Page | None = None
     ) -> Problem:
-        """上报问题"""
+        """上报问题（extra_context 为 ProblemContext 的字段，如 element_selector / expected_value）"""
+        page = page or self.browser.page
+
         # 截图
         screenshot_path = None
-        if self.browser.page:
+        if page:
             try:
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 screenshot_path = f"data/screenshots/problem_{timestamp}.png"
                 Path(screenshot_path).parent.mkdir(parents=True, exist_ok=True)
-                await self.browser.page.screenshot(path=screenshot_path)
+                await page.screenshot(path=screenshot_path)
             except Exception:
                 pass
 
         # 获取当前页面 URL
         page_url = ""
-        if self.browser.page:
-            page_url = self.browser.page.url
+        if page:
+            page_url = page.url
 
         # 创建问题记录
         problem = Problem(
@@ -0,0 +1,155 @@
+"""
+HTTP 采集器
+
+直接请求商品详情页 HTML，用与浏览器模式相同的提取规则解析，
+不启动标签页、不执行 JS。需要 JS 的页面（登录/验证跳转、无内联数据）
+回退到浏览器采集；站点限流（429/503）时不回退，交给重试和并发控制处理。
+"""
+import re
+from typing import Callable
+
+from src.models import Product, Result
+from src.infra.browser import BrowserManager
+from src.infra.http import THROTTLE_STATUS, HttpClient, HttpConfig, HttpPage
+from src.infra.logger import logger
+from .collector import Collector, BatchItem
+from .events import EventBus
+
+log = logger.get("http_collector")
+
+# 重定向到这些地址说明需要登录或人机验证，只能交给浏览器处理
+_JS_REQUIRED_PATTERNS = [
+    re.compile(r"login\.taobao\.com"),
+    re.compile(r"login\.tmall\.com"),
+    re.compile(r"/punish"),
+    re.compile(r"_____tmd_____"),
+    re.compile(r"sec\.taobao\.com"),
+]
+
+
+class HttpCollector(Collector):
+    """HTTP 采集器：连接池复用，按需回退浏览器"""
+
+    def __init__(
+        self,
+        browser: BrowserManager | None = None,
+        event_bus: EventBus = None,
+        http_config: HttpConfig = None,
+        block_profile: str = "collect-lean"
+    ):
+        super().__init__(browser, event_bus, block_profile)
+        # 与浏览器共用按域名的熔断和限速，回退到浏览器时不会绕过
+        self.http = HttpClient(
+            http_config,
+            breakers=browser.breakers if browser else None,
+            rate_limiter=browser.rate_limiter if browser else None
+        )
+        self.fallbacks = 0  # 回退到浏览器的链接数
+
+    async def collect(self, url: str, page=None) -> Result[Product]:
+        """采集单个商品"""
+        start_result = await self.http.start()
+        if not start_result.success:
+            return start_result
+        try:
+            return await self._collect_item(url)
+        finally:
+            await self.http.close()
+
+    async def collect_batch(
+        self,
+        urls: list[str],
+        concurrency: int = 16,
+        on_item: Callable[[BatchItem], None] = None
+    ) -> Result[list[BatchItem]]:
+        """批量采集（整个批次共用一个连接池）"""
+        self.fallbacks = 0
+        try:
+            return await super().collect_batch(urls, concurrency, on_item)
+        finally:
+            await self.http.close()
+
+    async def close_session(self):
+        """关闭连接池"""
+        await super().close_session()
+        await self.http.close()
+
+    def max_workers(self) -> int:
+        return self.http.config.max_connections
+
+    async def _prepare_batch(self, worker_count: int) -> Result[int]:
+        """启动连接池（浏览器标签页在回退时按需创建）"""
+        result = await self.http.start()
+        if not result.success:
+            return result
+        return Result.ok(worker_count)
+
+    async def _collect_item(self, url: str) -> Result[Product]:
+        """HTTP 采集，页面需要 JS 时回退到浏览器"""
+        if not self._is_valid_url(url):
+            return Result.fail_with(
+                code="C_INVALID_URL",
+                message=f"无效的商品链接: {url}",
+                recoverable=False
+            )
+
+        fetch_result = await self.http.get(url)
+        if not fetch_result.success:
+            return fetch_result
+
+        result = self._parse_page(url, fetch_result.data)
+        if result.success or result.error.code != "C_NEEDS_BROWSER":
+            return result
+
+        if self.browser is None:
+            return result
+
+        log.info("回退到浏览器采集", url=url, reason=result.error.message)
+        self.fallbacks += 1
+        return await super()._collect_item(url)
+
+    def _parse_page(self, url: str, page: HttpPage) -> Result[Product]:
+        """解析 HTML；站点限流时返回 B_NETWORK_ERROR，页面需要 JS 时返回 C_NEEDS_BROWSER"""
+        if page.status in THROTTLE_STATUS:
+            # 换成浏览器请求同一域名只会加重限流，交给重试退避和 AIMD 降并发
+            return Result.fail_with(
+                code="B_NETWORK_ERROR",
+                message=f"站点限流: HTTP {page.status}",
+                recoverable=True,
+                context={"url": url, "status": page.status}
+            )
+        if page.status != 200:
+            return self._needs_browser(url, f"HTTP {page.status}")
+        if any(p.search(page.url) for p in _JS_REQUIRED_PATTERNS):
+            return self._needs_browser(url, "跳转到登录或验证页面")
+
+        extracted = self.ITEM_PLAN.run_html(page.text)
+        model = self._parse_inline_model(extracted)
+
+        # 没有内联数据时，DOM 字段必须至少包含标题和价格
+        if model is None or not model.is_complete:
+            if not (model and model.title) and not extracted.candidates("title"):
+                return self._needs_browser(url, "页面缺少商品数据")
+            if self._parse_price(extracted) is None and not (model and model.price is not None):
+                return self._needs_browser(url, "页面缺少价格")
+
+        product = self._build_product(url, extracted, model, [])
+        return Result.ok(product)
+
+    def _needs_browser(self, url: str, reason: str) -> Result:
+        return Result.fail_with(
+            code="C_NEEDS_BROWSER",
+            message=f"页面需要浏览器渲染: {reason}",
+            recoverable=True,
+            context={"url": url}
+        )
+
+    def _batch_stats(self) -> dict:
+        stats = {
+            "fallbacks": self.fallbacks,
+            "breakers": self.http.breakers.stats(),
+            "rate_limits": self.http.rate_limiter.stats()
+        }
+        if self.browser is not None and self.fallbacks:
+            stats.update(super()._batch_stats())
+        return stats
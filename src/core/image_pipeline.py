@@ -0,0 +1,160 @@
+"""
+图片下载/上传管道
+
+商品图片用连接池并发下载到本地内容缓存（按 SHA-256 去重），同一地址、
+内容相同的图片只下载和保存一次。采集完成后即可预先下载，上架时只剩上传；
+发布表单只能通过文件选择框添加图片，每次填写都要把文件上传到表单，
+同一商品中内容相同的图片只上传一次。
+"""
+import asyncio
+from typing import Awaitable, Callable
+
+from src.models import ImageAsset, Product, Result
+from src.infra.http import HttpClient, HttpConfig
+from src.infra.storage import ImageCache
+from src.infra.logger import logger
+from .item_model import normalize_image_url
+
+log = logger.get("image_pipeline")
+
+# 图片请求头（其余沿用 HttpClient 的浏览器请求头）
+_IMAGE_HEADERS = {"Accept": "image/avif,image/webp,image/apng,image/*,*/*;q=0.8"}
+
+# 上传函数：上传给定图片，返回 内容哈希 -> 上传后的地址（未返回的视为上传失败）
+Uploader = Callable[[list[ImageAsset]], Awaitable[Result[dict[str, str]]]]
+
+
+class ImagePipeline:
+    """图片管道：并发下载 + 内容缓存 + 按内容去重上传"""
+
+    CONCURRENCY = 8                      # 同时下载的图片数
+    MAX_BYTES = 20 * 1024 * 1024         # 单张图片上限
+
+    def __init__(
+        self,
+        cache: ImageCache,
+        http_config: HttpConfig = None,
+        concurrency: int = None,
+        rate_limits: dict[str, dict] = None
+    ):
+        self.cache = cache
+        self.concurrency = concurrency or self.CONCURRENCY
+        self.http = HttpClient(http_config or HttpConfig(
+            max_connections=self.concurrency,
+            max_keepalive=self.concurrency,
+            rate_limits=rate_limits or {}
+        ))
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        # 正在下载的地址：并发请求同一地址时共用一次下载
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    async def close(self):
+        """关闭连接池和缓存索引"""
+        await self.http.close()
+        self.cache.close()
+
+    @staticmethod
+    def product_images(product: Product) -> list[str]:
+        """商品的全部图片地址（主图、详情图、SKU 图，已去重）"""
+        urls = [*product.images, *product.detail_images, *(sku.image for sku in product.skus if sku.image)]
+        return list(dict.fromkeys(normalize_image_url(url) for url in urls if url))
+
+    async def fetch(self, urls: list[str]) -> Result[list[ImageAsset]]:
+        """下载图片（已缓存的直接返回），结果与去重后的地址顺序一致
+
+        部分图片失败时返回成功的部分；全部失败时返回第一个错误。
+        """
+        urls = list(dict.fromkeys(normalize_image_url(url) for url in urls if url))
+        if not urls:
+            return Result.ok([])
+
+        results = await asyncio.gather(*(self._fetch_one(url) for url in urls))
+        assets = [r.data for r in results if r.success]
+        failed = [(url, r.error) for url, r in zip(urls, results) if not r.success]
+        if failed:
+            log.warning(
+                "部分图片下载失败",
+                failed=len(failed),
+                total=len(urls),
+                first_error=failed[0][1].message
+            )
+        if not assets and failed:
+            return Result.fail(failed[0][1])
+        return Result.ok(assets)
+
+    async def prefetch(self, product: Product) -> Result[int]:
+        """预先下载商品的全部图片，返回已缓存的数量"""
+        result = await self.fetch(self.product_images(product))
+        if not result.success:
+            return result
+        return Result.ok(len(result.data))
+
+    async def publish(self, urls: list[str], uploader: Uploader) -> Result[list[ImageAsset]]:
+        """下载（或取缓存）图片并交给 uploader 上传，返回带上传地址的图片（保持顺序）
+
+        内容相同的图片只上传一次，共用同一个上传地址；上传失败的图片 remote_url 为空。
+        """
+        fetch_result = await self.fetch(urls)
+        if not fetch_result.success:
+            return fetch_result
+        assets = fetch_result.data
+
+        unique: dict[str, ImageAsset] = {}
+        for asset in assets:
+            unique.setdefault(asset.sha256, asset)
+
+        uploaded = {}
+        if unique:
+            upload_result = await uploader(list(unique.values()))
+            if not upload_result.success:
+                return upload_result
+            uploaded = {h: url for h, url in upload_result.data.items() if h in unique and url}
+
+        for asset in assets:
+            asset.remote_url = uploaded.get(asset.sha256)
+
+        log.info("图片已上传", images=len(assets), unique=len(unique), uploaded=len(uploaded))
+        return Result.ok(assets)
+
+    async def _fetch_one(self, url: str) -> Result[ImageAsset]:
+        """下载单张图片（命中缓存时不发请求）"""
+        cached = self.cache.lookup(url)
+        if cached.success and cached.data:
+            return cached
+
+        inflight = self._inflight.get(url)
+        if inflight:
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[url] = future
+        try:
+            async with self._semaphore:
+                result = await self._download(url)
+            future.set_result(result)
+            return result
+        except BaseException:
+            future.cancel()
+            raise
+        finally:
+            self._inflight.pop(url, None)
+
+    async def _download(self, url: str) -> Result[ImageAsset]:
+        start_result = await self.http.start()
+        if not start_result.success:
+            return start_result
+
+        result = await self.http.download(url, self.cache.tmp_dir, headers=_IMAGE_HEADERS, max_bytes=self.MAX_BYTES)
+        if not result.success:
+            return result
+
+        download = result.data
+        if download.content_type and not download.content_type.startswith("image/"):
+            download.path.unlink(missing_ok=True)
+            return Result.fail_with(
+                code="I_NOT_IMAGE",
+                message=f"不是图片: {download.content_type}",
+                recoverable=False,
+                context={"url": url}
+            )
+        return self.cache.put(url, download.path, download.sha256, download.size, download.content_type)
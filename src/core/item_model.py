@@ -0,0 +1,292 @@
+"""
+淘宝/天猫商品数据模型解析
+
+详情页把完整商品数据（SKU 矩阵、价格、图片、属性）放在接口响应
+（mtop.taobao.pcdetail.data.get 等）或内联脚本 JSON 中，
+这里把这些结构直接映射为 Product/SKU 字段，无需解析渲染后的 DOM。
+"""
+import json
+import re
+from dataclasses import dataclass, field
+
+from src.models import SKU
+
+# 商品详情接口（响应包含完整商品模型）
+ITEM_API_PATTERNS = [
+    re.compile(r"mtop\.taobao\.pcdetail\.data\.get"),
+    re.compile(r"mtop\.taobao\.detail\.getdetail"),
+    re.compile(r"mtop\.tmall\.detail\."),
+]
+
+# 商品描述接口（详情图）
+DESC_API_PATTERNS = [
+    re.compile(r"mtop\.taobao\.detail\.getdesc"),
+    re.compile(r"mtop\.taobao\.pcdetail\.desc"),
+]
+
+# 内联脚本中包含商品模型的标记
+INLINE_MARKERS = ("__ICE_APP_CONTEXT__", "__INIT_DATA__", "TShop.Setup")
+
+_JSONP_RE = re.compile(r"^\s*[\w$.]+\((.*)\)\s*;?\s*$", re.S)
+_IMG_SRC_RE = re.compile(r"<img[^>]+src=[\"']([^\"']+)[\"']", re.I)
+_NUMBER_RE = re.compile(r"\d+(?:\.\d+)?")
+
+
+def normalize_image_url(url: str) -> str:
+    """转换为大图 URL（移除尺寸后缀，补全协议）"""
+    url = re.sub(r"_\d+x\d+\.[a-z]+$", "", url)
+    if url.startswith("//"):
+        url = "https:" + url
+    return url
+
+
+def parse_json_text(text: str) -> dict | list | None:
+    """解析 JSON 或 JSONP 文本"""
+    if not text:
+        return None
+    match = _JSONP_RE.match(text)
+    if match and not text.lstrip().startswith(("{", "[")):
+        text = match.group(1)
+    try:
+        return json.loads(text)
+    except (json.JSONDecodeError, ValueError):
+        return None
+
+
+def extract_inline_json(script: str) -> list[dict]:
+    """从内联脚本中提取标记后面的 JSON 对象"""
+    decoder = json.JSONDecoder()
+    objects = []
+    for marker in INLINE_MARKERS:
+        start = script.find(marker)
+        while start != -1:
+            brace = script.find("{", start)
+            if brace == -1:
+                break
+            try:
+                obj, end = decoder.raw_decode(script, brace)
+                if isinstance(obj, dict):
+                    objects.append(obj)
+                start = script.find(marker, end)
+            except json.JSONDecodeError:
+                start = script.find(marker, brace + 1)
+    return objects
+
+
+def _to_float(value) -> float | None:
+    """解析价格（区间价取最低值）"""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = _NUMBER_RE.search(str(value))
+    return float(match.group()) if match else None
+
+
+def _to_int(value) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _find_dict(obj, predicate, depth: int = 0) -> dict | None:
+    """限制深度的递归查找：返回第一个满足条件的字典"""
+    if depth > 8:
+        return None
+    if isinstance(obj, dict):
+        if predicate(obj):
+            return obj
+        children = obj.values()
+    elif isinstance(obj, list):
+        children = obj
+    else:
+        return None
+    for child in children:
+        if isinstance(child, (dict, list)):
+            found = _find_dict(child, predicate, depth + 1)
+            if found is not None:
+                return found
+    return None
+
+
+def _price_text(node: dict | None) -> float | None:
+    if not isinstance(node, dict):
+        return None
+    price = node.get("price")
+    if isinstance(price, dict):
+        return _to_float(price.get("priceText") or price.get("priceMoney"))
+    return _to_float(price if price is not None else node.get("priceText"))
+
+
+@dataclass
+class ItemModel:
+    """从结构化数据中解析出的商品字段"""
+    title: str = ""
+    price: float | None = None
+    original_price: float | None = None
+    category: str | None = None
+    images: list[str] = field(default_factory=list)
+    detail_images: list[str] = field(default_factory=list)
+    skus: list[SKU] = field(default_factory=list)
+    extra: dict = field(default_factory=dict)
+
+    @property
+    def is_complete(self) -> bool:
+        """是否包含核心字段（标题、价格、主图）"""
+        return bool(self.title and self.price is not None and self.images)
+
+
+def parse_item_model(obj: dict | list) -> ItemModel | None:
+    """从接口响应或内联 JSON 中解析商品模型"""
+    root = _find_dict(obj, lambda d: "skuBase" in d or "skuCore" in d)
+    if root is not None:
+        return _parse_pcdetail(root)
+
+    legacy = _find_dict(obj, lambda d: "itemDO" in d or "valItemInfo" in d)
+    if legacy is not None:
+        return _parse_legacy(legacy)
+
+    return None
+
+
+def parse_desc_images(obj: dict | list) -> list[str]:
+    """从描述接口响应中提取详情图"""
+    images: list[str] = []
+
+    def walk(node, depth=0):
+        if depth > 10:
+            return
+        if isinstance(node, str):
+            if "<img" in node:
+                for src in _IMG_SRC_RE.findall(node):
+                    src = normalize_image_url(src)
+                    if src not in images:
+                        images.append(src)
+        elif isinstance(node, dict):
+            for value in node.values():
+                walk(value, depth + 1)
+        elif isinstance(node, list):
+            for value in node:
+                walk(value, depth + 1)
+
+    walk(obj)
+    return images
+
+
+def _parse_pcdetail(root: dict) -> ItemModel:
+    """新版详情接口（item / skuBase / skuCore / componentsVO）"""
+    item = root.get("item") or {}
+    components = root.get("componentsVO") or {}
+    model = ItemModel()
+
+    model.title = (item.get("title") or (components.get("titleVO") or {}).get("title") or "").strip()
+
+    images = item.get("images") or (components.get("headImageVO") or {}).get("images") or []
+    for src in images:
+        src = normalize_image_url(src)
+        if src not in model.images:
+            model.images.append(src)
+
+    category = item.get("categoryId") or item.get("cid") or item.get("rootCategoryId")
+    model.category = str(category) if category else None
+
+    sku2info = (root.get("skuCore") or {}).get("sku2info") or {}
+    price_vo = components.get("priceVO") or {}
+    model.price = _price_text(sku2info.get("0")) or _price_text(price_vo)
+    model.original_price = _price_text(price_vo.get("extraPrice"))
+
+    # 属性值映射 pid:vid -> (属性名, 值名, 图片)
+    props = (root.get("skuBase") or {}).get("props") or []
+    prop_values: dict[str, tuple[str, str, str | None]] = {}
+    for prop in props:
+        for value in prop.get("values") or []:
+            key = f"{prop.get('pid')}:{value.get('vid')}"
+            image = value.get("image")
+            prop_values[key] = (
+                prop.get("name", ""),
+                value.get("name", ""),
+                normalize_image_url(image) if image else None
+            )
+
+    for sku in (root.get("skuBase") or {}).get("skus") or []:
+        sku_id = str(sku.get("skuId", ""))
+        names, image = [], None
+        for pv in (sku.get("propPath") or "").split(";"):
+            if pv in prop_values:
+                prop_name, value_name, value_image = prop_values[pv]
+                names.append(f"{prop_name}: {value_name}")
+                image = image or value_image
+        info = sku2info.get(sku_id) or {}
+        model.skus.append(SKU(
+            id=sku_id,
+            name="; ".join(names),
+            price=_price_text(info) or model.price or 0.0,
+            stock=_to_int(info.get("quantity")),
+            image=image
+        ))
+
+    if model.price is None and model.skus:
+        model.price = min(sku.price for sku in model.skus)
+
+    if item.get("itemId"):
+        model.extra["item_id"] = str(item["itemId"])
+    if props:
+        model.extra["sku_props"] = [
+            {"name": p.get("name"), "values": [v.get("name") for v in p.get("values") or []]}
+            for p in props
+        ]
+    return model
+
+
+def _parse_legacy(root: dict) -> ItemModel:
+    """旧版详情页内联数据（TShop.Setup: itemDO / valItemInfo）"""
+    item = root.get("itemDO") or {}
+    info = root.get("valItemInfo") or {}
+    model = ItemModel()
+
+    model.title = (item.get("title") or "").strip()
+    category = item.get("categoryId") or root.get("categoryId")
+    model.category = str(category) if category else None
+    model.original_price = _to_float(item.get("reservePrice"))
+
+    # 主图：propertyPics.default（部分页面为 auctionImages 或 itemDO 内的同名字段）
+    pics = root.get("propertyPics") or item.get("propertyPics")
+    pics = pics if isinstance(pics, dict) else {}
+    images = pics.get("default") or root.get("auctionImages") or item.get("auctionImages") or []
+    for src in images:
+        src = normalize_image_url(src)
+        if src not in model.images:
+            model.images.append(src)
+
+    # 其余 propertyPics 键为 ";pid:vid;"，对应销售属性值的图片
+    prop_images = {
+        key.strip(";"): normalize_image_url(srcs[0])
+        for key, srcs in pics.items()
+        if key != "default" and isinstance(srcs, list) and srcs
+    }
+
+    names = {
+        s.get("pvs"): (s.get("names") or "").strip()
+        for s in info.get("skuList") or []
+    }
+    for path, sku in (info.get("skuMap") or {}).items():
+        pvs = path.strip(";")
+        image = next((prop_images[pv] for pv in pvs.split(";") if pv in prop_images), None)
+        model.skus.append(SKU(
+            id=str(sku.get("skuId", "")),
+            name=names.get(pvs, pvs),
+            price=_to_float(sku.get("price")) or model.original_price or 0.0,
+            stock=_to_int(sku.get("stock")),
+            image=image
+        ))
+
+    # 售价取 SKU 最低价，无 SKU 时使用一口价
+    if model.skus:
+        model.price = min(sku.price for sku in model.skus)
+    else:
+        model.price = model.original_price
+
+    if item.get("itemId"):
+        model.extra["item_id"] = str(item["itemId"])
+    return model
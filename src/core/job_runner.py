@@ -0,0 +1,330 @@
+"""
+任务队列执行器
+
+从 JobQueue 领取采集/上架任务，用 Collector / Filler 执行并写回结果。
+租约在执行期间定期续期；进程崩溃后重新运行即可从中断处继续。
+"""
+import asyncio
+import os
+import socket
+from dataclasses import dataclass
+from datetime import datetime
+
+from src.models import Job, JobKind, ProductStatus, Result
+from src.infra.browser import BrowserManager
+from src.infra.storage import BindingStorage, JobQueue, ProductStorage
+from src.infra.logger import logger
+from .collector import Collector
+from .events import EventBus, EventTypes
+from .filler import Filler
+from .image_pipeline import ImagePipeline
+from .pipeline import Reviewer
+
+log = logger.get("job_runner")
+
+
+@dataclass
+class RunStats:
+    """一次运行的统计"""
+    recovered: int = 0      # 启动时恢复的中断任务
+    done: int = 0
+    failed: int = 0         # 不再重试的失败
+    retried: int = 0        # 失败后重新排队
+    released: int = 0       # 因登录过期等原因归还的任务
+
+    def to_dict(self) -> dict:
+        return {
+            "recovered": self.recovered,
+            "done": self.done,
+            "failed": self.failed,
+            "retried": self.retried,
+            "released": self.released
+        }
+
+
+class JobRunner:
+    """任务队列执行器：固定数量的 worker 并发领取任务"""
+
+    LEASE_SECONDS = 300     # 租约时长，执行期间每 1/3 时长续期一次
+    RETRY_BACKOFF = 30.0    # 首次重试的等待时间（秒），之后按尝试次数翻倍
+    IDLE_POLL = 5.0         # 只有退避中的任务时，最长等待多久再检查一次
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        storage: ProductStorage,
+        event_bus: EventBus = None,
+        collector: Collector = None,
+        filler: Filler = None,
+        bindings: BindingStorage = None,
+        images: ImagePipeline = None,
+        review: Reviewer = None
+    ):
+        self.queue = queue
+        self.storage = storage
+        self.event_bus = event_bus or EventBus()
+        self.collector = collector
+        self.filler = filler
+        self.bindings = bindings
+        # 采集后预先下载图片，上架时只需上传
+        self.images = images
+        # 填写完成后的确认回调（返回 True 表示已提交）；为空时等待页面跳转到发布成功页
+        self.review = review
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self._paused: set[JobKind] = set()
+        self._wakeup = asyncio.Event()
+
+    def notify(self):
+        """有新任务入队时唤醒空闲的 worker（否则最多等待 IDLE_POLL 秒）"""
+        self._wakeup.set()
+
+    def resume(self, kind: JobKind = JobKind.UPLOAD):
+        """用户重新登录后恢复被暂停的任务类型"""
+        self._paused.discard(kind)
+        self.notify()
+
+    @property
+    def browser(self) -> BrowserManager | None:
+        return self.filler.browser if self.filler else None
+
+    def _handled_kinds(self, kinds: list[JobKind] | None) -> list[JobKind]:
+        """有对应执行组件的任务类型"""
+        available = []
+        if self.collector:
+            available.append(JobKind.COLLECT)
+        if self.filler:
+            available.append(JobKind.UPLOAD)
+        return [k for k in (kinds or available) if k in available]
+
+    async def run(
+        self,
+        kinds: list[JobKind] = None,
+        concurrency: int = 3,
+        until_empty: bool = True,
+        stop: asyncio.Event = None
+    ) -> Result[RunStats]:
+        """运行 worker 直到队列清空（或 stop 被设置）
+
+        Args:
+            kinds: 要处理的任务类型（为空时处理所有有执行组件的类型）
+            concurrency: worker 数量
+            until_empty: 没有等待中的任务时退出；False 时持续等待新任务
+            stop: 外部停止信号，worker 完成当前任务后退出
+        """
+        kinds = self._handled_kinds(kinds)
+        if not kinds:
+            return Result.fail_with(
+                code="J_NO_HANDLER",
+                message="没有可执行任务的组件（需要采集器或填充器）",
+                recoverable=False
+            )
+
+        stats = RunStats()
+        self._paused.clear()
+        stop = stop or asyncio.Event()
+
+        # 上次运行中断的任务立即重新排队（单进程运行，不会误收其他 worker 的任务）
+        recover_result = self.queue.recover()
+        if recover_result.success:
+            stats.recovered = recover_result.data
+
+        if JobKind.COLLECT in kinds:
+            session_result = await self.collector.open_session(concurrency)
+            if not session_result.success:
+                return session_result
+
+        log.info("任务队列开始运行", kinds=[k.value for k in kinds], workers=concurrency, owner=self.owner)
+        self._emit_event(EventTypes.BATCH_START, workers=concurrency, recovered=stats.recovered)
+
+        async def worker():
+            while not stop.is_set():
+                active = [k for k in kinds if k not in self._paused]
+                if not active:
+                    if until_empty:
+                        return
+                    # 常驻模式：等待 resume()
+                    await self._wait(stop, self.IDLE_POLL)
+                    continue
+
+                lease_result = self.queue.lease(self.owner, active, self.LEASE_SECONDS)
+                if not lease_result.success:
+                    log.warning("领取任务失败", error=lease_result.error.message)
+                    await asyncio.sleep(self.IDLE_POLL)
+                    continue
+
+                job = lease_result.data
+                if job is None:
+                    wait_result = self.queue.next_available_in(active)
+                    delay = wait_result.data if wait_result.success else self.IDLE_POLL
+                    if delay is None:
+                        if until_empty:
+                            return
+                        delay = self.IDLE_POLL
+                    await self._wait(stop, min(delay, self.IDLE_POLL))
+                    continue
+
+                await self._process(job, stats)
+
+        try:
+            await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+        finally:
+            if JobKind.COLLECT in kinds:
+                await self.collector.close_session()
+
+        log.info("任务队列运行结束", **stats.to_dict())
+        self._emit_event(EventTypes.BATCH_DONE, **stats.to_dict())
+        return Result.ok(stats)
+
+    async def _wait(self, stop: asyncio.Event, seconds: float):
+        """等待指定时间，stop 被设置或有新任务时提前返回"""
+        waiters = [asyncio.ensure_future(stop.wait()), asyncio.ensure_future(self._wakeup.wait())]
+        try:
+            await asyncio.wait(waiters, timeout=max(seconds, 0.05), return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+        self._wakeup.clear()
+
+    async def _process(self, job: Job, stats: RunStats):
+        """执行单个任务并写回结果"""
+        heartbeat = asyncio.ensure_future(self._heartbeat(job))
+        try:
+            if job.kind == JobKind.COLLECT:
+                result = await self._run_collect(job)
+            else:
+                result = await self._run_upload(job)
+        except Exception as e:
+            log.error("任务执行异常", job_id=job.id, kind=job.kind.value, error=str(e))
+            result = Result.fail_with(
+                code="J_JOB_CRASHED",
+                message=f"任务执行异常: {e}",
+                recoverable=True
+            )
+        finally:
+            heartbeat.cancel()
+
+        if result.success:
+            self.queue.complete(job.id, self.owner, result.data)
+            stats.done += 1
+        elif result.error.code == "B_LOGIN_EXPIRED":
+            # 与任务本身无关：归还任务并暂停该类型，等待用户重新登录后再运行
+            self.queue.release(job.id, self.owner)
+            self._paused.add(job.kind)
+            stats.released += 1
+            self._emit_event(EventTypes.LOGIN_EXPIRED, session_id=self.owner, job_id=job.id)
+        else:
+            retry = result.error.recoverable and job.attempts < job.max_attempts
+            self.queue.fail(job.id, self.owner, result.error.message, retry=retry, backoff=self.RETRY_BACKOFF)
+            if retry:
+                stats.retried += 1
+            else:
+                stats.failed += 1
+
+        log.info(
+            "任务完成" if result.success else "任务失败",
+            job_id=job.id,
+            kind=job.kind.value,
+            attempt=job.attempts,
+            error=result.error.message if result.error else None
+        )
+        self._emit_event(
+            EventTypes.BATCH_ITEM,
+            job_id=job.id,
+            kind=job.kind.value,
+            success=result.success,
+            error=result.error.message if result.error else None
+        )
+
+    async def _heartbeat(self, job: Job):
+        """执行期间定期续期租约"""
+        interval = self.LEASE_SECONDS / 3
+        while True:
+            await asyncio.sleep(interval)
+            self.queue.heartbeat(job.id, self.owner, self.LEASE_SECONDS)
+
+    async def _run_collect(self, job: Job) -> Result[dict]:
+        """采集任务：采集链接并保存商品"""
+        url = job.payload.get("url", "")
+        result = await self.collector.collect_pooled(url)
+        if not result.success:
+            return result
+
+        product = result.data
+        save_result = self.storage.save(product)
+        if not save_result.success:
+            return save_result
+
+        output = {"product_id": product.id}
+        if self.images:
+            # 图片下载失败不影响采集结果，上架时会再次尝试
+            images_result = await self.images.prefetch(product)
+            if images_result.success:
+                output["images"] = images_result.data
+            else:
+                log.warning("预下载图片失败", product_id=product.id, error=images_result.error.message)
+        return Result.ok(output)
+
+    async def _run_upload(self, job: Job) -> Result[dict]:
+        """上架任务：填写表单，确认提交后把商品标记为已上架（已上架的商品直接跳过）
+
+        表单只由用户提交：标签页在提交前一直保持租用，不会被下一个任务覆盖；
+        未提交（跳过、超时）时任务失败，商品保持待上架，可重试任务再次填写。
+        """
+        product_id = job.payload.get("product_id", "")
+        get_result = self.storage.get(product_id)
+        if not get_result.success:
+            return get_result
+
+        product = get_result.data
+        if product.status == ProductStatus.UPLOADED:
+            return Result.ok({"product_id": product.id, "skipped": True})
+
+        binding = None
+        binding_id = job.payload.get("binding_id")
+        if binding_id and self.bindings:
+            binding_result = self.bindings.get(binding_id)
+            if not binding_result.success:
+                return binding_result
+            binding = binding_result.data
+
+        async with self.browser.lease_page() as page:
+            # 池中的标签页可能启用了采集用的资源拦截，发布页需要完整加载
+            await self.browser.clear_block_profile(page)
+            if binding is None:
+                fill_result = await self.filler.fill(product, page)
+            else:
+                fill_result = await self.filler.fill_with_binding(product, binding, page)
+            if not fill_result.success:
+                return fill_result
+            submitted = await self._await_submit(product, page)
+
+        if not submitted:
+            return Result.fail_with(
+                code="F_NOT_SUBMITTED",
+                message="表单已填写但未提交，商品保持待上架",
+                recoverable=False,
+                context={"product_id": product.id}
+            )
+
+        product.status = ProductStatus.UPLOADED
+        product.uploaded_at = datetime.now()
+        save_result = self.storage.save(product)
+        if not save_result.success:
+            return save_result
+        return Result.ok({"product_id": product.id})
+
+    async def _await_submit(self, product, page) -> bool:
+        """等待表单提交：有确认回调时询问用户，否则等待页面跳转到发布成功页"""
+        if self.review:
+            try:
+                await page.bring_to_front()
+            except Exception:
+                pass
+            return await self.review(product)
+        result = await self.filler.wait_for_submit(page)
+        return result.success and result.data
+
+    def _emit_event(self, event_type: str, **payload):
+        """发送事件"""
+        if self.event_bus:
+            self.event_bus.emit(event_type, **payload)
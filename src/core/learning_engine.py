@@ -141,6 +141,13 @@ class LearningEngine:
                 self._current_session = None
                 return Result.ok(None)
 
+            # 录制时填入的期望值替换为占位符，执行时使用当前商品的值
+            expected = session.problem.context.expected_value if session.problem else None
+            if expected:
+                for step in steps:
+                    if step.action == StepAction.FILL and step.value == expected:
+                        step.value = "${value}"
+
             # 创建方案
             problem_type = session.problem.type if session.problem else ProblemType.UNKNOWN
             solution = Solution(
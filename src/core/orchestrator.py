@@ -0,0 +1,414 @@
+"""
+多店铺上架编排
+
+每个店铺使用独立的持久化浏览器上下文（各自的 user_data 目录和登录态），
+所有店铺共用一个 Playwright 驱动进程。任务按 (店铺, 商品) 展开，
+每个店铺有自己的并发数和最小发布间隔，店铺之间并行执行。
+表单由用户提交：标签页在提交前一直保持租用，同一店铺的下一个商品不会覆盖它。
+"""
+import asyncio
+import time
+from dataclasses import dataclass, field, replace
+from typing import Awaitable, Callable
+
+from playwright.async_api import async_playwright, Playwright
+
+from src.models import Product, BindingConfig, Result
+from src.infra.browser import BrowserManager, BrowserConfig
+from src.infra.knowledge import KnowledgeBase
+from src.infra.selector_cache import SelectorCache
+from src.infra.storage import BindingStorage
+from src.infra.logger import logger
+from .events import Event, EventBus, EventTypes
+from .filler import Filler
+from .image_pipeline import ImagePipeline
+
+log = logger.get("orchestrator")
+
+# 店铺填写完成后的确认回调（店铺名, 商品）：返回 True 表示已提交
+ShopReviewer = Callable[[str, Product], Awaitable[bool]]
+
+
+@dataclass
+class ShopProfile:
+    """店铺配置"""
+    name: str
+    user_data_dir: str                 # 店铺专用的浏览器用户目录（不能与主浏览器相同）
+    concurrency: int = 1               # 同时填写的标签页数
+    min_interval: float = 5.0          # 两次发布开始之间的最小间隔（秒）
+    binding_id: str | None = None      # 使用的字段绑定配置（为空时使用内置规则）
+    enabled: bool = True
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "user_data_dir": self.user_data_dir,
+            "concurrency": self.concurrency,
+            "min_interval": self.min_interval,
+            "binding_id": self.binding_id,
+            "enabled": self.enabled
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'ShopProfile':
+        return cls(
+            name=data["name"],
+            user_data_dir=data["user_data_dir"],
+            concurrency=data.get("concurrency", 1),
+            min_interval=data.get("min_interval", 5.0),
+            binding_id=data.get("binding_id"),
+            enabled=data.get("enabled", True)
+        )
+
+
+@dataclass
+class ShopUploadResult:
+    """单个店铺上架单个商品的结果"""
+    shop: str
+    product_id: str
+    result: Result        # Result[bool]（内置规则）或 Result[FillReport]（绑定配置）
+    elapsed: float = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "shop": self.shop,
+            "product_id": self.product_id,
+            "success": self.result.success,
+            "error_code": self.result.error.code if self.result.error else None,
+            "error": self.result.error.message if self.result.error else None,
+            "elapsed": round(self.elapsed, 3)
+        }
+
+
+class _IntervalLimiter:
+    """保证相邻两次放行之间至少间隔 interval 秒"""
+
+    def __init__(self, interval: float):
+        self.interval = max(0.0, interval)
+        self._lock = asyncio.Lock()
+        self._last: float | None = None
+
+    async def wait(self):
+        async with self._lock:
+            if self._last is not None:
+                delay = self._last + self.interval - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            self._last = time.monotonic()
+
+
+class _ShopEventForwarder:
+    """把店铺内部事件转发到主事件总线（附带店铺名，丢弃单次填写的进度事件）"""
+
+    def __init__(self, shop: str, target: EventBus):
+        self.shop = shop
+        self.target = target
+
+    def on_event(self, event: Event) -> None:
+        if event.type == EventTypes.PROGRESS:
+            return
+        self.target.publish(Event(
+            type=event.type,
+            timestamp=event.timestamp,
+            payload={**event.payload, "shop": self.shop}
+        ))
+
+
+@dataclass
+class _ShopRuntime:
+    """店铺运行时状态"""
+    profile: ShopProfile
+    browser: BrowserManager
+    filler: Filler
+    limiter: _IntervalLimiter
+    login_expired: bool = False
+    binding: BindingConfig | None = field(default=None, repr=False)
+
+
+class ShopOrchestrator:
+    """多店铺上架编排器"""
+
+    def __init__(
+        self,
+        knowledge_base: KnowledgeBase,
+        event_bus: EventBus = None,
+        browser_config: BrowserConfig = None,
+        bindings: BindingStorage = None,
+        selector_cache: SelectorCache = None,
+        max_shops: int = 10,
+        images: ImagePipeline = None,
+        review: ShopReviewer = None
+    ):
+        self.knowledge_base = knowledge_base
+        self.event_bus = event_bus or EventBus()
+        # 各店铺浏览器配置的模板（user_data_dir 和 pool_size 按店铺覆盖）
+        self.browser_config = browser_config or BrowserConfig()
+        self.bindings = bindings
+        # 所有店铺共享选择器命中统计（页面结构相同）
+        self.selector_cache = selector_cache or SelectorCache()
+        self.max_shops = max_shops
+        # 图片缓存各店铺共享
+        self.images = images
+        # 填写完成后的确认回调；为空时等待页面跳转到发布成功页
+        self.review = review
+        self._playwright: Playwright | None = None
+        self._shops: dict[str, _ShopRuntime] = {}
+
+    @property
+    def shops(self) -> list[str]:
+        """已启动的店铺"""
+        return list(self._shops)
+
+    async def start(self, profiles: list[ShopProfile]) -> Result[list[str]]:
+        """并行启动各店铺的浏览器，返回启动成功的店铺名
+
+        部分店铺启动失败不影响其他店铺，全部失败时返回错误。
+        """
+        profiles = [p for p in profiles if p.enabled and p.name not in self._shops]
+        if len(self._shops) + len(profiles) > self.max_shops:
+            return Result.fail_with(
+                code="B_TOO_MANY_SHOPS",
+                message=f"店铺数量超过上限: {self.max_shops}",
+                recoverable=False,
+                context={"requested": len(self._shops) + len(profiles)}
+            )
+
+        dirs = [p.user_data_dir for p in profiles] + [
+            rt.profile.user_data_dir for rt in self._shops.values()
+        ]
+        if len(set(dirs)) != len(dirs):
+            return Result.fail_with(
+                code="B_PROFILE_CONFLICT",
+                message="多个店铺使用了同一个 user_data 目录",
+                recoverable=False
+            )
+
+        if self._playwright is None:
+            try:
+                self._playwright = await async_playwright().start()
+            except Exception as e:
+                return Result.fail_with(
+                    code="B_LAUNCH_FAILED",
+                    message=f"启动 Playwright 失败: {e}",
+                    recoverable=False
+                )
+
+        results = await asyncio.gather(*(self._start_shop(p) for p in profiles))
+        started = [p.name for p, ok in zip(profiles, results) if ok]
+        if profiles and not started:
+            return Result.fail_with(
+                code="B_LAUNCH_FAILED",
+                message="所有店铺浏览器启动失败",
+                recoverable=False,
+                context={"shops": [p.name for p in profiles]}
+            )
+        return Result.ok(started)
+
+    async def _start_shop(self, profile: ShopProfile) -> bool:
+        """启动单个店铺的浏览器"""
+        # 店铺浏览器总是由本进程启动（不连接主浏览器的常驻实例）
+        config = replace(
+            self.browser_config,
+            mode="launch",
+            user_data_dir=profile.user_data_dir,
+            pool_size=max(1, profile.concurrency)
+        )
+        browser = BrowserManager(config)
+        result = await browser.start(self._playwright)
+        if not result.success:
+            log.error("店铺浏览器启动失败", shop=profile.name, error=result.error.message)
+            return False
+
+        shop_bus = EventBus()
+        shop_bus.subscribe(_ShopEventForwarder(profile.name, self.event_bus))
+        runtime = _ShopRuntime(
+            profile=profile,
+            browser=browser,
+            filler=Filler(
+                browser, self.knowledge_base, shop_bus,
+                selector_cache=self.selector_cache,
+                images=self.images
+            ),
+            limiter=_IntervalLimiter(profile.min_interval),
+            binding=self._load_binding(profile)
+        )
+        self._shops[profile.name] = runtime
+        log.info("店铺浏览器已启动", shop=profile.name, concurrency=config.pool_size)
+        return True
+
+    def _load_binding(self, profile: ShopProfile) -> BindingConfig | None:
+        """读取店铺配置的字段绑定"""
+        if not profile.binding_id or not self.bindings:
+            return None
+        result = self.bindings.get(profile.binding_id)
+        if not result.success:
+            log.warning("读取店铺绑定配置失败，使用内置规则", shop=profile.name, error=result.error.message)
+            return None
+        return result.data
+
+    async def stop(self):
+        """关闭所有店铺浏览器"""
+        for name, runtime in list(self._shops.items()):
+            try:
+                await runtime.browser.stop()
+            except Exception as e:
+                log.warning("关闭店铺浏览器时出错", shop=name, error=str(e))
+        self._shops.clear()
+        self.selector_cache.flush()
+        if self._playwright:
+            await self._playwright.stop()
+            self._playwright = None
+
+    def reset_login(self, shop: str):
+        """用户重新登录后清除店铺的登录过期标记"""
+        if shop in self._shops:
+            self._shops[shop].login_expired = False
+
+    async def publish(
+        self,
+        products: list[Product],
+        shops: list[str] = None,
+        binding: BindingConfig = None
+    ) -> Result[list[ShopUploadResult]]:
+        """把商品发布到多个店铺
+
+        Args:
+            products: 要发布的商品
+            shops: 目标店铺（为空时为全部已启动店铺）
+            binding: 覆盖各店铺自己的绑定配置
+
+        每个商品在提交（或确认跳过、等待超时）后才归还标签页，未提交的返回 F_NOT_SUBMITTED。
+        返回结果按店铺、商品顺序排列。某店铺登录过期后，该店铺剩余任务直接失败，
+        其他店铺不受影响。
+        """
+        names = shops if shops is not None else self.shops
+        missing = [n for n in names if n not in self._shops]
+        if missing:
+            return Result.fail_with(
+                code="B_NOT_STARTED",
+                message=f"店铺浏览器未启动: {', '.join(missing)}",
+                recoverable=False,
+                context={"shops": missing}
+            )
+        if not names or not products:
+            return Result.ok([])
+
+        total = len(names) * len(products)
+        results: list[ShopUploadResult | None] = [None] * total
+        done = 0
+        started_at = time.monotonic()
+
+        log.info("开始多店铺上架", shops=len(names), products=len(products))
+        self._emit_event(EventTypes.BATCH_START, total=total, shops=len(names))
+
+        async def worker(shop_idx: int, runtime: _ShopRuntime, queue: asyncio.Queue):
+            nonlocal done
+            while True:
+                try:
+                    product_idx, product = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+
+                item = await self._publish_one(runtime, product, binding)
+                results[shop_idx * len(products) + product_idx] = item
+                done += 1
+
+                self._emit_event(EventTypes.BATCH_ITEM, **item.to_dict())
+                self._emit_progress(done, total, f"已完成 {done}/{total}")
+
+        workers = []
+        for shop_idx, name in enumerate(names):
+            runtime = self._shops[name]
+            queue: asyncio.Queue[tuple[int, Product]] = asyncio.Queue()
+            for product_idx, product in enumerate(products):
+                queue.put_nowait((product_idx, product))
+            count = max(1, min(runtime.profile.concurrency, len(products)))
+            workers.extend(worker(shop_idx, runtime, queue) for _ in range(count))
+
+        await asyncio.gather(*workers)
+
+        succeeded = sum(1 for item in results if item.result.success)
+        log.info(
+            "多店铺上架完成",
+            total=total,
+            succeeded=succeeded,
+            elapsed=round(time.monotonic() - started_at, 2)
+        )
+        self._emit_event(
+            EventTypes.BATCH_DONE,
+            total=total,
+            succeeded=succeeded,
+            failed=total - succeeded
+        )
+        return Result.ok(results)
+
+    async def _publish_one(
+        self,
+        runtime: _ShopRuntime,
+        product: Product,
+        binding: BindingConfig | None
+    ) -> ShopUploadResult:
+        """在店铺的一个标签页中填写商品，并在同一标签页上等待提交"""
+        shop = runtime.profile.name
+        if runtime.login_expired:
+            return ShopUploadResult(shop, product.id, Result.fail_with(
+                code="B_LOGIN_EXPIRED",
+                message=f"店铺未登录: {shop}",
+                recoverable=True,
+                context={"shop": shop}
+            ))
+
+        await runtime.limiter.wait()
+        started_at = time.monotonic()
+        binding = binding or runtime.binding
+        try:
+            async with runtime.browser.lease_page() as page:
+                if binding is None:
+                    result = await runtime.filler.fill(product, page)
+                else:
+                    result = await runtime.filler.fill_with_binding(product, binding, page)
+                if result.success and not await self._await_submit(runtime, product, page):
+                    result = Result.fail_with(
+                        code="F_NOT_SUBMITTED",
+                        message="表单已填写但未提交，商品保持待上架",
+                        recoverable=False,
+                        context={"shop": shop, "product_id": product.id}
+                    )
+        except Exception as e:
+            log.error("店铺上架异常", shop=shop, product_id=product.id, error=str(e))
+            result = Result.fail_with(
+                code="F_FILL_FAILED",
+                message=f"上架异常: {e}",
+                recoverable=True,
+                context={"shop": shop}
+            )
+
+        if not result.success and result.error.code == "B_LOGIN_EXPIRED":
+            runtime.login_expired = True
+        return ShopUploadResult(shop, product.id, result, time.monotonic() - started_at)
+
+    async def _await_submit(self, runtime: _ShopRuntime, product: Product, page) -> bool:
+        """等待表单提交：有确认回调时询问用户，否则等待页面跳转到发布成功页"""
+        if self.review:
+            try:
+                await page.bring_to_front()
+            except Exception:
+                pass
+            return await self.review(runtime.profile.name, product)
+        result = await runtime.filler.wait_for_submit(page)
+        return result.success and result.data
+
+    def _emit_progress(self, step: int, total: int, message: str):
+        """发送进度事件"""
+        if self.event_bus:
+            self.event_bus.emit(
+                EventTypes.PROGRESS,
+                step=step,
+                total=total,
+                message=message
+            )
+
+    def _emit_event(self, event_type: str, **payload):
+        """发送事件"""
+        if self.event_bus:
+            self.event_bus.emit(event_type, **payload)
@@ -0,0 +1,322 @@
+"""
+采集→上架流水线
+
+采集和填写分两个阶段并行执行：一个标签页填写当前商品的发布表单时，
+另一个标签页已在采集下一个商品。两个阶段之间是有界缓冲区（lookahead），
+采集最多领先填写 lookahead 个商品，每个商品的耗时接近 max(采集, 填写)。
+"""
+import asyncio
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Awaitable, Callable
+
+from src.models import BindingConfig, Product, ProductStatus, Result
+from src.infra.browser import BrowserManager
+from src.infra.storage import ProductStorage
+from src.infra.logger import logger
+from .collector import Collector
+from .events import EventBus, EventTypes
+from .filler import Filler
+from .image_pipeline import ImagePipeline
+
+log = logger.get("pipeline")
+
+# 填写完成后的确认回调：返回 True 表示已提交（商品标记为已上架）
+Reviewer = Callable[[Product], Awaitable[bool]]
+
+
+@dataclass
+class PipelineItem:
+    """单个链接在流水线中的结果"""
+    url: str
+    product_id: str | None = None
+    title: str = ""
+    collect_error: str | None = None
+    upload_error: str | None = None
+    uploaded: bool = False
+    deferred: bool = False      # 已采集但未填写（登录过期后或用户跳过），商品保留为待上架
+    collect_seconds: float = 0.0
+    fill_seconds: float = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "url": self.url,
+            "product_id": self.product_id,
+            "title": self.title,
+            "collect_error": self.collect_error,
+            "upload_error": self.upload_error,
+            "uploaded": self.uploaded,
+            "deferred": self.deferred,
+            "collect_seconds": round(self.collect_seconds, 2),
+            "fill_seconds": round(self.fill_seconds, 2)
+        }
+
+
+@dataclass
+class PipelineStats:
+    """一次运行的统计"""
+    total: int = 0
+    collected: int = 0
+    uploaded: int = 0
+    collect_failed: int = 0
+    upload_failed: int = 0
+    deferred: int = 0
+    elapsed: float = 0.0         # 总耗时
+    collect_time: float = 0.0    # 各商品采集耗时之和
+    fill_time: float = 0.0       # 各商品填写耗时之和
+    items: list[PipelineItem] = field(default_factory=list)
+
+    @property
+    def overlap(self) -> float:
+        """两个阶段重叠节省的时间（串行执行的耗时 - 实际耗时）"""
+        return max(0.0, self.collect_time + self.fill_time - self.elapsed)
+
+    def to_dict(self) -> dict:
+        return {
+            "total": self.total,
+            "collected": self.collected,
+            "uploaded": self.uploaded,
+            "collect_failed": self.collect_failed,
+            "upload_failed": self.upload_failed,
+            "deferred": self.deferred,
+            "elapsed": round(self.elapsed, 2),
+            "collect_time": round(self.collect_time, 2),
+            "fill_time": round(self.fill_time, 2),
+            "overlap": round(self.overlap, 2)
+        }
+
+
+class CollectUploadPipeline:
+    """采集→上架流水线：采集和填写在不同的标签页上重叠执行"""
+
+    LOOKAHEAD = 2       # 采集领先填写的最大商品数
+
+    def __init__(
+        self,
+        browser: BrowserManager,
+        storage: ProductStorage,
+        collector: Collector,
+        filler: Filler,
+        event_bus: EventBus = None,
+        images: ImagePipeline = None,
+        lookahead: int = None
+    ):
+        self.browser = browser
+        self.storage = storage
+        self.collector = collector
+        self.filler = filler
+        self.event_bus = event_bus or EventBus()
+        self.images = images
+        self.lookahead = max(1, lookahead or self.LOOKAHEAD)
+
+    async def run(
+        self,
+        urls: list[str],
+        binding: BindingConfig = None,
+        collect_workers: int = 1,
+        upload_workers: int = 1,
+        review: Reviewer = None
+    ) -> Result[PipelineStats]:
+        """采集链接并依次填写发布表单
+
+        Args:
+            binding: 字段绑定配置（为空时使用内置规则）
+            collect_workers: 采集并发数
+            upload_workers: 填写并发数
+            review: 填写完成后的确认回调（期间继续采集后续商品）；
+                为空时填写完成即标记为已上架
+        """
+        urls = list(dict.fromkeys(u.strip() for u in urls if u and u.strip()))
+        stats = PipelineStats(total=len(urls))
+        if not urls:
+            return Result.ok(stats)
+
+        # 采集和填写各占一部分标签页（浏览器模式下受池容量限制）
+        upload_workers = max(1, upload_workers)
+        collect_workers = max(1, min(collect_workers, len(urls)))
+        pool_size = self.browser.config.pool_size
+        if collect_workers + upload_workers > pool_size:
+            collect_workers = max(1, pool_size - upload_workers)
+            upload_workers = max(1, pool_size - collect_workers)
+
+        session_result = await self.collector.open_session(collect_workers + upload_workers)
+        if not session_result.success:
+            return session_result
+
+        stats.items = [PipelineItem(url=url) for url in urls]
+        pending: asyncio.Queue[int] = asyncio.Queue()
+        for idx in range(len(urls)):
+            pending.put_nowait(idx)
+        ready: asyncio.Queue[tuple[int, Product] | None] = asyncio.Queue(self.lookahead)
+        login_expired = False
+
+        async def collect_worker():
+            while True:
+                try:
+                    idx = pending.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                item = stats.items[idx]
+                product = await self._collect(item)
+                self._emit_progress(stats, "collect", item)
+                if product is not None:
+                    # 缓冲区满时等待填写阶段跟上
+                    await ready.put((idx, product))
+
+        async def upload_worker():
+            nonlocal login_expired
+            while True:
+                entry = await ready.get()
+                if entry is None:
+                    return
+                idx, product = entry
+                item = stats.items[idx]
+                if login_expired:
+                    item.deferred = True
+                else:
+                    try:
+                        expired = await self._upload(item, product, binding, review)
+                    except Exception as e:
+                        # 不能让填写阶段退出，否则采集阶段会在缓冲区上一直等待
+                        log.error("填写阶段异常", product_id=product.id, error=str(e))
+                        item.upload_error = f"填写异常: {e}"
+                        expired = False
+                    if expired:
+                        login_expired = True
+                        self._emit_event(EventTypes.LOGIN_EXPIRED, session_id="pipeline")
+                self._emit_progress(stats, "upload", item)
+
+        log.info(
+            "流水线开始运行",
+            total=len(urls),
+            collect_workers=collect_workers,
+            upload_workers=upload_workers,
+            lookahead=self.lookahead
+        )
+        self._emit_event(EventTypes.BATCH_START, total=len(urls), mode="pipeline")
+        started = time.perf_counter()
+
+        uploaders = [asyncio.ensure_future(upload_worker()) for _ in range(upload_workers)]
+        try:
+            await asyncio.gather(*(collect_worker() for _ in range(collect_workers)))
+            for _ in uploaders:
+                await ready.put(None)
+            await asyncio.gather(*uploaders)
+        finally:
+            for task in uploaders:
+                task.cancel()
+            await self.collector.close_session()
+
+        stats.elapsed = time.perf_counter() - started
+        for item in stats.items:
+            stats.collect_time += item.collect_seconds
+            stats.fill_time += item.fill_seconds
+            stats.collected += item.product_id is not None
+            stats.collect_failed += item.collect_error is not None
+            stats.uploaded += item.uploaded
+            stats.upload_failed += item.upload_error is not None
+            stats.deferred += item.deferred
+
+        log.info("流水线运行结束", **stats.to_dict())
+        self._emit_event(EventTypes.BATCH_DONE, mode="pipeline", **stats.to_dict())
+        return Result.ok(stats)
+
+    async def _collect(self, item: PipelineItem) -> Product | None:
+        """采集并保存（商品以待上架状态保存，之后中断也不会丢失）"""
+        started = time.perf_counter()
+        try:
+            result = await self.collector.collect_pooled(item.url)
+        except Exception as e:
+            log.error("采集异常", url=item.url, error=str(e))
+            result = Result.fail_with(code="C_COLLECT_FAILED", message=f"采集异常: {e}", recoverable=True)
+
+        if result.success:
+            product = result.data
+            save_result = self.storage.save(product)
+            if save_result.success:
+                item.product_id = product.id
+                item.title = product.title
+                if self.images:
+                    # 图片在等待填写期间下载，填写时直接从缓存上传
+                    images_result = await self.images.prefetch(product)
+                    if not images_result.success:
+                        log.warning("预下载图片失败", url=item.url, error=images_result.error.message)
+            else:
+                result = save_result
+
+        item.collect_seconds = time.perf_counter() - started
+        if not result.success:
+            item.collect_error = result.error.message
+            log.warning("采集失败", url=item.url, error=result.error.message)
+            return None
+        return result.data
+
+    async def _upload(
+        self,
+        item: PipelineItem,
+        product: Product,
+        binding: BindingConfig | None,
+        review: Reviewer | None
+    ) -> bool:
+        """在独占标签页上填写发布表单，返回是否登录过期"""
+        started = time.perf_counter()
+        async with self.browser.lease_page() as page:
+            # 池中的标签页可能启用了采集用的资源拦截，发布页需要完整加载
+            await self.browser.clear_block_profile(page)
+            try:
+                if binding is None:
+                    result = await self.filler.fill(product, page)
+                else:
+                    result = await self.filler.fill_with_binding(product, binding, page)
+            except Exception as e:
+                log.error("填写异常", product_id=product.id, error=str(e))
+                result = Result.fail_with(code="F_FILL_FAILED", message=f"填写异常: {e}", recoverable=True)
+            item.fill_seconds = time.perf_counter() - started
+
+            if not result.success:
+                if result.error.code == "B_LOGIN_EXPIRED":
+                    item.deferred = True
+                    return True
+                item.upload_error = result.error.message
+                log.warning("填写失败", product_id=product.id, error=result.error.message)
+                return False
+
+            # 确认期间标签页保持租用（表单不会被下一个商品覆盖），采集阶段继续运行
+            submitted = True
+            if review:
+                try:
+                    await page.bring_to_front()
+                except Exception:
+                    pass
+                submitted = await review(product)
+
+        if not submitted:
+            item.deferred = True
+            return False
+
+        product.status = ProductStatus.UPLOADED
+        product.uploaded_at = datetime.now()
+        save_result = self.storage.save(product)
+        if not save_result.success:
+            item.upload_error = save_result.error.message
+            return False
+        item.uploaded = True
+        return False
+
+    def _emit_progress(self, stats: PipelineStats, stage: str, item: PipelineItem):
+        """发送单项完成事件和汇总进度"""
+        collected = sum(1 for i in stats.items if i.product_id or i.collect_error)
+        filled = sum(1 for i in stats.items if i.uploaded or i.upload_error or i.deferred)
+        self._emit_event(EventTypes.BATCH_ITEM, stage=stage, **item.to_dict())
+        self._emit_event(
+            EventTypes.PROGRESS,
+            step=filled,
+            total=stats.total,
+            message=f"已采集 {collected}/{stats.total}，已填写 {filled}/{stats.total}"
+        )
+
+    def _emit_event(self, event_type: str, **payload):
+        """发送事件"""
+        if self.event_bus:
+            self.event_bus.emit(event_type, **payload)
@@ -1,27 +1,85 @@
 """
 基础设施层模块
+
+browser / http 依赖 playwright、httpx，首次访问时才导入：
+只使用存储、熔断限速等模块时不需要安装这些依赖。
 """
-from .browser import BrowserManager, BrowserConfig, RetryPolicy
-from .storage import ProductStorage, Config, ConfigManager
+import importlib
+
+from .resilience import (
+    RetryPolicy, CircuitBreaker, CircuitState, HostBreakers, AdaptiveLimiter, with_retry,
+    RateLimit, HostRateLimiter
+)
+from .storage import ProductStorage, SqliteProductStorage, create_product_storage, BindingStorage, JobQueue, ImageCache, Config, ConfigManager
 from .knowledge import KnowledgeBase, ProblemStorage, SolutionStorage
+from .selector_cache import SelectorCache
 from .logger import logger, trace, get_run_id, get_trace_id
 
 __all__ = [
     # browser
     "BrowserManager",
     "BrowserConfig",
+    "PoolStats",
+    "BlockProfile",
+    "BLOCK_PROFILES",
+    "NavStrategy",
+    "NAV_STRATEGIES",
+    # resilience
     "RetryPolicy",
+    "CircuitBreaker",
+    "CircuitState",
+    "HostBreakers",
+    "AdaptiveLimiter",
+    "with_retry",
+    "RateLimit",
+    "HostRateLimiter",
+    # http
+    "HttpClient",
+    "HttpConfig",
+    "HttpPage",
+    "HttpDownload",
     # storage
     "ProductStorage",
+    "SqliteProductStorage",
+    "create_product_storage",
+    "BindingStorage",
+    "JobQueue",
+    "ImageCache",
     "Config",
     "ConfigManager",
     # knowledge
     "KnowledgeBase",
     "ProblemStorage",
     "SolutionStorage",
+    # selector_cache
+    "SelectorCache",
     # logger
     "logger",
     "trace",
     "get_run_id",
     "get_trace_id",
 ]
+
+# 按需导入的导出名 -> 子模块
+_LAZY_EXPORTS = {
+    "BrowserManager": "browser",
+    "BrowserConfig": "browser",
+    "PoolStats": "browser",
+    "BlockProfile": "browser",
+    "BLOCK_PROFILES": "browser",
+    "NavStrategy": "browser",
+    "NAV_STRATEGIES": "browser",
+    "HttpClient": "http",
+    "HttpConfig": "http",
+    "HttpPage": "http",
+    "HttpDownload": "http",
+}
+
+
+def __getattr__(name: str):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
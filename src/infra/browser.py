@@ -3,37 +3,543 @@ Playwright 浏览器封装
 """
 import asyncio
 import json
+import os
+import re
+import subprocess
+import time
+import urllib.request
+import weakref
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Callable
+from typing import AsyncIterator, Callable
 from dataclasses import dataclass, field
 from datetime import datetime
 
-from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Playwright
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Playwright, Route
 
 from src.models import Result
 from src.infra.logger import logger
+from src.infra.resilience import HostBreakers, HostRateLimiter, RetryPolicy, with_retry
 
 log = logger.get("browser")
 
 
 @dataclass
-class RetryPolicy:
-    """重试策略"""
-    max_attempts: int = 3
-    base_delay: float = 1.0
-    exponential: bool = True
-    max_delay: float = 30.0
-    retryable_codes: list[str] = field(default_factory=lambda: [
-        "B_TIMEOUT",
-        "B_NETWORK_ERROR",
-    ])
-
-    def get_delay(self, attempt: int) -> float:
-        if self.exponential:
-            delay = self.base_delay * (2 ** attempt)
+class BlockProfile:
+    """资源拦截配置：按资源类型和 URL 模式中止请求"""
+    name: str
+    resource_types: frozenset[str] = frozenset()
+    url_patterns: tuple[str, ...] = ()
+
+    def __post_init__(self):
+        self._compiled = [re.compile(p) for p in self.url_patterns]
+
+    @property
+    def blocks_anything(self) -> bool:
+        return bool(self.resource_types or self.url_patterns)
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        if resource_type in self.resource_types:
+            return True
+        return any(p.search(url) for p in self._compiled)
+
+
+# 统计/埋点脚本（淘宝系 + 常见第三方）
+_TRACKER_PATTERNS = (
+    r"//[^/]*mmstat\.com/",
+    r"//g\.alicdn\.com/alilog/",
+    r"//g\.alicdn\.com/.*/aplus",
+    r"//[^/]*arms-retcode[^/]*/",
+    r"//fourier\.taobao\.com/",
+    r"//[^/]*(googletagmanager|google-analytics|doubleclick)\.",
+    r"//[^/]*cnzz\.com/",
+)
+
+BLOCK_PROFILES: dict[str, BlockProfile] = {
+    # 不拦截任何请求
+    "full": BlockProfile("full"),
+    # 采集只读取标题/价格/图片 src，图片、媒体、字体和埋点都不需要下载
+    "collect-lean": BlockProfile(
+        "collect-lean",
+        resource_types=frozenset({"image", "media", "font"}),
+        url_patterns=_TRACKER_PATTERNS
+    ),
+}
+
+
+@dataclass
+class BlockStats:
+    """资源拦截统计"""
+    blocked_requests: int = 0
+    allowed_requests: int = 0
+    blocked_by_type: dict[str, int] = field(default_factory=dict)
+
+    def record(self, resource_type: str, blocked: bool):
+        if blocked:
+            self.blocked_requests += 1
+            self.blocked_by_type[resource_type] = self.blocked_by_type.get(resource_type, 0) + 1
         else:
-            delay = self.base_delay
-        return min(delay, self.max_delay)
+            self.allowed_requests += 1
+
+    def to_dict(self) -> dict:
+        return {
+            "blocked_requests": self.blocked_requests,
+            "allowed_requests": self.allowed_requests,
+            "blocked_by_type": dict(self.blocked_by_type)
+        }
+
+
+@dataclass
+class NavStrategy:
+    """导航等待策略：导航提交后等待页面类型对应的就绪信号
+
+    ready_selectors 中任一元素出现、或 ready_responses 中任一请求完成即视为就绪；
+    dom_ready_fallback 为真时 DOMContentLoaded 先到达也视为就绪（不会比原来等待更久）。
+    就绪后再按 network_quiet 等待网络空闲（最多 quiet_timeout）。
+    """
+    name: str
+    wait_until: str = "domcontentloaded"     # page.goto 返回的时机（commit / domcontentloaded / load）
+    ready_selectors: tuple[str, ...] = ()    # 任一元素出现（attached）即就绪
+    ready_responses: tuple[str, ...] = ()    # 任一 URL 匹配（正则）的请求完成即就绪
+    dom_ready_fallback: bool = True
+    network_quiet: int = 0                   # 就绪后要求的网络空闲时长（ms），0 表示不等待
+    quiet_timeout: int = 5000                # 等待网络空闲的上限（ms）
+
+    def __post_init__(self):
+        self._compiled = [re.compile(p) for p in self.ready_responses]
+
+    @property
+    def has_ready_signal(self) -> bool:
+        return bool(self.ready_selectors or self.ready_responses)
+
+    @property
+    def watches_network(self) -> bool:
+        return bool(self.ready_responses or self.network_quiet)
+
+    def matches_response(self, url: str) -> bool:
+        return any(p.search(url) for p in self._compiled)
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "wait_until": self.wait_until,
+            "ready_selectors": list(self.ready_selectors),
+            "ready_responses": list(self.ready_responses),
+            "dom_ready_fallback": self.dom_ready_fallback,
+            "network_quiet": self.network_quiet,
+            "quiet_timeout": self.quiet_timeout
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'NavStrategy':
+        return cls(
+            name=data["name"],
+            wait_until=data.get("wait_until", "domcontentloaded"),
+            ready_selectors=tuple(data.get("ready_selectors", ())),
+            ready_responses=tuple(data.get("ready_responses", ())),
+            dom_ready_fallback=data.get("dom_ready_fallback", True),
+            network_quiet=data.get("network_quiet", 0),
+            quiet_timeout=data.get("quiet_timeout", 5000)
+        )
+
+
+# Playwright 选择器引擎前缀（xpath= / text= 等），这类选择器不能用逗号合并
+_ENGINE_PREFIX = re.compile(r"^[\w-]+=")
+
+# 登录页标记（未登录时跳转到登录页，同样视为就绪，由调用方检查登录状态）
+_LOGIN_MARKERS = ("#fm-login-id", "#login-form", "#alibaba-login-box")
+
+NAV_STRATEGIES: dict[str, NavStrategy] = {
+    # 等待 DOMContentLoaded（未指定页面类型时使用）
+    "default": NavStrategy("default"),
+    # 商品详情页：标题已渲染或详情接口已返回即可提取，采集器会继续等待接口补全
+    "item": NavStrategy(
+        "item",
+        wait_until="commit",
+        ready_selectors=(
+            "h1.tb-main-title",
+            ".tb-detail-hd h1",
+            "div[data-spm='1000983'] h1",
+            ".ItemHeader--mainTitle--3CIjqW5",
+        ),
+        ready_responses=(
+            r"mtop\.taobao\.pcdetail\.data\.get",
+            r"mtop\.taobao\.detail\.getdetail",
+            r"mtop\.tmall\.detail\.",
+        )
+    ),
+    # 发布表单：登录昵称出现后即可检查登录并开始填写（各字段由 probe 等待渲染）
+    "publish-form": NavStrategy(
+        "publish-form",
+        wait_until="commit",
+        ready_selectors=(".user-nick", *_LOGIN_MARKERS)
+    ),
+    # 千牛后台首页：登录状态确定后再等网络空闲，页面不再跳转
+    "seller-home": NavStrategy(
+        "seller-home",
+        wait_until="commit",
+        ready_selectors=(".user-nick", *_LOGIN_MARKERS),
+        network_quiet=500
+    ),
+}
+
+
+class _NavWatcher:
+    """导航期间跟踪网络请求：匹配的请求是否完成、网络是否空闲（需在导航前进入）"""
+
+    def __init__(self, page: Page, strategy: NavStrategy):
+        self._page = page
+        self._strategy = strategy
+        self._inflight: set = set()
+        self._last_activity = time.monotonic()
+        self._activity = asyncio.Event()
+        self.response_done = asyncio.Event()
+
+    def __enter__(self) -> '_NavWatcher':
+        if self._strategy.watches_network:
+            self._page.on("request", self._on_request)
+            self._page.on("requestfinished", self._on_finished)
+            self._page.on("requestfailed", self._on_failed)
+        return self
+
+    def __exit__(self, *exc):
+        if self._strategy.watches_network:
+            self._page.remove_listener("request", self._on_request)
+            self._page.remove_listener("requestfinished", self._on_finished)
+            self._page.remove_listener("requestfailed", self._on_failed)
+
+    def _on_request(self, request):
+        self._inflight.add(request)
+        self._touch()
+
+    def _on_finished(self, request):
+        self._inflight.discard(request)
+        self._touch()
+        if self._strategy.matches_response(request.url):
+            self.response_done.set()
+
+    def _on_failed(self, request):
+        self._inflight.discard(request)
+        self._touch()
+
+    def _touch(self):
+        self._last_activity = time.monotonic()
+        self._activity.set()
+
+    async def wait_quiet(self, quiet: float, timeout: float) -> bool:
+        """等待没有进行中的请求且持续 quiet 秒，超时返回 False"""
+        deadline = time.monotonic() + timeout
+        while True:
+            now = time.monotonic()
+            wait = deadline - now
+            if not self._inflight:
+                idle = now - self._last_activity
+                if idle >= quiet:
+                    return True
+                wait = min(wait, quiet - idle)
+            if now >= deadline:
+                return False
+            self._activity.clear()
+            try:
+                await asyncio.wait_for(self._activity.wait(), wait)
+            except asyncio.TimeoutError:
+                pass
+
+
+# 探测脚本：参数为 [选择器列表, 时间预算 ms, 是否要求可见]
+# 立即检查一次，之后由 MutationObserver 在 DOM 变化时复查，返回第一个存在的选择器序号（-1 表示超时）
+# 选择器支持 CSS 和 "xpath=" 前缀；无法在页面内解析的选择器（如 text=）视为不存在
+_PROBE_JS = """
+([selectors, budget, visible]) => new Promise(resolve => {
+    const find = (selector) => {
+        try {
+            if (selector.startsWith('xpath=')) {
+                return document.evaluate(
+                    selector.slice(6), document, null,
+                    XPathResult.FIRST_ORDERED_NODE_TYPE, null
+                ).singleNodeValue;
+            }
+            return document.querySelector(selector);
+        } catch (e) {
+            return null;
+        }
+    };
+    const check = () => {
+        for (let i = 0; i < selectors.length; i++) {
+            const el = find(selectors[i]);
+            if (el && (!visible || (el.getClientRects && el.getClientRects().length))) return i;
+        }
+        return -1;
+    };
+
+    const found = check();
+    if (found >= 0 || budget <= 0) return resolve(found);
+
+    let timer = null;
+    const observer = new MutationObserver(() => {
+        const idx = check();
+        if (idx >= 0) done(idx);
+    });
+    const done = (idx) => {
+        observer.disconnect();
+        clearTimeout(timer);
+        resolve(idx);
+    };
+    observer.observe(document.documentElement, {
+        childList: true, subtree: true,
+        attributes: true, attributeFilter: ['style', 'class', 'hidden']
+    });
+    timer = setTimeout(() => done(check()), budget);
+})
+"""
+
+
+# 元素捕获脚本：通过 add_init_script 注册一次，之后每次导航自动安装（重复执行不会重复注册监听）
+# Ctrl+点击时通过 expose_binding 的 __pushCapturedElement 直接通知 Python；
+# 没有推送通道时写入 window.__capturedElement，由 Python 轮询读取
+_CAPTURE_JS = """
+(() => {
+    if (window.__captureInstalled) return;
+    window.__captureInstalled = true;
+    window.__elementCaptureEnabled = false;
+    window.__capturedElement = null;
+
+    let overlay = null;
+    let label = null;
+    const root = () => document.body || document.documentElement;
+
+    // 高亮覆盖层和标签在首次需要时创建（init script 执行时页面还没有 body）
+    const ensureOverlay = () => {
+        if (overlay && overlay.isConnected) return;
+        overlay = document.createElement('div');
+        overlay.id = '__capture_overlay';
+        overlay.style.cssText = `
+            position: fixed;
+            pointer-events: none;
+            border: 2px solid #1890ff;
+            background: rgba(24, 144, 255, 0.1);
+            z-index: 999999;
+            display: none;
+            transition: all 0.1s ease;
+        `;
+        root().appendChild(overlay);
+
+        label = document.createElement('div');
+        label.id = '__capture_label';
+        label.style.cssText = `
+            position: fixed;
+            background: #1890ff;
+            color: white;
+            padding: 2px 8px;
+            font-size: 12px;
+            font-family: monospace;
+            z-index: 999999;
+            display: none;
+            border-radius: 2px;
+        `;
+        root().appendChild(label);
+    };
+
+    const hideOverlay = () => {
+        if (overlay) overlay.style.display = 'none';
+        if (label) label.style.display = 'none';
+    };
+
+    // 状态提示（右下角），3 秒后淡出
+    const showStatus = () => {
+        const existing = document.getElementById('__capture_status');
+        if (existing) existing.remove();
+        const status = document.createElement('div');
+        status.id = '__capture_status';
+        status.innerHTML = '捕获模式已激活<br><small>按住 Ctrl 移动鼠标</small>';
+        status.style.cssText = `
+            position: fixed;
+            bottom: 20px;
+            right: 20px;
+            background: #1890ff;
+            color: white;
+            padding: 12px 16px;
+            font-size: 14px;
+            font-family: system-ui, sans-serif;
+            z-index: 999999;
+            border-radius: 8px;
+            box-shadow: 0 4px 12px rgba(0,0,0,0.15);
+        `;
+        root().appendChild(status);
+        setTimeout(() => {
+            status.style.transition = 'opacity 0.5s';
+            status.style.opacity = '0';
+            setTimeout(() => status.remove(), 500);
+        }, 3000);
+    };
+
+    window.__setElementCapture = (enabled) => {
+        window.__elementCaptureEnabled = enabled;
+        window.__capturedElement = null;
+        if (enabled) {
+            showStatus();
+            return;
+        }
+        hideOverlay();
+        const status = document.getElementById('__capture_status');
+        if (status) status.remove();
+    };
+
+    // 生成 XPath 选择器
+    function getXPath(el) {
+        // 优先使用 id
+        if (el.id) {
+            return '//' + el.tagName.toLowerCase() + '[@id="' + el.id + '"]';
+        }
+
+        // 尝试用属性生成唯一 XPath
+        const attrs = ['name', 'data-testid', 'data-id', 'placeholder', 'type'];
+        for (const attr of attrs) {
+            const value = el.getAttribute(attr);
+            if (value) {
+                const xpath = '//' + el.tagName.toLowerCase() + '[@' + attr + '="' + value + '"]';
+                try {
+                    const result = document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+                    if (result.snapshotLength === 1) {
+                        return xpath;
+                    }
+                } catch (e) {}
+            }
+        }
+
+        // 尝试用 class
+        const className = el.getAttribute('class');
+        if (className) {
+            const classes = className.split(' ').filter(c => c && !c.includes(':') && c.length < 30);
+            for (const cls of classes.slice(0, 3)) {
+                const xpath = '//' + el.tagName.toLowerCase() + '[contains(@class, "' + cls + '")]';
+                try {
+                    const result = document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+                    if (result.snapshotLength === 1) {
+                        return xpath;
+                    }
+                } catch (e) {}
+            }
+        }
+
+        // 使用完整路径
+        const path = [];
+        let current = el;
+        while (current && current.nodeType === Node.ELEMENT_NODE) {
+            let index = 1;
+            let sibling = current.previousElementSibling;
+            while (sibling) {
+                if (sibling.tagName === current.tagName) {
+                    index++;
+                }
+                sibling = sibling.previousElementSibling;
+            }
+
+            const tagName = current.tagName.toLowerCase();
+            // 检查是否有同名兄弟节点
+            let hasMultiple = false;
+            sibling = current.parentElement ? current.parentElement.firstElementChild : null;
+            while (sibling) {
+                if (sibling !== current && sibling.tagName === current.tagName) {
+                    hasMultiple = true;
+                    break;
+                }
+                sibling = sibling.nextElementSibling;
+            }
+
+            if (hasMultiple) {
+                path.unshift(tagName + '[' + index + ']');
+            } else {
+                path.unshift(tagName);
+            }
+
+            current = current.parentElement;
+        }
+        return '/' + path.join('/');
+    }
+
+    // 鼠标移动高亮
+    document.addEventListener('mousemove', (e) => {
+        if (!window.__elementCaptureEnabled || !e.ctrlKey) {
+            hideOverlay();
+            return;
+        }
+
+        ensureOverlay();
+        const el = document.elementFromPoint(e.clientX, e.clientY);
+        if (!el || el === overlay || el === label) return;
+
+        const rect = el.getBoundingClientRect();
+        overlay.style.left = rect.left + 'px';
+        overlay.style.top = rect.top + 'px';
+        overlay.style.width = rect.width + 'px';
+        overlay.style.height = rect.height + 'px';
+        overlay.style.display = 'block';
+
+        label.textContent = el.tagName.toLowerCase() + (el.id ? '#' + el.id : '');
+        label.style.left = rect.left + 'px';
+        label.style.top = (rect.top - 24) + 'px';
+        label.style.display = 'block';
+    }, true);
+
+    // Ctrl+点击捕获
+    document.addEventListener('click', (e) => {
+        if (!window.__elementCaptureEnabled || !e.ctrlKey) return;
+
+        e.preventDefault();
+        e.stopPropagation();
+
+        ensureOverlay();
+        const el = document.elementFromPoint(e.clientX, e.clientY);
+        if (!el || el === overlay || el === label) return;
+
+        const captured = {
+            selector: getXPath(el),
+            tagName: el.tagName.toLowerCase(),
+            id: el.id || null,
+            className: el.className || null,
+            text: el.innerText ? el.innerText.slice(0, 50) : null
+        };
+        if (window.__pushCapturedElement) {
+            window.__pushCapturedElement(captured);
+        } else {
+            window.__capturedElement = captured;
+        }
+
+        // 闪烁确认效果
+        overlay.style.background = 'rgba(82, 196, 26, 0.3)';
+        overlay.style.borderColor = '#52c41a';
+        setTimeout(() => {
+            overlay.style.background = 'rgba(24, 144, 255, 0.1)';
+            overlay.style.borderColor = '#1890ff';
+        }, 300);
+    }, true);
+
+    // 导航后的新文档：向 Python 查询该标签页是否处于捕获模式
+    if (window.__captureEnabled) {
+        window.__captureEnabled().then(enabled => {
+            window.__elementCaptureEnabled = !!enabled;
+        }).catch(() => {});
+    }
+})();
+"""
+
+
+# 启动浏览器的命令行参数（launch 和 server 模式共用）
+_LAUNCH_ARGS = [
+    "--start-maximized",
+    "--disable-blink-features=AutomationControlled",
+    "--no-proxy-server",
+]
+
+
+def _endpoint_alive(endpoint: str) -> bool:
+    """CDP 调试端口是否可连接"""
+    try:
+        with urllib.request.urlopen(f"{endpoint}/json/version", timeout=1) as response:
+            return response.status == 200
+    except OSError:
+        return False
 
 
 def _get_default_user_data_dir() -> str:
@@ -52,12 +558,239 @@ class BrowserConfig:
     user_data_dir: str = None  # None 时使用默认路径
     viewport_width: int = 1280
     viewport_height: int = 800
+    pool_size: int = 4               # 标签页池容量
+    page_max_navigations: int = 50   # 单个标签页导航次数上限，超过后回收重建
+    probe_timeout: int = 1500        # 探测候选选择器的默认时间预算（ms）
+    # 运行模式:
+    #   launch - 本进程启动持久化浏览器，退出时关闭
+    #   server - 连接 127.0.0.1:debug_port 上常驻的浏览器，不存在时以独立进程启动；
+    #            本进程退出后浏览器继续运行，下次启动（或其他进程）直接连接
+    #   cdp    - 只连接 cdp_endpoint 指定的已有浏览器
+    mode: str = "launch"
+    debug_port: int = 9222
+    cdp_endpoint: str | None = None
+    reconnect_attempts: int = 3      # 连接断开后自动重连次数
+    max_retry: int = 3               # 导航等操作的重试次数（含首次）
+    retry_delay: float = 1.0         # 重试基础延迟（秒，指数退避 + 随机抖动）
+    breaker_threshold: int = 5       # 同一域名连续超时/网络错误多少次后熔断
+    breaker_reset: float = 15.0      # 熔断冷却时间（秒），之后放行一个探测请求
+    # 按域名限速：域名 -> {"rate": 每秒请求数, "burst": 突发数}，"*" 为其余域名的默认值
+    # 每个 BrowserManager 一组令牌桶（多店铺上架时即每个店铺账号单独限速）
+    rate_limits: dict[str, dict] = field(default_factory=dict)
+    # 导航等待策略覆盖：页面类型 -> NavStrategy.to_dict() 的部分字段（合并到内置策略上）
+    nav_strategies: dict[str, dict] = field(default_factory=dict)
 
     def __post_init__(self):
         if self.user_data_dir is None:
             self.user_data_dir = _get_default_user_data_dir()
 
 
+@dataclass
+class PoolStats:
+    """标签页池统计"""
+    capacity: int = 0
+    created: int = 0         # 当前存活页面数
+    in_use: int = 0          # 正在租用的页面数
+    leases: int = 0          # 累计租用次数
+    total_wait: float = 0.0  # 累计等待时间（秒）
+    max_wait: float = 0.0    # 最长等待时间（秒）
+    recycled: int = 0        # 因导航次数上限回收的页面数
+    unhealthy: int = 0       # 健康检查失败被替换的页面数
+
+    @property
+    def avg_wait(self) -> float:
+        if self.leases == 0:
+            return 0.0
+        return self.total_wait / self.leases
+
+    @property
+    def utilisation(self) -> float:
+        if self.capacity == 0:
+            return 0.0
+        return self.in_use / self.capacity
+
+    def to_dict(self) -> dict:
+        return {
+            "capacity": self.capacity,
+            "created": self.created,
+            "in_use": self.in_use,
+            "leases": self.leases,
+            "avg_wait": round(self.avg_wait, 4),
+            "max_wait": round(self.max_wait, 4),
+            "utilisation": round(self.utilisation, 4),
+            "recycled": self.recycled,
+            "unhealthy": self.unhealthy
+        }
+
+
+class PagePool:
+    """标签页池：租用/归还语义，按导航次数回收页面以限制渲染进程内存"""
+
+    HEALTH_CHECK_TIMEOUT = 2.0  # 秒
+
+    def __init__(self, context: BrowserContext, size: int, max_navigations: int):
+        self._context = context
+        self._size = max(1, size)
+        self._max_navigations = max_navigations
+        # 空闲页面；None 表示页面被丢弃后空出的名额，取到的 worker 负责补建
+        self._idle: asyncio.Queue[Page | None] = asyncio.Queue()
+        self._reserved = 0  # 已占用的名额（存活页面 + 创建中 + 空出待补建）
+        self._navigations: dict[int, int] = {}
+        self._leased: set[int] = set()
+        self._closed = False
+        self.stats = PoolStats(capacity=self._size)
+
+    async def warm(self, count: int = None) -> int:
+        """预热页面，返回当前空闲页面数"""
+        target = min(count or self._size, self._size)
+        while self._reserved < target:
+            self._reserved += 1
+            page = await self._create()
+            self._idle.put_nowait(page)
+        return self._idle.qsize()
+
+    async def acquire(self, timeout: float = None) -> Page:
+        """租用页面（池满时等待归还）"""
+        if self._closed:
+            raise RuntimeError("标签页池已关闭")
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        # 丢弃不健康页面后重新等待时共用同一截止时间，总等待不超过 timeout
+        deadline = None if timeout is None else start + timeout
+
+        while True:
+            if self._idle.empty() and self._reserved < self._size:
+                # 先占名额再创建，并发租用不会超出池大小
+                self._reserved += 1
+                page = await self._create()
+            else:
+                remaining = None if deadline is None else max(0.0, deadline - loop.time())
+                page = await asyncio.wait_for(self._idle.get(), remaining)
+                if page is None:
+                    page = await self._create()
+
+            if await self._is_healthy(page):
+                break
+
+            # 不健康的页面直接丢弃，下一轮补建
+            self.stats.unhealthy += 1
+            await self._discard(page)
+
+        waited = loop.time() - start
+        self.stats.leases += 1
+        self.stats.total_wait += waited
+        self.stats.max_wait = max(self.stats.max_wait, waited)
+        self.stats.in_use += 1
+        self._leased.add(id(page))
+        return page
+
+    async def release(self, page: Page) -> None:
+        """归还页面"""
+        if id(page) not in self._leased:
+            return
+        self._leased.discard(id(page))
+        self.stats.in_use -= 1
+
+        if self._closed or page.is_closed():
+            await self._discard(page)
+            return
+
+        if self._navigations.get(id(page), 0) >= self._max_navigations:
+            self.stats.recycled += 1
+            log.debug("标签页达到导航上限，回收", navigations=self._navigations.get(id(page)))
+            await self._discard(page)
+            return
+
+        self._idle.put_nowait(page)
+
+    def record_navigation(self, page: Page) -> None:
+        """记录一次导航（仅统计池内页面）"""
+        key = id(page)
+        if key in self._navigations:
+            self._navigations[key] += 1
+
+    def owns(self, page: Page) -> bool:
+        return id(page) in self._navigations
+
+    async def close(self) -> None:
+        """关闭池内全部空闲页面"""
+        self._closed = True
+        while not self._idle.empty():
+            page = self._idle.get_nowait()
+            if page is None:
+                self._reserved -= 1
+            else:
+                await self._discard(page)
+
+    async def _create(self) -> Page:
+        """在已占用的名额上创建页面（失败时交还名额）"""
+        try:
+            page = await self._context.new_page()
+        except Exception:
+            self._free_slot()
+            raise
+        self._navigations[id(page)] = 0
+        self.stats.created += 1
+        return page
+
+    async def _discard(self, page: Page) -> None:
+        if self._navigations.pop(id(page), None) is not None:
+            self.stats.created -= 1
+            self._free_slot()
+        try:
+            if not page.is_closed():
+                await page.close()
+        except Exception as e:
+            log.warning("关闭标签页失败", error=str(e))
+
+    def _free_slot(self) -> None:
+        """交还名额：放入补建标记唤醒等待中的租用（池已关闭时直接释放）"""
+        if self._closed:
+            self._reserved -= 1
+        else:
+            self._idle.put_nowait(None)
+
+    async def _is_healthy(self, page: Page) -> bool:
+        if page.is_closed():
+            return False
+        try:
+            await asyncio.wait_for(page.evaluate("1"), self.HEALTH_CHECK_TIMEOUT)
+            return True
+        except Exception:
+            return False
+
+
+async def _first_completed(awaitables: list, timeout: float) -> None:
+    """等待任一可等待对象成功完成（失败的忽略），全部失败或超时时抛出 TimeoutError"""
+    tasks = {asyncio.ensure_future(a) for a in awaitables}
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    try:
+        while tasks:
+            done, tasks = await asyncio.wait(
+                tasks,
+                timeout=max(0.0, deadline - loop.time()),
+                return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                break
+            if any(not t.cancelled() and t.exception() is None for t in done):
+                return
+        raise asyncio.TimeoutError("等待页面就绪超时")
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+@dataclass
+class _CaptureSession:
+    """单个标签页的元素捕获状态"""
+    enabled: bool = False
+    push: bool = False       # 已注册 expose_binding 推送通道
+    captured: asyncio.Queue = field(default_factory=asyncio.Queue)
+
+
 class BrowserManager:
     """浏览器管理器"""
 
@@ -67,40 +800,37 @@ class BrowserManager:
         self._browser: Browser | None = None
         self._context: BrowserContext | None = None
         self._page: Page | None = None
-        self._retry_policy = RetryPolicy()
-
-    async def start(self) -> Result[Page]:
-        """启动浏览器"""
+        self._pool: PagePool | None = None
+        self._owns_playwright = True
+        self._attached = False       # 通过 CDP 连接的浏览器（stop 时只断开，不关闭浏览器）
+        self._disconnected = False   # 浏览器被关闭或连接断开，下次操作前重连
+        self._stopping = False
+        self._reconnect_lock = asyncio.Lock()
+        self._retry_policy = RetryPolicy(max_attempts=self.config.max_retry, base_delay=self.config.retry_delay)
+        self.breakers = HostBreakers(self.config.breaker_threshold, self.config.breaker_reset)
+        self.rate_limiter = HostRateLimiter.from_config(self.config.rate_limits)
+        self._block_profiles: dict[str, BlockProfile] = dict(BLOCK_PROFILES)
+        self._page_routes: weakref.WeakKeyDictionary[Page, tuple[str, Callable]] = weakref.WeakKeyDictionary()
+        self._captures: weakref.WeakKeyDictionary[Page, _CaptureSession] = weakref.WeakKeyDictionary()
+        self.block_stats = BlockStats()
+        self._nav_strategies: dict[str, NavStrategy] = dict(NAV_STRATEGIES)
+        for name, override in self.config.nav_strategies.items():
+            base = self._nav_strategies.get(name)
+            data = {**(base.to_dict() if base else {}), **override, "name": name}
+            self.register_nav_strategy(NavStrategy.from_dict(data))
+
+    async def start(self, playwright: Playwright | None = None) -> Result[Page]:
+        """启动浏览器
+
+        Args:
+            playwright: 共享的 Playwright 实例（多个浏览器共用一个驱动进程），
+                为空时自行启动，stop() 时一并关闭
+        """
         try:
-            self._playwright = await async_playwright().start()
-
-            # 使用持久化上下文保存登录态
-            user_data_path = Path(self.config.user_data_dir)
-            user_data_path.mkdir(parents=True, exist_ok=True)
-
-            self._context = await self._playwright.chromium.launch_persistent_context(
-                user_data_dir=str(user_data_path),
-                headless=self.config.headless,
-                slow_mo=self.config.slow_mo,
-                args=[
-                    "--start-maximized",
-                    "--disable-blink-features=AutomationControlled",
-                    "--no-proxy-server",
-                ],
-                ignore_https_errors=True,
-                no_viewport=True,
-            )
-
-            # 设置默认超时
-            self._context.set_default_timeout(self.config.timeout)
-
-            # 获取或创建页面
-            pages = self._context.pages
-            if pages:
-                self._page = pages[0]
-            else:
-                self._page = await self._context.new_page()
-
+            self._owns_playwright = playwright is None
+            self._playwright = playwright or await async_playwright().start()
+            self._stopping = False
+            await self._open()
             return Result.ok(self._page)
         except Exception as e:
             return Result.fail_with(
@@ -109,14 +839,169 @@ class BrowserManager:
                 recoverable=False
             )
 
-    async def stop(self):
-        """关闭浏览器"""
-        if self._context:
+    async def _open(self):
+        """按运行模式启动或连接浏览器，并初始化标签页池和主标签页"""
+        if self.config.mode == "launch":
+            await self._launch()
+        else:
+            await self._attach()
+
+        # 设置默认超时
+        self._context.set_default_timeout(self.config.timeout)
+
+        self._pool = PagePool(
+            self._context,
+            size=self.config.pool_size,
+            max_navigations=self.config.page_max_navigations
+        )
+
+        # 获取或创建页面（连接已有浏览器时使用自己的标签页，不占用其他进程的页面）
+        pages = self._context.pages
+        if pages and not self._attached:
+            self._page = pages[0]
+        else:
+            self._page = await self._context.new_page()
+        self._disconnected = False
+
+    async def _launch(self):
+        """本进程启动持久化浏览器"""
+        # 使用持久化上下文保存登录态
+        user_data_path = Path(self.config.user_data_dir)
+        user_data_path.mkdir(parents=True, exist_ok=True)
+
+        self._context = await self._playwright.chromium.launch_persistent_context(
+            user_data_dir=str(user_data_path),
+            headless=self.config.headless,
+            slow_mo=self.config.slow_mo,
+            args=_LAUNCH_ARGS,
+            ignore_https_errors=True,
+            no_viewport=True,
+        )
+        self._attached = False
+        self._context.on("close", lambda _: self._on_disconnected())
+
+    async def _attach(self):
+        """通过 CDP 连接浏览器（server 模式下不存在时先启动独立进程）"""
+        endpoint = self.config.cdp_endpoint
+        if self.config.mode == "server":
+            endpoint = f"http://127.0.0.1:{self.config.debug_port}"
+            if not await asyncio.to_thread(_endpoint_alive, endpoint):
+                await self._spawn_server(endpoint)
+        if not endpoint:
+            raise RuntimeError("cdp 模式需要配置 cdp_endpoint")
+
+        self._browser = await self._playwright.chromium.connect_over_cdp(
+            endpoint, slow_mo=self.config.slow_mo, timeout=self.config.timeout
+        )
+        self._attached = True
+        self._browser.on("disconnected", lambda _: self._on_disconnected())
+
+        # 默认上下文即浏览器的用户目录，登录态与其他连接共享
+        if self._browser.contexts:
+            self._context = self._browser.contexts[0]
+        else:
+            self._context = await self._browser.new_context(no_viewport=True, ignore_https_errors=True)
+        log.info("已连接浏览器", endpoint=endpoint, pages=len(self._context.pages))
+
+    async def _spawn_server(self, endpoint: str):
+        """以独立进程启动带调试端口的浏览器，等待端口可用"""
+        user_data_path = Path(self.config.user_data_dir)
+        user_data_path.mkdir(parents=True, exist_ok=True)
+        args = [
+            self._playwright.chromium.executable_path,
+            f"--user-data-dir={user_data_path.resolve()}",
+            f"--remote-debugging-port={self.config.debug_port}",
+            "--no-first-run",
+            "--no-default-browser-check",
+            *_LAUNCH_ARGS,
+        ]
+        if self.config.headless:
+            args.append("--headless=new")
+
+        # 与当前进程脱离，进程退出后浏览器继续运行
+        kwargs = {"stdin": subprocess.DEVNULL, "stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL}
+        if os.name == "nt":
+            kwargs["creationflags"] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+        else:
+            kwargs["start_new_session"] = True
+        subprocess.Popen(args, **kwargs)
+        log.info("已启动常驻浏览器", port=self.config.debug_port, user_data_dir=str(user_data_path))
+
+        deadline = asyncio.get_running_loop().time() + self.config.timeout / 1000
+        while not await asyncio.to_thread(_endpoint_alive, endpoint):
+            if asyncio.get_running_loop().time() > deadline:
+                raise RuntimeError(f"等待浏览器调试端口超时: {endpoint}")
+            await asyncio.sleep(0.2)
+
+    def _on_disconnected(self):
+        """浏览器被关闭或连接断开"""
+        if self._stopping:
+            return
+        self._disconnected = True
+        log.warning("浏览器连接已断开，下次操作前自动重连", mode=self.config.mode)
+
+    @property
+    def connected(self) -> bool:
+        return self._context is not None and not self._disconnected
+
+    async def ensure_connected(self) -> Result[bool]:
+        """连接断开时重新启动或连接浏览器（旧的标签页全部失效）"""
+        if self._playwright is None:
+            return Result.fail_with(
+                code="B_NOT_STARTED",
+                message="浏览器未启动",
+                recoverable=False
+            )
+        async with self._reconnect_lock:
+            if not self._disconnected:
+                return Result.ok(True)
+
+            self._pool = None
+            self._page = None
+            self._page_routes = weakref.WeakKeyDictionary()
+            self._captures = weakref.WeakKeyDictionary()
+            last_error = None
+            for attempt in range(max(1, self.config.reconnect_attempts)):
+                try:
+                    await self._open()
+                    log.info("浏览器已重连", attempt=attempt + 1)
+                    return Result.ok(True)
+                except Exception as e:
+                    last_error = e
+                    log.warning("浏览器重连失败", attempt=attempt + 1, error=str(e))
+                    await asyncio.sleep(self._retry_policy.get_delay(attempt))
+
+            return Result.fail_with(
+                code="B_LAUNCH_FAILED",
+                message=f"浏览器重连失败: {last_error}",
+                recoverable=True
+            )
+
+    async def stop(self, shutdown_server: bool = False):
+        """关闭浏览器
+
+        连接模式下只关闭本进程创建的标签页并断开连接，浏览器继续运行；
+        shutdown_server=True 时同时关闭 server 模式启动的常驻浏览器。
+        """
+        self._stopping = True
+        if self._pool:
+            await self._pool.close()
+            self._pool = None
+        if self._attached and self._browser:
+            if self._page and not self._page.is_closed():
+                await self._page.close()
+            if shutdown_server and self.config.mode == "server":
+                session = await self._browser.new_browser_cdp_session()
+                await session.send("Browser.close")
+            else:
+                await self._browser.close()
+        elif self._context:
             await self._context.close()
-        if self._playwright:
+        if self._playwright and self._owns_playwright:
             await self._playwright.stop()
         self._page = None
         self._context = None
+        self._browser = None
         self._playwright = None
 
     @property
@@ -127,9 +1012,32 @@ class BrowserManager:
     def context(self) -> BrowserContext | None:
         return self._context
 
-    async def goto(self, url: str) -> Result[Page]:
-        """导航到指定 URL"""
-        if not self._page:
+    # ==================== 标签页池 ====================
+
+    @asynccontextmanager
+    async def lease_page(self, timeout: float = None) -> AsyncIterator[Page]:
+        """租用一个独占标签页，退出上下文时自动归还
+
+        用法:
+            async with browser.lease_page() as page:
+                await browser.goto(url, page=page)
+        """
+        if self._disconnected:
+            await self.ensure_connected()
+        pool = self._pool
+        if not pool:
+            raise RuntimeError("浏览器未启动")
+
+        # 归还到租出时的池（期间可能因重连换了新池）
+        page = await pool.acquire(timeout)
+        try:
+            yield page
+        finally:
+            await pool.release(page)
+
+    async def warm_pool(self, count: int = None) -> Result[int]:
+        """预热标签页池"""
+        if not self._pool:
             return Result.fail_with(
                 code="B_NOT_STARTED",
                 message="浏览器未启动",
@@ -137,16 +1045,201 @@ class BrowserManager:
             )
 
         try:
-            await self._page.goto(url, wait_until="domcontentloaded")
-            return Result.ok(self._page)
+            return Result.ok(await self._pool.warm(count))
+        except Exception as e:
+            return Result.fail_with(
+                code="B_NEW_PAGE_FAILED",
+                message=f"预热标签页失败: {e}",
+                recoverable=True
+            )
+
+    def pool_stats(self) -> PoolStats:
+        """标签页池统计"""
+        if not self._pool:
+            return PoolStats()
+        return self._pool.stats
+
+    # ==================== 资源拦截 ====================
+
+    def register_block_profile(self, profile: BlockProfile) -> None:
+        """注册（或覆盖）资源拦截配置"""
+        self._block_profiles[profile.name] = profile
+
+    async def apply_block_profile(self, profile_name: str, page: Page | None = None) -> Result[bool]:
+        """为标签页启用资源拦截配置（重复调用同一配置不会重复注册路由）"""
+        page = page or self._page
+        if not page:
+            return Result.fail_with(
+                code="B_NOT_STARTED",
+                message="浏览器未启动",
+                recoverable=False
+            )
+
+        profile = self._block_profiles.get(profile_name)
+        if profile is None:
+            return Result.fail_with(
+                code="B_UNKNOWN_PROFILE",
+                message=f"未知的拦截配置: {profile_name}",
+                recoverable=False,
+                context={"profile": profile_name}
+            )
+
+        current = self._page_routes.get(page)
+        if current and current[0] == profile_name:
+            return Result.ok(True)
+
+        try:
+            await self.clear_block_profile(page)
+            # 路由拦截会禁用 HTTP 缓存，不拦截任何资源的配置直接跳过
+            if not profile.blocks_anything:
+                return Result.ok(True)
+
+            stats = self.block_stats
+
+            async def handler(route: Route):
+                request = route.request
+                blocked = profile.should_block(request.resource_type, request.url)
+                stats.record(request.resource_type, blocked)
+                if blocked:
+                    await route.abort("blockedbyclient")
+                else:
+                    await route.continue_()
+
+            await page.route("**/*", handler)
+            self._page_routes[page] = (profile_name, handler)
+            return Result.ok(True)
+        except Exception as e:
+            return Result.fail_with(
+                code="B_ROUTE_FAILED",
+                message=f"设置资源拦截失败: {e}",
+                recoverable=True,
+                context={"profile": profile_name}
+            )
+
+    async def clear_block_profile(self, page: Page | None = None) -> None:
+        """移除标签页上的资源拦截"""
+        page = page or self._page
+        current = self._page_routes.pop(page, None) if page else None
+        if current and not page.is_closed():
+            await page.unroute("**/*", current[1])
+
+    # ==================== 导航 ====================
+
+    def register_nav_strategy(self, strategy: NavStrategy) -> None:
+        """注册（或覆盖）导航等待策略"""
+        self._nav_strategies[strategy.name] = strategy
+
+    def nav_strategy(self, strategy: str | NavStrategy | None = None) -> Result[NavStrategy]:
+        """按名称查找导航等待策略（为空时使用 default）"""
+        if isinstance(strategy, NavStrategy):
+            return Result.ok(strategy)
+        name = strategy or "default"
+        found = self._nav_strategies.get(name)
+        if found is None:
+            return Result.fail_with(
+                code="B_UNKNOWN_STRATEGY",
+                message=f"未知的导航策略: {name}",
+                recoverable=False,
+                context={"strategy": name}
+            )
+        return Result.ok(found)
+
+    async def goto(
+        self,
+        url: str,
+        page: Page | None = None,
+        timeout: int = None,
+        strategy: str | NavStrategy | None = None
+    ) -> Result[Page]:
+        """导航到指定 URL（timeout 为空时使用默认超时）
+
+        strategy 为页面类型对应的导航等待策略（见 NAV_STRATEGIES），为空时等待 DOMContentLoaded。
+        """
+        return await self._navigate(
+            page, url, timeout, strategy,
+            lambda p, wait_until, t: p.goto(url, wait_until=wait_until, timeout=t)
+        )
+
+    async def reload(
+        self,
+        page: Page | None = None,
+        timeout: int = None,
+        strategy: str | NavStrategy | None = None
+    ) -> Result[Page]:
+        """刷新页面，按导航等待策略等待就绪"""
+        return await self._navigate(
+            page, None, timeout, strategy,
+            lambda p, wait_until, t: p.reload(wait_until=wait_until, timeout=t)
+        )
+
+    async def _navigate(
+        self,
+        page: Page | None,
+        url: str | None,
+        timeout: int | None,
+        strategy: str | NavStrategy | None,
+        action: Callable
+    ) -> Result[Page]:
+        if self._disconnected:
+            await self.ensure_connected()
+        page = page or self._page
+        if not page:
+            return Result.fail_with(
+                code="B_NOT_STARTED",
+                message="浏览器未启动",
+                recoverable=False
+            )
+
+        strategy_result = self.nav_strategy(strategy)
+        if not strategy_result.success:
+            return strategy_result
+        nav = strategy_result.data
+
+        url = url or page.url
+        breaker = self.breakers.for_url(url)
+        if breaker and not breaker.allow():
+            return breaker.reject(url)
+        await self.rate_limiter.acquire(url)
+
+        result = await self._navigate_once(page, url, timeout or self.config.timeout, nav, action)
+        if breaker:
+            breaker.record(result)
+        return result
+
+    async def _navigate_once(
+        self,
+        page: Page,
+        url: str,
+        timeout: int,
+        nav: NavStrategy,
+        action: Callable
+    ) -> Result[Page]:
+        try:
+            if self._pool:
+                self._pool.record_navigation(page)
+            with _NavWatcher(page, nav) as watcher:
+                started = time.perf_counter()
+                await action(page, nav.wait_until, timeout)
+                # 导航与就绪等待共用 timeout，只把剩余时间交给 _wait_ready
+                remaining = timeout - (time.perf_counter() - started) * 1000
+                if remaining <= 0 and nav.has_ready_signal:
+                    raise asyncio.TimeoutError()
+                await self._wait_ready(page, nav, watcher, max(remaining, 0))
+            log.debug(
+                "页面就绪",
+                strategy=nav.name,
+                elapsed=round(time.perf_counter() - started, 3),
+                url=url
+            )
+            return Result.ok(page)
         except Exception as e:
             error_msg = str(e)
-            if "timeout" in error_msg.lower():
+            if isinstance(e, asyncio.TimeoutError) or "timeout" in error_msg.lower():
                 return Result.fail_with(
                     code="B_TIMEOUT",
                     message=f"页面加载超时: {url}",
                     recoverable=True,
-                    context={"url": url}
+                    context={"url": url, "strategy": nav.name}
                 )
             return Result.fail_with(
                 code="B_NETWORK_ERROR",
@@ -155,13 +1248,78 @@ class BrowserManager:
                 context={"url": url}
             )
 
+    async def _wait_ready(self, page: Page, nav: NavStrategy, watcher: _NavWatcher, timeout: float):
+        """等待就绪信号（任一满足即可），之后按策略等待网络空闲
+
+        timeout 为剩余预算（ms），网络空闲等待也不超出该预算。
+        """
+        deadline = time.perf_counter() + timeout / 1000
+        if nav.has_ready_signal:
+            waiters = []
+            selectors = list(nav.ready_selectors)
+            # CSS 选择器合并为一次等待；xpath/text 等其他引擎单独等待
+            css = [s for s in selectors if not _ENGINE_PREFIX.match(s) and not s.startswith("//")]
+            others = [s for s in selectors if s not in css]
+            if css:
+                waiters.append(page.wait_for_selector(", ".join(css), state="attached", timeout=timeout))
+            for selector in others:
+                waiters.append(page.wait_for_selector(selector, state="attached", timeout=timeout))
+            if nav.ready_responses:
+                waiters.append(watcher.response_done.wait())
+            if nav.dom_ready_fallback:
+                waiters.append(page.wait_for_load_state("domcontentloaded", timeout=timeout))
+            await _first_completed(waiters, timeout / 1000)
+
+        if nav.network_quiet:
+            budget = min(nav.quiet_timeout / 1000, max(0.0, deadline - time.perf_counter()))
+            quiet = await watcher.wait_quiet(nav.network_quiet / 1000, budget)
+            if not quiet:
+                log.debug("等待网络空闲超时", strategy=nav.name, url=page.url)
+
+    async def probe(
+        self,
+        selectors: list[str],
+        timeout: int = None,
+        visible: bool = True,
+        page: Page | None = None
+    ) -> Result[str | None]:
+        """在时间预算内并行探测候选选择器，返回第一个存在的（按列表顺序）
+
+        一次页面往返检查全部候选，元素尚未渲染时等待 DOM 变化，
+        不会像逐个 fill/click 那样在错误的候选上耗尽默认超时。
+        全部不存在时返回 None。
+        """
+        page = page or self._page
+        if not page:
+            return Result.fail_with(
+                code="B_NOT_STARTED",
+                message="浏览器未启动",
+                recoverable=False
+            )
+        if not selectors:
+            return Result.ok(None)
+
+        budget = self.config.probe_timeout if timeout is None else timeout
+        try:
+            idx = await page.evaluate(_PROBE_JS, [list(selectors), budget, visible])
+        except Exception as e:
+            return Result.fail_with(
+                code="B_PROBE_FAILED",
+                message=f"探测元素失败: {e}",
+                recoverable=True,
+                context={"selectors": list(selectors)}
+            )
+        return Result.ok(selectors[idx] if idx >= 0 else None)
+
     async def wait_for_selector(
         self,
         selector: str,
-        timeout: int = None
+        timeout: int = None,
+        page: Page | None = None
     ) -> Result[bool]:
         """等待元素出现"""
-        if not self._page:
+        page = page or self._page
+        if not page:
             return Result.fail_with(
                 code="B_NOT_STARTED",
                 message="浏览器未启动",
@@ -169,7 +1327,7 @@ class BrowserManager:
             )
 
         try:
-            await self._page.wait_for_selector(
+            await page.wait_for_selector(
                 selector,
                 timeout=timeout or self.config.timeout
             )
@@ -189,9 +1347,10 @@ class BrowserManager:
                 context={"selector": selector}
             )
 
-    async def click(self, selector: str) -> Result[bool]:
-        """点击元素"""
-        if not self._page:
+    async def click(self, selector: str, page: Page | None = None, timeout: int = None) -> Result[bool]:
+        """点击元素（timeout 为空时使用默认超时）"""
+        page = page or self._page
+        if not page:
             return Result.fail_with(
                 code="B_NOT_STARTED",
                 message="浏览器未启动",
@@ -199,7 +1358,7 @@ class BrowserManager:
             )
 
         try:
-            await self._page.click(selector)
+            await page.click(selector, timeout=timeout or self.config.timeout)
             return Result.ok(True)
         except Exception as e:
             return Result.fail_with(
@@ -209,9 +1368,16 @@ class BrowserManager:
                 context={"selector": selector}
             )
 
-    async def fill(self, selector: str, value: str) -> Result[bool]:
-        """填写输入框"""
-        if not self._page:
+    async def fill(
+        self,
+        selector: str,
+        value: str,
+        page: Page | None = None,
+        timeout: int = None
+    ) -> Result[bool]:
+        """填写输入框（timeout 为空时使用默认超时）"""
+        page = page or self._page
+        if not page:
             return Result.fail_with(
                 code="B_NOT_STARTED",
                 message="浏览器未启动",
@@ -219,7 +1385,7 @@ class BrowserManager:
             )
 
         try:
-            await self._page.fill(selector, value)
+            await page.fill(selector, value, timeout=timeout or self.config.timeout)
             return Result.ok(True)
         except Exception as e:
             return Result.fail_with(
@@ -229,9 +1395,15 @@ class BrowserManager:
                 context={"selector": selector, "value": value}
             )
 
-    async def screenshot(self, path: str = None) -> Result[bytes]:
-        """截图"""
-        if not self._page:
+    async def screenshot(
+        self,
+        path: str = None,
+        page: Page | None = None,
+        timeout: int = None
+    ) -> Result[bytes]:
+        """截图（timeout 为空时使用默认超时）"""
+        page = page or self._page
+        if not page:
             return Result.fail_with(
                 code="B_NOT_STARTED",
                 message="浏览器未启动",
@@ -239,7 +1411,7 @@ class BrowserManager:
             )
 
         try:
-            screenshot = await self._page.screenshot(path=path)
+            screenshot = await page.screenshot(path=path, timeout=timeout or self.config.timeout)
             return Result.ok(screenshot)
         except Exception as e:
             return Result.fail_with(
@@ -248,9 +1420,10 @@ class BrowserManager:
                 recoverable=True
             )
 
-    async def get_content(self, selector: str) -> Result[str]:
+    async def get_content(self, selector: str, page: Page | None = None) -> Result[str]:
         """获取元素内容"""
-        if not self._page:
+        page = page or self._page
+        if not page:
             return Result.fail_with(
                 code="B_NOT_STARTED",
                 message="浏览器未启动",
@@ -258,7 +1431,7 @@ class BrowserManager:
             )
 
         try:
-            element = await self._page.query_selector(selector)
+            element = await page.query_selector(selector)
             if element:
                 content = await element.text_content()
                 return Result.ok(content or "")
@@ -276,9 +1449,15 @@ class BrowserManager:
                 context={"selector": selector}
             )
 
-    async def get_attribute(self, selector: str, attribute: str) -> Result[str | None]:
+    async def get_attribute(
+        self,
+        selector: str,
+        attribute: str,
+        page: Page | None = None
+    ) -> Result[str | None]:
         """获取元素属性"""
-        if not self._page:
+        page = page or self._page
+        if not page:
             return Result.fail_with(
                 code="B_NOT_STARTED",
                 message="浏览器未启动",
@@ -286,7 +1465,7 @@ class BrowserManager:
             )
 
         try:
-            element = await self._page.query_selector(selector)
+            element = await page.query_selector(selector)
             if element:
                 value = await element.get_attribute(attribute)
                 return Result.ok(value)
@@ -304,9 +1483,10 @@ class BrowserManager:
                 context={"selector": selector, "attribute": attribute}
             )
 
-    async def is_logged_in(self, check_selector: str) -> Result[bool]:
+    async def is_logged_in(self, check_selector: str, page: Page | None = None) -> Result[bool]:
         """检查是否已登录"""
-        if not self._page:
+        page = page or self._page
+        if not page:
             return Result.fail_with(
                 code="B_NOT_STARTED",
                 message="浏览器未启动",
@@ -314,246 +1494,49 @@ class BrowserManager:
             )
 
         try:
-            element = await self._page.query_selector(check_selector)
+            element = await page.query_selector(check_selector)
             return Result.ok(element is not None)
         except Exception:
             return Result.ok(False)
 
+    @property
+    def retry_policy(self) -> RetryPolicy:
+        return self._retry_policy
+
     async def with_retry(
         self,
         action: Callable,
         *args,
         **kwargs
     ) -> Result:
-        """带重试的执行"""
-        last_result = None
-        for attempt in range(self._retry_policy.max_attempts):
-            result = await action(*args, **kwargs)
-            if result.success:
-                return result
-
-            last_result = result
-            # 检查是否可重试
-            if result.error and result.error.code in self._retry_policy.retryable_codes:
-                delay = self._retry_policy.get_delay(attempt)
-                await asyncio.sleep(delay)
-            else:
-                break
-
-        return last_result or Result.fail_with(
-            code="B_RETRY_EXHAUSTED",
-            message="重试次数已用尽",
-            recoverable=False
-        )
+        """带重试的执行（指数退避 + 随机抖动，熔断中的域名等冷却结束再重试）"""
+        return await with_retry(action, *args, policy=self._retry_policy, **kwargs)
 
     # ==================== 元素捕获模式 ====================
 
-    async def enable_element_capture(self) -> Result[bool]:
-        """启用元素捕获模式（Ctrl+点击捕获元素）"""
-        if not self._page:
+    async def enable_element_capture(self, page: Page | None = None) -> Result[bool]:
+        """启用元素捕获模式（Ctrl+点击捕获元素）
+
+        捕获脚本在标签页上只注册一次，页面导航后自动恢复，不需要重复调用。
+        """
+        page = page or self._page
+        if not page:
             return Result.fail_with(
                 code="B_NOT_STARTED",
                 message="浏览器未启动",
                 recoverable=False
             )
 
-        js_code = """
-        (() => {
-            // 清理已有元素（支持重复注入）
-            const existingOverlay = document.getElementById('__capture_overlay');
-            const existingLabel = document.getElementById('__capture_label');
-            if (existingOverlay) existingOverlay.remove();
-            if (existingLabel) existingLabel.remove();
-
-            window.__elementCaptureEnabled = true;
-            window.__capturedElement = null;
-
-            // 创建高亮覆盖层
-            const overlay = document.createElement('div');
-            overlay.id = '__capture_overlay';
-            overlay.style.cssText = `
-                position: fixed;
-                pointer-events: none;
-                border: 2px solid #1890ff;
-                background: rgba(24, 144, 255, 0.1);
-                z-index: 999999;
-                display: none;
-                transition: all 0.1s ease;
-            `;
-            document.body.appendChild(overlay);
-
-            // 创建标签提示
-            const label = document.createElement('div');
-            label.id = '__capture_label';
-            label.style.cssText = `
-                position: fixed;
-                background: #1890ff;
-                color: white;
-                padding: 2px 8px;
-                font-size: 12px;
-                font-family: monospace;
-                z-index: 999999;
-                display: none;
-                border-radius: 2px;
-            `;
-            document.body.appendChild(label);
-
-            // 创建状态提示（右下角）
-            const status = document.createElement('div');
-            status.id = '__capture_status';
-            status.innerHTML = '捕获模式已激活<br><small>按住 Ctrl 移动鼠标</small>';
-            status.style.cssText = `
-                position: fixed;
-                bottom: 20px;
-                right: 20px;
-                background: #1890ff;
-                color: white;
-                padding: 12px 16px;
-                font-size: 14px;
-                font-family: system-ui, sans-serif;
-                z-index: 999999;
-                border-radius: 8px;
-                box-shadow: 0 4px 12px rgba(0,0,0,0.15);
-            `;
-            document.body.appendChild(status);
-
-            // 3秒后淡出状态提示
-            setTimeout(() => {
-                status.style.transition = 'opacity 0.5s';
-                status.style.opacity = '0';
-                setTimeout(() => status.remove(), 500);
-            }, 3000);
-
-            // 生成 XPath 选择器
-            function getXPath(el) {
-                // 优先使用 id
-                if (el.id) {
-                    return '//' + el.tagName.toLowerCase() + '[@id="' + el.id + '"]';
-                }
-
-                // 尝试用属性生成唯一 XPath
-                const attrs = ['name', 'data-testid', 'data-id', 'placeholder', 'type'];
-                for (const attr of attrs) {
-                    const value = el.getAttribute(attr);
-                    if (value) {
-                        const xpath = '//' + el.tagName.toLowerCase() + '[@' + attr + '="' + value + '"]';
-                        try {
-                            const result = document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
-                            if (result.snapshotLength === 1) {
-                                return xpath;
-                            }
-                        } catch (e) {}
-                    }
-                }
-
-                // 尝试用 class
-                const className = el.getAttribute('class');
-                if (className) {
-                    const classes = className.split(' ').filter(c => c && !c.includes(':') && c.length < 30);
-                    for (const cls of classes.slice(0, 3)) {
-                        const xpath = '//' + el.tagName.toLowerCase() + '[contains(@class, "' + cls + '")]';
-                        try {
-                            const result = document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
-                            if (result.snapshotLength === 1) {
-                                return xpath;
-                            }
-                        } catch (e) {}
-                    }
-                }
-
-                // 使用完整路径
-                const path = [];
-                let current = el;
-                while (current && current.nodeType === Node.ELEMENT_NODE) {
-                    let index = 1;
-                    let sibling = current.previousElementSibling;
-                    while (sibling) {
-                        if (sibling.tagName === current.tagName) {
-                            index++;
-                        }
-                        sibling = sibling.previousElementSibling;
-                    }
-
-                    const tagName = current.tagName.toLowerCase();
-                    // 检查是否有同名兄弟节点
-                    let hasMultiple = false;
-                    sibling = current.parentElement ? current.parentElement.firstElementChild : null;
-                    while (sibling) {
-                        if (sibling !== current && sibling.tagName === current.tagName) {
-                            hasMultiple = true;
-                            break;
-                        }
-                        sibling = sibling.nextElementSibling;
-                    }
-
-                    if (hasMultiple) {
-                        path.unshift(tagName + '[' + index + ']');
-                    } else {
-                        path.unshift(tagName);
-                    }
-
-                    current = current.parentElement;
-                }
-                return '/' + path.join('/');
-            }
-
-            // 鼠标移动高亮
-            document.addEventListener('mousemove', (e) => {
-                if (!e.ctrlKey) {
-                    overlay.style.display = 'none';
-                    label.style.display = 'none';
-                    return;
-                }
-
-                const el = document.elementFromPoint(e.clientX, e.clientY);
-                if (!el || el === overlay || el === label) return;
-
-                const rect = el.getBoundingClientRect();
-                overlay.style.left = rect.left + 'px';
-                overlay.style.top = rect.top + 'px';
-                overlay.style.width = rect.width + 'px';
-                overlay.style.height = rect.height + 'px';
-                overlay.style.display = 'block';
-
-                label.textContent = el.tagName.toLowerCase() + (el.id ? '#' + el.id : '');
-                label.style.left = rect.left + 'px';
-                label.style.top = (rect.top - 24) + 'px';
-                label.style.display = 'block';
-            });
-
-            // Ctrl+点击捕获
-            document.addEventListener('click', (e) => {
-                if (!e.ctrlKey) return;
-
-                e.preventDefault();
-                e.stopPropagation();
-
-                const el = document.elementFromPoint(e.clientX, e.clientY);
-                if (!el || el === overlay || el === label) return;
-
-                const xpath = getXPath(el);
-                window.__capturedElement = {
-                    selector: xpath,
-                    tagName: el.tagName.toLowerCase(),
-                    id: el.id || null,
-                    className: el.className || null,
-                    text: el.innerText ? el.innerText.slice(0, 50) : null
-                };
-
-                // 闪烁确认效果
-                overlay.style.background = 'rgba(82, 196, 26, 0.3)';
-                overlay.style.borderColor = '#52c41a';
-                setTimeout(() => {
-                    overlay.style.background = 'rgba(24, 144, 255, 0.1)';
-                    overlay.style.borderColor = '#1890ff';
-                }, 300);
-            }, true);
-        })();
-        """
-
         try:
-            await self._page.evaluate(js_code)
-            log.info("元素捕获模式已启用")
+            session = await self._install_capture(page)
+            session.enabled = True
+            # 丢弃上次捕获模式中未取走的元素
+            while not session.captured.empty():
+                session.captured.get_nowait()
+            # init script 只对之后的导航生效，当前文档直接执行一次
+            await page.evaluate(_CAPTURE_JS)
+            await page.evaluate("window.__setElementCapture(true)")
+            log.info("元素捕获模式已启用", push=session.push)
             return Result.ok(True)
         except Exception as e:
             return Result.fail_with(
@@ -562,20 +1545,54 @@ class BrowserManager:
                 recoverable=False
             )
 
-    async def get_captured_element(self) -> Result[dict | None]:
-        """获取捕获的元素信息"""
-        if not self._page:
+    async def _install_capture(self, page: Page) -> _CaptureSession:
+        """为标签页注册捕获脚本和推送通道（每个标签页只注册一次）"""
+        session = self._captures.get(page)
+        if session is not None:
+            return session
+
+        session = _CaptureSession()
+        try:
+            await page.expose_binding(
+                "__pushCapturedElement",
+                lambda source, element: self._on_element_captured(page, element)
+            )
+            await page.expose_binding("__captureEnabled", lambda source: session.enabled)
+            session.push = True
+        except Exception as e:
+            # 推送通道不可用时退回轮询 window.__capturedElement
+            log.debug("无法注册捕获推送通道，使用轮询", error=str(e))
+        await page.add_init_script(_CAPTURE_JS)
+        self._captures[page] = session
+        return session
+
+    def _on_element_captured(self, page: Page, element: dict):
+        """页面推送的捕获结果"""
+        session = self._captures.get(page)
+        if session is not None and session.enabled and element:
+            session.captured.put_nowait(element)
+
+    async def get_captured_element(self, page: Page | None = None) -> Result[dict | None]:
+        """获取捕获的元素信息（没有新捕获时返回 None）"""
+        page = page or self._page
+        if not page:
             return Result.fail_with(
                 code="B_NOT_STARTED",
                 message="浏览器未启动",
                 recoverable=False
             )
 
+        session = self._captures.get(page)
+        if session is not None and session.push:
+            if session.captured.empty():
+                return Result.ok(None)
+            return Result.ok(session.captured.get_nowait())
+
         try:
-            result = await self._page.evaluate("window.__capturedElement")
+            result = await page.evaluate("window.__capturedElement")
             if result:
                 # 清除已捕获的元素
-                await self._page.evaluate("window.__capturedElement = null")
+                await page.evaluate("window.__capturedElement = null")
             return Result.ok(result)
         except Exception as e:
             return Result.fail_with(
@@ -584,43 +1601,52 @@ class BrowserManager:
                 recoverable=True
             )
 
-    async def disable_element_capture(self) -> Result[bool]:
+    async def disable_element_capture(self, page: Page | None = None) -> Result[bool]:
         """禁用元素捕获模式"""
-        if not self._page:
+        page = page or self._page
+        if not page:
             return Result.ok(True)
 
-        js_code = """
-        (() => {
-            window.__elementCaptureEnabled = false;
-            window.__capturedElement = null;
-            const overlay = document.getElementById('__capture_overlay');
-            const label = document.getElementById('__capture_label');
-            const status = document.getElementById('__capture_status');
-            if (overlay) overlay.remove();
-            if (label) label.remove();
-            if (status) status.remove();
-        })();
-        """
+        session = self._captures.get(page)
+        if session is not None:
+            session.enabled = False
 
         try:
-            await self._page.evaluate(js_code)
+            await page.evaluate("window.__setElementCapture && window.__setElementCapture(false)")
             log.info("元素捕获模式已禁用")
             return Result.ok(True)
         except Exception:
             return Result.ok(True)
 
-    async def wait_for_element_capture(self, timeout: int = 60000) -> Result[dict]:
-        """等待用户捕获元素"""
-        if not self._page:
+    async def wait_for_element_capture(
+        self,
+        timeout: int = 60000,
+        page: Page | None = None
+    ) -> Result[dict]:
+        """等待用户捕获元素（有推送通道时立即返回，否则每 0.2 秒轮询）"""
+        page = page or self._page
+        if not page:
             return Result.fail_with(
                 code="B_NOT_STARTED",
                 message="浏览器未启动",
                 recoverable=False
             )
 
+        session = self._captures.get(page)
+        if session is not None and session.push:
+            try:
+                element = await asyncio.wait_for(session.captured.get(), timeout / 1000)
+                return Result.ok(element)
+            except asyncio.TimeoutError:
+                return Result.fail_with(
+                    code="B_TIMEOUT",
+                    message="等待元素捕获超时",
+                    recoverable=True
+                )
+
         start_time = asyncio.get_event_loop().time()
         while True:
-            result = await self.get_captured_element()
+            result = await self.get_captured_element(page)
             if result.success and result.data:
                 return Result.ok(result.data)
 
@@ -0,0 +1,245 @@
+"""
+HTTP 客户端封装（连接池 + 复用浏览器 cookies）
+"""
+import hashlib
+import importlib.util
+import json
+import os
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import httpx
+
+from src.models import Result
+from src.infra.logger import logger
+from src.infra.resilience import HostBreakers, HostRateLimiter
+
+log = logger.get("http")
+
+# 与浏览器保持一致的请求头，避免被识别为脚本请求
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
+}
+
+# 说明站点正在限流的状态码
+THROTTLE_STATUS = frozenset({429, 503})
+
+
+@dataclass
+class HttpConfig:
+    """HTTP 客户端配置"""
+    timeout: float = 15.0               # 单次请求超时（秒）
+    max_connections: int = 32           # 连接池上限
+    max_keepalive: int = 16             # 保持的空闲连接数
+    http2: bool = True                  # 启用 HTTP/2（需安装 h2）
+    cookie_file: str = "cookies.json"   # BrowserManager.save_cookies 导出的文件
+    # 按域名限速（格式同 BrowserConfig.rate_limits），传入共用的 rate_limiter 时忽略
+    rate_limits: dict[str, dict] = field(default_factory=dict)
+
+
+@dataclass
+class HttpPage:
+    """HTTP 响应"""
+    url: str           # 重定向后的最终 URL
+    status: int
+    text: str
+
+
+@dataclass
+class HttpDownload:
+    """流式下载结果（内容写入临时文件，由调用方移动或删除）"""
+    url: str
+    path: Path
+    sha256: str
+    size: int
+    content_type: str
+
+
+class HttpClient:
+    """异步 HTTP 客户端：单个连接池在整个批次中复用"""
+
+    def __init__(
+        self,
+        config: HttpConfig = None,
+        breakers: HostBreakers = None,
+        rate_limiter: HostRateLimiter = None
+    ):
+        self.config = config or HttpConfig()
+        # 按域名熔断和限速（可与 BrowserManager 共用，两种采集后端看到同一个限流状态）
+        self.breakers = breakers or HostBreakers()
+        self.rate_limiter = rate_limiter or HostRateLimiter.from_config(self.config.rate_limits)
+        self._client: httpx.AsyncClient | None = None
+
+    async def start(self) -> Result[bool]:
+        """创建连接池并加载 cookies"""
+        if self._client:
+            return Result.ok(True)
+
+        http2 = self.config.http2 and importlib.util.find_spec("h2") is not None
+        if self.config.http2 and not http2:
+            log.info("未安装 h2，使用 HTTP/1.1")
+
+        self._client = httpx.AsyncClient(
+            http2=http2,
+            headers=DEFAULT_HEADERS,
+            cookies=self._load_cookies(),
+            timeout=self.config.timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=self.config.max_connections,
+                max_keepalive_connections=self.config.max_keepalive
+            )
+        )
+        return Result.ok(True)
+
+    async def close(self):
+        """关闭连接池"""
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+
+    async def get(self, url: str, headers: dict = None) -> Result[HttpPage]:
+        """GET 请求，返回文本响应（域名熔断中时直接返回 B_CIRCUIT_OPEN）"""
+        if not self._client:
+            return Result.fail_with(
+                code="B_NOT_STARTED",
+                message="HTTP 客户端未启动",
+                recoverable=False
+            )
+
+        breaker = self.breakers.for_url(url)
+        if breaker and not breaker.allow():
+            return breaker.reject(url)
+        await self.rate_limiter.acquire(url)
+
+        result = await self._get(url, headers)
+        if breaker:
+            # 429/503 是站点在限流，和超时一样计入熔断
+            if result.success and result.data.status in THROTTLE_STATUS:
+                breaker.record_failure()
+            else:
+                breaker.record(result)
+        return result
+
+    async def _get(self, url: str, headers: dict | None) -> Result[HttpPage]:
+        try:
+            response = await self._client.get(url, headers=headers)
+            return Result.ok(HttpPage(
+                url=str(response.url),
+                status=response.status_code,
+                text=response.text
+            ))
+        except httpx.TimeoutException:
+            return Result.fail_with(
+                code="B_TIMEOUT",
+                message=f"请求超时: {url}",
+                recoverable=True,
+                context={"url": url}
+            )
+        except httpx.HTTPError as e:
+            return Result.fail_with(
+                code="B_NETWORK_ERROR",
+                message=f"网络错误: {e}",
+                recoverable=True,
+                context={"url": url}
+            )
+
+    async def download(
+        self,
+        url: str,
+        dest_dir: Path,
+        headers: dict = None,
+        max_bytes: int = None
+    ) -> Result[HttpDownload]:
+        """流式下载到 dest_dir 下的临时文件，边写入边计算 SHA-256"""
+        if not self._client:
+            return Result.fail_with(
+                code="B_NOT_STARTED",
+                message="HTTP 客户端未启动",
+                recoverable=False
+            )
+
+        await self.rate_limiter.acquire(url)
+        dest_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=dest_dir, suffix=".part")
+        tmp_path = Path(tmp_name)
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with os.fdopen(fd, "wb") as f:
+                async with self._client.stream("GET", url, headers=headers) as response:
+                    if response.status_code != 200:
+                        tmp_path.unlink(missing_ok=True)
+                        return Result.fail_with(
+                            code="B_NETWORK_ERROR",
+                            message=f"下载失败: HTTP {response.status_code}",
+                            recoverable=response.status_code == 429 or response.status_code >= 500,
+                            context={"url": url, "status": response.status_code}
+                        )
+                    async for chunk in response.aiter_bytes():
+                        size += len(chunk)
+                        if max_bytes and size > max_bytes:
+                            tmp_path.unlink(missing_ok=True)
+                            return Result.fail_with(
+                                code="B_NETWORK_ERROR",
+                                message=f"文件超过 {max_bytes} 字节",
+                                recoverable=False,
+                                context={"url": url}
+                            )
+                        digest.update(chunk)
+                        f.write(chunk)
+                    content_type = response.headers.get("content-type", "")
+                    final_url = str(response.url)
+        except httpx.TimeoutException:
+            tmp_path.unlink(missing_ok=True)
+            return Result.fail_with(
+                code="B_TIMEOUT",
+                message=f"下载超时: {url}",
+                recoverable=True,
+                context={"url": url}
+            )
+        except (httpx.HTTPError, OSError) as e:
+            tmp_path.unlink(missing_ok=True)
+            return Result.fail_with(
+                code="B_NETWORK_ERROR",
+                message=f"下载失败: {e}",
+                recoverable=True,
+                context={"url": url}
+            )
+
+        return Result.ok(HttpDownload(
+            url=final_url,
+            path=tmp_path,
+            sha256=digest.hexdigest(),
+            size=size,
+            content_type=content_type.split(";")[0].strip()
+        ))
+
+    def _load_cookies(self) -> httpx.Cookies:
+        """加载浏览器导出的 cookies"""
+        cookies = httpx.Cookies()
+        cookie_path = Path(self.config.cookie_file)
+        if not cookie_path.exists():
+            return cookies
+
+        try:
+            with open(cookie_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            for cookie in data:
+                if cookie.get("name") and cookie.get("value") is not None:
+                    cookies.set(
+                        cookie["name"],
+                        cookie["value"],
+                        domain=cookie.get("domain", ""),
+                        path=cookie.get("path", "/")
+                    )
+            log.info(f"已加载 {len(data)} 个 cookies", file=str(cookie_path))
+        except (json.JSONDecodeError, OSError, TypeError) as e:
+            log.warning("加载 cookies 失败", error=str(e))
+        return cookies
@@ -3,10 +3,12 @@
 """
 from .problem import ProblemStorage
 from .solution import SolutionStorage
+from .matcher import SolutionMatcher
 from .base import KnowledgeBase
 
 __all__ = [
     "ProblemStorage",
     "SolutionStorage",
+    "SolutionMatcher",
     "KnowledgeBase",
 ]
@@ -0,0 +1,233 @@
+"""
+方案匹配索引
+
+按问题类型分组缓存方案，正则只编译一次；URL 规则按字面量前缀建立前缀树，
+查找时只需对少量候选执行正则。
+"""
+import re
+from dataclasses import dataclass, field
+
+from src.models import Solution, TrustLevel
+from src.infra.logger import logger
+
+log = logger.get("knowledge")
+
+# 信任等级排序（FAILED 方案不参与匹配）
+_TRUST_ORDER = {
+    TrustLevel.TRUSTED.value: 0,
+    TrustLevel.TESTING.value: 1,
+    TrustLevel.NEW.value: 2,
+}
+
+_REGEX_SPECIAL = set(".^$*+?{}[]\\|()")
+_QUANTIFIERS = set("*+?{")
+
+# 非锚定模式的字面量短于该长度时不做子串预筛
+_MIN_LITERAL = 4
+
+
+def literal_prefix(pattern: str) -> tuple[bool, str]:
+    """提取正则开头的字面量前缀
+
+    返回 (是否锚定到开头, 字面量)。包含分支（|）的模式无法安全提取，返回空字面量。
+    """
+    if "|" in pattern:
+        return False, ""
+
+    anchored = False
+    i = 0
+    if pattern.startswith("^"):
+        anchored, i = True, 1
+    elif pattern.startswith("\\A"):
+        anchored, i = True, 2
+
+    chars: list[str] = []
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == "\\":
+            if i + 1 < len(pattern) and not pattern[i + 1].isalnum():
+                ch, step = pattern[i + 1], 2
+            else:
+                break
+        elif ch in _REGEX_SPECIAL:
+            break
+        else:
+            step = 1
+
+        # 后面跟量词时该字符可有可无，不能计入前缀
+        if i + step < len(pattern) and pattern[i + step] in _QUANTIFIERS:
+            break
+        chars.append(ch)
+        i += step
+
+    return anchored, "".join(chars)
+
+
+def _compile(pattern: str | None, solution_id: str) -> re.Pattern | None:
+    if not pattern:
+        return None
+    try:
+        return re.compile(pattern)
+    except re.error as e:
+        log.warning("方案匹配规则无效", solution_id=solution_id, pattern=pattern, error=str(e))
+        return None
+
+
+@dataclass
+class _Entry:
+    """编译后的方案"""
+    solution: Solution
+    seq: int                              # 加入顺序（同分时保持原索引顺序）
+    url_re: re.Pattern | None = None
+    element_re: re.Pattern | None = None
+    has_url_rule: bool = False
+    has_element_rule: bool = False
+    invalid: bool = False                 # 规则无法编译，永不匹配
+    url_literal: str = ""                 # 非锚定模式的字面量（子串预筛）
+
+    @property
+    def sort_key(self) -> tuple:
+        return (
+            _TRUST_ORDER.get(self.solution.trust_level.value, 99),
+            -self.solution.stats.success_rate,
+            self.seq
+        )
+
+    def matches(self, context: dict) -> bool:
+        """与 SolutionStorage._matches 语义一致"""
+        if self.invalid:
+            return False
+        if self.has_url_rule and "page_url" in context:
+            if not self.url_re.search(context["page_url"] or ""):
+                return False
+        if self.has_element_rule and "element_selector" in context:
+            if not self.element_re.search(context.get("element_selector") or ""):
+                return False
+        return True
+
+
+class _PrefixTrie:
+    """字符前缀树：查找所有前缀与 URL 开头一致的条目"""
+
+    def __init__(self):
+        self._root: dict = {}
+
+    def add(self, prefix: str, entry: _Entry):
+        node = self._root
+        for ch in prefix:
+            node = node.setdefault(ch, {})
+        node.setdefault(None, []).append(entry)
+
+    def remove(self, prefix: str, entry: _Entry):
+        node = self._root
+        for ch in prefix:
+            node = node.get(ch)
+            if node is None:
+                return
+        items = node.get(None, [])
+        if entry in items:
+            items.remove(entry)
+
+    def lookup(self, text: str) -> list[_Entry]:
+        found = list(self._root.get(None, []))
+        node = self._root
+        for ch in text:
+            node = node.get(ch)
+            if node is None:
+                break
+            found.extend(node.get(None, []))
+        return found
+
+
+@dataclass
+class _Group:
+    """同一问题类型的方案"""
+    anchored: _PrefixTrie = field(default_factory=_PrefixTrie)   # 锚定 URL 规则
+    literal: list[_Entry] = field(default_factory=list)          # 非锚定，可子串预筛
+    unindexed: list[_Entry] = field(default_factory=list)        # 无 URL 规则或无法提取字面量
+    all: list[_Entry] = field(default_factory=list)
+    prefixes: dict[str, str] = field(default_factory=dict)       # 方案 ID -> 锚定前缀
+
+
+class SolutionMatcher:
+    """方案匹配索引：按问题类型分组，方案保存时同步更新"""
+
+    def __init__(self):
+        self._groups: dict[str, _Group] = {}
+        self._entries: dict[str, tuple[str, _Entry]] = {}  # 方案 ID -> (问题类型, 条目)
+        self._seq = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, solution: Solution):
+        """加入或更新方案"""
+        self.remove(solution.id)
+        if solution.trust_level == TrustLevel.FAILED:
+            return
+
+        rules = solution.match_rules or {}
+        entry = _Entry(solution=solution, seq=self._seq)
+        self._seq += 1
+
+        url_pattern = rules.get("url_pattern") if "url_pattern" in rules else None
+        if "url_pattern" in rules:
+            entry.has_url_rule = True
+            entry.url_re = _compile(url_pattern, solution.id) if url_pattern else re.compile("")
+            entry.invalid = entry.url_re is None
+        if "element_pattern" in rules:
+            entry.has_element_rule = True
+            pattern = rules["element_pattern"]
+            entry.element_re = _compile(pattern, solution.id) if pattern else re.compile("")
+            entry.invalid = entry.invalid or entry.element_re is None
+
+        type_key = solution.problem_type.value
+        group = self._groups.setdefault(type_key, _Group())
+        group.all.append(entry)
+
+        anchored, literal = literal_prefix(url_pattern) if url_pattern else (False, "")
+        if entry.has_url_rule and anchored and literal:
+            group.anchored.add(literal, entry)
+            group.prefixes[solution.id] = literal
+        elif entry.has_url_rule and len(literal) >= _MIN_LITERAL:
+            entry.url_literal = literal
+            group.literal.append(entry)
+        else:
+            group.unindexed.append(entry)
+
+        self._entries[solution.id] = (type_key, entry)
+
+    def remove(self, solution_id: str):
+        """移除方案"""
+        if solution_id not in self._entries:
+            return
+        type_key, entry = self._entries.pop(solution_id)
+        group = self._groups[type_key]
+        group.all.remove(entry)
+        if solution_id in group.prefixes:
+            group.anchored.remove(group.prefixes.pop(solution_id), entry)
+        elif entry in group.literal:
+            group.literal.remove(entry)
+        else:
+            group.unindexed.remove(entry)
+
+    def find(self, problem_type_value: str, context: dict) -> Solution | None:
+        """查找第一个匹配的方案（按信任等级、成功率排序）"""
+        group = self._groups.get(problem_type_value)
+        if not group:
+            return None
+
+        if "page_url" in context:
+            url = context["page_url"] or ""
+            candidates = group.anchored.lookup(url)
+            candidates.extend(e for e in group.literal if e.url_literal in url)
+            candidates.extend(group.unindexed)
+        else:
+            # 上下文没有 URL 时不检查 URL 规则，全部方案都是候选
+            candidates = list(group.all)
+
+        candidates.sort(key=lambda e: e.sort_key)
+        for entry in candidates:
+            if entry.matches(context):
+                return entry.solution
+        return None
@@ -1,6 +1,7 @@
 """
 问题库存储
 """
+import builtins
 import uuid
 from pathlib import Path
 
@@ -39,12 +40,7 @@ class ProblemStorage(BaseStorage[Problem]):
             item_path = self._item_path(problem.id)
             self._write_json(item_path, problem.to_dict())
 
-            index = self._get_index()
-            entries = index["problems"]
-            entries = [e for e in entries if e["id"] != problem.id]
-            entries.append(self._to_index_entry(problem))
-            index["problems"] = entries
-            self._save_index(index)
+            self._put_entry(problem)
 
             return Result.ok(problem)
         except Exception as e:
@@ -80,8 +76,7 @@ class ProblemStorage(BaseStorage[Problem]):
     ) -> Result[list[dict]]:
         """列出问题"""
         try:
-            index = self._get_index()
-            entries = index["problems"]
+            entries = self._entries()
             if status:
                 entries = [e for e in entries if e["status"] == status.value]
             if problem_type:
@@ -94,7 +89,7 @@ class ProblemStorage(BaseStorage[Problem]):
                 recoverable=False
             )
 
-    def list_open(self) -> Result[list[dict]]:
+    def list_open(self) -> Result[builtins.list[dict]]:
         """列出待处理的问题"""
         return self.list(status=ProblemStatus.OPEN)
 
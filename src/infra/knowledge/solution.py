@@ -1,12 +1,13 @@
 """
 方案库存储
 """
+import builtins
 import uuid
-import re
 from pathlib import Path
 
 from src.models import Solution, ProblemType, TrustLevel, Result
 from src.infra.storage.base import BaseStorage
+from .matcher import SolutionMatcher
 
 
 class SolutionStorage(BaseStorage[Solution]):
@@ -16,6 +17,8 @@ class SolutionStorage(BaseStorage[Solution]):
         if data_dir is None:
             data_dir = Path("data/solutions")
         super().__init__(data_dir)
+        self._matcher: SolutionMatcher | None = None
+        self._matcher_generation = -1
 
     def _empty_index(self) -> dict:
         return {"solutions": []}
@@ -40,12 +43,13 @@ class SolutionStorage(BaseStorage[Solution]):
             item_path = self._item_path(solution.id)
             self._write_json(item_path, solution.to_dict())
 
-            index = self._get_index()
-            entries = index["solutions"]
-            entries = [e for e in entries if e["id"] != solution.id]
-            entries.append(self._to_index_entry(solution))
-            index["solutions"] = entries
-            self._save_index(index)
+            # 匹配索引与磁盘同步时直接更新，否则下次查找时重建
+            synced = self._matcher is not None and self._matcher_generation == self.generation
+            before = self.generation
+            self._put_entry(solution)
+            if synced and self.generation == before + 1:
+                self._matcher.add(solution)
+                self._matcher_generation = self.generation
 
             return Result.ok(solution)
         except Exception as e:
@@ -81,8 +85,7 @@ class SolutionStorage(BaseStorage[Solution]):
     ) -> Result[list[dict]]:
         """列出方案"""
         try:
-            index = self._get_index()
-            entries = index["solutions"]
+            entries = self._entries()
             if problem_type:
                 entries = [e for e in entries if e["problem_type"] == problem_type.value]
             if trust_level:
@@ -95,7 +98,7 @@ class SolutionStorage(BaseStorage[Solution]):
                 recoverable=False
             )
 
-    def list_trusted(self) -> Result[list[dict]]:
+    def list_trusted(self) -> Result[builtins.list[dict]]:
         """列出可信方案"""
         return self.list(trust_level=TrustLevel.TRUSTED)
 
@@ -104,37 +107,9 @@ class SolutionStorage(BaseStorage[Solution]):
         problem_type: ProblemType,
         context: dict
     ) -> Result[Solution | None]:
-        """查找匹配的方案"""
+        """查找匹配的方案（按信任等级和成功率排序，FAILED 方案不参与）"""
         try:
-            # 获取该类型的所有可用方案（非 FAILED）
-            index = self._get_index()
-            candidates = [
-                e for e in index["solutions"]
-                if e["problem_type"] == problem_type.value
-                and e["trust_level"] != TrustLevel.FAILED.value
-            ]
-
-            # 按信任等级和成功率排序
-            trust_order = {
-                TrustLevel.TRUSTED.value: 0,
-                TrustLevel.TESTING.value: 1,
-                TrustLevel.NEW.value: 2
-            }
-            candidates.sort(
-                key=lambda x: (trust_order.get(x["trust_level"], 99), -x["success_rate"])
-            )
-
-            # 逐个检查匹配规则
-            for entry in candidates:
-                result = self.get(entry["id"])
-                if not result.success:
-                    continue
-
-                solution = result.data
-                if self._matches(solution, context):
-                    return Result.ok(solution)
-
-            return Result.ok(None)
+            return Result.ok(self._get_matcher().find(problem_type.value, context))
         except Exception as e:
             return Result.fail_with(
                 code="K_SOLUTION_NOT_FOUND",
@@ -142,25 +117,20 @@ class SolutionStorage(BaseStorage[Solution]):
                 recoverable=True
             )
 
-    def _matches(self, solution: Solution, context: dict) -> bool:
-        """检查方案是否匹配上下文"""
-        rules = solution.match_rules
-        if not rules:
-            return True  # 无规则则匹配所有
-
-        # URL 模式匹配
-        if "url_pattern" in rules and "page_url" in context:
-            pattern = rules["url_pattern"]
-            if not re.search(pattern, context["page_url"]):
-                return False
-
-        # 元素选择器匹配
-        if "element_pattern" in rules and "element_selector" in context:
-            pattern = rules["element_pattern"]
-            if not re.search(pattern, context.get("element_selector", "")):
-                return False
-
-        return True
+    def _get_matcher(self) -> SolutionMatcher:
+        """获取匹配索引（索引文件被外部修改时重建）"""
+        self._load_index()
+        if self._matcher is None or self._matcher_generation != self.generation:
+            matcher = SolutionMatcher()
+            for entry in self._entries():
+                if entry["trust_level"] == TrustLevel.FAILED.value:
+                    continue
+                result = self.get(entry["id"])
+                if result.success:
+                    matcher.add(result.data)
+            self._matcher = matcher
+            self._matcher_generation = self.generation
+        return self._matcher
 
     def record_execution(self, solution_id: str, success: bool) -> Result[Solution]:
         """记录方案执行结果"""
@@ -4,7 +4,7 @@
 特性：
 - run_id: 每次程序运行生成唯一 ID，追踪本次运行的所有日志
 - trace_id: 追踪单个操作/请求的完整链路
-- layer: 标记代码层级 (cli/core/infra)
+- layer: 标记代码层级 (cli/api/core/infra)
 - 自动文件轮转
 - 结构化日志（JSON）
 """
@@ -28,6 +28,7 @@ _context: ContextVar[dict] = ContextVar("log_context", default={})
 # 层级定义
 class Layer:
     CLI = "cli"
+    API = "api"
     CORE = "core"
     INFRA = "infra"
 
@@ -41,14 +42,27 @@ LAYER_MAP = {
     "upload_flow": Layer.CLI,
     "learn_flow": Layer.CLI,
     "knowledge_flow": Layer.CLI,
+    # API 层
+    "api": Layer.API,
+    "service": Layer.API,
     # Core 层
     "collector": Layer.CORE,
+    "extractor": Layer.CORE,
+    "http_collector": Layer.CORE,
     "filler": Layer.CORE,
+    "executor": Layer.CORE,
+    "orchestrator": Layer.CORE,
+    "job_runner": Layer.CORE,
+    "pipeline": Layer.CORE,
+    "image_pipeline": Layer.CORE,
     "learning": Layer.CORE,
     "learning_engine": Layer.CORE,
     "events": Layer.CORE,
     # Infra 层
     "browser": Layer.INFRA,
+    "http": Layer.INFRA,
+    "resilience": Layer.INFRA,
+    "selector_cache": Layer.INFRA,
     "storage": Layer.INFRA,
     "knowledge": Layer.INFRA,
     "logger": Layer.INFRA,
@@ -162,6 +176,7 @@ class ConsoleFormatter(logging.Formatter):
     }
     LAYER_COLORS = {
         "cli": "\033[94m",       # Blue
+        "api": "\033[96m",       # Bright Cyan
         "core": "\033[93m",      # Yellow
         "infra": "\033[95m",     # Magenta
     }
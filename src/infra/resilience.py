@@ -0,0 +1,429 @@
+"""
+重试、熔断与自适应并发
+
+- RetryPolicy / with_retry: 带随机抖动的指数退避，避免多个 worker 同时重试
+- CircuitBreaker / HostBreakers: 按域名熔断，连续超时/网络错误后暂停访问该域名，
+  冷却后放行一个探测请求（半开），成功则恢复
+- AdaptiveLimiter: AIMD 并发控制，成功时线性增加并发上限，限流类错误时减半
+- RateLimit / HostRateLimiter: 按域名的令牌桶限速，所有 worker 共用，按到达顺序放行
+"""
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Awaitable, Callable
+from urllib.parse import urlparse
+
+from src.models import Result
+from src.infra.logger import logger
+
+log = logger.get("resilience")
+
+# 说明目标站点不可用或正在限流的错误码（计入熔断、触发并发收缩）
+THROTTLE_CODES = frozenset({"B_TIMEOUT", "B_NETWORK_ERROR", "B_CIRCUIT_OPEN"})
+
+
+@dataclass
+class RetryPolicy:
+    """重试策略"""
+    max_attempts: int = 3
+    base_delay: float = 1.0
+    exponential: bool = True
+    max_delay: float = 30.0
+    jitter: float = 0.5      # 随机缩短延迟的比例上限（0 表示固定延迟）
+    retryable_codes: list[str] = field(default_factory=lambda: [
+        "B_TIMEOUT",
+        "B_NETWORK_ERROR",
+        "B_CIRCUIT_OPEN",
+    ])
+
+    def get_delay(self, attempt: int) -> float:
+        if self.exponential:
+            delay = self.base_delay * (2 ** attempt)
+        else:
+            delay = self.base_delay
+        delay = min(delay, self.max_delay)
+        if self.jitter:
+            delay *= 1 - self.jitter * random.random()
+        return delay
+
+
+async def with_retry(
+    action: Callable[..., Awaitable[Result]],
+    *args,
+    policy: RetryPolicy = None,
+    **kwargs
+) -> Result:
+    """带重试的执行
+
+    熔断中的错误（B_CIRCUIT_OPEN）至少等到熔断器允许探测后再重试。
+    """
+    policy = policy or RetryPolicy()
+    last_result = None
+    for attempt in range(max(1, policy.max_attempts)):
+        result = await action(*args, **kwargs)
+        if result.success:
+            return result
+
+        last_result = result
+        if not (result.error and result.error.code in policy.retryable_codes):
+            break
+        if attempt + 1 >= policy.max_attempts:
+            break
+
+        delay = policy.get_delay(attempt)
+        retry_after = (result.error.context or {}).get("retry_after")
+        if retry_after:
+            # 加少量抖动，避免冷却结束时所有 worker 同时探测
+            delay = max(delay, retry_after + random.random() * policy.base_delay)
+        await asyncio.sleep(delay)
+
+    return last_result or Result.fail_with(
+        code="B_RETRY_EXHAUSTED",
+        message="重试次数已用尽",
+        recoverable=False
+    )
+
+
+class CircuitState(Enum):
+    """熔断器状态"""
+    CLOSED = "closed"         # 正常放行
+    OPEN = "open"             # 熔断中，直接拒绝
+    HALF_OPEN = "half_open"   # 冷却结束，只放行一个探测请求
+
+
+class CircuitBreaker:
+    """单个域名的熔断器：连续 failure_threshold 次限流类错误后熔断 reset_timeout 秒"""
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 15.0):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.state = CircuitState.CLOSED
+        self.failures = 0            # 连续失败次数
+        self.trips = 0               # 累计熔断次数
+        self._opened_at = 0.0
+        self._probe_started: float | None = None
+
+    @property
+    def retry_after(self) -> float:
+        """距离允许探测还需等待的秒数"""
+        if self.state is not CircuitState.OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+
+    def allow(self) -> bool:
+        """是否放行本次请求"""
+        now = time.monotonic()
+        if self.state is CircuitState.CLOSED:
+            return True
+        if self.state is CircuitState.OPEN:
+            if now - self._opened_at < self.reset_timeout:
+                return False
+            self.state = CircuitState.HALF_OPEN
+            self._probe_started = now
+            log.info("熔断冷却结束，放行探测请求", host=self.name)
+            return True
+        # 半开：探测请求未返回（可能已被取消）且超过冷却时间时，再放行一个
+        if self._probe_started is None or now - self._probe_started >= self.reset_timeout:
+            self._probe_started = now
+            return True
+        return False
+
+    def record(self, result: Result) -> None:
+        """记录请求结果：限流类错误计为失败，其余结果说明站点有响应"""
+        if not result.success and result.error.code in THROTTLE_CODES:
+            self.record_failure()
+        else:
+            self.record_success()
+
+    def record_success(self) -> None:
+        if self.state is not CircuitState.CLOSED:
+            log.info("熔断恢复", host=self.name)
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self._probe_started = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state is CircuitState.HALF_OPEN or (
+            self.state is CircuitState.CLOSED and self.failures >= self.failure_threshold
+        ):
+            self.state = CircuitState.OPEN
+            self._opened_at = time.monotonic()
+            self._probe_started = None
+            self.trips += 1
+            log.warning(
+                "域名熔断",
+                host=self.name,
+                failures=self.failures,
+                reset_timeout=self.reset_timeout
+            )
+
+    def reject(self, url: str) -> Result:
+        """熔断中的拒绝结果（可重试，context 中带 retry_after）"""
+        return Result.fail_with(
+            code="B_CIRCUIT_OPEN",
+            message=f"{self.name} 连续请求失败，暂停访问 {self.retry_after:.0f} 秒",
+            recoverable=True,
+            context={"url": url, "host": self.name, "retry_after": round(self.retry_after, 2)}
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "state": self.state.value,
+            "failures": self.failures,
+            "trips": self.trips,
+            "retry_after": round(self.retry_after, 2)
+        }
+
+
+class HostBreakers:
+    """按域名管理熔断器（浏览器导航和 HTTP 请求共用）"""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 15.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def for_url(self, url: str) -> CircuitBreaker | None:
+        """URL 对应域名的熔断器（无法解析域名时返回 None，不做熔断）"""
+        host = urlparse(url).hostname if url else None
+        if not host:
+            return None
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = CircuitBreaker(host, self.failure_threshold, self.reset_timeout)
+            self._breakers[host] = breaker
+        return breaker
+
+    def stats(self) -> dict:
+        """各域名的熔断状态（只包含出现过失败的域名）"""
+        return {
+            host: breaker.to_dict()
+            for host, breaker in self._breakers.items()
+            if breaker.failures or breaker.trips
+        }
+
+
+class AdaptiveLimiter:
+    """AIMD 并发控制
+
+    每次成功把并发上限增加 1/上限（约每轮增加 1），限流类错误把上限乘以 decrease_factor；
+    一个 cooldown 窗口内只收缩一次，同一波失败不会把并发一路压到最低。
+    """
+
+    def __init__(
+        self,
+        limit: int,
+        min_limit: int = 1,
+        max_limit: int = None,
+        decrease_factor: float = 0.5,
+        cooldown: float = 2.0
+    ):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit or limit)
+        self.decrease_factor = decrease_factor
+        self.cooldown = cooldown
+        self._limit = float(min(max(limit, self.min_limit), self.max_limit))
+        self._inflight = 0
+        self._changed = asyncio.Event()
+        self._last_decrease = float("-inf")
+        self.increases = 0
+        self.decreases = 0
+        self.lowest = self.limit
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def inflight(self) -> int:
+        return self._inflight
+
+    async def acquire(self) -> None:
+        """等待并发槽位"""
+        while self._inflight >= self.limit:
+            self._changed.clear()
+            await self._changed.wait()
+        self._inflight += 1
+
+    def release(self) -> None:
+        self._inflight -= 1
+        self._changed.set()
+
+    async def __aenter__(self) -> 'AdaptiveLimiter':
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc):
+        self.release()
+
+    def record(self, result: Result) -> None:
+        """按结果调整并发上限（非限流类错误不调整）"""
+        if result.success:
+            before = self.limit
+            self._limit = min(float(self.max_limit), self._limit + 1 / self._limit)
+            if self.limit > before:
+                self.increases += 1
+                self._changed.set()
+                log.debug("并发上限增加", limit=self.limit)
+        elif result.error.code in THROTTLE_CODES:
+            now = time.monotonic()
+            if now - self._last_decrease < self.cooldown:
+                return
+            self._last_decrease = now
+            before = self.limit
+            self._limit = max(float(self.min_limit), self._limit * self.decrease_factor)
+            if self.limit < before:
+                self.decreases += 1
+                self.lowest = min(self.lowest, self.limit)
+                log.info("检测到限流，降低并发", limit=self.limit, code=result.error.code)
+
+    def to_dict(self) -> dict:
+        return {
+            "limit": self.limit,
+            "max_limit": self.max_limit,
+            "lowest": self.lowest,
+            "increases": self.increases,
+            "decreases": self.decreases
+        }
+
+
+@dataclass
+class RateLimit:
+    """令牌桶参数"""
+    rate: float          # 每秒放行的请求数（<= 0 表示不限速）
+    burst: int = 1       # 桶容量：空闲后允许连续放行的请求数
+
+    def to_dict(self) -> dict:
+        return {"rate": self.rate, "burst": self.burst}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'RateLimit':
+        return cls(rate=data.get("rate", 0), burst=data.get("burst", 1))
+
+
+@dataclass
+class RateStats:
+    """单个令牌桶的等待统计"""
+    acquired: int = 0        # 放行的请求数
+    delayed: int = 0         # 需要等待的请求数
+    total_wait: float = 0.0  # 累计等待（秒）
+    max_wait: float = 0.0
+
+    @property
+    def avg_wait(self) -> float:
+        return self.total_wait / self.acquired if self.acquired else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "acquired": self.acquired,
+            "delayed": self.delayed,
+            "total_wait": round(self.total_wait, 3),
+            "avg_wait": round(self.avg_wait, 4),
+            "max_wait": round(self.max_wait, 3)
+        }
+
+
+class TokenBucket:
+    """令牌桶：按 rate 匀速补充令牌，最多积累 burst 个
+
+    等待令牌的请求按到达顺序排队（asyncio.Lock 先到先得），
+    请求多的 worker 不会让其他 worker 饿死。
+    """
+
+    def __init__(self, limit: RateLimit):
+        self.limit = limit
+        self._capacity = max(1, limit.burst)
+        self._tokens = float(self._capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self.stats = RateStats()
+
+    async def acquire(self) -> float:
+        """取一个令牌，返回等待的秒数"""
+        if self.limit.rate <= 0:
+            self.stats.acquired += 1
+            return 0.0
+
+        started = time.monotonic()
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.limit.rate)
+                self._refill()
+            self._tokens -= 1
+
+        waited = time.monotonic() - started
+        self.stats.acquired += 1
+        if waited > 0.001:
+            self.stats.delayed += 1
+            self.stats.total_wait += waited
+            self.stats.max_wait = max(self.stats.max_wait, waited)
+        return waited
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self.limit.rate)
+        self._updated = now
+
+
+class HostRateLimiter:
+    """按域名限速（浏览器导航和 HTTP 请求共用）
+
+    limits 的键为域名，匹配该域名及其子域名（如 "taobao.com" 包含 item.taobao.com），
+    多个键匹配时取最长的；同一个键下的所有域名共用一个令牌桶。
+    键 "*" 为其余域名的默认限速（每个域名一个桶），未配置时不限速。
+    """
+
+    def __init__(self, limits: dict[str, RateLimit] = None):
+        self.limits = dict(limits or {})
+        self._buckets: dict[str, TokenBucket] = {}
+
+    @classmethod
+    def from_config(cls, limits: dict[str, dict]) -> 'HostRateLimiter':
+        """从配置创建：域名 -> RateLimit.to_dict()"""
+        return cls({key: RateLimit.from_dict(value) for key, value in (limits or {}).items()})
+
+    async def acquire(self, url: str) -> float:
+        """等待 URL 对应域名的令牌，返回等待的秒数（不限速的域名立即返回）"""
+        bucket = self._bucket_for(url)
+        if bucket is None:
+            return 0.0
+        waited = await bucket.acquire()
+        if waited >= 1.0:
+            log.debug("限速等待", url=url, waited=round(waited, 3))
+        return waited
+
+    def stats(self) -> dict:
+        """各令牌桶的等待统计"""
+        return {key: bucket.stats.to_dict() for key, bucket in self._buckets.items()}
+
+    def _bucket_for(self, url: str) -> TokenBucket | None:
+        if not self.limits:
+            return None
+        host = urlparse(url).hostname if url else None
+        if not host:
+            return None
+
+        key = None
+        for candidate in self.limits:
+            if candidate != "*" and (host == candidate or host.endswith("." + candidate)):
+                if key is None or len(candidate) > len(key):
+                    key = candidate
+        if key is None:
+            if "*" not in self.limits:
+                return None
+            limit, key = self.limits["*"], host
+        else:
+            limit = self.limits[key]
+        if limit.rate <= 0:
+            return None
+
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(limit)
+            self._buckets[key] = bucket
+        return bucket
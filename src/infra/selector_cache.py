@@ -0,0 +1,177 @@
+"""
+选择器命中缓存
+
+按 (页面 URL 模式, 字段) 记录每个候选选择器的命中/未命中次数，
+下次按历史命中率重新排序候选列表，让最可能成功的选择器排在第一位。
+计数按指数衰减，页面改版后旧的命中记录会逐渐失效。
+"""
+import json
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from .storage.base import atomic_write_json
+from .logger import logger
+
+log = logger.get("selector_cache")
+
+# 路径中的数字 ID 段归一化，同类页面共享统计
+_ID_SEGMENT_RE = re.compile(r"/\d+(?=/|$)")
+
+
+def url_pattern(url: str) -> str:
+    """页面 URL 归一化：host + 路径（去掉查询参数和数字 ID）"""
+    if not url:
+        return ""
+    parts = urlsplit(url)
+    return parts.netloc + _ID_SEGMENT_RE.sub("/*", parts.path)
+
+
+@dataclass
+class SelectorStats:
+    """单个选择器的统计（衰减计数）"""
+    hits: float = 0.0
+    misses: float = 0.0
+
+    @property
+    def score(self) -> float:
+        """命中率估计（拉普拉斯平滑，未知选择器为 0.5）"""
+        return (self.hits + 1) / (self.hits + self.misses + 2)
+
+    def to_dict(self) -> dict:
+        return {"hits": round(self.hits, 4), "misses": round(self.misses, 4)}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'SelectorStats':
+        return cls(hits=data.get("hits", 0.0), misses=data.get("misses", 0.0))
+
+
+@dataclass
+class CacheStats:
+    """缓存效果统计（本次运行）"""
+    lookups: int = 0            # 排序次数
+    first_try_hits: int = 0     # 排在第一位的选择器直接命中
+    misses: int = 0             # 未命中的尝试次数
+
+    @property
+    def first_try_rate(self) -> float:
+        return self.first_try_hits / self.lookups if self.lookups else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "lookups": self.lookups,
+            "first_try_hits": self.first_try_hits,
+            "misses": self.misses,
+            "first_try_rate": round(self.first_try_rate, 3)
+        }
+
+
+class SelectorCache:
+    """持久化的选择器命中缓存"""
+
+    DECAY = 0.9          # 每次记录时旧计数的保留比例
+    FLUSH_EVERY = 20     # 累计多少次记录后写盘
+
+    def __init__(self, path: Path = None):
+        self.path = path or Path("data/selector_cache.json")
+        self.stats = CacheStats()
+        self._entries: dict[str, dict[str, SelectorStats]] = {}
+        self._first: dict[str, str] = {}    # 本次排序后排在第一位的选择器
+        self._dirty = 0
+        self._touched: set[str] = set()     # 上次写盘后本实例记录过的键
+        self._load()
+
+    @staticmethod
+    def _key(url: str, field_name: str) -> str:
+        return f"{url_pattern(url)}|{field_name}"
+
+    def order(self, url: str, field_name: str, candidates: list[str]) -> list[str]:
+        """按历史命中率排序候选选择器（同分时保持原顺序）"""
+        key = self._key(url, field_name)
+        entry = self._entries.get(key, {})
+        ordered = sorted(
+            candidates,
+            key=lambda s: -(entry[s].score if s in entry else 0.5)
+        )
+        self.stats.lookups += 1
+        if ordered:
+            self._first[key] = ordered[0]
+        return ordered
+
+    def record(self, url: str, field_name: str, selector: str, success: bool):
+        """记录一次尝试结果"""
+        key = self._key(url, field_name)
+        entry = self._entries.setdefault(key, {})
+
+        # 衰减该字段全部选择器的历史计数
+        for stats in entry.values():
+            stats.hits *= self.DECAY
+            stats.misses *= self.DECAY
+
+        stats = entry.setdefault(selector, SelectorStats())
+        if success:
+            stats.hits += 1
+            if self._first.pop(key, None) == selector:
+                self.stats.first_try_hits += 1
+        else:
+            stats.misses += 1
+            self.stats.misses += 1
+
+        self._touched.add(key)
+        self._dirty += 1
+        if self._dirty >= self.FLUSH_EVERY:
+            self.flush()
+
+    def flush(self):
+        """写入磁盘
+
+        同一文件可能被多个实例（多个填充器、CLI 与 API 进程）同时使用：
+        写盘前重新读取文件，只用本实例记录过的键覆盖，其余键保留文件中的最新值。
+        """
+        if not self._dirty:
+            return
+        self._merge_from_disk()
+        data = {
+            key: {selector: stats.to_dict() for selector, stats in entry.items()}
+            for key, entry in self._entries.items()
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_json(self.path, data)
+            self._dirty = 0
+            self._touched.clear()
+        except OSError as e:
+            log.warning("保存选择器缓存失败", error=str(e))
+
+    def _load(self):
+        """加载缓存文件"""
+        self._entries = self._read() or {}
+
+    def _merge_from_disk(self):
+        """合并其他实例写入的统计（本实例记录过的键以内存为准，新出现的选择器补入）"""
+        disk = self._read()
+        if not disk:
+            return
+        for key, entry in disk.items():
+            if key not in self._touched:
+                self._entries[key] = entry
+                continue
+            mine = self._entries.setdefault(key, {})
+            for selector, stats in entry.items():
+                mine.setdefault(selector, stats)
+
+    def _read(self) -> dict[str, dict[str, SelectorStats]] | None:
+        """读取缓存文件（不存在或损坏时返回 None）"""
+        if not self.path.exists():
+            return None
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return {
+                key: {selector: SelectorStats.from_dict(s) for selector, s in entry.items()}
+                for key, entry in data.items()
+            }
+        except (ValueError, OSError, AttributeError) as e:
+            log.warning("加载选择器缓存失败，将重新统计", error=str(e))
+            return None
@@ -1,13 +1,23 @@
 """
 存储层模块
 """
-from .base import BaseStorage
-from .product import ProductStorage
+from .base import BaseStorage, atomic_write_json
+from .product import ProductStorage, create_product_storage
+from .sqlite import SqliteProductStorage
+from .binding import BindingStorage
+from .jobs import JobQueue
+from .images import ImageCache
 from .config import Config, ConfigManager
 
 __all__ = [
     "BaseStorage",
+    "atomic_write_json",
     "ProductStorage",
+    "SqliteProductStorage",
+    "create_product_storage",
+    "BindingStorage",
+    "JobQueue",
+    "ImageCache",
     "Config",
     "ConfigManager",
 ]
@@ -3,20 +3,72 @@
 """
 import json
 import os
+import shutil
+import tempfile
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime
 from pathlib import Path
-from typing import TypeVar, Generic
+from typing import TypeVar, Generic, Iterator
 
 from src.models import Result
 
 T = TypeVar('T')
 
 
+def atomic_write_json(path: Path, data: dict | list, fsync: bool = False):
+    """原子写入 JSON：先写同目录临时文件，再 os.replace 替换
+
+    写入中途崩溃只会留下临时文件，原文件保持完整。
+    fsync=True 时在替换前后刷盘，保证断电后数据仍在。
+    """
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+    if fsync and hasattr(os, "O_DIRECTORY"):
+        # 刷新目录项，确保 rename 本身已落盘
+        dir_fd = os.open(path.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
 class BaseStorage(ABC, Generic[T]):
-    """存储基类"""
+    """存储基类
+
+    索引在内存中缓存为 {id: 条目} 字典，写入时同步更新（write-through）。
+    每次读取前用 index.json 的 (mtime_ns, inode, size) 判断文件是否被其他进程修改，
+    变化时才重新解析；invalidate() 可显式丢弃缓存。
+
+    所有文件均为原子写入；batch() 内的多次保存每 BATCH_FLUSH_EVERY 次写一次索引。
+    """
 
-    def __init__(self, data_dir: Path):
+    BATCH_FLUSH_EVERY = 50  # 批量写入期间每累计多少次变更写一次索引
+
+    def __init__(self, data_dir: Path, fsync: bool = False):
         self.data_dir = data_dir
+        self.fsync = fsync  # 写入后是否刷盘（更安全，但更慢）
+        self._index_cache: dict[str, dict] | None = None
+        self._index_signature: tuple | None = None
+        self._batch_depth = 0
+        self._batch_flush_every = self.BATCH_FLUSH_EVERY
+        self._index_dirty = False
+        self._pending_changes = 0  # 批量写入期间尚未写入索引的变更数
+        self.generation = 0  # 索引每次变更递增，调用方可据此判断数据是否更新
         self._ensure_dir()
 
     def _ensure_dir(self):
@@ -46,20 +98,129 @@ class BaseStorage(ABC, Generic[T]):
             return None
 
     def _write_json(self, path: Path, data: dict | list):
-        """写入 JSON 文件"""
-        with open(path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        """写入 JSON 文件（原子替换）"""
+        atomic_write_json(path, data, fsync=self.fsync)
+
+    @property
+    def _index_path(self) -> Path:
+        return self.data_dir / "index.json"
+
+    @property
+    def _index_key(self) -> str:
+        """索引中条目列表的键名（如 "products"）"""
+        return next(iter(self._empty_index()))
+
+    def _file_signature(self) -> tuple | None:
+        """index.json 的 (mtime_ns, inode, size)，文件不存在时为 None"""
+        try:
+            stat = os.stat(self._index_path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_ino, stat.st_size)
+
+    def invalidate(self):
+        """丢弃内存索引，下次访问时从磁盘重新加载"""
+        self._index_cache = None
+        self._index_signature = None
+
+    def _read_index_file(self) -> dict:
+        """读取 index.json
+
+        文件损坏时备份后抛出异常，不能当作空索引处理，否则下一次保存会覆盖全部数据。
+        """
+        try:
+            with open(self._index_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return self._empty_index()
+        except json.JSONDecodeError as e:
+            backup = self._index_path.with_name(
+                f"index.corrupt-{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            )
+            shutil.copy2(self._index_path, backup)
+            raise ValueError(f"索引文件损坏（已备份到 {backup}）: {e}") from e
+
+    def _load_index(self) -> dict[str, dict]:
+        """获取内存索引（文件被外部修改时重新加载；批量写入期间以内存为准）"""
+        if self._index_dirty:
+            return self._index_cache
+
+        signature = self._file_signature()
+        if self._index_cache is None or signature != self._index_signature:
+            data = self._read_index_file()
+            self._index_cache = {e["id"]: e for e in data.get(self._index_key, [])}
+            self._index_signature = signature
+            self.generation += 1
+        return self._index_cache
+
+    def _entries(self) -> list[dict]:
+        """全部索引条目（按写入顺序；返回副本，调用方修改不会影响缓存）"""
+        return [dict(e) for e in self._load_index().values()]
+
+    def _put_entry(self, item: T):
+        """写入或更新索引条目（更新的条目移到末尾，与原先的重写顺序一致）"""
+        cache = self._load_index()
+        entry = self._to_index_entry(item)
+        cache.pop(entry["id"], None)
+        cache[entry["id"]] = entry
+        self._flush_index()
+
+    def _drop_entry(self, item_id: str):
+        """删除索引条目"""
+        cache = self._load_index()
+        if cache.pop(item_id, None) is not None:
+            self._flush_index()
+
+    def _flush_index(self):
+        """把内存索引写回磁盘（批量写入期间每累计 flush_every 次变更写一次）"""
+        self.generation += 1
+        if self._batch_depth > 0:
+            self._index_dirty = True
+            self._pending_changes += 1
+            if self._pending_changes < self._batch_flush_every:
+                return
+        self._write_index()
+
+    def _write_index(self):
+        """写入 index.json"""
+        self._write_json(self._index_path, {self._index_key: list(self._index_cache.values())})
+        self._index_signature = self._file_signature()
+        self._index_dirty = False
+        self._pending_changes = 0
+
+    @contextmanager
+    def batch(self, flush_every: int = None) -> Iterator[None]:
+        """批量写入：期间的 save/delete 先更新内存索引，每 flush_every 次变更及退出时写 index.json
+
+        单品文件仍然逐个写入，进程被强制结束时最多丢失索引中最近 flush_every 个条目。
+        用法:
+            with storage.batch():
+                for product in products:
+                    storage.save(product)
+        """
+        outer = self._batch_depth == 0
+        if outer:
+            self._batch_flush_every = max(1, flush_every or self.BATCH_FLUSH_EVERY)
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._index_dirty:
+                self._write_index()
 
     def _get_index(self) -> dict:
         """获取索引"""
-        index_path = self.data_dir / "index.json"
-        data = self._read_json(index_path)
-        return data if data else self._empty_index()
+        return {self._index_key: self._entries()}
 
     def _save_index(self, index: dict):
         """保存索引"""
-        index_path = self.data_dir / "index.json"
-        self._write_json(index_path, index)
+        self._index_cache = {e["id"]: e for e in index.get(self._index_key, [])}
+        self._flush_index()
+
+    def close(self):
+        """释放存储资源（文件存储无需处理）"""
+        pass
 
     def _item_path(self, item_id: str) -> Path:
         """获取单项文件路径"""
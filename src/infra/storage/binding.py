@@ -0,0 +1,125 @@
+"""
+字段绑定配置存储
+"""
+import builtins
+from pathlib import Path
+
+from src.models import BindingConfig, Result
+from ..logger import logger
+from .base import BaseStorage
+
+log = logger.get("storage")
+
+
+class BindingStorage(BaseStorage[BindingConfig]):
+    """绑定配置存储（data/bindings）"""
+
+    def __init__(self, data_dir: Path = None):
+        if data_dir is None:
+            data_dir = Path("data/bindings")
+        # 早期版本没有索引文件：只在索引创建前迁移一次，之后不再扫描目录
+        needs_migration = not (data_dir / "index.json").exists()
+        super().__init__(data_dir)
+        if needs_migration:
+            result = self.migrate_legacy_files()
+            if not result.success:
+                log.error("迁移旧版绑定配置失败", error=result.error.message)
+
+    def _empty_index(self) -> dict:
+        return {"bindings": []}
+
+    def _to_index_entry(self, config: BindingConfig) -> dict:
+        return {
+            "id": config.id,
+            "name": config.name,
+            "field_count": len(config.fields),
+            "target_url_pattern": config.target_url_pattern,
+            "created_at": config.created_at.isoformat(),
+            "updated_at": config.updated_at.isoformat()
+        }
+
+    def migrate_legacy_files(self) -> Result[int]:
+        """为早期版本直接写入的配置文件补建索引，返回新增的条目数
+
+        无法解析的文件跳过并记录日志。
+        """
+        try:
+            indexed = self._load_index()
+            missing = [
+                path for path in self.data_dir.glob("*.json")
+                if path.name != "index.json" and path.stem not in indexed
+            ]
+            added = 0
+            with self.batch():
+                for path in missing:
+                    try:
+                        self._put_entry(BindingConfig.from_dict(self._read_json(path)))
+                        added += 1
+                    except Exception as e:
+                        log.warning("跳过无法解析的绑定配置", file=path.name, error=str(e))
+            if added:
+                log.info("已为旧版绑定配置补建索引", count=added)
+            return Result.ok(added)
+        except Exception as e:
+            return Result.fail_with(
+                code="S_READ_FAILED",
+                message=f"迁移旧版绑定配置失败: {e}",
+                recoverable=False
+            )
+
+    def save(self, config: BindingConfig) -> Result[BindingConfig]:
+        """保存配置"""
+        try:
+            self._write_json(self._item_path(config.id), config.to_dict())
+            self._put_entry(config)
+            return Result.ok(config)
+        except Exception as e:
+            return Result.fail_with(
+                code="S_WRITE_FAILED",
+                message=f"保存配置失败: {e}",
+                recoverable=False
+            )
+
+    def get(self, config_id: str) -> Result[BindingConfig]:
+        """获取配置"""
+        try:
+            data = self._read_json(self._item_path(config_id))
+            if data is None:
+                return Result.fail_with(
+                    code="S_NOT_FOUND",
+                    message=f"配置不存在: {config_id}",
+                    recoverable=False
+                )
+            return Result.ok(BindingConfig.from_dict(data))
+        except Exception as e:
+            return Result.fail_with(
+                code="S_READ_FAILED",
+                message=f"读取配置失败: {e}",
+                recoverable=False
+            )
+
+    def delete(self, config_id: str) -> Result[bool]:
+        """删除配置"""
+        try:
+            item_path = self._item_path(config_id)
+            if item_path.exists():
+                item_path.unlink()
+            self._drop_entry(config_id)
+            return Result.ok(True)
+        except Exception as e:
+            return Result.fail_with(
+                code="S_WRITE_FAILED",
+                message=f"删除配置失败: {e}",
+                recoverable=False
+            )
+
+    def list(self) -> Result[builtins.list[dict]]:
+        """列出配置（返回索引条目）"""
+        try:
+            return Result.ok(self._entries())
+        except Exception as e:
+            return Result.fail_with(
+                code="S_READ_FAILED",
+                message=f"列出配置失败: {e}",
+                recoverable=False
+            )
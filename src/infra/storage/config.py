@@ -13,9 +13,19 @@ class Config:
     browser_headless: bool = False        # 是否无头模式
     browser_slow_mo: int = 0              # 操作延迟（ms）
     browser_timeout: int = 30000          # 默认超时（ms）
+    # 浏览器运行模式（launch: 每次启动 / server: 常驻浏览器，进程重启后直接连接 / cdp: 连接已有浏览器）
+    browser_mode: str = "launch"
+    browser_debug_port: int = 9222        # server 模式的调试端口
+    browser_cdp_endpoint: str | None = None   # cdp 模式的连接地址，如 http://127.0.0.1:9222
+    # 导航等待策略覆盖（页面类型 -> 字段），如 {"item": {"wait_until": "domcontentloaded"}}
+    browser_nav_strategies: dict = field(default_factory=dict)
 
     # 存储路径
     data_dir: str = "data"
+    # 商品存储后端（json: 单品文件 + index.json / sqlite: products.db）
+    storage_backend: str = "json"
+    # JSON 存储写入后是否 fsync（断电安全，写入更慢）
+    storage_fsync: bool = False
 
     # 重试策略
     max_retry: int = 3
@@ -24,15 +34,49 @@ class Config:
     # 用户状态目录（保存登录态等）
     user_data_dir: str = "user_data"
 
+    # 批量采集并发数（同时打开的标签页数量）
+    collect_concurrency: int = 3
+    # 批量采集的资源拦截配置（collect-lean / full）
+    collect_block_profile: str = "collect-lean"
+    # 批量采集后端（browser: 标签页池 / http: 直接请求 HTML，需要 JS 时回退浏览器）
+    collect_backend: str = "browser"
+    # HTTP 后端并发请求数
+    http_concurrency: int = 16
+
+    # 多店铺上架：店铺列表（ShopProfile.to_dict() 格式）和同时运行的店铺数上限
+    shops: list[dict] = field(default_factory=list)
+    shop_max_contexts: int = 10
+
+    # 按域名限速：域名 -> {"rate": 每秒请求数, "burst": 突发数}，匹配子域名，"*" 为其余域名的默认值
+    # 如 {"taobao.com": {"rate": 2, "burst": 4}}；为空时不限速
+    rate_limits: dict = field(default_factory=dict)
+
+    # 交互界面的事件分发方式（sync: 发布时直接调用处理器 / async: 后台分发，发布方不等待处理器）
+    event_dispatch: str = "sync"
+
     def to_dict(self) -> dict:
         return {
             "browser_headless": self.browser_headless,
             "browser_slow_mo": self.browser_slow_mo,
             "browser_timeout": self.browser_timeout,
+            "browser_mode": self.browser_mode,
+            "browser_debug_port": self.browser_debug_port,
+            "browser_cdp_endpoint": self.browser_cdp_endpoint,
+            "browser_nav_strategies": self.browser_nav_strategies,
             "data_dir": self.data_dir,
+            "storage_backend": self.storage_backend,
+            "storage_fsync": self.storage_fsync,
             "max_retry": self.max_retry,
             "retry_delay": self.retry_delay,
-            "user_data_dir": self.user_data_dir
+            "user_data_dir": self.user_data_dir,
+            "collect_concurrency": self.collect_concurrency,
+            "collect_block_profile": self.collect_block_profile,
+            "collect_backend": self.collect_backend,
+            "http_concurrency": self.http_concurrency,
+            "shops": self.shops,
+            "shop_max_contexts": self.shop_max_contexts,
+            "rate_limits": self.rate_limits,
+            "event_dispatch": self.event_dispatch
         }
 
     @classmethod
@@ -41,10 +85,24 @@ class Config:
             browser_headless=data.get("browser_headless", False),
             browser_slow_mo=data.get("browser_slow_mo", 0),
             browser_timeout=data.get("browser_timeout", 30000),
+            browser_mode=data.get("browser_mode", "launch"),
+            browser_debug_port=data.get("browser_debug_port", 9222),
+            browser_cdp_endpoint=data.get("browser_cdp_endpoint"),
+            browser_nav_strategies=data.get("browser_nav_strategies", {}),
             data_dir=data.get("data_dir", "data"),
+            storage_backend=data.get("storage_backend", "json"),
+            storage_fsync=data.get("storage_fsync", False),
             max_retry=data.get("max_retry", 3),
             retry_delay=data.get("retry_delay", 1.0),
-            user_data_dir=data.get("user_data_dir", "user_data")
+            user_data_dir=data.get("user_data_dir", "user_data"),
+            collect_concurrency=data.get("collect_concurrency", 3),
+            collect_block_profile=data.get("collect_block_profile", "collect-lean"),
+            collect_backend=data.get("collect_backend", "browser"),
+            http_concurrency=data.get("http_concurrency", 16),
+            shops=data.get("shops", []),
+            shop_max_contexts=data.get("shop_max_contexts", 10),
+            rate_limits=data.get("rate_limits", {}),
+            event_dispatch=data.get("event_dispatch", "sync")
         )
 
 
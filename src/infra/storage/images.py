@@ -0,0 +1,153 @@
+"""
+图片内容缓存
+
+下载的图片按 SHA-256 保存在 data/images/<前两位>/<哈希>.<扩展名>，索引在 data/images/images.db：
+- sources: 图片地址 -> 内容哈希（同一地址不重复下载）
+- blobs: 内容哈希 -> 本地文件（不同地址、不同商品/SKU 的相同图片只保存一份）
+"""
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from src.models import ImageAsset, Result
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    sha256 TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    content_type TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sources (
+    url TEXT PRIMARY KEY,
+    sha256 TEXT NOT NULL,
+    fetched_at TEXT NOT NULL
+);
+-- 早期版本的店铺上传记录：发布表单只能通过文件选择框添加图片，记录无法复用
+DROP TABLE IF EXISTS uploads;
+"""
+
+# Content-Type -> 扩展名（未知类型按地址后缀，仍未知时用 .img）
+_EXTENSIONS = {
+    "image/jpeg": ".jpg",
+    "image/jpg": ".jpg",
+    "image/png": ".png",
+    "image/webp": ".webp",
+    "image/gif": ".gif",
+    "image/bmp": ".bmp",
+}
+
+
+class ImageCache:
+    """按内容哈希去重的本地图片缓存"""
+
+    DIR_NAME = "images"
+    DB_NAME = "images.db"
+
+    def __init__(self, data_dir: Path = None):
+        self.root = (data_dir or Path("data")) / self.DIR_NAME
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.root / self.DB_NAME, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    @property
+    def tmp_dir(self) -> Path:
+        """下载中的临时文件目录（与缓存同一文件系统，完成后原子移动）"""
+        return self.root / "tmp"
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            if self._conn:
+                self._conn.close()
+                self._conn = None
+
+    def lookup(self, url: str) -> Result[ImageAsset | None]:
+        """按图片地址查找已缓存的文件（文件已被删除时视为未缓存）"""
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT b.* FROM sources s JOIN blobs b ON b.sha256 = s.sha256 WHERE s.url = ?",
+                    (url,)
+                ).fetchone()
+        except Exception as e:
+            return Result.fail_with(
+                code="S_READ_FAILED",
+                message=f"读取图片缓存失败: {e}",
+                recoverable=True
+            )
+        if row is None:
+            return Result.ok(None)
+        asset = self._row_to_asset(row, url)
+        if not Path(asset.path).exists():
+            return Result.ok(None)
+        return Result.ok(asset)
+
+    def put(self, url: str, tmp_path: Path, sha256: str, size: int, content_type: str = "") -> Result[ImageAsset]:
+        """把下载完成的临时文件放入缓存
+
+        相同内容已缓存时丢弃临时文件，只记录新的来源地址。
+        """
+        now = datetime.now().isoformat()
+        relative = Path(sha256[:2]) / f"{sha256}{self._extension(content_type, url)}"
+        try:
+            with self._lock:
+                row = self._conn.execute("SELECT * FROM blobs WHERE sha256 = ?", (sha256,)).fetchone()
+                if row is not None and (self.root / row["path"]).exists():
+                    tmp_path.unlink(missing_ok=True)
+                else:
+                    target = self.root / relative
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    os.replace(tmp_path, target)
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO blobs (sha256, path, size, content_type, created_at) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (sha256, relative.as_posix(), size, content_type, now)
+                    )
+                    row = self._conn.execute("SELECT * FROM blobs WHERE sha256 = ?", (sha256,)).fetchone()
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO sources (url, sha256, fetched_at) VALUES (?, ?, ?)",
+                    (url, sha256, now)
+                )
+            return Result.ok(self._row_to_asset(row, url))
+        except Exception as e:
+            tmp_path.unlink(missing_ok=True)
+            return Result.fail_with(
+                code="S_WRITE_FAILED",
+                message=f"写入图片缓存失败: {e}",
+                recoverable=False,
+                context={"url": url}
+            )
+
+    def stats(self) -> dict:
+        """缓存统计"""
+        with self._lock:
+            blobs = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM blobs").fetchone()
+            sources = self._conn.execute("SELECT COUNT(*) FROM sources").fetchone()[0]
+        return {"files": blobs[0], "bytes": blobs[1], "sources": sources}
+
+    def _row_to_asset(self, row: sqlite3.Row, url: str) -> ImageAsset:
+        return ImageAsset(
+            sha256=row["sha256"],
+            path=str(self.root / row["path"]),
+            size=row["size"],
+            content_type=row["content_type"],
+            source_url=url,
+            created_at=datetime.fromisoformat(row["created_at"])
+        )
+
+    @staticmethod
+    def _extension(content_type: str, url: str) -> str:
+        if content_type in _EXTENSIONS:
+            return _EXTENSIONS[content_type]
+        suffix = Path(url.split("?")[0]).suffix.lower()
+        if suffix in (".jpg", ".jpeg", ".png", ".webp", ".gif", ".bmp"):
+            return ".jpg" if suffix == ".jpeg" else suffix
+        return ".img"
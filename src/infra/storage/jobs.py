@@ -0,0 +1,425 @@
+"""
+持久化任务队列
+
+采集/上架任务保存在 data/jobs.db（SQLite，WAL 模式）。worker 通过租约领取任务：
+租约到期未续期的任务会被重新领取，进程崩溃后重启即可从中断处继续，
+已完成的任务不会重复执行。
+"""
+import builtins
+import json
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from src.models import Job, JobKind, JobStatus, Result
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    dedupe_key TEXT UNIQUE,
+    available_at TEXT NOT NULL,
+    lease_owner TEXT,
+    lease_until TEXT,
+    result TEXT,
+    last_error TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_ready ON jobs(status, priority DESC, id);
+"""
+
+# dedupe_key 冲突时忽略，重复入队不会重置已完成的任务
+_INSERT = """
+INSERT OR IGNORE INTO jobs (
+    kind, payload, status, priority, attempts, max_attempts, dedupe_key,
+    available_at, created_at, updated_at
+) VALUES (
+    :kind, :payload, 'pending', :priority, 0, :max_attempts, :dedupe_key,
+    :now, :now, :now
+)
+"""
+
+
+def _row_to_job(row: sqlite3.Row) -> Job:
+    data = dict(row)
+    data["payload"] = json.loads(data["payload"])
+    data["result"] = json.loads(data["result"]) if data["result"] else None
+    return Job.from_dict(data)
+
+
+class JobQueue:
+    """SQLite 任务队列（优先级 + 重试退避 + 租约）"""
+
+    DB_NAME = "jobs.db"
+
+    def __init__(self, data_dir: Path = None):
+        self.data_dir = data_dir or Path("data")
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    @property
+    def db_path(self) -> Path:
+        return self.data_dir / self.DB_NAME
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            if self._conn:
+                self._conn.close()
+                self._conn = None
+
+    def enqueue(
+        self,
+        kind: JobKind,
+        payload: dict,
+        priority: int = 0,
+        max_attempts: int = 3,
+        dedupe_key: str = None
+    ) -> Result[bool]:
+        """加入任务，返回是否新入队（dedupe_key 已存在时为 False）"""
+        result = self.enqueue_many(kind, [payload], priority, max_attempts, [dedupe_key])
+        if not result.success:
+            return result
+        return Result.ok(result.data == 1)
+
+    def enqueue_many(
+        self,
+        kind: JobKind,
+        payloads: builtins.list[dict],
+        priority: int = 0,
+        max_attempts: int = 3,
+        dedupe_keys: builtins.list[str | None] = None
+    ) -> Result[int]:
+        """批量加入任务（单个事务），返回新入队的数量"""
+        now = datetime.now().isoformat()
+        keys = dedupe_keys or [None] * len(payloads)
+        rows = [
+            {
+                "kind": kind.value,
+                "payload": json.dumps(payload, ensure_ascii=False),
+                "priority": priority,
+                "max_attempts": max_attempts,
+                "dedupe_key": key,
+                "now": now
+            }
+            for payload, key in zip(payloads, keys)
+        ]
+        try:
+            with self._lock:
+                before = self._conn.total_changes
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    self._conn.executemany(_INSERT, rows)
+                    self._conn.execute("COMMIT")
+                except BaseException:
+                    self._conn.execute("ROLLBACK")
+                    raise
+                return Result.ok(self._conn.total_changes - before)
+        except Exception as e:
+            return Result.fail_with(
+                code="S_WRITE_FAILED",
+                message=f"任务入队失败: {e}",
+                recoverable=False
+            )
+
+    def lease(
+        self,
+        owner: str,
+        kinds: builtins.list[JobKind] = None,
+        lease_seconds: float = 300
+    ) -> Result[Job | None]:
+        """领取一个可执行任务（优先级高、入队早的优先），没有任务时返回 None
+
+        可领取的任务：等待中且已到可执行时间，或租约已过期的运行中任务。
+        每次领取计一次尝试；租约过期且尝试次数已用尽的任务直接标记为失败。
+        """
+        now = datetime.now()
+        now_text = now.isoformat()
+        kind_values = [k.value for k in kinds] if kinds else [k.value for k in JobKind]
+        marks = ",".join("?" * len(kind_values))
+
+        try:
+            with self._lock:
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = 'failed', lease_owner = NULL, lease_until = NULL, "
+                        "last_error = COALESCE(last_error, '租约过期'), updated_at = ? "
+                        "WHERE status = 'running' AND lease_until < ? AND attempts >= max_attempts",
+                        (now_text, now_text)
+                    )
+                    row = self._conn.execute(
+                        f"SELECT id FROM jobs WHERE kind IN ({marks}) AND ("
+                        "(status = 'pending' AND available_at <= ?) "
+                        "OR (status = 'running' AND lease_until < ?)) "
+                        "ORDER BY priority DESC, id LIMIT 1",
+                        (*kind_values, now_text, now_text)
+                    ).fetchone()
+                    if row is None:
+                        self._conn.execute("COMMIT")
+                        return Result.ok(None)
+
+                    self._conn.execute(
+                        "UPDATE jobs SET status = 'running', attempts = attempts + 1, "
+                        "lease_owner = ?, lease_until = ?, updated_at = ? WHERE id = ?",
+                        (owner, (now + timedelta(seconds=lease_seconds)).isoformat(), now_text, row["id"])
+                    )
+                    job_row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone()
+                    self._conn.execute("COMMIT")
+                except BaseException:
+                    self._conn.execute("ROLLBACK")
+                    raise
+            return Result.ok(_row_to_job(job_row))
+        except Exception as e:
+            return Result.fail_with(
+                code="S_READ_FAILED",
+                message=f"领取任务失败: {e}",
+                recoverable=True
+            )
+
+    def heartbeat(self, job_id: int, owner: str, lease_seconds: float = 300) -> Result[bool]:
+        """续期租约，返回租约是否仍属于 owner"""
+        now = datetime.now()
+        return self._update(
+            "UPDATE jobs SET lease_until = ?, updated_at = ? "
+            "WHERE id = ? AND status = 'running' AND lease_owner = ?",
+            ((now + timedelta(seconds=lease_seconds)).isoformat(), now.isoformat(), job_id, owner),
+            "续期租约失败"
+        )
+
+    def complete(self, job_id: int, owner: str, result: dict = None) -> Result[bool]:
+        """标记任务完成"""
+        return self._update(
+            "UPDATE jobs SET status = 'done', result = ?, last_error = NULL, "
+            "lease_owner = NULL, lease_until = NULL, updated_at = ? "
+            "WHERE id = ? AND status = 'running' AND lease_owner = ?",
+            (json.dumps(result or {}, ensure_ascii=False), datetime.now().isoformat(), job_id, owner),
+            "更新任务状态失败"
+        )
+
+    def fail(
+        self,
+        job_id: int,
+        owner: str,
+        error: str,
+        retry: bool = True,
+        backoff: float = 30.0
+    ) -> Result[bool]:
+        """记录任务失败
+
+        retry=True 且尝试次数未用尽时重新排队，backoff 秒后可再次领取（按尝试次数指数增长）；
+        否则标记为失败。
+        """
+        now = datetime.now()
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT attempts, max_attempts FROM jobs "
+                    "WHERE id = ? AND status = 'running' AND lease_owner = ?",
+                    (job_id, owner)
+                ).fetchone()
+                if row is None:
+                    return Result.ok(False)
+
+                if retry and row["attempts"] < row["max_attempts"]:
+                    delay = backoff * (2 ** (row["attempts"] - 1))
+                    self._conn.execute(
+                        "UPDATE jobs SET status = 'pending', available_at = ?, last_error = ?, "
+                        "lease_owner = NULL, lease_until = NULL, updated_at = ? WHERE id = ?",
+                        ((now + timedelta(seconds=delay)).isoformat(), error, now.isoformat(), job_id)
+                    )
+                else:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = 'failed', last_error = ?, "
+                        "lease_owner = NULL, lease_until = NULL, updated_at = ? WHERE id = ?",
+                        (error, now.isoformat(), job_id)
+                    )
+            return Result.ok(True)
+        except Exception as e:
+            return Result.fail_with(
+                code="S_WRITE_FAILED",
+                message=f"更新任务状态失败: {e}",
+                recoverable=False
+            )
+
+    def release(self, job_id: int, owner: str, delay: float = 0) -> Result[bool]:
+        """归还任务（不计入尝试次数），用于登录过期等与任务本身无关的中断"""
+        now = datetime.now()
+        return self._update(
+            "UPDATE jobs SET status = 'pending', attempts = MAX(attempts - 1, 0), available_at = ?, "
+            "lease_owner = NULL, lease_until = NULL, updated_at = ? "
+            "WHERE id = ? AND status = 'running' AND lease_owner = ?",
+            ((now + timedelta(seconds=delay)).isoformat(), now.isoformat(), job_id, owner),
+            "归还任务失败"
+        )
+
+    def recover(self) -> Result[int]:
+        """把上次运行遗留的运行中任务重新排队（仅在没有其他 worker 进程时调用）
+
+        崩溃时正在执行的任务不计入尝试次数，启动后立即可领取，不必等待租约过期。
+        """
+        now = datetime.now().isoformat()
+        try:
+            with self._lock:
+                cursor = self._conn.execute(
+                    "UPDATE jobs SET status = 'pending', attempts = MAX(attempts - 1, 0), available_at = ?, "
+                    "lease_owner = NULL, lease_until = NULL, updated_at = ? WHERE status = 'running'",
+                    (now, now)
+                )
+            return Result.ok(cursor.rowcount)
+        except Exception as e:
+            return Result.fail_with(
+                code="S_WRITE_FAILED",
+                message=f"恢复任务失败: {e}",
+                recoverable=False
+            )
+
+    def retry_failed(self, kind: JobKind = None) -> Result[int]:
+        """把失败的任务重新排队（尝试次数清零）"""
+        now = datetime.now().isoformat()
+        sql = (
+            "UPDATE jobs SET status = 'pending', attempts = 0, available_at = ?, updated_at = ? "
+            "WHERE status = 'failed'"
+        )
+        params: builtins.list = [now, now]
+        if kind:
+            sql += " AND kind = ?"
+            params.append(kind.value)
+        try:
+            with self._lock:
+                cursor = self._conn.execute(sql, params)
+            return Result.ok(cursor.rowcount)
+        except Exception as e:
+            return Result.fail_with(
+                code="S_WRITE_FAILED",
+                message=f"重试失败任务出错: {e}",
+                recoverable=False
+            )
+
+    def purge(self, status: JobStatus = JobStatus.DONE) -> Result[int]:
+        """删除指定状态的任务（默认清理已完成任务）"""
+        try:
+            with self._lock:
+                cursor = self._conn.execute("DELETE FROM jobs WHERE status = ?", (status.value,))
+            return Result.ok(cursor.rowcount)
+        except Exception as e:
+            return Result.fail_with(
+                code="S_WRITE_FAILED",
+                message=f"清理任务失败: {e}",
+                recoverable=False
+            )
+
+    def next_available_in(self, kinds: builtins.list[JobKind] = None) -> Result[float | None]:
+        """距离下一个任务可领取还有多少秒（没有等待中或运行中的任务时为 None）"""
+        kind_values = [k.value for k in kinds] if kinds else [k.value for k in JobKind]
+        marks = ",".join("?" * len(kind_values))
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT MIN(CASE WHEN status = 'pending' THEN available_at ELSE lease_until END) "
+                    f"FROM jobs WHERE kind IN ({marks}) AND status IN ('pending', 'running')",
+                    kind_values
+                ).fetchone()
+            if row[0] is None:
+                return Result.ok(None)
+            delta = (datetime.fromisoformat(row[0]) - datetime.now()).total_seconds()
+            return Result.ok(max(0.0, delta))
+        except Exception as e:
+            return Result.fail_with(
+                code="S_READ_FAILED",
+                message=f"读取任务失败: {e}",
+                recoverable=True
+            )
+
+    def counts(self, kind: JobKind = None) -> Result[dict[str, int]]:
+        """各状态的任务数量"""
+        sql = "SELECT status, COUNT(*) FROM jobs"
+        params: builtins.list = []
+        if kind:
+            sql += " WHERE kind = ?"
+            params.append(kind.value)
+        sql += " GROUP BY status"
+        try:
+            with self._lock:
+                rows = self._conn.execute(sql, params).fetchall()
+            counts = {status.value: 0 for status in JobStatus}
+            counts.update({row[0]: row[1] for row in rows})
+            return Result.ok(counts)
+        except Exception as e:
+            return Result.fail_with(
+                code="S_READ_FAILED",
+                message=f"统计任务失败: {e}",
+                recoverable=False
+            )
+
+    def get(self, job_id: int) -> Result[Job]:
+        """获取任务"""
+        try:
+            with self._lock:
+                row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return Result.fail_with(
+                    code="S_NOT_FOUND",
+                    message=f"任务不存在: {job_id}",
+                    recoverable=False
+                )
+            return Result.ok(_row_to_job(row))
+        except Exception as e:
+            return Result.fail_with(
+                code="S_READ_FAILED",
+                message=f"读取任务失败: {e}",
+                recoverable=False
+            )
+
+    def list(self, status: JobStatus = None, kind: JobKind = None, limit: int = None) -> Result[builtins.list[Job]]:
+        """列出任务（按入队顺序）"""
+        sql = "SELECT * FROM jobs"
+        clauses, params = [], []
+        if status:
+            clauses.append("status = ?")
+            params.append(status.value)
+        if kind:
+            clauses.append("kind = ?")
+            params.append(kind.value)
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY id"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        try:
+            with self._lock:
+                rows = self._conn.execute(sql, params).fetchall()
+            return Result.ok([_row_to_job(row) for row in rows])
+        except Exception as e:
+            return Result.fail_with(
+                code="S_READ_FAILED",
+                message=f"列出任务失败: {e}",
+                recoverable=False
+            )
+
+    def _update(self, sql: str, params: tuple, message: str) -> Result[bool]:
+        """执行单条更新，返回是否有行被修改"""
+        try:
+            with self._lock:
+                cursor = self._conn.execute(sql, params)
+            return Result.ok(cursor.rowcount > 0)
+        except Exception as e:
+            return Result.fail_with(
+                code="S_WRITE_FAILED",
+                message=f"{message}: {e}",
+                recoverable=False
+            )
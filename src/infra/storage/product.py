@@ -1,20 +1,24 @@
 """
 商品数据存储
 """
+import os
 import uuid
 from pathlib import Path
 
 from src.models import Product, ProductStatus, Result
+from src.infra.logger import logger
 from .base import BaseStorage
 
+log = logger.get("storage")
+
 
 class ProductStorage(BaseStorage[Product]):
     """商品数据存储"""
 
-    def __init__(self, data_dir: Path = None):
+    def __init__(self, data_dir: Path = None, fsync: bool = False):
         if data_dir is None:
             data_dir = Path("data/products")
-        super().__init__(data_dir)
+        super().__init__(data_dir, fsync)
 
     def _empty_index(self) -> dict:
         return {"products": []}
@@ -39,14 +43,7 @@ class ProductStorage(BaseStorage[Product]):
             self._write_json(item_path, product.to_dict())
 
             # 更新索引
-            index = self._get_index()
-            entries = index["products"]
-            # 移除旧条目
-            entries = [e for e in entries if e["id"] != product.id]
-            # 添加新条目
-            entries.append(self._to_index_entry(product))
-            index["products"] = entries
-            self._save_index(index)
+            self._put_entry(product)
 
             return Result.ok(product)
         except Exception as e:
@@ -78,8 +75,7 @@ class ProductStorage(BaseStorage[Product]):
     def list(self, status: ProductStatus = None) -> Result[list[dict]]:
         """列出商品（返回索引条目）"""
         try:
-            index = self._get_index()
-            entries = index["products"]
+            entries = self._entries()
             if status:
                 entries = [e for e in entries if e["status"] == status.value]
             return Result.ok(entries)
@@ -98,9 +94,7 @@ class ProductStorage(BaseStorage[Product]):
                 item_path.unlink()
 
             # 更新索引
-            index = self._get_index()
-            index["products"] = [e for e in index["products"] if e["id"] != product_id]
-            self._save_index(index)
+            self._drop_entry(product_id)
 
             return Result.ok(True)
         except Exception as e:
@@ -109,3 +103,56 @@ class ProductStorage(BaseStorage[Product]):
                 message=f"删除商品失败: {e}",
                 recoverable=False
             )
+
+
+def create_product_storage(data_dir: Path = None, backend: str = "json", fsync: bool = False):
+    """按配置创建商品存储
+
+    backend:
+        json   - 每个商品一个 JSON 文件 + index.json
+        sqlite - 单文件 SQLite 数据库（首次启用时自动导入已有 JSON 数据）
+    """
+    if backend != "sqlite":
+        return ProductStorage(data_dir, fsync)
+
+    from .sqlite import SqliteProductStorage
+
+    data_dir = data_dir or Path("data/products")
+    db_path = data_dir / SqliteProductStorage.DB_NAME
+    if not db_path.exists() and (data_dir / "index.json").exists():
+        # 先导入临时数据库，成功后再改名；失败时不留下空库，下次启动会重新迁移
+        result = _migrate_to_sqlite(data_dir, fsync)
+        if not result.success:
+            log.error("迁移到 SQLite 失败，继续使用 JSON 存储", error=result.error.message)
+            return ProductStorage(data_dir, fsync)
+        log.info("已从 JSON 迁移到 SQLite", products=result.data)
+    return SqliteProductStorage(data_dir, fsync)
+
+
+def _migrate_to_sqlite(data_dir: Path, fsync: bool) -> Result[int]:
+    """把 JSON 目录导入临时数据库，成功后原子替换为 products.db"""
+    from .sqlite import SqliteProductStorage
+
+    tmp_name = SqliteProductStorage.DB_NAME + ".migrating"
+    tmp_files = [data_dir / (tmp_name + suffix) for suffix in ("", "-wal", "-shm")]
+    for path in tmp_files:
+        path.unlink(missing_ok=True)
+
+    try:
+        storage = SqliteProductStorage(data_dir, fsync, db_name=tmp_name)
+        try:
+            result = storage.migrate_from_json(data_dir)
+        finally:
+            storage.close()
+        if result.success:
+            os.replace(tmp_files[0], data_dir / SqliteProductStorage.DB_NAME)
+    except Exception as e:
+        result = Result.fail_with(
+            code="S_WRITE_FAILED",
+            message=f"迁移商品数据失败: {e}",
+            recoverable=False
+        )
+
+    for path in tmp_files:
+        path.unlink(missing_ok=True)
+    return result
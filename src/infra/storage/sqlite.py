@@ -0,0 +1,247 @@
+"""
+SQLite 商品存储
+
+与 ProductStorage 接口一致，索引字段（id / status / collected_at）建索引，
+单次保存只写一行，不再整体重写 index.json。
+
+从 JSON 目录迁移:
+    python -m src.infra.storage.sqlite data/products
+"""
+import json
+import sqlite3
+import sys
+import threading
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+from src.models import Product, ProductStatus, Result
+from src.infra.logger import logger
+from .base import BaseStorage
+
+log = logger.get("storage")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL DEFAULT '',
+    status TEXT NOT NULL,
+    collected_at TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_products_status ON products(status);
+CREATE INDEX IF NOT EXISTS idx_products_collected_at ON products(collected_at);
+"""
+
+# INSERT OR REPLACE 会重新分配 rowid，按 rowid 排序即与 JSON 索引的顺序一致（最近保存的在后）
+_UPSERT = """
+INSERT OR REPLACE INTO products (id, title, status, collected_at, data)
+VALUES (:id, :title, :status, :collected_at, :data)
+"""
+
+
+class SqliteProductStorage(BaseStorage[Product]):
+    """SQLite 商品存储（单文件数据库，WAL 模式）"""
+
+    DB_NAME = "products.db"
+
+    def __init__(self, data_dir: Path = None, fsync: bool = False, db_name: str = None):
+        if data_dir is None:
+            data_dir = Path("data/products")
+        self.db_name = db_name or self.DB_NAME
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        super().__init__(data_dir, fsync)
+
+    @property
+    def db_path(self) -> Path:
+        return self.data_dir / self.db_name
+
+    def _ensure_dir(self):
+        """确保目录和表结构存在"""
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # fsync=True 时每次提交都刷盘，否则只在 WAL 检查点刷盘
+        self._conn.execute(f"PRAGMA synchronous={'FULL' if self.fsync else 'NORMAL'}")
+        self._conn.executescript(_SCHEMA)
+
+    def _empty_index(self) -> dict:
+        return {"products": []}
+
+    def _to_index_entry(self, product: Product) -> dict:
+        return {
+            "id": product.id,
+            "title": product.title,
+            "status": product.status.value,
+            "collected_at": product.collected_at.isoformat()
+        }
+
+    def _to_row(self, product: Product) -> dict:
+        row = self._to_index_entry(product)
+        row["data"] = json.dumps(product.to_dict(), ensure_ascii=False)
+        return row
+
+    def close(self):
+        """关闭数据库连接（先把 WAL 写回主文件，数据库文件可以单独复制或改名）"""
+        with self._lock:
+            if self._conn:
+                self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                self._conn.close()
+                self._conn = None
+
+    def generate_id(self) -> str:
+        """生成唯一 ID"""
+        return f"prod_{uuid.uuid4().hex[:8]}"
+
+    def save(self, product: Product) -> Result[Product]:
+        """保存商品"""
+        result = self.save_many([product])
+        if not result.success:
+            return result
+        return Result.ok(product)
+
+    def save_many(self, products: list[Product]) -> Result[int]:
+        """批量保存（单个事务，全部成功或全部回滚）"""
+        try:
+            rows = [self._to_row(p) for p in products]
+            with self._lock, self._conn:
+                self._conn.executemany(_UPSERT, rows)
+            return Result.ok(len(rows))
+        except Exception as e:
+            return Result.fail_with(
+                code="S_WRITE_FAILED",
+                message=f"保存商品失败: {e}",
+                recoverable=False
+            )
+
+    def get(self, product_id: str) -> Result[Product]:
+        """获取商品"""
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT data FROM products WHERE id = ?", (product_id,)
+                ).fetchone()
+            if row is None:
+                return Result.fail_with(
+                    code="S_NOT_FOUND",
+                    message=f"商品不存在: {product_id}",
+                    recoverable=False
+                )
+            return Result.ok(Product.from_dict(json.loads(row["data"])))
+        except Exception as e:
+            return Result.fail_with(
+                code="S_READ_FAILED",
+                message=f"读取商品失败: {e}",
+                recoverable=False
+            )
+
+    def count(self, status: ProductStatus = None) -> Result[int]:
+        """统计商品数量"""
+        try:
+            with self._lock:
+                if status:
+                    row = self._conn.execute(
+                        "SELECT COUNT(*) FROM products WHERE status = ?", (status.value,)
+                    ).fetchone()
+                else:
+                    row = self._conn.execute("SELECT COUNT(*) FROM products").fetchone()
+            return Result.ok(row[0])
+        except Exception as e:
+            return Result.fail_with(
+                code="S_READ_FAILED",
+                message=f"统计商品失败: {e}",
+                recoverable=False
+            )
+
+    def delete(self, product_id: str) -> Result[bool]:
+        """删除商品"""
+        try:
+            with self._lock, self._conn:
+                self._conn.execute("DELETE FROM products WHERE id = ?", (product_id,))
+            return Result.ok(True)
+        except Exception as e:
+            return Result.fail_with(
+                code="S_WRITE_FAILED",
+                message=f"删除商品失败: {e}",
+                recoverable=False
+            )
+
+    def migrate_from_json(self, json_dir: Path = None) -> Result[int]:
+        """从 JSON 目录（index.json + 单品文件）导入商品，已存在的 ID 会被覆盖
+
+        缺失或格式错误的单品文件跳过并记录日志（原文件保留），返回导入的数量。
+        """
+        json_dir = Path(json_dir) if json_dir else self.data_dir
+        index = self._read_json(json_dir / "index.json")
+        if not index:
+            return Result.ok(0)
+
+        products, skipped = [], []
+        for entry in index.get("products", []):
+            product_id = entry.get("id") if isinstance(entry, dict) else None
+            if not product_id:
+                skipped.append(str(entry))
+                continue
+            data = self._read_json(json_dir / f"{product_id}.json")
+            try:
+                if data is None:
+                    raise ValueError("文件缺失或不是有效的 JSON")
+                products.append(Product.from_dict(data))
+            except Exception as e:
+                skipped.append(product_id)
+                log.warning("跳过无法读取的商品文件", id=product_id, error=str(e))
+
+        result = self.save_many(products)
+        if not result.success:
+            return result
+        if skipped:
+            log.warning("迁移时跳过部分商品", imported=result.data, skipped=len(skipped), ids=skipped[:20])
+        return result
+
+    def list(
+        self,
+        status: ProductStatus = None,
+        since: datetime = None,
+        limit: int = None
+    ) -> Result[list[dict]]:
+        """列出商品（返回索引条目，可按状态和采集时间过滤）"""
+        sql = "SELECT id, title, status, collected_at FROM products"
+        clauses, params = [], []
+        if status:
+            clauses.append("status = ?")
+            params.append(status.value)
+        if since:
+            clauses.append("collected_at >= ?")
+            params.append(since.isoformat())
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY rowid"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        try:
+            with self._lock:
+                rows = self._conn.execute(sql, params).fetchall()
+            return Result.ok([dict(row) for row in rows])
+        except Exception as e:
+            return Result.fail_with(
+                code="S_READ_FAILED",
+                message=f"列出商品失败: {e}",
+                recoverable=False
+            )
+
+
+if __name__ == "__main__":
+    # 迁移工具：把 JSON 目录中的商品导入同目录下的 products.db
+    source = Path(sys.argv[1]) if len(sys.argv) > 1 else Path("data/products")
+    storage = SqliteProductStorage(source)
+    result = storage.migrate_from_json(source)
+    storage.close()
+    if result.success:
+        print(f"已迁移 {result.data} 个商品到 {storage.db_path}")
+    else:
+        print(f"迁移失败: {result.error.message}")
+        sys.exit(1)
@@ -2,6 +2,9 @@
 Product Uploader - 淘宝商品一键上架工具
 
 主入口文件
+
+    uploader          交互式命令行
+    uploader serve    常驻服务模式（本地 HTTP API）
 """
 import sys
 from pathlib import Path
@@ -10,7 +13,16 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from src.cli.shell import main
+from src.cli.shell import main as shell_main
+
+
+def main():
+    """程序入口：按子命令选择交互模式或服务模式"""
+    if len(sys.argv) > 1 and sys.argv[1] == "serve":
+        from src.api import serve
+        serve(sys.argv[2:])
+    else:
+        shell_main()
 
 
 if __name__ == "__main__":
@@ -6,6 +6,8 @@ from .product import Product, SKU, ProductStatus
 from .problem import Problem, ProblemContext, ProblemType, ProblemStatus
 from .solution import Solution, Step, StepAction, SolutionStats, TrustLevel
 from .binding import FieldType, FieldBinding, BindingConfig
+from .job import Job, JobKind, JobStatus
+from .image import ImageAsset
 
 __all__ = [
     # result
@@ -30,4 +32,10 @@ __all__ = [
     "FieldType",
     "FieldBinding",
     "BindingConfig",
+    # job
+    "Job",
+    "JobKind",
+    "JobStatus",
+    # image
+    "ImageAsset",
 ]
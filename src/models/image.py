@@ -0,0 +1,41 @@
+"""
+图片缓存模型
+"""
+from dataclasses import dataclass, field
+from datetime import datetime
+
+
+@dataclass
+class ImageAsset:
+    """按内容哈希缓存的图片（同一内容只保存、只上传一次）"""
+    sha256: str
+    path: str                          # 本地缓存文件
+    size: int = 0
+    content_type: str = ""
+    source_url: str | None = None      # 下载来源（同一内容可能有多个来源，这里是本次请求的地址）
+    remote_url: str | None = None      # 本次上传后返回的素材库地址
+    created_at: datetime = field(default_factory=datetime.now)
+
+    def to_dict(self) -> dict:
+        return {
+            "sha256": self.sha256,
+            "path": self.path,
+            "size": self.size,
+            "content_type": self.content_type,
+            "source_url": self.source_url,
+            "remote_url": self.remote_url,
+            "created_at": self.created_at.isoformat()
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'ImageAsset':
+        created_at = data.get("created_at")
+        return cls(
+            sha256=data["sha256"],
+            path=data["path"],
+            size=data.get("size", 0),
+            content_type=data.get("content_type", ""),
+            source_url=data.get("source_url"),
+            remote_url=data.get("remote_url"),
+            created_at=datetime.fromisoformat(created_at) if created_at else datetime.now()
+        )
@@ -0,0 +1,80 @@
+"""
+后台任务模型
+"""
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+
+
+class JobKind(Enum):
+    """任务类型"""
+    COLLECT = "collect"     # 采集链接，payload: {"url": ...}
+    UPLOAD = "upload"       # 上架商品，payload: {"product_id": ..., "binding_id": ...}
+
+
+class JobStatus(Enum):
+    """任务状态"""
+    PENDING = "pending"     # 等待执行（含失败后等待重试）
+    RUNNING = "running"     # 已被 worker 租用
+    DONE = "done"           # 已完成
+    FAILED = "failed"       # 重试次数用尽或不可恢复
+
+
+@dataclass
+class Job:
+    """队列中的任务"""
+    id: int
+    kind: JobKind
+    payload: dict = field(default_factory=dict)
+    status: JobStatus = JobStatus.PENDING
+    priority: int = 0                          # 越大越先执行
+    attempts: int = 0                          # 已租用次数
+    max_attempts: int = 3
+    dedupe_key: str | None = None              # 相同键的任务只入队一次
+    available_at: datetime = field(default_factory=datetime.now)   # 最早可执行时间（重试退避）
+    lease_owner: str | None = None
+    lease_until: datetime | None = None
+    result: dict | None = None
+    last_error: str | None = None
+    created_at: datetime = field(default_factory=datetime.now)
+    updated_at: datetime = field(default_factory=datetime.now)
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "kind": self.kind.value,
+            "payload": self.payload,
+            "status": self.status.value,
+            "priority": self.priority,
+            "attempts": self.attempts,
+            "max_attempts": self.max_attempts,
+            "dedupe_key": self.dedupe_key,
+            "available_at": self.available_at.isoformat(),
+            "lease_owner": self.lease_owner,
+            "lease_until": self.lease_until.isoformat() if self.lease_until else None,
+            "result": self.result,
+            "last_error": self.last_error,
+            "created_at": self.created_at.isoformat(),
+            "updated_at": self.updated_at.isoformat()
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Job':
+        lease_until = data.get("lease_until")
+        return cls(
+            id=data["id"],
+            kind=JobKind(data["kind"]),
+            payload=data.get("payload") or {},
+            status=JobStatus(data.get("status", "pending")),
+            priority=data.get("priority", 0),
+            attempts=data.get("attempts", 0),
+            max_attempts=data.get("max_attempts", 3),
+            dedupe_key=data.get("dedupe_key"),
+            available_at=datetime.fromisoformat(data["available_at"]),
+            lease_owner=data.get("lease_owner"),
+            lease_until=datetime.fromisoformat(lease_until) if lease_until else None,
+            result=data.get("result"),
+            last_error=data.get("last_error"),
+            created_at=datetime.fromisoformat(data["created_at"]),
+            updated_at=datetime.fromisoformat(data["updated_at"])
+        )
@@ -0,0 +1,45 @@
+"""
+测试公共夹具：Playwright Page / BrowserContext 的最小替身
+"""
+import asyncio
+
+import pytest
+
+
+class FakePage:
+    """只实现标签页池用到的接口"""
+
+    def __init__(self, healthy: bool = True):
+        self.healthy = healthy
+        self.closed = False
+        self.url = "about:blank"
+
+    def is_closed(self) -> bool:
+        return self.closed
+
+    async def evaluate(self, expression, arg=None):
+        if not self.healthy:
+            raise RuntimeError("页面无响应")
+        return 1
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeContext:
+    """new_page() 带一点延迟，模拟并发创建标签页"""
+
+    def __init__(self, delay: float = 0.01):
+        self.delay = delay
+        self.pages: list[FakePage] = []
+
+    async def new_page(self) -> FakePage:
+        await asyncio.sleep(self.delay)
+        page = FakePage()
+        self.pages.append(page)
+        return page
+
+
+@pytest.fixture
+def context() -> FakeContext:
+    return FakeContext()
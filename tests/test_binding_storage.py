@@ -0,0 +1,66 @@
+"""
+绑定配置存储：旧版配置文件补建索引
+"""
+import json
+
+from src.infra.storage import BindingStorage
+from src.models import BindingConfig, FieldBinding, FieldType
+
+
+def make_config(config_id: str) -> BindingConfig:
+    return BindingConfig(
+        id=config_id,
+        name=f"配置 {config_id}",
+        fields=[FieldBinding(name="标题", field_type=FieldType.TEXT, required=True, target_selector="#title")]
+    )
+
+
+def write_legacy(directory, config: BindingConfig):
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / f"{config.id}.json").write_text(
+        json.dumps(config.to_dict(), ensure_ascii=False), encoding="utf-8"
+    )
+
+
+def test_legacy_files_are_indexed_on_first_open(tmp_path):
+    write_legacy(tmp_path, make_config("b1"))
+    write_legacy(tmp_path, make_config("b2"))
+    (tmp_path / "broken.json").write_text("{", encoding="utf-8")
+
+    storage = BindingStorage(tmp_path)
+
+    entries = storage.list().data
+    assert sorted(e["id"] for e in entries) == ["b1", "b2"]
+    assert entries[0]["field_count"] == 1
+    assert storage.get("b1").data.fields[0].target_selector == "#title"
+
+
+def test_directory_is_not_rescanned_once_indexed(tmp_path, monkeypatch):
+    write_legacy(tmp_path, make_config("b1"))
+    BindingStorage(tmp_path)
+
+    scans = []
+    monkeypatch.setattr(BindingStorage, "migrate_legacy_files", lambda self: scans.append(1))
+    write_legacy(tmp_path, make_config("late"))
+
+    storage = BindingStorage(tmp_path)
+    assert scans == []
+    assert [e["id"] for e in storage.list().data] == ["b1"]
+
+
+def test_explicit_migration_picks_up_unindexed_files(tmp_path):
+    storage = BindingStorage(tmp_path)
+    storage.save(make_config("b1"))
+    write_legacy(tmp_path, make_config("b2"))
+
+    assert storage.migrate_legacy_files().data == 1
+    assert storage.migrate_legacy_files().data == 0
+    assert [e["id"] for e in storage.list().data] == ["b1", "b2"]
+
+
+def test_save_and_delete(tmp_path):
+    storage = BindingStorage(tmp_path)
+    storage.save(make_config("b1"))
+    assert storage.delete("b1").data is True
+    assert storage.list().data == []
+    assert storage.get("b1").error.code == "S_NOT_FOUND"
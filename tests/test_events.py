@@ -0,0 +1,163 @@
+"""
+事件总线：同步/异步分发、背压策略与处理器隔离
+"""
+import asyncio
+
+import pytest
+
+from src.core.events import DispatchPolicy, Event, EventBus, EventTypes
+
+
+def test_sync_dispatch_to_listeners_and_handlers():
+    bus = EventBus()
+    received = []
+
+    class Listener:
+        def on_event(self, event: Event):
+            received.append(("all", event.type))
+
+    bus.subscribe(Listener())
+    bus.on("saved", lambda e: received.append(("saved", e.payload["id"])))
+
+    bus.emit("saved", id="p1")
+    bus.emit("other")
+
+    assert received == [("all", "saved"), ("saved", "p1"), ("all", "other")]
+
+
+def test_failing_handler_does_not_block_others():
+    bus = EventBus()
+    received = []
+
+    def broken(event):
+        raise ValueError("boom")
+
+    bus.on("x", broken)
+    bus.on("x", lambda e: received.append(e.type))
+    bus.emit("x")
+
+    assert received == ["x"]
+    errors = [s["errors"] for s in bus.stats()["subscribers"]]
+    assert errors == [1, 0]
+
+
+def test_off_removes_handler():
+    bus = EventBus()
+    received = []
+    handler = received.append
+    bus.on("x", handler)
+    bus.off("x", handler)
+    bus.emit("x")
+    assert received == []
+
+
+def test_async_handler_without_loop_is_not_left_pending(recwarn):
+    bus = EventBus()
+    called = []
+
+    async def handler(event):
+        called.append(event)
+
+    bus.on("x", handler)
+    bus.emit("x")
+
+    assert called == []
+    assert bus.stats()["subscribers"][0]["errors"] == 1
+    assert not [w for w in recwarn if "never awaited" in str(w.message)]
+
+
+async def test_sync_mode_schedules_async_handler_in_loop():
+    bus = EventBus()
+    called = []
+
+    async def handler(event):
+        called.append(event.type)
+
+    bus.on("x", handler)
+    bus.emit("x")
+    assert await bus.drain(timeout=1)
+    assert called == ["x"]
+
+
+async def test_async_mode_delivers_in_order_without_blocking_publisher():
+    bus = EventBus(mode="async")
+    received = []
+
+    async def slow(event):
+        await asyncio.sleep(0.001)
+        received.append(event.payload["n"])
+
+    bus.on("x", slow)
+    for n in range(20):
+        bus.emit("x", n=n)
+    # 发布方不等待处理器
+    assert received == []
+
+    assert await bus.drain(timeout=2)
+    assert received == list(range(20))
+    await bus.close()
+
+
+async def test_drop_oldest_keeps_latest_events():
+    bus = EventBus(mode="async")
+    received = []
+    gate = asyncio.Event()
+
+    async def handler(event):
+        await gate.wait()
+        received.append(event.payload["n"])
+
+    bus.on("x", handler, policy=DispatchPolicy.DROP_OLDEST, maxsize=2)
+    for n in range(6):
+        bus.emit("x", n=n)
+    await asyncio.sleep(0.05)
+    gate.set()
+
+    assert await bus.drain(timeout=2)
+    # 处理器开始前全部事件已分发，队列只保留最新的 2 个
+    assert received == [4, 5]
+    assert bus.stats()["subscribers"][0]["dropped"] == 4
+    await bus.close()
+
+
+async def test_block_policy_loses_nothing():
+    bus = EventBus(mode="async")
+    received = []
+
+    async def handler(event):
+        await asyncio.sleep(0.001)
+        received.append(event.payload["n"])
+
+    bus.on("x", handler, policy=DispatchPolicy.BLOCK, maxsize=2)
+    for n in range(10):
+        bus.emit("x", n=n)
+
+    assert await bus.drain(timeout=2)
+    assert received == list(range(10))
+    await bus.close()
+
+
+async def test_progress_events_are_coalesced():
+    bus = EventBus(mode="async")
+    received = []
+    gate = asyncio.Event()
+
+    async def handler(event):
+        await gate.wait()
+        received.append(event.payload["current"])
+
+    bus.on(EventTypes.PROGRESS, handler)
+    for current in range(5):
+        bus.emit(EventTypes.PROGRESS, current=current)
+    await asyncio.sleep(0.05)
+    gate.set()
+
+    assert await bus.drain(timeout=2)
+    assert received == [4]
+    assert bus.stats()["subscribers"][0]["coalesced"] == 4
+    await bus.close()
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        EventBus(mode="threaded")
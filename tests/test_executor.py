@@ -0,0 +1,203 @@
+"""
+方案执行器：批量填写、逐步回退与失败恢复
+"""
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("playwright")
+
+from src.core.executor import SolutionExecutor
+from src.core.filler import Filler
+from src.infra.knowledge import KnowledgeBase
+from src.infra.selector_cache import SelectorCache
+from src.models import (
+    Problem, ProblemContext, ProblemStatus, ProblemType, Solution, Step, StepAction, TrustLevel
+)
+
+PUBLISH_URL = "https://upload.taobao.com/auction/publish.htm"
+
+
+class FormPage:
+    """发布表单替身：visible 中的元素可被批量脚本直接填写，missing 中的元素任何操作都失败"""
+
+    def __init__(self, visible=(), missing=()):
+        self.url = PUBLISH_URL
+        self.visible = set(visible)
+        self.missing = set(missing)
+        self.values: dict[str, str] = {}
+        self.actions: list[tuple] = []
+        self.batches = 0
+
+    async def evaluate(self, expression, items):
+        self.batches += 1
+        filled = []
+        for selector, value in items:
+            ok = selector in self.visible and selector not in self.missing
+            if ok:
+                self.values[selector] = value
+            filled.append(ok)
+        return filled
+
+    def _check(self, selector):
+        if selector in self.missing:
+            raise TimeoutError(f"等待 {selector} 超时")
+
+    async def fill(self, selector, value, timeout=None):
+        self._check(selector)
+        self.actions.append(("fill", selector))
+        self.values[selector] = value
+
+    async def click(self, selector, timeout=None):
+        self._check(selector)
+        self.actions.append(("click", selector))
+
+    async def screenshot(self, path=None):
+        pass
+
+
+def fill(selector, value="${value}", optional=False) -> Step:
+    return Step(action=StepAction.FILL, selector=selector, value=value, optional=optional)
+
+
+def click(selector, optional=False) -> Step:
+    return Step(action=StepAction.CLICK, selector=selector, optional=optional)
+
+
+@pytest.fixture
+def knowledge_base(tmp_path):
+    return KnowledgeBase(tmp_path)
+
+
+def save_solution(knowledge_base, steps, trust=TrustLevel.TESTING, rules=None) -> Solution:
+    solution = Solution(
+        id=knowledge_base.solutions.generate_id(),
+        problem_type=ProblemType.FIELD_MISMATCH,
+        name="填写标题",
+        description="",
+        match_rules=rules or {},
+        steps=steps,
+        trust_level=trust
+    )
+    knowledge_base.save_solution(solution)
+    return solution
+
+
+@pytest.fixture
+def executor(knowledge_base):
+    return SolutionExecutor(SimpleNamespace(page=None), knowledge_base)
+
+
+async def test_consecutive_fills_run_in_one_script(executor, knowledge_base):
+    page = FormPage(visible={"#title", "#price"})
+    solution = save_solution(knowledge_base, [
+        click("#open"), fill("#title"), fill("#price", "9.90"), click("#save"),
+    ])
+
+    report = (await executor.execute(solution, page=page, variables={"value": "新标题"})).data
+
+    assert report.success and report.executed == 4
+    assert report.batched_fills == 2
+    assert page.batches == 1
+    assert page.values == {"#title": "新标题", "#price": "9.90"}
+    assert page.actions == [("click", "#open"), ("click", "#save")]
+
+
+async def test_batch_falls_back_to_playwright_for_unfilled_steps(executor, knowledge_base):
+    page = FormPage(visible={"#title"})
+    solution = save_solution(knowledge_base, [fill("#title", "a"), fill("#hidden", "b"), fill("text=价格", "c")])
+
+    report = (await executor.execute(solution, page=page)).data
+
+    # #hidden 批量脚本未填写，回退到 page.fill；"text=" 选择器不参与合并
+    assert report.success
+    assert report.batched_fills == 1
+    assert page.actions == [("fill", "#hidden"), ("fill", "text=价格")]
+
+
+async def test_optional_step_failure_is_skipped(executor, knowledge_base):
+    page = FormPage(missing={"#popup-close"})
+    solution = save_solution(knowledge_base, [click("#popup-close", optional=True), click("#save")])
+
+    report = (await executor.execute(solution, page=page)).data
+    assert report.success
+    assert report.skipped == [0]
+    assert report.executed == 1
+
+
+async def test_required_step_failure_stops_and_is_recorded(executor, knowledge_base):
+    page = FormPage(visible={"#title"}, missing={"#price"})
+    solution = save_solution(knowledge_base, [fill("#title", "a"), fill("#price", "b"), click("#save")])
+
+    report = (await executor.execute(solution, page=page)).data
+
+    assert not report.success
+    assert report.failed_step == 1
+    assert "#price" in report.error
+    assert ("click", "#save") not in page.actions
+    # TESTING 方案执行失败后降级
+    saved = knowledge_base.solutions.get(solution.id).data
+    assert saved.stats.fail_count == 1
+    assert saved.trust_level == TrustLevel.FAILED
+
+
+async def test_unknown_variables_are_left_as_is(executor, knowledge_base):
+    page = FormPage()
+    solution = save_solution(knowledge_base, [fill("#title", "${value}-${missing}")])
+
+    await executor.execute(solution, page=page, variables={"value": "x"}, record=False)
+    assert page.values == {"#title": "x-${missing}"}
+    assert knowledge_base.solutions.get(solution.id).data.stats.total_runs == 0
+
+
+def make_filler(knowledge_base, tmp_path) -> Filler:
+    return Filler(
+        SimpleNamespace(page=None),
+        knowledge_base,
+        selector_cache=SelectorCache(tmp_path / "selector_cache.json")
+    )
+
+
+def report_problem(knowledge_base, selector="#title") -> Problem:
+    problem = Problem(
+        id=knowledge_base.problems.generate_id(),
+        type=ProblemType.FIELD_MISMATCH,
+        message="无法填写商品标题",
+        context=ProblemContext(page_url=PUBLISH_URL, element_selector=selector, expected_value="新标题")
+    )
+    knowledge_base.report_problem(problem)
+    return problem
+
+
+async def test_filler_recovers_with_matching_solution(knowledge_base, tmp_path):
+    filler = make_filler(knowledge_base, tmp_path)
+    solution = save_solution(knowledge_base, [fill("#title")], rules={"element_pattern": "^#title$"})
+    problem = report_problem(knowledge_base)
+    page = FormPage()
+
+    assert await filler._try_recover(problem, {"value": "新标题"}, page)
+    assert page.values == {"#title": "新标题"}
+
+    solved = knowledge_base.problems.get(problem.id).data
+    assert solved.status == ProblemStatus.SOLVED
+    assert solved.solution_id == solution.id
+
+
+async def test_filler_does_not_run_unconfirmed_or_unmatched_solutions(knowledge_base, tmp_path):
+    filler = make_filler(knowledge_base, tmp_path)
+    save_solution(knowledge_base, [fill("#title")], trust=TrustLevel.NEW, rules={"element_pattern": "^#title$"})
+    save_solution(knowledge_base, [fill("#price")], rules={"element_pattern": "^#price$"})
+    page = FormPage()
+
+    assert not await filler._try_recover(report_problem(knowledge_base), {"value": "x"}, page)
+    assert not await filler._try_recover(report_problem(knowledge_base, "#desc"), {"value": "x"}, page)
+    assert page.values == {}
+
+
+async def test_filler_recovery_fails_when_replay_fails(knowledge_base, tmp_path):
+    filler = make_filler(knowledge_base, tmp_path)
+    save_solution(knowledge_base, [fill("#title")], rules={"element_pattern": "^#title$"})
+    problem = report_problem(knowledge_base)
+
+    assert not await filler._try_recover(problem, {"value": "x"}, FormPage(missing={"#title"}))
+    assert knowledge_base.problems.get(problem.id).data.status == ProblemStatus.OPEN
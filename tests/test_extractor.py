@@ -0,0 +1,113 @@
+"""
+HTML 提取：CSS 选择器子集与 run_html
+"""
+import pytest
+
+from src.core.extractor import ExtractionPlan, FieldRule, HtmlDocument
+
+HTML = """
+<html><head><title> 商品页 </title></head><body>
+<div id="main" class="box wide" data-spm="a, b">
+  <h1 title="foo bar">标题</h1>
+  <ul><li class="x">一<li class="y">二</ul>
+  <p><span data-v="1>2">深层</span></p>
+</div>
+<div class="box"><h1>其他</h1></div>
+</body></html>
+"""
+
+
+def texts(document: HtmlDocument, selector: str) -> list[str]:
+    return [node.text().strip() for node in document.select(selector)]
+
+
+@pytest.fixture
+def document():
+    return HtmlDocument(HTML)
+
+
+def test_basic_selectors(document):
+    assert document.title == "商品页"
+    assert texts(document, "h1") == ["标题", "其他"]
+    assert texts(document, "#main > h1") == ["标题"]
+    assert texts(document, "div.box.wide h1") == ["标题"]
+    assert texts(document, "div>h1") == ["标题", "其他"]
+    assert texts(document, "li:not(.x)") == ["二"]
+    assert texts(document, "div > span") == []
+    assert texts(document, "#main span, .y") == ["二", "深层"]
+
+
+def test_quoted_attribute_values(document):
+    assert texts(document, '[data-spm="a, b"] h1') == ["标题"]
+    assert texts(document, "div[data-spm='a, b'] > h1, li.x") == ["标题", "一"]
+    assert texts(document, '[title="foo bar"]') == ["标题"]
+    assert texts(document, '[ title = "foo bar" ]') == ["标题"]
+    assert texts(document, 'h1:not([title="foo bar"])') == ["其他"]
+    assert texts(document, '[data-v="1>2"]') == ["深层"]
+    assert texts(document, "[title~=bar]") == ["标题"]
+
+
+@pytest.mark.parametrize("selector", [
+    '[title="foo bar]',
+    "[title",
+    "div]",
+    "h1 >",
+    "xpath=//h1",
+    "h1::before",
+])
+def test_unsupported_or_malformed_selectors_match_nothing(document, selector):
+    assert document.select(selector) == []
+
+
+def test_run_html_collects_candidates_in_rule_order():
+    plan = ExtractionPlan([
+        FieldRule("title", ["h2", '[title="foo bar"]', "h1"], first_only=True),
+        FieldRule("items", ["li"], multiple=True),
+        FieldRule("spm", ["div"], attribute="data-spm"),
+    ])
+    result = plan.run_html(HTML)
+
+    assert result.candidates("title") == [('[title="foo bar"]', "标题")]
+    assert result.first("items") == ["一", "二"]
+    assert result.first("spm") == "a, b"
+    assert result.document_title == "商品页"
+
+
+# ITEM_PLAN 每个选择器对应的最小页面片段
+ITEM_FIXTURES = {
+    "h1.tb-main-title": '<h1 class="tb-main-title">旧版标题</h1>',
+    ".tb-detail-hd h1": '<div class="tb-detail-hd"><h1>天猫标题</h1></div>',
+    "div[data-spm='1000983'] h1": '<div data-spm="1000983"><h1>天猫新版标题</h1></div>',
+    ".ItemHeader--mainTitle--3CIjqW5": '<div class="ItemHeader--mainTitle--3CIjqW5">新版标题</div>',
+    ".tb-rmb-num": '<em class="tb-rmb-num">19.90</em>',
+    ".tm-price": '<span class="tm-price">29.00</span>',
+    ".tm-promo-price .tm-price": '<div class="tm-promo-price"><span class="tm-price">25.00</span></div>',
+    ".Price--priceText--2nLbVda": '<span class="Price--priceText--2nLbVda">39.00</span>',
+    "#J_UlThumb img": '<ul id="J_UlThumb"><li><img src="//img.alicdn.com/a.jpg"></li></ul>',
+    ".tb-thumb img": '<ul class="tb-thumb"><li><img src="//img.alicdn.com/b.jpg"></li></ul>',
+    ".PicGallery--thumbnails--2XJVxAf img":
+        '<div class="PicGallery--thumbnails--2XJVxAf"><img src="//img.alicdn.com/c.jpg"></div>',
+    "script:not([src])":
+        '<script src="//g.alicdn.com/x.js"></script><script>window.__INIT_DATA__ = {};</script>',
+}
+
+
+def test_every_item_plan_selector_matches_its_fixture():
+    pytest.importorskip("playwright")
+    from src.core.collector import Collector
+
+    for rule in Collector.ITEM_PLAN.rules:
+        for selector in rule.selectors:
+            assert selector in ITEM_FIXTURES, f"缺少 {selector} 的页面片段"
+            html = f"<html><body>{ITEM_FIXTURES[selector]}</body></html>"
+            result = ExtractionPlan([rule]).run_html(html)
+            assert selector in [s for s, _ in result.candidates(rule.name)], selector
+
+
+def test_inline_model_skips_external_scripts():
+    pytest.importorskip("playwright")
+    from src.core.collector import Collector
+
+    html = f"<html><body>{ITEM_FIXTURES['script:not([src])']}</body></html>"
+    result = Collector.ITEM_PLAN.run_html(html)
+    assert result.first("inline_model") == ["window.__INIT_DATA__ = {};"]
@@ -0,0 +1,86 @@
+"""
+按绑定配置填写：批量脚本与逐个回退
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("playwright")
+
+from src.core.filler import Filler
+from src.infra.knowledge import KnowledgeBase
+from src.infra.selector_cache import SelectorCache
+from src.models import BindingConfig, FieldBinding, FieldType, Product, Result
+
+
+class FormBrowser:
+    """BrowserManager 替身：记录 fill 调用顺序和同时进行的操作数"""
+
+    def __init__(self, page):
+        self.page = page
+        self.filled: list[str] = []
+        self.active = 0
+        self.peak = 0
+
+    async def with_retry(self, action, *args, **kwargs):
+        return await action(*args, **kwargs)
+
+    async def goto(self, url, page=None, strategy=None):
+        return Result.ok(page)
+
+    async def is_logged_in(self, selector, page=None):
+        return Result.ok(True)
+
+    async def probe(self, selectors, page=None):
+        return Result.ok(selectors[0])
+
+    async def fill(self, selector, value, page=None, timeout=None):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        self.filled.append(selector)
+        return Result.ok(True)
+
+
+class FormPage:
+    """批量脚本只能写入 scriptable 中的元素"""
+
+    url = "https://upload.taobao.com/auction/publish.htm"
+
+    def __init__(self, scriptable=()):
+        self.scriptable = set(scriptable)
+
+    async def evaluate(self, expression, items):
+        return [selector in self.scriptable for selector, _, _ in items]
+
+
+def text_field(name, selector) -> FieldBinding:
+    return FieldBinding(name=name, field_type=FieldType.TEXT, required=True, target_selector=selector)
+
+
+async def test_fields_the_script_misses_are_filled_one_at_a_time(tmp_path):
+    page = FormPage(scriptable={"#title"})
+    browser = FormBrowser(page)
+    filler = Filler(
+        browser, KnowledgeBase(tmp_path),
+        selector_cache=SelectorCache(tmp_path / "selector_cache.json")
+    )
+    binding = BindingConfig(id="b1", name="默认", fields=[
+        text_field("title", "#title"),
+        text_field("brand", "#brand"),
+        text_field("material", "#material"),
+        text_field("origin", "#origin"),
+    ])
+    product = Product(
+        id="p1", source_url="", title="标题", price=1.0,
+        extra={"brand": "无", "material": "棉", "origin": "杭州"}
+    )
+
+    result = await filler.fill_with_binding(product, binding, page=page)
+
+    assert result.success
+    assert result.data.batched == 1
+    assert browser.filled == ["#brand", "#material", "#origin"]
+    assert browser.peak == 1
@@ -0,0 +1,54 @@
+"""
+HTTP 采集：限流状态码与浏览器回退
+"""
+import pytest
+
+pytest.importorskip("playwright")
+pytest.importorskip("httpx")
+
+from src.core.collector import Collector
+from src.core.http_collector import HttpCollector
+from src.infra.http import HttpPage
+from src.models import Result
+
+URL = "https://item.taobao.com/item.htm?id=1"
+
+
+@pytest.fixture
+def collector():
+    return HttpCollector()
+
+
+def page(status: int, text: str = "", url: str = URL) -> HttpPage:
+    return HttpPage(url=url, status=status, text=text)
+
+
+@pytest.mark.parametrize("status", [429, 503])
+def test_throttle_status_is_retryable_network_error(collector, status):
+    result = collector._parse_page(URL, page(status))
+    assert result.error.code == "B_NETWORK_ERROR"
+    assert result.error.recoverable
+    assert result.error.context["status"] == status
+
+
+def test_other_failures_need_browser(collector):
+    assert collector._parse_page(URL, page(404)).error.code == "C_NEEDS_BROWSER"
+    login = page(200, url="https://login.taobao.com/member/login.jhtml")
+    assert collector._parse_page(URL, login).error.code == "C_NEEDS_BROWSER"
+    assert collector._parse_page(URL, page(200, "<html></html>")).error.code == "C_NEEDS_BROWSER"
+
+
+async def test_throttled_page_does_not_fall_back_to_browser(collector, monkeypatch):
+    async def get(url, headers=None):
+        return Result.ok(page(429))
+
+    async def browser_collect(self, url):
+        raise AssertionError("限流时不应回退到浏览器")
+
+    monkeypatch.setattr(collector.http, "get", get)
+    monkeypatch.setattr(Collector, "_collect_item", browser_collect)
+    collector.browser = object()
+
+    result = await collector._collect_item(URL)
+    assert result.error.code == "B_NETWORK_ERROR"
+    assert collector.fallbacks == 0
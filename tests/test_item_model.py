@@ -0,0 +1,142 @@
+"""
+商品数据模型：接口响应、JSONP 与内联脚本解析
+"""
+import json
+
+from src.core.item_model import (
+    extract_inline_json, normalize_image_url, parse_desc_images, parse_item_model, parse_json_text
+)
+
+PCDETAIL = {
+    "api": "mtop.taobao.pcdetail.data.get",
+    "data": {
+        "item": {
+            "itemId": 123,
+            "title": " 纯棉T恤 ",
+            "images": ["//img.alicdn.com/a.jpg_60x60.jpg", "//img.alicdn.com/b.jpg", "//img.alicdn.com/a.jpg"],
+            "categoryId": 50000671,
+        },
+        "skuBase": {
+            "props": [
+                {"pid": "1627207", "name": "颜色", "values": [
+                    {"vid": "1", "name": "白色", "image": "//img.alicdn.com/white.jpg"},
+                    {"vid": "2", "name": "黑色"},
+                ]},
+                {"pid": "20509", "name": "尺码", "values": [{"vid": "3", "name": "L"}]},
+            ],
+            "skus": [
+                {"skuId": 11, "propPath": "1627207:1;20509:3"},
+                {"skuId": 12, "propPath": "1627207:2;20509:3"},
+            ],
+        },
+        "skuCore": {
+            "sku2info": {
+                "0": {"price": {"priceText": "59-69"}},
+                "11": {"price": {"priceText": "59.00"}, "quantity": "10"},
+                "12": {"price": {"priceText": "69.00"}, "quantity": None},
+            }
+        },
+        "componentsVO": {"priceVO": {"extraPrice": {"priceText": "99.00"}}},
+    },
+}
+
+LEGACY = {
+    "itemDO": {"itemId": "456", "title": "旧版商品", "categoryId": 16, "reservePrice": "88.00"},
+    "propertyPics": {
+        "default": ["//img.alicdn.com/main.jpg_400x400.jpg"],
+        ";1627207:1;": ["//img.alicdn.com/red.jpg"],
+    },
+    "valItemInfo": {
+        "skuList": [{"pvs": "1627207:1", "names": "红色 "}, {"pvs": "1627207:2", "names": "蓝色"}],
+        "skuMap": {
+            ";1627207:1;": {"skuId": 21, "price": "39.90", "stock": 5},
+            ";1627207:2;": {"skuId": 22, "price": "35.00", "stock": "x"},
+        },
+    },
+}
+
+
+def test_normalize_image_url():
+    assert normalize_image_url("//img.alicdn.com/a.jpg_60x60.jpg") == "https://img.alicdn.com/a.jpg"
+    assert normalize_image_url("https://img.alicdn.com/a.png") == "https://img.alicdn.com/a.png"
+
+
+def test_parse_json_text_accepts_json_and_jsonp():
+    assert parse_json_text('{"a": 1}') == {"a": 1}
+    assert parse_json_text('mtopjsonp3({"a": [1]});') == {"a": [1]}
+    assert parse_json_text("not json") is None
+    assert parse_json_text("") is None
+
+
+def test_extract_inline_json_finds_objects_after_markers():
+    script = (
+        'window.__INIT_DATA__ = {"a": {"b": "}"}};\n'
+        "TShop.Setup({broken: true});\n"
+        'TShop.Setup({"itemDO": {}});'
+    )
+    assert extract_inline_json(script) == [{"a": {"b": "}"}}, {"itemDO": {}}]
+    assert extract_inline_json("var x = 1;") == []
+
+
+def test_parse_pcdetail_model():
+    model = parse_item_model(PCDETAIL)
+
+    assert model.title == "纯棉T恤"
+    assert model.images == ["https://img.alicdn.com/a.jpg", "https://img.alicdn.com/b.jpg"]
+    assert model.category == "50000671"
+    assert model.price == 59.0
+    assert model.original_price == 99.0
+    assert model.is_complete
+    assert model.extra["item_id"] == "123"
+    assert model.extra["sku_props"][0] == {"name": "颜色", "values": ["白色", "黑色"]}
+
+    white, black = model.skus
+    assert (white.id, white.name, white.price, white.stock) == ("11", "颜色: 白色; 尺码: L", 59.0, 10)
+    assert white.image == "https://img.alicdn.com/white.jpg"
+    assert (black.price, black.stock, black.image) == (69.0, 0, None)
+
+
+def test_pcdetail_price_falls_back_to_lowest_sku():
+    data = json.loads(json.dumps(PCDETAIL))
+    del data["data"]["skuCore"]["sku2info"]["0"]
+    assert parse_item_model(data).price == 59.0
+
+
+def test_parse_legacy_model():
+    model = parse_item_model({"TShop": LEGACY})
+
+    assert model.title == "旧版商品"
+    assert model.category == "16"
+    assert model.images == ["https://img.alicdn.com/main.jpg"]
+    assert model.original_price == 88.0
+    # 售价取 SKU 最低价
+    assert model.price == 35.0
+    assert model.extra["item_id"] == "456"
+
+    red, blue = sorted(model.skus, key=lambda s: s.id)
+    assert (red.name, red.price, red.stock) == ("红色", 39.9, 5)
+    assert red.image == "https://img.alicdn.com/red.jpg"
+    assert (blue.name, blue.stock, blue.image) == ("蓝色", 0, None)
+
+
+def test_legacy_without_skus_uses_reserve_price():
+    model = parse_item_model({"itemDO": {"title": "单品", "reservePrice": "10"}})
+    assert model.price == 10.0
+    assert model.skus == []
+    assert not model.is_complete
+
+
+def test_unknown_structure_returns_none():
+    assert parse_item_model({"data": {"foo": 1}}) is None
+    assert parse_item_model([]) is None
+
+
+def test_parse_desc_images_dedupes_in_order():
+    desc = {"data": {"components": [
+        '<p><img src="//img.alicdn.com/d1.jpg_q90.jpg"><img src=\'//img.alicdn.com/d2.jpg\'></p>',
+        {"html": '<img class="x" src="//img.alicdn.com/d2.jpg">'},
+    ]}}
+    assert parse_desc_images(desc) == [
+        "https://img.alicdn.com/d1.jpg_q90.jpg",
+        "https://img.alicdn.com/d2.jpg",
+    ]
@@ -0,0 +1,142 @@
+"""
+任务队列：租约、失败重试与崩溃恢复
+"""
+import time
+
+import pytest
+
+from src.infra import JobQueue
+from src.models import JobKind, JobStatus
+
+
+@pytest.fixture
+def queue(tmp_path):
+    q = JobQueue(tmp_path)
+    yield q
+    q.close()
+
+
+def test_enqueue_dedupes_by_key(queue):
+    assert queue.enqueue(JobKind.COLLECT, {"url": "a"}, dedupe_key="collect:a").data is True
+    assert queue.enqueue(JobKind.COLLECT, {"url": "a"}, dedupe_key="collect:a").data is False
+    assert queue.enqueue_many(
+        JobKind.COLLECT, [{"url": "a"}, {"url": "b"}], dedupe_keys=["collect:a", "collect:b"]
+    ).data == 1
+    assert queue.counts().data["pending"] == 2
+
+
+def test_lease_prefers_priority_then_fifo(queue):
+    queue.enqueue(JobKind.COLLECT, {"url": "first"})
+    queue.enqueue(JobKind.COLLECT, {"url": "second"})
+    queue.enqueue(JobKind.COLLECT, {"url": "urgent"}, priority=5)
+
+    leased = [queue.lease("w").data.payload["url"] for _ in range(3)]
+    assert leased == ["urgent", "first", "second"]
+    assert queue.lease("w").data is None
+
+
+def test_lease_filters_by_kind(queue):
+    queue.enqueue(JobKind.UPLOAD, {"product_id": "p1"})
+    assert queue.lease("w", [JobKind.COLLECT]).data is None
+    job = queue.lease("w", [JobKind.UPLOAD]).data
+    assert job.kind == JobKind.UPLOAD
+    assert job.status == JobStatus.RUNNING
+    assert job.attempts == 1
+
+
+def test_complete_requires_lease_owner(queue):
+    queue.enqueue(JobKind.COLLECT, {"url": "a"})
+    job = queue.lease("w1").data
+
+    assert queue.complete(job.id, "w2").data is False
+    assert queue.complete(job.id, "w1", {"product_id": "p1"}).data is True
+
+    done = queue.get(job.id).data
+    assert done.status == JobStatus.DONE
+    assert done.result == {"product_id": "p1"}
+
+
+def test_fail_requeues_with_backoff_until_attempts_exhausted(queue):
+    queue.enqueue(JobKind.COLLECT, {"url": "a"}, max_attempts=2)
+
+    job = queue.lease("w").data
+    assert queue.fail(job.id, "w", "超时", backoff=60).data is True
+    assert queue.get(job.id).data.status == JobStatus.PENDING
+    # 退避期间不可领取
+    assert queue.lease("w").data is None
+    assert queue.next_available_in().data > 50
+
+    queue.fail(job.id, "w", "超时")  # 不再持有租约，忽略
+    assert queue.get(job.id).data.status == JobStatus.PENDING
+
+
+def test_fail_without_retry_marks_failed(queue):
+    queue.enqueue(JobKind.COLLECT, {"url": "a"})
+    job = queue.lease("w").data
+    queue.fail(job.id, "w", "链接无效", retry=False)
+
+    failed = queue.get(job.id).data
+    assert failed.status == JobStatus.FAILED
+    assert failed.last_error == "链接无效"
+
+    assert queue.retry_failed().data == 1
+    retried = queue.lease("w").data
+    assert retried.id == job.id
+    assert retried.attempts == 1
+
+
+def test_last_attempt_failure_is_final(queue):
+    queue.enqueue(JobKind.COLLECT, {"url": "a"}, max_attempts=1)
+    job = queue.lease("w").data
+    queue.fail(job.id, "w", "超时", retry=True, backoff=0)
+    assert queue.get(job.id).data.status == JobStatus.FAILED
+
+
+def test_release_does_not_count_attempt(queue):
+    queue.enqueue(JobKind.UPLOAD, {"product_id": "p1"})
+    job = queue.lease("w").data
+    assert queue.release(job.id, "w").data is True
+
+    again = queue.lease("w").data
+    assert again.id == job.id
+    assert again.attempts == 1
+
+
+def test_expired_lease_can_be_taken_over(queue):
+    queue.enqueue(JobKind.COLLECT, {"url": "a"})
+    job = queue.lease("dead", lease_seconds=0.05).data
+    assert queue.lease("w").data is None
+
+    time.sleep(0.1)
+    taken = queue.lease("w").data
+    assert taken.id == job.id
+    assert taken.attempts == 2
+    # 原 owner 的租约已失效
+    assert queue.heartbeat(job.id, "dead").data is False
+    assert queue.heartbeat(job.id, "w").data is True
+
+
+def test_expired_lease_with_no_attempts_left_fails(queue):
+    queue.enqueue(JobKind.COLLECT, {"url": "a"}, max_attempts=1)
+    job = queue.lease("dead", lease_seconds=0.05).data
+
+    time.sleep(0.1)
+    assert queue.lease("w").data is None
+    assert queue.get(job.id).data.status == JobStatus.FAILED
+
+
+def test_recover_requeues_running_jobs(tmp_path):
+    queue = JobQueue(tmp_path)
+    queue.enqueue(JobKind.COLLECT, {"url": "a"})
+    job = queue.lease("crashed", lease_seconds=999).data
+    queue.close()
+
+    # 重启后立即可领取，不必等待租约过期，且不计入尝试次数
+    reopened = JobQueue(tmp_path)
+    try:
+        assert reopened.recover().data == 1
+        again = reopened.lease("w").data
+        assert again.id == job.id
+        assert again.attempts == 1
+    finally:
+        reopened.close()
@@ -0,0 +1,120 @@
+"""
+方案匹配索引：前缀提取、候选预筛与排序
+"""
+import pytest
+
+from src.infra.knowledge.matcher import SolutionMatcher, literal_prefix
+from src.models import ProblemType, Solution, SolutionStats, TrustLevel
+
+POPUP = ProblemType.UNEXPECTED_POPUP
+
+
+def make_solution(
+    solution_id: str,
+    rules: dict = None,
+    trust: TrustLevel = TrustLevel.NEW,
+    runs: tuple[int, int] = (0, 0),
+    problem_type: ProblemType = POPUP
+) -> Solution:
+    return Solution(
+        id=solution_id,
+        problem_type=problem_type,
+        name=solution_id,
+        description="",
+        match_rules=rules or {},
+        trust_level=trust,
+        stats=SolutionStats(total_runs=runs[0], success_count=runs[1])
+    )
+
+
+@pytest.mark.parametrize("pattern, expected", [
+    (r"^https://item\.taobao\.com/", (True, "https://item.taobao.com/")),
+    (r"\Ahttps://a", (True, "https://a")),
+    (r"upload\.taobao", (False, "upload.taobao")),
+    (r"^https?://x", (True, "http")),
+    (r"^abc\d+", (True, "abc")),
+    (r"^(a|b)", (False, "")),
+    (r"^(ab)c", (True, "")),
+    (r"a|b", (False, "")),
+    (r"^ab{2}", (True, "a")),
+])
+def test_literal_prefix(pattern, expected):
+    assert literal_prefix(pattern) == expected
+
+
+def test_find_by_url_rule_kinds():
+    matcher = SolutionMatcher()
+    matcher.add(make_solution("anchored", {"url_pattern": r"^https://upload\.taobao\.com/"}))
+    matcher.add(make_solution("literal", {"url_pattern": r"sell/publish"}))
+    matcher.add(make_solution("short", {"url_pattern": r"x\d"}))
+
+    def find(url):
+        found = matcher.find(POPUP.value, {"page_url": url})
+        return found.id if found else None
+
+    assert find("https://upload.taobao.com/sell") == "anchored"
+    assert find("https://other.com/sell/publish.htm") == "literal"
+    assert find("https://other.com/x1") == "short"
+    assert find("https://other.com/") is None
+    assert len(matcher) == 3
+
+
+def test_rules_are_ignored_when_context_lacks_field():
+    matcher = SolutionMatcher()
+    matcher.add(make_solution("s1", {"url_pattern": "^https://a/", "element_pattern": "#close"}))
+
+    assert matcher.find(POPUP.value, {}).id == "s1"
+    assert matcher.find(POPUP.value, {"element_selector": "#close-btn"}).id == "s1"
+    assert matcher.find(POPUP.value, {"element_selector": ".other"}) is None
+    assert matcher.find(POPUP.value, {"page_url": None}) is None
+
+
+def test_sorted_by_trust_then_success_rate_then_order():
+    matcher = SolutionMatcher()
+    matcher.add(make_solution("new", trust=TrustLevel.NEW, runs=(10, 10)))
+    matcher.add(make_solution("testing-low", trust=TrustLevel.TESTING, runs=(10, 5)))
+    matcher.add(make_solution("testing-high", trust=TrustLevel.TESTING, runs=(10, 9)))
+    assert matcher.find(POPUP.value, {}).id == "testing-high"
+
+    matcher.add(make_solution("trusted", {"url_pattern": "^https://a/"}, trust=TrustLevel.TRUSTED))
+    assert matcher.find(POPUP.value, {"page_url": "https://a/x"}).id == "trusted"
+    assert matcher.find(POPUP.value, {"page_url": "https://b/x"}).id == "testing-high"
+
+
+def test_same_score_keeps_insertion_order():
+    matcher = SolutionMatcher()
+    matcher.add(make_solution("first", {"url_pattern": "publish"}))
+    matcher.add(make_solution("second", {"url_pattern": "^https://a/"}))
+    assert matcher.find(POPUP.value, {"page_url": "https://a/publish"}).id == "first"
+
+
+def test_failed_and_invalid_solutions_never_match():
+    matcher = SolutionMatcher()
+    matcher.add(make_solution("failed", trust=TrustLevel.FAILED))
+    matcher.add(make_solution("invalid", {"url_pattern": "(unclosed"}))
+    assert matcher.find(POPUP.value, {"page_url": "(unclosed"}) is None
+    assert len(matcher) == 1
+
+
+def test_update_and_remove():
+    matcher = SolutionMatcher()
+    matcher.add(make_solution("s1", {"url_pattern": "^https://a/"}))
+    matcher.add(make_solution("s1", {"url_pattern": "^https://b/"}))
+    assert matcher.find(POPUP.value, {"page_url": "https://a/"}) is None
+    assert matcher.find(POPUP.value, {"page_url": "https://b/"}).id == "s1"
+
+    # 降级为 FAILED 后从索引移除
+    matcher.add(make_solution("s1", {"url_pattern": "^https://b/"}, trust=TrustLevel.FAILED))
+    assert matcher.find(POPUP.value, {"page_url": "https://b/"}) is None
+
+    matcher.add(make_solution("s2"))
+    matcher.remove("s2")
+    matcher.remove("missing")
+    assert len(matcher) == 0
+
+
+def test_problem_types_are_separate():
+    matcher = SolutionMatcher()
+    matcher.add(make_solution("s1", problem_type=ProblemType.PAGE_CHANGED))
+    assert matcher.find(POPUP.value, {}) is None
+    assert matcher.find(ProblemType.PAGE_CHANGED.value, {}).id == "s1"
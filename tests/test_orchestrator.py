@@ -0,0 +1,126 @@
+"""
+多店铺上架：提交前保持标签页租用、登录过期与未提交
+"""
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+pytest.importorskip("playwright")
+
+from src.core.orchestrator import ShopOrchestrator, ShopProfile, _IntervalLimiter, _ShopRuntime
+from src.infra.selector_cache import SelectorCache
+from src.models import Product, Result
+
+
+class ShopPage:
+    def __init__(self):
+        self.form: str | None = None
+
+    async def bring_to_front(self):
+        pass
+
+
+class ShopBrowser:
+    """只有一个标签页的店铺浏览器：两个 worker 争用，租用期间另一个等待"""
+
+    def __init__(self):
+        self.page = ShopPage()
+        self._lock = asyncio.Lock()
+
+    @asynccontextmanager
+    async def lease_page(self):
+        async with self._lock:
+            yield self.page
+
+
+class ShopFiller:
+    def __init__(self, expired: bool = False, submitted: bool = True):
+        self.expired = expired
+        self.submitted = submitted
+        self.waited: list[str] = []
+
+    async def fill(self, product, page):
+        if self.expired:
+            return Result.fail_with(code="B_LOGIN_EXPIRED", message="请先登录淘宝账号", recoverable=True)
+        page.form = product.id
+        await asyncio.sleep(0.001)
+        return Result.ok(True)
+
+    async def wait_for_submit(self, page):
+        self.waited.append(page.form)
+        return Result.ok(self.submitted)
+
+
+def product(product_id: str) -> Product:
+    return Product(id=product_id, source_url="", title=f"商品 {product_id}", price=1.0)
+
+
+def make_orchestrator(tmp_path, fillers: dict, review=None) -> ShopOrchestrator:
+    orchestrator = ShopOrchestrator(
+        knowledge_base=None,
+        selector_cache=SelectorCache(tmp_path / "selector_cache.json"),
+        review=review
+    )
+    for name, filler in fillers.items():
+        orchestrator._shops[name] = _ShopRuntime(
+            profile=ShopProfile(name=name, user_data_dir=name, concurrency=2, min_interval=0),
+            browser=ShopBrowser(),
+            filler=filler,
+            limiter=_IntervalLimiter(0)
+        )
+    return orchestrator
+
+
+async def test_form_is_reviewed_before_next_product_reuses_the_page(tmp_path):
+    reviewed = []
+    orchestrator = None
+
+    async def review(shop, item):
+        await asyncio.sleep(0.01)
+        # 确认时标签页上仍是该商品的表单
+        reviewed.append((shop, item.id, orchestrator._shops[shop].browser.page.form))
+        return True
+
+    orchestrator = make_orchestrator(tmp_path, {"a": ShopFiller(), "b": ShopFiller()}, review)
+    result = await orchestrator.publish([product("p1"), product("p2")])
+
+    assert [(i.shop, i.product_id, i.result.success) for i in result.data] == [
+        ("a", "p1", True), ("a", "p2", True), ("b", "p1", True), ("b", "p2", True),
+    ]
+    assert sorted(reviewed) == [("a", "p1", "p1"), ("a", "p2", "p2"), ("b", "p1", "p1"), ("b", "p2", "p2")]
+
+
+async def test_waits_for_submit_page_without_review(tmp_path):
+    filler = ShopFiller()
+    orchestrator = make_orchestrator(tmp_path, {"a": filler})
+
+    await orchestrator.publish([product("p1"), product("p2")])
+    assert filler.waited == ["p1", "p2"]
+
+
+async def test_unsubmitted_form_is_reported(tmp_path):
+    orchestrator = make_orchestrator(tmp_path, {"a": ShopFiller(submitted=False)})
+
+    item = (await orchestrator.publish([product("p1")])).data[0]
+    assert item.result.error.code == "F_NOT_SUBMITTED"
+    assert item.result.error.context == {"shop": "a", "product_id": "p1"}
+
+
+async def test_login_expired_fails_remaining_products_for_that_shop_only(tmp_path):
+    orchestrator = make_orchestrator(tmp_path, {"a": ShopFiller(expired=True), "b": ShopFiller()})
+
+    items = (await orchestrator.publish([product("p1"), product("p2")])).data
+
+    assert [i.result.error.code for i in items[:2]] == ["B_LOGIN_EXPIRED", "B_LOGIN_EXPIRED"]
+    assert all(i.result.success for i in items[2:])
+
+    orchestrator.reset_login("a")
+    assert not orchestrator._shops["a"].login_expired
+
+
+async def test_unknown_shop_is_rejected(tmp_path):
+    orchestrator = make_orchestrator(tmp_path, {"a": ShopFiller()})
+    result = await orchestrator.publish([product("p1")], shops=["a", "missing"])
+    assert result.error.code == "B_NOT_STARTED"
+    assert result.error.context == {"shops": ["missing"]}
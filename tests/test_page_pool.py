@@ -0,0 +1,134 @@
+"""
+标签页池：容量上限、等待唤醒与页面回收
+"""
+import asyncio
+
+import pytest
+
+pytest.importorskip("playwright")
+
+from src.infra.browser import PagePool
+
+
+async def test_concurrent_acquire_never_exceeds_size(context):
+    pool = PagePool(context, size=2, max_navigations=100)
+
+    async def use():
+        page = await pool.acquire(timeout=2)
+        await asyncio.sleep(0.02)
+        await pool.release(page)
+
+    await asyncio.gather(*(use() for _ in range(6)))
+
+    assert len(context.pages) == 2
+    assert pool.stats.created == 2
+    assert pool.stats.leases == 6
+    assert pool.stats.in_use == 0
+
+
+async def test_released_page_is_reused(context):
+    pool = PagePool(context, size=1, max_navigations=100)
+    first = await pool.acquire()
+    await pool.release(first)
+    assert await pool.acquire() is first
+
+
+async def test_acquire_times_out_when_pool_is_full(context):
+    pool = PagePool(context, size=1, max_navigations=100)
+    await pool.acquire()
+    with pytest.raises(asyncio.TimeoutError):
+        await pool.acquire(timeout=0.05)
+
+
+async def test_acquire_timeout_covers_retries_after_unhealthy_page(context):
+    pool = PagePool(context, size=1, max_navigations=100)
+    page = await pool.acquire()
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    waiter = asyncio.ensure_future(pool.acquire(timeout=0.2))
+    await asyncio.sleep(0.01)
+    # 后到的租用者抢走补建名额，先到的只能重新等待
+    other = asyncio.ensure_future(pool.acquire())
+    await asyncio.sleep(0.1)
+
+    page.healthy = False
+    await pool.release(page)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await waiter
+    assert loop.time() - start < 0.28
+    await pool.release(await other)
+
+
+async def test_recycled_page_wakes_waiter(context):
+    pool = PagePool(context, size=1, max_navigations=1)
+    page = await pool.acquire()
+    pool.record_navigation(page)
+
+    waiter = asyncio.ensure_future(pool.acquire(timeout=1))
+    await asyncio.sleep(0.01)
+    await pool.release(page)
+
+    replacement = await waiter
+    assert replacement is not page
+    assert page.closed
+    assert pool.stats.recycled == 1
+    assert pool.stats.created == 1
+
+
+async def test_closed_page_is_replaced(context):
+    pool = PagePool(context, size=1, max_navigations=100)
+    page = await pool.acquire()
+    waiter = asyncio.ensure_future(pool.acquire(timeout=1))
+    await asyncio.sleep(0.01)
+
+    page.closed = True
+    await pool.release(page)
+
+    assert await waiter is not page
+    assert len(context.pages) == 2
+
+
+async def test_unhealthy_idle_page_is_discarded(context):
+    pool = PagePool(context, size=1, max_navigations=100)
+    pool.HEALTH_CHECK_TIMEOUT = 0.1
+    page = await pool.acquire()
+    await pool.release(page)
+
+    page.healthy = False
+    fresh = await pool.acquire()
+    assert fresh is not page
+    assert page.closed
+    assert pool.stats.unhealthy == 1
+
+
+async def test_failed_create_frees_slot(context):
+    pool = PagePool(context, size=1, max_navigations=100)
+    original = context.new_page
+
+    async def broken():
+        raise RuntimeError("浏览器已断开")
+
+    context.new_page = broken
+    with pytest.raises(RuntimeError):
+        await pool.acquire()
+
+    context.new_page = original
+    page = await pool.acquire(timeout=1)
+    assert page in context.pages
+
+
+async def test_warm_and_close(context):
+    pool = PagePool(context, size=3, max_navigations=100)
+    assert await pool.warm(2) == 2
+
+    leased = await pool.acquire()
+    await pool.close()
+    assert all(p.closed for p in context.pages if p is not leased)
+
+    await pool.release(leased)
+    assert leased.closed
+    assert pool.stats.created == 0
+    with pytest.raises(RuntimeError):
+        await pool.acquire()
@@ -0,0 +1,164 @@
+"""
+采集→上架流水线：结果顺序、登录过期后暂缓与确认回调
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("playwright")
+
+from src.core.events import EventBus, EventTypes
+from src.core.pipeline import CollectUploadPipeline
+from src.infra.storage import ProductStorage
+from src.models import Product, ProductStatus, Result
+
+
+class LeasedPage:
+    async def bring_to_front(self):
+        pass
+
+
+class PoolBrowser:
+    """只实现流水线用到的标签页租用接口"""
+
+    def __init__(self, pool_size: int = 4):
+        self.config = SimpleNamespace(pool_size=pool_size)
+        self.leased = 0
+
+    @asynccontextmanager
+    async def lease_page(self):
+        self.leased += 1
+        try:
+            yield LeasedPage()
+        finally:
+            self.leased -= 1
+
+    async def clear_block_profile(self, page):
+        pass
+
+
+class FakeCollector:
+    """链接中带 "bad" 的采集失败；delays 按链接指定采集耗时"""
+
+    def __init__(self, delays: dict = None):
+        self.delays = delays or {}
+        self.collected: list[str] = []
+
+    async def open_session(self, workers):
+        return Result.ok(workers)
+
+    async def close_session(self):
+        pass
+
+    async def collect_pooled(self, url):
+        await asyncio.sleep(self.delays.get(url, 0.001))
+        self.collected.append(url)
+        if "bad" in url:
+            return Result.fail_with(code="C_PARSE_FAILED", message="解析失败", recoverable=False)
+        return Result.ok(Product(id=f"prod_{url}", source_url=url, title=f"商品 {url}", price=1.0))
+
+
+class FakeFiller:
+    """expire_on 对应的商品返回登录过期，raise_on 对应的商品抛出异常"""
+
+    def __init__(self, expire_on: str = None, raise_on: str = None, delay: float = 0.001):
+        self.expire_on = expire_on
+        self.raise_on = raise_on
+        self.delay = delay
+        self.filled: list[str] = []
+
+    async def fill(self, product, page):
+        await asyncio.sleep(self.delay)
+        if product.source_url == self.raise_on:
+            raise RuntimeError("页面崩溃")
+        self.filled.append(product.source_url)
+        if product.source_url == self.expire_on:
+            return Result.fail_with(code="B_LOGIN_EXPIRED", message="请先登录淘宝账号", recoverable=True)
+        return Result.ok(True)
+
+
+def make_pipeline(tmp_path, collector=None, filler=None, **kwargs) -> CollectUploadPipeline:
+    return CollectUploadPipeline(
+        PoolBrowser(),
+        ProductStorage(tmp_path),
+        collector or FakeCollector(),
+        filler or FakeFiller(),
+        **kwargs
+    )
+
+
+async def test_items_follow_input_order(tmp_path):
+    # 第一个链接采集最慢，结果仍按输入顺序返回
+    collector = FakeCollector(delays={"u1": 0.05})
+    pipeline = make_pipeline(tmp_path, collector=collector)
+
+    stats = (await pipeline.run(["u1", "bad", " u3 ", "u1", ""], collect_workers=3)).data
+
+    assert [i.url for i in stats.items] == ["u1", "bad", "u3"]
+    assert collector.collected[0] != "u1"
+    assert stats.total == 3
+    assert stats.collected == 2 and stats.collect_failed == 1
+    assert stats.uploaded == 2
+    assert stats.items[1].collect_error == "解析失败"
+    assert pipeline.storage.get("prod_u3").data.status == ProductStatus.UPLOADED
+
+
+async def test_login_expired_defers_remaining_products(tmp_path):
+    events = []
+    bus = EventBus()
+    bus.on(EventTypes.LOGIN_EXPIRED, events.append)
+    filler = FakeFiller(expire_on="u2")
+    pipeline = make_pipeline(tmp_path, filler=filler, event_bus=bus)
+
+    stats = (await pipeline.run(["u1", "u2", "u3", "u4"])).data
+
+    assert filler.filled == ["u1", "u2"]
+    assert [i.uploaded for i in stats.items] == [True, False, False, False]
+    assert [i.deferred for i in stats.items] == [False, True, True, True]
+    assert stats.deferred == 3 and stats.upload_failed == 0
+    assert len(events) == 1
+    # 暂缓的商品已采集保存，保持待上架
+    assert pipeline.storage.get("prod_u4").data.status == ProductStatus.DRAFT
+
+
+async def test_review_keeps_page_leased_and_can_skip(tmp_path):
+    pipeline = make_pipeline(tmp_path)
+    leased_during_review = []
+
+    async def review(product):
+        leased_during_review.append(pipeline.browser.leased)
+        return product.source_url != "u2"
+
+    stats = (await pipeline.run(["u1", "u2"], review=review)).data
+
+    assert leased_during_review == [1, 1]
+    assert [i.uploaded for i in stats.items] == [True, False]
+    assert stats.items[1].deferred
+    assert pipeline.browser.leased == 0
+
+
+async def test_fill_exception_does_not_stall_pipeline(tmp_path):
+    pipeline = make_pipeline(tmp_path, filler=FakeFiller(raise_on="u1"))
+
+    stats = (await asyncio.wait_for(pipeline.run(["u1", "u2"]), timeout=2)).data
+
+    assert "页面崩溃" in stats.items[0].upload_error
+    assert stats.items[1].uploaded
+
+
+async def test_collection_stays_within_lookahead(tmp_path):
+    collector = FakeCollector()
+    filler = FakeFiller(delay=0.02)
+    pipeline = make_pipeline(tmp_path, collector=collector, filler=filler, lookahead=1)
+    ahead = []
+
+    async def review(product):
+        ahead.append(len(collector.collected) - len(filler.filled))
+        return True
+
+    await pipeline.run([f"u{n}" for n in range(6)], review=review)
+
+    # 已采集未填写的最多为：缓冲区 1 个 + 采集完成等待放入缓冲区的 1 个
+    assert max(ahead) <= 2
@@ -0,0 +1,66 @@
+"""
+按域名的令牌桶限速
+"""
+import asyncio
+import time
+
+import pytest
+
+from src.infra.resilience import HostRateLimiter, RateLimit, TokenBucket
+
+
+async def test_token_bucket_allows_burst_then_paces():
+    bucket = TokenBucket(RateLimit(rate=20, burst=2))
+    started = time.monotonic()
+    waits = [await bucket.acquire() for _ in range(4)]
+    elapsed = time.monotonic() - started
+
+    assert waits[0] == pytest.approx(0, abs=0.005)
+    assert waits[1] == pytest.approx(0, abs=0.005)
+    # 桶空后每 1/rate 秒放行一个
+    assert elapsed >= 0.09
+    assert bucket.stats.acquired == 4
+    assert bucket.stats.delayed == 2
+
+
+async def test_token_bucket_serves_waiters_in_arrival_order():
+    bucket = TokenBucket(RateLimit(rate=50, burst=1))
+    order = []
+
+    async def take(n):
+        await bucket.acquire()
+        order.append(n)
+
+    await asyncio.gather(*(take(n) for n in range(5)))
+    assert order == list(range(5))
+
+
+async def test_unlimited_bucket_never_waits():
+    bucket = TokenBucket(RateLimit(rate=0))
+    assert [await bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+
+
+async def test_host_rate_limiter_matching():
+    limiter = HostRateLimiter.from_config({
+        "taobao.com": {"rate": 1000, "burst": 5},
+        "item.taobao.com": {"rate": 1000, "burst": 1},
+        "*": {"rate": 1000, "burst": 1},
+    })
+
+    await limiter.acquire("https://item.taobao.com/item.htm")   # 最长匹配
+    await limiter.acquire("https://s.taobao.com/search")        # 父域名，子域名共用
+    await limiter.acquire("https://shop.taobao.com/")
+    await limiter.acquire("https://a.example.com/")              # 默认限速，每个域名一个桶
+    await limiter.acquire("https://b.example.com/")
+
+    stats = limiter.stats()
+    assert stats["item.taobao.com"]["acquired"] == 1
+    assert stats["taobao.com"]["acquired"] == 2
+    assert stats["a.example.com"]["acquired"] == 1
+    assert stats["b.example.com"]["acquired"] == 1
+
+
+async def test_host_rate_limiter_without_limits_is_noop():
+    limiter = HostRateLimiter()
+    assert await limiter.acquire("https://item.taobao.com/") == 0.0
+    assert limiter.stats() == {}
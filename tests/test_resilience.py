@@ -0,0 +1,149 @@
+"""
+熔断器、重试与 AIMD 并发控制
+"""
+import asyncio
+import time
+
+import pytest
+
+from src.infra.resilience import (
+    AdaptiveLimiter, CircuitBreaker, CircuitState, HostBreakers, RetryPolicy, with_retry
+)
+from src.models import Result
+
+
+def throttled() -> Result:
+    return Result.fail_with(code="B_TIMEOUT", message="超时", recoverable=True)
+
+
+def test_breaker_opens_after_consecutive_throttle_errors():
+    breaker = CircuitBreaker("item.taobao.com", failure_threshold=3, reset_timeout=60)
+    for _ in range(2):
+        breaker.record(throttled())
+    assert breaker.state is CircuitState.CLOSED
+
+    breaker.record(throttled())
+    assert breaker.state is CircuitState.OPEN
+    assert breaker.trips == 1
+    assert not breaker.allow()
+
+    rejected = breaker.reject("https://item.taobao.com/item.htm")
+    assert rejected.error.code == "B_CIRCUIT_OPEN"
+    assert rejected.error.recoverable
+    assert rejected.error.context["retry_after"] > 0
+
+
+def test_success_resets_failure_count():
+    breaker = CircuitBreaker("h", failure_threshold=2)
+    breaker.record(throttled())
+    breaker.record(Result.ok(None))
+    breaker.record(throttled())
+    assert breaker.state is CircuitState.CLOSED
+
+
+def test_non_throttle_errors_do_not_trip():
+    breaker = CircuitBreaker("h", failure_threshold=1)
+    breaker.record(Result.fail_with(code="C_INVALID_URL", message="无效", recoverable=False))
+    assert breaker.state is CircuitState.CLOSED
+
+
+def test_half_open_probe_closes_or_reopens():
+    breaker = CircuitBreaker("h", failure_threshold=1, reset_timeout=0.05)
+    breaker.record(throttled())
+    assert not breaker.allow()
+
+    time.sleep(0.06)
+    assert breaker.allow()
+    assert breaker.state is CircuitState.HALF_OPEN
+    # 探测请求未返回前不再放行
+    assert not breaker.allow()
+
+    breaker.record(throttled())
+    assert breaker.state is CircuitState.OPEN
+    assert breaker.trips == 2
+
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record(Result.ok(None))
+    assert breaker.state is CircuitState.CLOSED
+    assert breaker.allow()
+
+
+def test_host_breakers_are_per_host():
+    breakers = HostBreakers(failure_threshold=1)
+    a = breakers.for_url("https://item.taobao.com/item.htm?id=1")
+    assert breakers.for_url("https://item.taobao.com/item.htm?id=2") is a
+    assert breakers.for_url("https://detail.tmall.com/item.htm") is not a
+    assert breakers.for_url("") is None
+
+    a.record(throttled())
+    # 只统计出现过失败的域名
+    assert set(breakers.stats()) == {"item.taobao.com"}
+    assert breakers.stats()["item.taobao.com"]["state"] == "open"
+
+
+async def test_with_retry_retries_only_retryable_codes():
+    calls = []
+
+    async def action(code):
+        calls.append(code)
+        return Result.fail_with(code=code, message="失败", recoverable=True)
+
+    policy = RetryPolicy(max_attempts=3, base_delay=0.001)
+    assert (await with_retry(action, "B_TIMEOUT", policy=policy)).error.code == "B_TIMEOUT"
+    assert len(calls) == 3
+
+    calls.clear()
+    await with_retry(action, "C_INVALID_URL", policy=policy)
+    assert len(calls) == 1
+
+
+async def test_with_retry_returns_first_success():
+    results = [throttled(), Result.ok("done")]
+
+    async def action():
+        return results.pop(0)
+
+    result = await with_retry(action, policy=RetryPolicy(base_delay=0.001))
+    assert result.success and result.data == "done"
+
+
+def test_retry_delay_is_jittered_and_capped():
+    policy = RetryPolicy(base_delay=1.0, max_delay=4.0, jitter=0.5)
+    delays = [policy.get_delay(5) for _ in range(50)]
+    assert all(2.0 <= d <= 4.0 for d in delays)
+    assert len(set(delays)) > 1
+    assert RetryPolicy(base_delay=1.0, jitter=0).get_delay(2) == 4.0
+
+
+def test_adaptive_limiter_decreases_once_per_cooldown_and_recovers():
+    limiter = AdaptiveLimiter(8, cooldown=60)
+    limiter.record(throttled())
+    limiter.record(throttled())
+    assert limiter.limit == 4
+    assert limiter.decreases == 1
+
+    # 每次成功增加 1/上限：从 4 回到 8 约需 4 + 5 + 6 + 7 次，之后不超过 max_limit
+    for _ in range(30):
+        limiter.record(Result.ok(None))
+    assert limiter.limit == 8
+    assert limiter.lowest == 4
+
+    # 非限流类错误不调整
+    limiter.record(Result.fail_with(code="C_PARSE_FAILED", message="解析失败", recoverable=False))
+    assert limiter.limit == 8
+
+
+async def test_adaptive_limiter_caps_inflight():
+    limiter = AdaptiveLimiter(2)
+    peak = 0
+
+    async def job():
+        nonlocal peak
+        async with limiter:
+            peak = max(peak, limiter.inflight)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(job() for _ in range(8)))
+    assert peak == 2
+    assert limiter.inflight == 0
@@ -0,0 +1,108 @@
+"""
+选择器命中缓存：排序、衰减与多实例合并写盘
+"""
+import json
+
+import pytest
+
+from src.infra.selector_cache import SelectorCache, url_pattern
+
+URL = "https://upload.taobao.com/sell/123/publish.htm?id=9"
+CANDIDATES = ["#a", "#b", "#c"]
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / "selector_cache.json"
+
+
+def test_url_pattern_drops_query_and_numeric_ids():
+    assert url_pattern(URL) == "upload.taobao.com/sell/*/publish.htm"
+    assert url_pattern("https://upload.taobao.com/sell/456/publish.htm") == url_pattern(URL)
+    assert url_pattern("") == ""
+
+
+def test_order_prefers_hits_and_keeps_original_order_on_ties(path):
+    cache = SelectorCache(path)
+    assert cache.order(URL, "title", CANDIDATES) == CANDIDATES
+
+    cache.record(URL, "title", "#a", False)
+    cache.record(URL, "title", "#c", True)
+    assert cache.order(URL, "title", CANDIDATES) == ["#c", "#b", "#a"]
+    # 其他字段不受影响
+    assert cache.order(URL, "price", CANDIDATES) == CANDIDATES
+
+
+def test_first_try_hits_are_counted(path):
+    cache = SelectorCache(path)
+    cache.order(URL, "title", CANDIDATES)
+    cache.record(URL, "title", "#a", True)
+    cache.order(URL, "title", CANDIDATES)
+    cache.record(URL, "title", "#b", True)
+
+    assert cache.stats.lookups == 2
+    assert cache.stats.first_try_hits == 1
+
+
+def test_old_results_decay(path):
+    cache = SelectorCache(path)
+    for _ in range(5):
+        cache.record(URL, "title", "#a", True)
+    # 页面改版后 #a 持续失败，#b 开始命中
+    for _ in range(20):
+        cache.record(URL, "title", "#a", False)
+        cache.record(URL, "title", "#b", True)
+    assert cache.order(URL, "title", CANDIDATES)[0] == "#b"
+
+
+def test_flush_persists_and_reloads(path):
+    cache = SelectorCache(path)
+    cache.record(URL, "title", "#b", True)
+    cache.flush()
+
+    assert SelectorCache(path).order(URL, "title", CANDIDATES)[0] == "#b"
+
+
+def test_flush_every_writes_automatically(path):
+    cache = SelectorCache(path)
+    cache.FLUSH_EVERY = 2
+    cache.record(URL, "title", "#a", True)
+    assert not path.exists()
+    cache.record(URL, "title", "#a", True)
+    assert path.exists()
+
+
+def test_flush_merges_keys_written_by_other_instances(path):
+    first = SelectorCache(path)
+    second = SelectorCache(path)
+
+    first.record(URL, "title", "#a", True)
+    second.record(URL, "price", "#p", True)
+    second.record(URL, "title", "#b", True)
+    second.flush()
+    first.flush()
+
+    data = json.loads(path.read_text(encoding="utf-8"))
+    title_key, price_key = (f"{url_pattern(URL)}|{name}" for name in ("title", "price"))
+    # 其他实例写入的键保留；同一键以本实例为准，并补入对方新出现的选择器
+    assert set(data) == {title_key, price_key}
+    assert data[title_key]["#a"]["hits"] == 1
+    assert data[title_key]["#b"]["hits"] == 1
+
+    # 未记录过的键取文件中的最新值
+    second.record(URL, "price", "#q", True)
+    second.flush()
+    first.record(URL, "title", "#a", True)
+    first.flush()
+    data = json.loads(path.read_text(encoding="utf-8"))
+    assert set(data[price_key]) == {"#p", "#q"}
+
+
+def test_corrupt_file_starts_fresh(path):
+    path.write_text("{broken", encoding="utf-8")
+    cache = SelectorCache(path)
+    assert cache.order(URL, "title", CANDIDATES) == CANDIDATES
+
+    cache.record(URL, "title", "#a", True)
+    cache.flush()
+    assert json.loads(path.read_text(encoding="utf-8"))
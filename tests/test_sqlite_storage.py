@@ -0,0 +1,133 @@
+"""
+SQLite 商品存储：增删改查与从 JSON 目录迁移
+"""
+import json
+from datetime import datetime
+
+import pytest
+
+from src.infra.storage import ProductStorage, SqliteProductStorage, create_product_storage
+from src.models import SKU, Product, ProductStatus
+
+
+def make_product(product_id: str, status=ProductStatus.DRAFT, collected_at=None) -> Product:
+    return Product(
+        id=product_id,
+        source_url=f"https://item.taobao.com/item.htm?id={product_id}",
+        title=f"商品 {product_id}",
+        price=9.9,
+        skus=[SKU(id="1", name="颜色: 红色", price=9.9, stock=3)],
+        images=["https://img.alicdn.com/a.jpg"],
+        status=status,
+        collected_at=collected_at or datetime.now()
+    )
+
+
+@pytest.fixture
+def storage(tmp_path):
+    s = SqliteProductStorage(tmp_path)
+    yield s
+    s.close()
+
+
+def test_save_get_and_delete(storage):
+    product = make_product("p1")
+    assert storage.save(product).success
+
+    loaded = storage.get("p1").data
+    assert loaded.to_dict() == product.to_dict()
+
+    assert storage.delete("p1").data is True
+    assert storage.get("p1").error.code == "S_NOT_FOUND"
+
+
+def test_save_replaces_and_moves_to_end(storage):
+    storage.save_many([make_product("p1"), make_product("p2")])
+    updated = make_product("p1", status=ProductStatus.UPLOADED)
+    storage.save(updated)
+
+    assert [e["id"] for e in storage.list().data] == ["p2", "p1"]
+    assert storage.count().data == 2
+    assert storage.count(ProductStatus.UPLOADED).data == 1
+
+
+def test_list_filters(storage):
+    storage.save_many([
+        make_product("old", collected_at=datetime(2024, 1, 1)),
+        make_product("new", collected_at=datetime(2024, 6, 1)),
+        make_product("done", status=ProductStatus.UPLOADED, collected_at=datetime(2024, 6, 2)),
+    ])
+
+    drafts = storage.list(ProductStatus.DRAFT).data
+    assert [e["id"] for e in drafts] == ["old", "new"]
+    assert set(drafts[0]) == {"id", "title", "status", "collected_at"}
+
+    recent = storage.list(since=datetime(2024, 5, 1)).data
+    assert [e["id"] for e in recent] == ["new", "done"]
+    assert [e["id"] for e in storage.list(limit=1).data] == ["old"]
+
+
+def test_data_survives_reopen(tmp_path):
+    storage = SqliteProductStorage(tmp_path)
+    storage.save(make_product("p1"))
+    storage.close()
+
+    reopened = SqliteProductStorage(tmp_path)
+    try:
+        assert reopened.get("p1").data.title == "商品 p1"
+    finally:
+        reopened.close()
+
+
+def write_json_store(directory, products, corrupt=()):
+    json_store = ProductStorage(directory)
+    for product in products:
+        json_store.save(product)
+    for product_id in corrupt:
+        (directory / f"{product_id}.json").write_text("{broken", encoding="utf-8")
+    return json_store
+
+
+def test_migrate_from_json_skips_unreadable_files(tmp_path, storage):
+    source = tmp_path / "json"
+    write_json_store(
+        source,
+        [make_product("p1"), make_product("p2"), make_product("p3")],
+        corrupt=["p2"]
+    )
+    (source / "p3.json").unlink()
+    index = json.loads((source / "index.json").read_text(encoding="utf-8"))
+    index["products"].append({"title": "缺少 ID"})
+    (source / "index.json").write_text(json.dumps(index), encoding="utf-8")
+
+    result = storage.migrate_from_json(source)
+    assert result.data == 1
+    assert [e["id"] for e in storage.list().data] == ["p1"]
+    # 原文件保留
+    assert (source / "p2.json").exists()
+
+
+def test_migrate_without_index_imports_nothing(tmp_path, storage):
+    assert storage.migrate_from_json(tmp_path / "missing").data == 0
+
+
+def test_create_product_storage_migrates_once(tmp_path):
+    write_json_store(tmp_path, [make_product("p1"), make_product("p2")])
+
+    storage = create_product_storage(tmp_path, backend="sqlite")
+    try:
+        assert isinstance(storage, SqliteProductStorage)
+        assert storage.count().data == 2
+        storage.delete("p1")
+    finally:
+        storage.close()
+    assert not list(tmp_path.glob("*.migrating*"))
+
+    # 数据库已存在时不再重复导入
+    storage = create_product_storage(tmp_path, backend="sqlite")
+    try:
+        assert storage.count().data == 1
+    finally:
+        storage.close()
+
+    assert isinstance(create_product_storage(tmp_path), ProductStorage)
@@ -0,0 +1,94 @@
+"""
+存储写入：原子替换与批量刷新索引
+"""
+import json
+
+import pytest
+
+from src.infra.storage import ProductStorage, atomic_write_json
+from src.models import Product
+
+
+def make_product(product_id: str) -> Product:
+    return Product(
+        id=product_id,
+        source_url=f"https://item.taobao.com/item.htm?id={product_id}",
+        title=f"商品 {product_id}",
+        price=1.0
+    )
+
+
+def index_ids(directory) -> list[str]:
+    data = json.loads((directory / "index.json").read_text(encoding="utf-8"))
+    return [e["id"] for e in data["products"]]
+
+
+def test_atomic_write_replaces_file(tmp_path):
+    path = tmp_path / "data.json"
+    atomic_write_json(path, {"v": 1})
+    atomic_write_json(path, {"v": 2}, fsync=True)
+
+    assert json.loads(path.read_text(encoding="utf-8")) == {"v": 2}
+    assert [p.name for p in tmp_path.iterdir()] == ["data.json"]
+
+
+def test_failed_write_keeps_original_and_cleans_up(tmp_path):
+    path = tmp_path / "data.json"
+    atomic_write_json(path, {"v": 1})
+
+    with pytest.raises(TypeError):
+        atomic_write_json(path, {"v": object()})
+
+    assert json.loads(path.read_text(encoding="utf-8")) == {"v": 1}
+    assert [p.name for p in tmp_path.iterdir()] == ["data.json"]
+
+
+def test_batch_defers_index_until_exit(tmp_path):
+    storage = ProductStorage(tmp_path)
+    with storage.batch():
+        for n in range(3):
+            storage.save(make_product(f"p{n}"))
+        # 单品文件立即写入，索引延后
+        assert (tmp_path / "p2.json").exists()
+        assert index_ids(tmp_path) == []
+        # 批量期间读取以内存为准
+        assert len(storage.list().data) == 3
+
+    assert index_ids(tmp_path) == ["p0", "p1", "p2"]
+
+
+def test_batch_flushes_every_n_changes(tmp_path):
+    storage = ProductStorage(tmp_path)
+    with storage.batch(flush_every=2):
+        storage.save(make_product("p0"))
+        assert index_ids(tmp_path) == []
+        storage.save(make_product("p1"))
+        assert index_ids(tmp_path) == ["p0", "p1"]
+        storage.save(make_product("p2"))
+        storage.delete("p0")
+        assert index_ids(tmp_path) == ["p1", "p2"]
+        storage.save(make_product("p3"))
+
+    assert index_ids(tmp_path) == ["p1", "p2", "p3"]
+
+
+def test_nested_batch_writes_once_at_outer_exit(tmp_path):
+    storage = ProductStorage(tmp_path)
+    with storage.batch():
+        with storage.batch():
+            storage.save(make_product("p0"))
+        assert index_ids(tmp_path) == []
+    assert index_ids(tmp_path) == ["p0"]
+
+
+def test_batch_writes_index_when_body_raises(tmp_path):
+    storage = ProductStorage(tmp_path)
+    with pytest.raises(RuntimeError):
+        with storage.batch():
+            storage.save(make_product("p0"))
+            raise RuntimeError("中断")
+
+    assert index_ids(tmp_path) == ["p0"]
+    # 批量结束后恢复逐次写入
+    storage.save(make_product("p1"))
+    assert index_ids(tmp_path) == ["p0", "p1"]
@@ -0,0 +1,99 @@
+"""
+存储索引缓存：按文件签名失效、写穿与返回副本
+"""
+import pytest
+
+from src.infra.storage import ProductStorage
+from src.models import Product
+
+
+def make_product(product_id: str, title: str = None) -> Product:
+    return Product(
+        id=product_id,
+        source_url=f"https://item.taobao.com/item.htm?id={product_id}",
+        title=title or f"商品 {product_id}",
+        price=1.0
+    )
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return ProductStorage(tmp_path)
+
+
+def count_reads(storage, monkeypatch) -> list:
+    reads = []
+    original = storage._read_index_file
+
+    def read():
+        reads.append(1)
+        return original()
+
+    monkeypatch.setattr(storage, "_read_index_file", read)
+    return reads
+
+
+def test_repeated_reads_use_cache(storage, monkeypatch):
+    storage.save(make_product("p1"))
+    reads = count_reads(storage, monkeypatch)
+
+    for _ in range(5):
+        assert len(storage.list().data) == 1
+    storage.save(make_product("p2"))
+    assert [e["id"] for e in storage.list().data] == ["p1", "p2"]
+    assert reads == []
+
+
+def test_update_moves_entry_to_end(storage):
+    storage.save(make_product("p1"))
+    storage.save(make_product("p2"))
+    storage.save(make_product("p1", title="新标题"))
+
+    entries = storage.list().data
+    assert [e["id"] for e in entries] == ["p2", "p1"]
+    assert entries[1]["title"] == "新标题"
+
+
+def test_list_returns_copies(storage):
+    storage.save(make_product("p1"))
+    entries = storage.list().data
+    entries[0]["title"] = "被调用方修改"
+    entries.clear()
+
+    assert storage.list().data[0]["title"] == "商品 p1"
+    assert storage._get_index()["products"][0]["title"] == "商品 p1"
+
+
+def test_external_write_is_detected(tmp_path, storage):
+    storage.save(make_product("p1"))
+    generation = storage.generation
+
+    other = ProductStorage(tmp_path)
+    other.save(make_product("p2"))
+    other.delete("p1")
+
+    assert [e["id"] for e in storage.list().data] == ["p2"]
+    assert storage.generation > generation
+
+
+def test_invalidate_forces_reload(storage, monkeypatch):
+    storage.save(make_product("p1"))
+    reads = count_reads(storage, monkeypatch)
+
+    storage.invalidate()
+    storage.list()
+    storage.list()
+    assert len(reads) == 1
+
+
+def test_corrupt_index_is_backed_up_not_overwritten(tmp_path, storage):
+    storage.save(make_product("p1"))
+    (tmp_path / "index.json").write_text("{broken", encoding="utf-8")
+
+    result = storage.list()
+    assert result.error.code == "S_READ_FAILED"
+    assert list(tmp_path.glob("index.corrupt-*.json"))
+
+    # 索引无法读取时保存失败，原文件不会被空索引覆盖
+    assert not storage.save(make_product("p2")).success
+    assert (tmp_path / "index.json").read_text(encoding="utf-8") == "{broken"